@@ -1,6 +1,9 @@
-from fastapi import FastAPI, HTTPException, Depends 
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import Header
+import asyncio
+import json
 import sys
 import logging
 import os
@@ -18,6 +21,9 @@ sys.path.insert(0, parent_dir)
 
 from Backend.backend_services import(
     test_connection_service,
+    test_connections_service,
+    get_connection_health_service,
+    load_saved_connections,
     create_connection_service,
     list_connections_service,
     get_connection_service,
@@ -32,15 +38,39 @@ from Backend.backend_services import(
     get_profile_results_by_run_id,
     get_profiling_runs_by_connection,
     get_all_profiling_runs_service,
-    get_latest_profiling_run_dashboard_data_service
+    get_latest_profiling_run_dashboard_data_service,
+    get_profiling_run_charts_service,
+    get_profiling_run_handle_service,
+    list_profiling_run_handles_service,
+    cancel_profiling_run_service,
+    get_profiling_run_version_service,
+    get_profile_results_page,
+    DASHBOARD_RUN_LIMIT,
+    PROFILE_RESULT_GRID_PAGE_SIZE,
+    MAX_PROFILE_RESULT_GRID_PAGE_SIZE
 )
+from Backend.http_cache import (
+    COMPLETED_RUN,
+    REVALIDATE,
+    SelectiveGZipMiddleware,
+    conditional_response,
+    hashed_response,
+    json_response,
+    make_etag,
+)
+from Backend.run_registry import profiling_run_registry
+from Backend.connection_health import connection_health_monitor
 from Backend.models.models import (
     DBConnectionCreate,
     DBConnectionUpdate,
     TestConnectionRequest,
     TestConnectionResponse,
+    BatchConnectionTestRequest,
+    ConnectionTestResult,
+    ConnectionHealthOut,
     TableGroupCreate, # Use TableGroupCreate for input
     ConnectionProfilingRequest,
+    ContingencyCountsOut,
     DBConnectionOut, # Use DBConnectionOut for output
     TableGroupOut,
     ProfileResultOut,
@@ -48,10 +78,15 @@ from Backend.models.models import (
     TriggerProfilingRequest,
     RunInfo,
     DashboardStats,
-    LatestProfilingRunDashboardData
+    LatestProfilingRunDashboardData,
+    ProfilingRunChartSeries,
+    ProfilingRunHandleOut,
+    GridSortItem,
+    GridFilterModel,
+    ProfileResultPage
     )
-from pydantic import BaseModel
-from typing import List, Dict, Any # Import Dict and Any for the profiling response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import List, Dict, Any, Optional # Import Dict and Any for the profiling response
 from uuid import UUID
 
 # Import the get_db dependency from your database file
@@ -67,8 +102,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the app read the ETag, to send it back in If-None-Match
+    expose_headers=["ETag"],
 )
+# Compresses JSON responses over 1 KB, e.g. profile results, for clients that accept gzip
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000, compresslevel=6)
+
+
 
+# Saved connections are checked in the background by one of the workers, see /connections/health
+@app.on_event("startup")
+def start_connection_health_monitor():
+    connection_health_monitor.start(load_saved_connections)
+
+@app.on_event("shutdown")
+def stop_connection_health_monitor():
+    connection_health_monitor.stop()
 
 
 # --- Connection Endpoints ---
@@ -77,13 +126,21 @@ app.add_middleware(
 def test_connection_route(conn: TestConnectionRequest):
     return test_connection_service(conn)
 
+@app.post("/connections/test-batch", response_model=List[ConnectionTestResult])
+def test_connections_route(request_data: BatchConnectionTestRequest):
+    return test_connections_service(request_data)
+
+@app.get("/connections/health", response_model=List[ConnectionHealthOut])
+def get_connection_health_route():
+    return get_connection_health_service()
+
 @app.post("/connections", response_model=DBConnectionOut)
 def create_connection_route(conn_data: DBConnectionCreate, db: Session = Depends(get_db)):
     return create_connection_service(conn_data=conn_data, db=db)
 
 @app.get("/connections", response_model=List[DBConnectionOut])
-def list_connections_route(db: Session = Depends(get_db)):
-    return list_connections_service(db=db)
+def list_connections_route(request: Request, db: Session = Depends(get_db)):
+    return hashed_response(request, list_connections_service(db=db))
 
 @app.get("/connections/{connection_id}", response_model=DBConnectionOut)
 def get_connection_route(connection_id: int, db: Session = Depends(get_db)):
@@ -99,9 +156,9 @@ def delete_connection_route(connection_id: int, db: Session = Depends(get_db)):
 
 # --- Profiling Endpoint ---
 
-@app.post("/connection/{connection_id}/profiling", response_model=Dict[str, Any]) 
-def profile_connection_route(connection_id: int, conn_data: ConnectionProfilingRequest):
-    return profile_connection_service(conn_id=connection_id, conn_data=conn_data)
+@app.post("/connection/{connection_id}/profiling", response_model=ContingencyCountsOut)
+def profile_connection_route(connection_id: int, conn_data: ConnectionProfilingRequest, db: Session = Depends(get_db)):
+    return profile_connection_service(conn_id=connection_id, conn_data=conn_data, db=db)
 
 # --- Table Group Endpoints ---
 
@@ -123,25 +180,136 @@ def delete_table_group_route(connection_id: int, group_id: str, db: Session = De
 
 # --- Trigger Background Profiling Endpoint ---
 
-@app.post("/run-profiling")
+@app.post("/run-profiling", response_model=ProfilingRunHandleOut, status_code=202)
 def trigger_profiling_route(request_data: TriggerProfilingRequest):
     return trigger_profiling_service(conn_id=request_data.connection_id, group_id=request_data.table_group_id)
 
+@app.get("/run-profiling", response_model=List[ProfilingRunHandleOut])
+def list_profiling_runs_route():
+    return list_profiling_run_handles_service()
+
+@app.get("/run-profiling/{run_handle_id}", response_model=ProfilingRunHandleOut)
+def get_profiling_run_route(run_handle_id: str):
+    return get_profiling_run_handle_service(run_handle_id)
+
+@app.delete("/run-profiling/{run_handle_id}", response_model=ProfilingRunHandleOut)
+def cancel_profiling_run_route(run_handle_id: str):
+    return cancel_profiling_run_service(run_handle_id)
+
+# Server-Sent Events: one event per status change and per profiling step, until the run is finished.
+# Clients that reconnect send Last-Event-ID and only get the events they missed.
+PROGRESS_POLL_SECONDS = 0.5
+
+@app.get("/run-profiling/{run_handle_id}/events")
+async def stream_profiling_run_events_route(run_handle_id: str, last_event_id: Optional[str] = Header(None)):
+    handle = profiling_run_registry.get(run_handle_id)
+    if not handle:
+        raise HTTPException(status_code=404, detail="Profiling run not found")
+
+    async def event_stream():
+        seq = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+        while True:
+            finished = handle.is_finished
+            for event in handle.events_after(seq):
+                seq = event["seq"]
+                yield f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            if finished:
+                break
+            await asyncio.sleep(PROGRESS_POLL_SECONDS)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 #----------   Profiling Endpoints   ----------
+# Read endpoints return an ETag, and 304 Not Modified when the client sends it back in If-None-Match and the data
+# hasn't changed. The results and charts of a run are versioned by its status, end time and result count, so that
+# pruning its results changes the ETag. Once the run is complete, clients reuse them for a few minutes before
+# revalidating.
 @app.get("/{conn_id}/profileresult", response_model=List[ProfilingRunOut])
-def get_profiling_runs_route(conn_id: int, db: Session = Depends(get_db)):
-    return get_profiling_runs_by_connection(conn_id, db)
+def get_profiling_runs_route(conn_id: int, request: Request, db: Session = Depends(get_db)):
+    runs = [ProfilingRunOut.from_orm(run) for run in get_profiling_runs_by_connection(conn_id, db)]
+    return hashed_response(request, runs)
 
 
 @app.get("/{conn_id}/profileresult/{profileresult_id}", response_model=List[ProfileResultOut])
-def get_profile_results_route(conn_id: int, profileresult_id: UUID, db: Session = Depends(get_db)):
-    return get_profile_results_by_run_id(conn_id, profileresult_id, db)
+def get_profile_results_route(conn_id: int, profileresult_id: UUID, request: Request, db: Session = Depends(get_db)):
+    run = get_profiling_run_version_service(profileresult_id, db)
+    if not run:
+        return json_response(get_profile_results_by_run_id(conn_id, profileresult_id, db))
+    return conditional_response(
+        request,
+        make_etag("profile-results", conn_id, run.id, run.status, run.profiling_endtime, run.result_ct),
+        lambda: get_profile_results_by_run_id(conn_id, profileresult_id, db),
+        COMPLETED_RUN if run.status == "Complete" else REVALIDATE,
+    )
+
+@app.get("/{conn_id}/profileresult/{profileresult_id}/grid", response_model=ProfileResultPage)
+def get_profile_results_page_route(
+    conn_id: int,
+    profileresult_id: UUID,
+    request: Request,
+    page: int = Query(0, ge=0),
+    page_size: int = Query(PROFILE_RESULT_GRID_PAGE_SIZE, ge=1, le=MAX_PROFILE_RESULT_GRID_PAGE_SIZE),
+    sort_model: Optional[str] = Query(None, description="JSON list of {field, sort}, as in the grid's sort model"),
+    filter_model: Optional[str] = Query(None, description="JSON filter model of the grid"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, all by default"),
+    db: Session = Depends(get_db),
+):
+    try:
+        sorts = TypeAdapter(List[GridSortItem]).validate_json(sort_model) if sort_model else None
+        filters = GridFilterModel.model_validate_json(filter_model) if filter_model else None
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid sort or filter model: {e}")
+
+    def get_page():
+        return get_profile_results_page(
+            conn_id,
+            profileresult_id,
+            db,
+            page=page,
+            page_size=page_size,
+            sort_model=sorts,
+            filter_model=filters,
+            fields=fields.split(",") if fields else None,
+        )
+
+    run = get_profiling_run_version_service(profileresult_id, db)
+    if not run:
+        return json_response(get_page())
+    return conditional_response(
+        request,
+        make_etag("profile-results-page", conn_id, run.id, run.status, run.profiling_endtime, run.result_ct, request.url.query),
+        get_page,
+        COMPLETED_RUN if run.status == "Complete" else REVALIDATE,
+    )
 
 @app.get("/home", response_model=DashboardStats)
-def get_all_profiling_runs(db: Session = Depends(get_db)):
-    return get_all_profiling_runs_service(db)
+def get_all_profiling_runs(request: Request, limit: int = Query(DASHBOARD_RUN_LIMIT, ge=1, le=500), db: Session = Depends(get_db)):
+    return hashed_response(request, get_all_profiling_runs_service(db, limit=limit))
 
 @app.get("/latest-profiling-run", response_model=LatestProfilingRunDashboardData)
-def get_latest_profiling_run_dashboard_data(db: Session = Depends(get_db)):
-    return get_latest_profiling_run_dashboard_data_service(db)
\ No newline at end of file
+def get_latest_profiling_run_dashboard_data(request: Request, db: Session = Depends(get_db)):
+    run = get_profiling_run_version_service(None, db)
+    if not run:
+        return get_latest_profiling_run_dashboard_data_service(db)
+    return conditional_response(
+        request,
+        make_etag("latest-run", run.id, run.status, run.profiling_endtime, run.result_ct),
+        lambda: get_latest_profiling_run_dashboard_data_service(db),
+    )
+
+@app.get("/profiling-runs/{run_id}/charts", response_model=ProfilingRunChartSeries)
+def get_profiling_run_charts(run_id: UUID, request: Request, db: Session = Depends(get_db)):
+    run = get_profiling_run_version_service(run_id, db)
+    if not run:
+        return get_profiling_run_charts_service(run_id, db)
+    return conditional_response(
+        request,
+        make_etag("run-charts", run.id, run.status, run.profiling_endtime, run.result_ct),
+        lambda: get_profiling_run_charts_service(run_id, db),
+        COMPLETED_RUN if run.status == "Complete" else REVALIDATE,
+    )
@@ -1,7 +1,13 @@
 from typing import List, Dict, Any, Optional, Union
 from uuid import uuid4, UUID
+from collections import OrderedDict
+from datetime import datetime, timezone
+from decimal import Decimal
 import base64
-from sqlalchemy import create_engine, desc
+import re
+import threading
+from sqlalchemy import Float, and_, cast, create_engine, desc, func, or_
+from pydantic_core import to_json
 from fastapi import Depends
 from sqlalchemy.orm import sessionmaker, Session # Import Session
 from fastapi import HTTPException
@@ -10,22 +16,37 @@ from Backend.models.models import (
     DBConnectionUpdate,
     TestConnectionRequest,
     TestConnectionResponse,
+    BatchConnectionTestRequest,
+    ConnectionTestResult,
+    ConnectionHealthOut,
     TableGroupCreate, # Use TableGroupCreate for input
     ConnectionProfilingRequest,
+    ContingencyCountsOut,
     DBConnectionOut, # Use DBConnectionOut for output
     TableGroupOut, # Use TableGroupOut for output
     ProfileResultOut,
     ProfilingRunOut,
-    LatestProfilingRunDashboardData
+    LatestProfilingRunDashboardData,
+    ProfilingRunChartSeries,
+    ProfilingRunHandleOut,
+    GridSortItem,
+    GridFilterModel
 )
-from Backend.db.database import TableGroupModel, Connection, ProfileResultModel, ProfilingRunModel
+from Backend.db.database import TableGroupModel, Connection, ProfileResultModel, ProfilingRunModel, DataTableCharsModel
 from testgen.common.encrypt import EncryptText, DecryptText
 from testgen.commands.queries.profiling_query import CProfilingSQL
-import testgen.commands.run_profiling_bridge as rpb
+from Backend.run_registry import RunAlreadyActiveError, profiling_run_registry
+from Backend.target_queries import TargetConnection, TargetConnectionError, run_target_query
+from Backend.connection_health import (
+    LATENCY_BUCKETS_MS,
+    ProbeResult,
+    connection_health_monitor,
+    probe_connection,
+    probe_connections,
+)
+from testgen.common.database.database_service import QuoteCSVItems
 #from testgen.commands.run_profiling_bridge import run_profiling_in_background
  
-# Assuming ConnectionsPage is still used for the initial test connection
-from testgen.ui.views.connections import ConnectionsPage
 import logging
  
 # Assuming you have a utility for password encryption/decryption
@@ -52,35 +73,34 @@ def get_db():
 # API logic functions
  
 #----------------------------test connection-----------------------------------
+# Tests go through the connection health probes: pooled engines per set of connection parameters, and outcomes
+# cached for a short while
+def _to_test_response(result: ProbeResult, **extra):
+    return dict(
+        status=result.successful,
+        message=result.message,
+        details=result.details,
+        latency_ms=result.latency_ms,
+        cached=result.cached,
+        **extra,
+    )
+
+
 # Uses TestConnectionRequest Pydantic model for input
 def test_connection_service(conn: TestConnectionRequest):
     try:
-        con = ConnectionsPage()
         password = conn.password
         if any(c in password for c in ['/', '+', '=']) and len(password) > 30:
             password = DecryptText(password)
-        # Maps fields from Pydantic model to the dictionary expected by ConnectionsPage
-        connection_dict = {
-            "sql_flavor": conn.sql_flavor.lower(),
-            "project_host": conn.db_hostname,
-            "project_port": conn.db_port, # TestConnectionRequest expects int port
-            "project_db": conn.project_db,
-            "project_user": conn.user_id,
-            "password": password,
-            "url": None,
-            "connect_by_url": False,
-            "connect_by_key": False,
-            "private_key": None,
-            "private_key_passphrase": None,
-            "http_path": None,
-        }
-        status = con.test_connection(connection_dict)
-        # Returns TestConnectionResponse Pydantic model
-        return TestConnectionResponse(
-            status=status.successful,
-            message=status.message,
-            details=status.details,
+        target = TargetConnection(
+            sql_flavor=conn.sql_flavor.lower(),
+            project_host=conn.db_hostname,
+            project_port=str(conn.db_port),
+            project_db=conn.project_db,
+            project_user=conn.user_id,
+            password=password,
         )
+        return TestConnectionResponse(**_to_test_response(probe_connection(target)))
     except Exception as e:
         LOG.error(f"Connection test failed: {e}")
         # Returns TestConnectionResponse Pydantic model on error
@@ -89,6 +109,59 @@ def test_connection_service(conn: TestConnectionRequest):
             message=f"Connection test failed: {str(e)}",
             details=None,
         )
+
+
+def load_saved_connections(connection_ids: Optional[List[int]] = None):
+    # Returns the id, name and parameters of the saved connections, for the health probes
+    db = SessionLocal()
+    try:
+        query = db.query(Connection)
+        if connection_ids is not None:
+            query = query.filter(Connection.connection_id.in_(connection_ids))
+        connections = []
+        for conn in query.all():
+            try:
+                connections.append((conn.connection_id, conn.connection_name, TargetConnection.from_connection(conn)))
+            except Exception as e:
+                LOG.error(f"Cannot read the parameters of connection {conn.connection_id}: {e}")
+        return connections
+    finally:
+        db.close()
+
+
+def test_connections_service(request: BatchConnectionTestRequest) -> List[ConnectionTestResult]:
+    connections = load_saved_connections(request.connection_ids)
+    results = probe_connections(
+        {connection_id: target for connection_id, _, target in connections}, refresh=request.refresh
+    )
+    response = []
+    for connection_id, connection_name, _ in connections:
+        result = results[connection_id]
+        connection_health_monitor.record(connection_id, connection_name, result)
+        response.append(ConnectionTestResult(**_to_test_response(
+            result, connection_id=connection_id, connection_name=connection_name, checked_at=result.checked_at
+        )))
+    return response
+
+
+def get_connection_health_service() -> List[ConnectionHealthOut]:
+    return [
+        ConnectionHealthOut(
+            connection_id=health.connection_id,
+            connection_name=health.connection_name,
+            status=health.last_result.successful if health.last_result else None,
+            message=health.last_result.message if health.last_result else None,
+            details=health.last_result.details if health.last_result else None,
+            latency_ms=health.last_result.latency_ms if health.last_result else None,
+            checked_at=health.last_result.checked_at if health.last_result else None,
+            check_ct=health.check_ct,
+            failure_ct=health.failure_ct,
+            latency_buckets_ms=list(LATENCY_BUCKETS_MS),
+            latency_histogram=list(health.latency_histogram),
+        )
+        for health in connection_health_monitor.get_all()
+    ]
+
  
 #-------------------------create connection---------------------------------
 # Uses DBConnectionCreate Pydantic model for input and Connection SQLAlchemy model for DB interaction
@@ -206,32 +279,108 @@ def delete_connection_service(conn_id: int, db: Session = next(get_db())):
         raise HTTPException(status_code=500, detail=f"Error deleting connection: {str(e)}")
  
  
-#--------------------------SQLquery generation for profiling---------------------------------
-def profile_connection_service(conn_id: int, conn_data: ConnectionProfilingRequest):
+#--------------------------contingency counts for a table---------------------------------
+# Names are checked before being put in the query: schema and table are used as is, and columns are quoted
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+COLUMN_NAME_PATTERN = re.compile(r'^[^",\x00-\x1f]{1,128}$')
+CONTINGENCY_TIMEOUT_SECONDS = 60
+CONTINGENCY_CACHE_SIZE = 256
+# Bounds the age of cached counts for tables whose changes aren't tracked by the data refresh or profiling
+CONTINGENCY_CACHE_TTL_SECONDS = 3600
+
+_contingency_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_contingency_cache_lock = threading.Lock()
+
+
+def _get_table_change_signal(conn_id: int, schema_name: str, table_name: str, db: Session):
+    # The data refresh and profiling update the table's characteristics when its data changes
+    table_chars = (
+        db.query(DataTableCharsModel)
+        .join(TableGroupModel, DataTableCharsModel.table_groups_id == TableGroupModel.id)
+        .filter(
+            TableGroupModel.connection_id == conn_id,
+            DataTableCharsModel.schema_name == schema_name,
+            DataTableCharsModel.table_name == table_name,
+        )
+        .order_by(desc(DataTableCharsModel.last_refresh_date))
+        .first()
+    )
+    if not table_chars:
+        return None
+    return (table_chars.last_refresh_date, table_chars.record_ct, table_chars.last_complete_profile_run_id)
+
+
+def _to_json_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def profile_connection_service(conn_id: int, conn_data: ConnectionProfilingRequest, db: Session = next(get_db())):
+    for name in (conn_data.schema_name, conn_data.table_name):
+        if not IDENTIFIER_PATTERN.match(name):
+            raise HTTPException(status_code=400, detail=f"Invalid schema or table name: {name}")
+    for name in conn_data.columns:
+        if not COLUMN_NAME_PATTERN.match(name):
+            raise HTTPException(status_code=400, detail=f"Invalid column name: {name}")
+
+    conn = db.query(Connection).filter(Connection.connection_id == conn_id).first()
+    if not conn:
+        raise HTTPException(status_code=404, detail="Connection not found")
+
+    signal = _get_table_change_signal(conn_id, conn_data.schema_name, conn_data.table_name, db)
+    cache_key = (conn_id, conn_data.schema_name, conn_data.table_name, tuple(conn_data.columns), conn_data.max_rows, signal)
+    now = datetime.now(timezone.utc)
+    if not conn_data.refresh:
+        with _contingency_cache_lock:
+            cached = _contingency_cache.get(cache_key)
+            if cached and (now - cached[0]).total_seconds() < CONTINGENCY_CACHE_TTL_SECONDS:
+                _contingency_cache.move_to_end(cache_key)
+                return ContingencyCountsOut(**cached[1], cached=True, computed_at=cached[0])
+
+    profiler = CProfilingSQL(strProjectCode=conn.project_code, flavor=conn.sql_flavor)
+    profiler.connection_id = str(conn_id)
+    profiler.data_schema = conn_data.schema_name
+    profiler.data_table = conn_data.table_name
+    profiler.contingency_columns = QuoteCSVItems(",".join(conn_data.columns))
     try:
-        LOG.info(f"Received profiling request for connection ID: {conn_id}")
-        # Maps fields from ConnectionProfilingRequest to CProfilingSQL parameters
-        profiler = CProfilingSQL(
-            strProjectCode=conn_data.project_code, # Use project_code from payload
-            flavor=conn_data.db_type.lower() # Use db_type from payload
+        target = TargetConnection.from_connection(conn)
+    except Exception as e:
+        LOG.error(f"Cannot read the parameters of connection {conn_id}: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid connection parameters: {str(e)}")
+    try:
+        LOG.info(f"Counting value combinations of {conn_data.columns} in {conn_data.schema_name}.{conn_data.table_name}, connection {conn_id}")
+        columns, rows, truncated = run_target_query(
+            target,
+            profiler.GetContingencyCounts(),
+            conn_data.max_rows,
+            CONTINGENCY_TIMEOUT_SECONDS,
+            dbschema=conn_data.schema_name,
         )
-        profiler.connection_id = str(conn_id) # Pass connection_id from URL
-        # Assuming data_schema, data_table, contingency_columns are fixed or derived elsewhere
-        # If these should come from the payload or a TableGroup, you'll need to adjust
-        profiler.data_schema = "testdb"
-        profiler.data_table = "land_registry_price"
-        profiler.contingency_columns = "'property_type', 'city'"
- 
-        # Assuming GetContingencyCounts is the method you want to call
-        result = profiler.GetContingencyCounts()
- 
-        return {"status": "success", "data": result}
+    except TargetConnectionError as e:
+        LOG.error(f"Cannot connect to the target database of connection {conn_id}: {e}")
+        raise HTTPException(status_code=502, detail=f"Error connecting to the target database: {str(e)}")
     except Exception as e:
-        LOG.error(f"Profiling failed for connection {conn_id}: {e}")
-        # Returns a failure status and message
-        return {"status":"failed", "data":str(e)}
- 
- 
+        LOG.error(f"Contingency counts failed for connection {conn_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error counting value combinations: {str(e)}")
+
+    result = {
+        "connection_id": conn_id,
+        "schema_name": conn_data.schema_name,
+        "table_name": conn_data.table_name,
+        "columns": columns,
+        "rows": [[_to_json_value(value) for value in row] for row in rows],
+        "row_count": len(rows),
+        "truncated": truncated,
+    }
+    with _contingency_cache_lock:
+        _contingency_cache[cache_key] = (now, result)
+        _contingency_cache.move_to_end(cache_key)
+        while len(_contingency_cache) > CONTINGENCY_CACHE_SIZE:
+            _contingency_cache.popitem(last=False)
+    return ContingencyCountsOut(**result, cached=False, computed_at=now)
+
+
 #--------------------create table groups for a connection---------------------------------
 def create_table_group_service(conn_id: int, table_group_data: TableGroupCreate, db: Session = next(get_db())):
     try:
@@ -429,14 +578,31 @@ def delete_table_group_service(conn_id: int, group_id: str, db: Session = next(g
  
  
 #--------------------do background profiling job---------------------------------
-# Triggers a background profiling job using the TableGroup UUID (str)
-def trigger_profiling_service(conn_id: int, group_id: str):
+# Queues a profiling job for the TableGroup UUID (str) in the run registry, which runs it in its own process
+def trigger_profiling_service(conn_id: int, group_id: str) -> ProfilingRunHandleOut:
     try:
-        rpb.run_profiling_in_background(group_id)
-        return {"status": "started", "message": "Profiling job launched in background"}
+        handle = profiling_run_registry.submit(conn_id, group_id)
+        return ProfilingRunHandleOut.from_orm(handle)
+    except RunAlreadyActiveError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         LOG.error(f"Error triggering profiling for group {group_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+def get_profiling_run_handle_service(run_handle_id: str) -> ProfilingRunHandleOut:
+    handle = profiling_run_registry.get(run_handle_id)
+    if not handle:
+        raise HTTPException(status_code=404, detail="Profiling run not found")
+    return ProfilingRunHandleOut.from_orm(handle)
+
+def list_profiling_run_handles_service() -> List[ProfilingRunHandleOut]:
+    return [ProfilingRunHandleOut.from_orm(handle) for handle in profiling_run_registry.list()]
+
+def cancel_profiling_run_service(run_handle_id: str) -> ProfilingRunHandleOut:
+    handle = profiling_run_registry.cancel(run_handle_id)
+    if not handle:
+        raise HTTPException(status_code=404, detail="Profiling run not found")
+    return ProfilingRunHandleOut.from_orm(handle)
  
 #---------------------profiling results--------------------------------------------------------------------
 def get_profiling_runs_by_connection(conn_id: int, db: Session):
@@ -449,28 +615,214 @@ def get_profiling_runs_by_connection(conn_id: int, db: Session):
         LOG.error(f"Error fetching profiling runs for connection {conn_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-def get_profile_results_by_run_id(conn_id: int, profileresult_id: UUID, db: Session):
+# Fields of ProfileResultOut, selected as columns instead of loading ORM objects. fractional_sum is NUMERIC in the
+# database, and is cast so that it comes back as a float, like the other statistics
+PROFILE_RESULT_FIELDS = list(ProfileResultOut.model_fields)
+PROFILE_RESULT_COLUMNS = [
+    cast(ProfileResultModel.fractional_sum, Float).label(name) if name == "fractional_sum"
+    else getattr(ProfileResultModel, name)
+    for name in PROFILE_RESULT_FIELDS
+]
+
+def get_profile_results_by_run_id(conn_id: int, profileresult_id: UUID, db: Session) -> bytes:
+    # Returns the results as JSON: the rows come from the database with the types of ProfileResultOut, so they are
+    # serialised in one pass in pydantic-core, without building and validating a model per row
     try:
-        results = db.query(ProfileResultModel).filter(
+        rows = db.query(*PROFILE_RESULT_COLUMNS).filter(
             ProfileResultModel.connection_id == conn_id,
             ProfileResultModel.profile_run_id == profileresult_id
         ).all()
+    except Exception as e:
+        LOG.error(f"Error fetching profile results for run {profileresult_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="No profile results found for this run.")
+    return to_json([dict(zip(PROFILE_RESULT_FIELDS, row)) for row in rows], inf_nan_mode="null")
+
+# Server-side mode of the profile results grid: sorting, filters and paging follow the grid's sort and filter models
+PROFILE_RESULT_GRID_PAGE_SIZE = 100
+MAX_PROFILE_RESULT_GRID_PAGE_SIZE = 1000
+# Default order, also used to break ties of the requested sort, so that rows don't move between pages
+PROFILE_RESULT_GRID_ORDER = ("schema_name", "table_name", "position", "id")
+# Columns searched by the grid's quick filter
+PROFILE_RESULT_QUICK_FILTER_FIELDS = ("schema_name", "table_name", "column_name")
 
-        if not results:
-            raise HTTPException(status_code=404, detail="No profile results found for this run.")
 
-        # Convert ORM objects to Pydantic
-        return [ProfileResultOut.from_orm(r) for r in results]
+def _like_pattern(value, prefix="%", suffix="%"):
+    escaped = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{prefix}{escaped}{suffix}"
 
+
+def _grid_value(column, value):
+    # Grid filter values come as strings: numeric columns compare them as numbers
+    if value is None or column.type.python_type not in (int, float, Decimal):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid number in filter: {value}")
+
+
+GRID_FILTER_OPERATORS = {
+    "contains": lambda column, value: column.ilike(_like_pattern(value), escape="\\"),
+    "doesNotContain": lambda column, value: ~column.ilike(_like_pattern(value), escape="\\"),
+    "startsWith": lambda column, value: column.ilike(_like_pattern(value, prefix=""), escape="\\"),
+    "endsWith": lambda column, value: column.ilike(_like_pattern(value, suffix=""), escape="\\"),
+    "equals": lambda column, value: column == _grid_value(column, value),
+    "doesNotEqual": lambda column, value: column != _grid_value(column, value),
+    "is": lambda column, value: column == _grid_value(column, value),
+    "not": lambda column, value: column != _grid_value(column, value),
+    "=": lambda column, value: column == _grid_value(column, value),
+    "!=": lambda column, value: column != _grid_value(column, value),
+    ">": lambda column, value: column > _grid_value(column, value),
+    ">=": lambda column, value: column >= _grid_value(column, value),
+    "<": lambda column, value: column < _grid_value(column, value),
+    "<=": lambda column, value: column <= _grid_value(column, value),
+    "after": lambda column, value: column > value,
+    "onOrAfter": lambda column, value: column >= value,
+    "before": lambda column, value: column < value,
+    "onOrBefore": lambda column, value: column <= value,
+    "isAnyOf": lambda column, value: column.in_(
+        [_grid_value(column, item) for item in (value if isinstance(value, list) else [value])]
+    ),
+}
+GRID_EMPTY_OPERATORS = {
+    "isEmpty": lambda column: column.is_(None),
+    "isNotEmpty": lambda column: column.isnot(None),
+}
+
+
+def _profile_result_column(field: str):
+    if field not in PROFILE_RESULT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown profile result field: {field}")
+    return PROFILE_RESULT_COLUMNS[PROFILE_RESULT_FIELDS.index(field)]
+
+
+def _profile_result_grid_filter(filter_model: GridFilterModel):
+    conditions = []
+    for item in filter_model.items:
+        column = _profile_result_column(item.field)
+        if item.operator in GRID_EMPTY_OPERATORS:
+            conditions.append(GRID_EMPTY_OPERATORS[item.operator](column))
+        elif item.operator not in GRID_FILTER_OPERATORS:
+            raise HTTPException(status_code=400, detail=f"Unsupported filter operator: {item.operator}")
+        # The grid sends filters that are still being edited, without a value
+        elif item.value not in (None, "", []):
+            conditions.append(GRID_FILTER_OPERATORS[item.operator](column, item.value))
+
+    combined = []
+    if conditions:
+        combined.append(or_(*conditions) if filter_model.logicOperator == "or" else and_(*conditions))
+    for value in filter_model.quickFilterValues:
+        combined.append(or_(*(
+            _profile_result_column(field).ilike(_like_pattern(value), escape="\\")
+            for field in PROFILE_RESULT_QUICK_FILTER_FIELDS
+        )))
+    return combined
+
+
+def get_profile_results_page(
+    conn_id: int,
+    profileresult_id: UUID,
+    db: Session,
+    page: int = 0,
+    page_size: int = PROFILE_RESULT_GRID_PAGE_SIZE,
+    sort_model: Optional[List[GridSortItem]] = None,
+    filter_model: Optional[GridFilterModel] = None,
+    fields: Optional[List[str]] = None,
+) -> bytes:
+    # Returns one page of the run's results as JSON, with the requested fields only, and the number of rows that match
+    # the filters, so that the grid only holds and renders the rows on screen
+    fields = ["id", *(field for field in fields if field != "id")] if fields else PROFILE_RESULT_FIELDS
+    columns = [_profile_result_column(field) for field in fields]
+    conditions = [
+        ProfileResultModel.connection_id == conn_id,
+        ProfileResultModel.profile_run_id == profileresult_id,
+        *_profile_result_grid_filter(filter_model or GridFilterModel()),
+    ]
+
+    order_by = []
+    for item in sort_model or []:
+        column = _profile_result_column(item.field)
+        order_by.append(column.desc().nullslast() if item.sort == "desc" else column.asc().nullsfirst())
+    order_by.extend(_profile_result_column(field) for field in PROFILE_RESULT_GRID_ORDER)
+
+    try:
+        row_count = db.query(func.count(ProfileResultModel.id)).filter(*conditions).scalar()
+        rows = (
+            db.query(*columns)
+            .filter(*conditions)
+            .order_by(*order_by)
+            .offset(page * page_size)
+            .limit(page_size)
+            .all()
+        )
     except Exception as e:
-        LOG.error(f"Error fetching profile results for run {profileresult_id}: {e}")
+        LOG.error(f"Error fetching profile results page for run {profileresult_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-def get_all_profiling_runs_service(db: Session):
+    return to_json(
+        {"rows": [dict(zip(fields, row)) for row in rows], "row_count": row_count},
+        inf_nan_mode="null",
+    )
+
+def get_profiling_run_version_service(run_id: Optional[UUID], db: Session):
+    # A run's results and charts only change until it ends, or when pruning deletes them: its status, end time and
+    # result count identify their version without loading them. With no run_id, identifies the latest run, as shown
+    # on the dashboard.
+    result_ct = (
+        db.query(func.count(ProfileResultModel.id))
+        .filter(ProfileResultModel.profile_run_id == ProfilingRunModel.id)
+        .correlate(ProfilingRunModel)
+        .scalar_subquery()
+    )
+    query = db.query(
+        ProfilingRunModel.id,
+        ProfilingRunModel.status,
+        ProfilingRunModel.profiling_endtime,
+        result_ct.label("result_ct"),
+    )
+    if run_id:
+        return query.filter(ProfilingRunModel.id == run_id).first()
+    return query.order_by(desc(ProfilingRunModel.profiling_starttime)).first()
+
+DASHBOARD_RUN_LIMIT = 20
+TOP_COLUMNS_LIMIT = 10
+
+def get_all_profiling_runs_service(db: Session, limit: int = DASHBOARD_RUN_LIMIT):
     try:
-        connections_count = db.query(Connection).count()
-        table_groups_count = db.query(TableGroupModel).count()
-        profiling_runs = db.query(ProfilingRunModel).all()
+        connections_count = db.query(func.count(Connection.connection_id)).scalar()
+        table_groups_count = db.query(func.count(TableGroupModel.id)).scalar()
+
+        # Counted in the database, rather than loading every run
+        status_counts = (
+            db.query(ProfilingRunModel.status, func.count(ProfilingRunModel.id))
+            .group_by(ProfilingRunModel.status)
+            .all()
+        )
+
+        # Only the summary columns of the most recent runs
+        recent_runs = (
+            db.query(
+                ProfilingRunModel.id,
+                ProfilingRunModel.connection_id,
+                ProfilingRunModel.status,
+                ProfilingRunModel.table_groups_id,
+                ProfilingRunModel.profiling_starttime,
+                ProfilingRunModel.table_ct,
+                ProfilingRunModel.column_ct,
+                ProfilingRunModel.anomaly_ct,
+                ProfilingRunModel.anomaly_table_ct,
+                ProfilingRunModel.anomaly_column_ct,
+                ProfilingRunModel.dq_affected_data_points,
+                ProfilingRunModel.dq_total_data_points,
+                ProfilingRunModel.dq_score_profiling,
+            )
+            .order_by(desc(ProfilingRunModel.profiling_starttime))
+            .limit(limit)
+            .all()
+        )
 
         formatted_runs = [
             {
@@ -479,21 +831,83 @@ def get_all_profiling_runs_service(db: Session):
                 "status": run.status,
                 "table_groups_id": run.table_groups_id,
                 "created_at": run.profiling_starttime,
+                "table_ct": run.table_ct,
+                "column_ct": run.column_ct,
+                "anomaly_ct": run.anomaly_ct,
+                "anomaly_table_ct": run.anomaly_table_ct,
+                "anomaly_column_ct": run.anomaly_column_ct,
+                "dq_affected_data_points": run.dq_affected_data_points,
+                "dq_total_data_points": run.dq_total_data_points,
+                "dq_score_profiling": run.dq_score_profiling,
             }
-            for run in profiling_runs
+            for run in recent_runs
         ]
 
         return {
             "connections": connections_count,
             "table_groups": table_groups_count,
-            "profiling_runs": len(profiling_runs),
+            "profiling_runs": sum(count for _, count in status_counts),
+            "status_counts": [{"status": status, "count": count} for status, count in status_counts],
             "runs": formatted_runs,
         }
 
     except Exception as e:
         print(f"Error getting dashboard stats: {e}")
         raise HTTPException(status_code=500, detail="Failed to get dashboard stats")
-    
+
+
+def get_profiling_run_chart_series(run_id: UUID, db: Session) -> ProfilingRunChartSeries:
+    # Aggregates the chart series of the dashboard in SQL, so that the profile results of the run aren't loaded
+    in_run = ProfileResultModel.profile_run_id == run_id
+
+    column_count = db.query(func.count(ProfileResultModel.id)).filter(in_run).scalar()
+
+    column_types = (
+        db.query(ProfileResultModel.general_type, func.count(ProfileResultModel.id))
+        .filter(in_run, ProfileResultModel.general_type.isnot(None))
+        .group_by(ProfileResultModel.general_type)
+        .all()
+    )
+
+    pii_flag = func.coalesce(func.nullif(func.trim(ProfileResultModel.pii_flag), ""), "Unknown")
+    pii_flags = (
+        db.query(pii_flag, func.count(ProfileResultModel.id))
+        .filter(in_run)
+        .group_by(pii_flag)
+        .all()
+    )
+
+    def top_columns(numerator, denominator):
+        percent = (numerator * 100.0 / denominator).label("percent")
+        rows = (
+            db.query(ProfileResultModel.table_name, ProfileResultModel.column_name, percent)
+            .filter(in_run, numerator.isnot(None), denominator > 0)
+            .order_by(desc(percent))
+            .limit(TOP_COLUMNS_LIMIT)
+            .all()
+        )
+        return [
+            {"name": f"{row.table_name}.{row.column_name}", "percent": float(row.percent)}
+            for row in rows
+        ]
+
+    return ProfilingRunChartSeries(
+        column_count=column_count,
+        column_types=[{"name": name, "value": count} for name, count in column_types],
+        pii_flags=[{"name": name, "value": count} for name, count in pii_flags],
+        top_null_columns=top_columns(ProfileResultModel.null_value_ct, ProfileResultModel.record_ct),
+        top_cardinality_columns=top_columns(ProfileResultModel.distinct_value_ct, ProfileResultModel.value_ct),
+    )
+
+
+def get_profiling_run_charts_service(run_id: UUID, db: Session) -> ProfilingRunChartSeries:
+    try:
+        return get_profiling_run_chart_series(run_id, db)
+    except Exception as e:
+        LOG.error(f"Error getting chart series for profiling run {run_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get profiling run charts")
+
+
 def get_latest_profiling_run_dashboard_data_service(db: Session) -> LatestProfilingRunDashboardData:
     latest_run = (
         db.query(ProfilingRunModel)
@@ -504,14 +918,7 @@ def get_latest_profiling_run_dashboard_data_service(db: Session) -> LatestProfil
     if not latest_run:
         raise HTTPException(status_code=404, detail="No profiling run found")
 
-    # Fetch profile results linked to the latest run
-    results = (
-        db.query(ProfileResultModel)
-        .filter(ProfileResultModel.profile_run_id == latest_run.id)
-        .all()
-    )
-
     return LatestProfilingRunDashboardData(
         latest_run=latest_run,
-        profile_results=results
+        charts=get_profiling_run_chart_series(latest_run.id, db)
     )
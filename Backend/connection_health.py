@@ -0,0 +1,250 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from Backend.db.database import ConnectionHealthModel, SessionLocal, engine
+from Backend.target_queries import TargetConnection, run_target_query, set_target_engine_capacity
+
+# Logging config
+LOG = logging.getLogger(__name__)
+
+PROBE_QUERY = "SELECT 1"
+PROBE_TIMEOUT_SECONDS = 15
+# Outcomes are reused for a short while, so that repeated clicks on Test don't log in again each time. Failures
+# expire sooner, so that a fix on the server side shows up on the next click.
+PROBE_CACHE_SECONDS = 30
+PROBE_FAILURE_CACHE_SECONDS = 5
+MAX_PROBE_CACHE_ENTRIES = 256
+MAX_CONCURRENT_PROBES = 16
+HEALTH_CHECK_INTERVAL_SECONDS = 300
+# Session-level advisory lock on the TestGen database, held by the API worker that runs the background checks
+HEALTH_CHECK_LOCK_KEY = 0x5447_4845_414C_5448
+# Upper bounds of the latency histogram buckets, in milliseconds. A last bucket counts the slower probes.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_probe_cache: Dict[TargetConnection, "ProbeResult"] = {}
+_probe_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    successful: bool
+    message: str
+    details: Optional[str]
+    latency_ms: Optional[float]
+    checked_at: datetime
+    cached: bool = False
+
+    def is_fresh(self, now: datetime) -> bool:
+        max_age = PROBE_CACHE_SECONDS if self.successful else PROBE_FAILURE_CACHE_SECONDS
+        return (now - self.checked_at).total_seconds() < max_age
+
+
+def probe_connection(target: TargetConnection, refresh: bool = False) -> ProbeResult:
+    """
+    Checks that the target database accepts a connection and answers a query, over the pooled engine of the
+    connection parameters. Returns the cached outcome of a recent probe of the same parameters, unless refresh is set.
+    """
+    now = datetime.now(timezone.utc)
+    if not refresh:
+        with _probe_cache_lock:
+            cached = _probe_cache.get(target)
+        if cached and cached.is_fresh(now):
+            return replace(cached, cached=True)
+
+    start = time.perf_counter()
+    try:
+        _, rows, _ = run_target_query(target, PROBE_QUERY, 1, PROBE_TIMEOUT_SECONDS)
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        if len(rows) == 1 and rows[0][0] == 1:
+            result = ProbeResult(True, "The connection was successful.", None, latency_ms, now)
+        else:
+            result = ProbeResult(False, "Error completing a query to the database server.", None, latency_ms, now)
+    except Exception as e:
+        details = str(e.args[0]) if e.args else str(e)
+        result = ProbeResult(False, "Error attempting the connection.", details, None, now)
+
+    with _probe_cache_lock:
+        _probe_cache[target] = result
+        if len(_probe_cache) > MAX_PROBE_CACHE_ENTRIES:
+            for key in [key for key, value in _probe_cache.items() if not value.is_fresh(now)]:
+                del _probe_cache[key]
+    return result
+
+
+def probe_connections(
+    targets: Dict[Hashable, TargetConnection], refresh: bool = False
+) -> Dict[Hashable, ProbeResult]:
+    # Probes the connections concurrently, so that checking many takes about as long as the slowest of them
+    if not targets:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_PROBES, len(targets)), thread_name_prefix="probe") as pool:
+        futures = {key: pool.submit(probe_connection, target, refresh) for key, target in targets.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+@dataclass
+class ConnectionHealth:
+    connection_id: int
+    connection_name: Optional[str]
+    last_result: Optional[ProbeResult] = None
+    check_ct: int = 0
+    failure_ct: int = 0
+    # Counts of successful probes per latency bucket, as in LATENCY_BUCKETS_MS, plus one for the slower ones
+    latency_histogram: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def record(self, result: ProbeResult):
+        self.last_result = result
+        self.check_ct += 1
+        if not result.successful:
+            self.failure_ct += 1
+        elif result.latency_ms is not None:
+            bucket = next(
+                (i for i, bound in enumerate(LATENCY_BUCKETS_MS) if result.latency_ms <= bound),
+                len(LATENCY_BUCKETS_MS),
+            )
+            self.latency_histogram[bucket] += 1
+
+    @classmethod
+    def from_model(cls, row: ConnectionHealthModel) -> "ConnectionHealth":
+        last_result = None
+        if row.checked_at:
+            last_result = ProbeResult(row.successful, row.message, row.details, row.latency_ms, row.checked_at)
+        return cls(
+            row.connection_id,
+            row.connection_name,
+            last_result,
+            row.check_ct,
+            row.failure_ct,
+            list(row.latency_histogram),
+        )
+
+    def to_model(self, row: ConnectionHealthModel):
+        row.connection_name = self.connection_name
+        row.successful = self.last_result.successful
+        row.message = self.last_result.message
+        row.details = self.last_result.details
+        row.latency_ms = self.last_result.latency_ms
+        row.checked_at = self.last_result.checked_at
+        row.check_ct = self.check_ct
+        row.failure_ct = self.failure_ct
+        row.latency_histogram = list(self.latency_histogram)
+
+
+class ConnectionHealthMonitor:
+    """
+    Probes all the saved connections every `interval_seconds`, in a background thread, and keeps the last outcome and
+    a latency histogram of each in the connection_health table, shared by the API workers. The probes of saved
+    connections requested through the API are recorded too.
+
+    Every worker starts the monitor, but only the one holding HEALTH_CHECK_LOCK_KEY runs the checks. Another worker
+    takes over once it exits.
+    """
+
+    def __init__(self, interval_seconds: int):
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._load_connections: Optional[Callable[[], List[Tuple[int, Optional[str], TargetConnection]]]] = None
+        self._lock_connection = None
+
+    def start(self, load_connections: Callable[[], List[Tuple[int, Optional[str], TargetConnection]]]):
+        # load_connections returns the id, name and parameters of each saved connection
+        self._load_connections = load_connections
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="connection-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._release_lock()
+
+    def record(self, connection_id: int, connection_name: Optional[str], result: ProbeResult):
+        if result.cached:
+            return
+        db = SessionLocal()
+        try:
+            # Inserted first, so that the row can be locked against the updates of the other workers
+            db.execute(
+                insert(ConnectionHealthModel)
+                .values(
+                    connection_id=connection_id,
+                    connection_name=connection_name,
+                    latency_histogram=[0] * (len(LATENCY_BUCKETS_MS) + 1),
+                )
+                .on_conflict_do_nothing()
+            )
+            row = (
+                db.query(ConnectionHealthModel)
+                .filter(ConnectionHealthModel.connection_id == connection_id)
+                .with_for_update()
+                .one()
+            )
+            health = ConnectionHealth.from_model(row)
+            health.connection_name = connection_name
+            health.record(result)
+            health.to_model(row)
+            db.commit()
+        except Exception:
+            db.rollback()
+            LOG.warning(f"Failed recording the health of connection {connection_id}", exc_info=True)
+        finally:
+            db.close()
+
+    def get_all(self) -> List[ConnectionHealth]:
+        db = SessionLocal()
+        try:
+            rows = db.query(ConnectionHealthModel).order_by(ConnectionHealthModel.connection_id).all()
+            return [ConnectionHealth.from_model(row) for row in rows]
+        finally:
+            db.close()
+
+    def check_all(self):
+        # The rows of deleted connections are deleted with them
+        connections = self._load_connections()
+        set_target_engine_capacity(len(connections))
+        results = probe_connections({connection_id: target for connection_id, _, target in connections}, refresh=True)
+        for connection_id, connection_name, _ in connections:
+            self.record(connection_id, connection_name, results[connection_id])
+
+    def _acquire_lock(self) -> bool:
+        # The lock belongs to the session: it stays with this worker while the connection is open, and the database
+        # releases it when the worker exits or the connection drops
+        if self._lock_connection is not None:
+            # Fails when the connection dropped, and the lock with it
+            self._lock_connection.execute(text("SELECT 1"))
+            return True
+        connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        if connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": HEALTH_CHECK_LOCK_KEY}).scalar():
+            LOG.info("This worker runs the connection health checks")
+            self._lock_connection = connection
+            return True
+        connection.close()
+        return False
+
+    def _release_lock(self):
+        connection, self._lock_connection = self._lock_connection, None
+        if connection is not None:
+            # Invalidated rather than returned to the pool, which would keep the lock held
+            connection.invalidate()
+            connection.close()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                if self._acquire_lock():
+                    self.check_all()
+            except Exception:
+                LOG.exception("Connection health check failed")
+                self._release_lock()
+            self._stopped.wait(self.interval_seconds)
+
+
+connection_health_monitor = ConnectionHealthMonitor(HEALTH_CHECK_INTERVAL_SECONDS)
@@ -20,7 +20,7 @@ from sqlalchemy.orm import Session
 import logging
 from sqlalchemy import Column, String, BigInteger, TIMESTAMP, Float, Integer, Numeric
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
 import uuid
 
 # Logging config
@@ -61,6 +61,23 @@ class Connection(Base):
     http_path = Column(String(200), nullable=True)
 
 
+class ConnectionHealthModel(Base):
+    # Outcome of the latest probe of each saved connection, shared by the API workers
+    __tablename__ = "connection_health"
+    __table_args__ = {'schema': 'tgapp'}
+
+    connection_id = Column(BigInteger, ForeignKey('tgapp.connections.connection_id'), primary_key=True)
+    connection_name = Column(String(40))
+    successful = Column(Boolean)
+    message = Column(String(200))
+    details = Column(String)
+    latency_ms = Column(Float)
+    checked_at = Column(TIMESTAMP(timezone=True))
+    check_ct = Column(Integer, nullable=False, default=0)
+    failure_ct = Column(Integer, nullable=False, default=0)
+    latency_histogram = Column(ARRAY(Integer), nullable=False)
+
+
 class TableGroupModel(Base):
     __tablename__ = "table_groups"
     __table_args__ = {'schema': 'tgapp'}
@@ -194,6 +211,20 @@ class ProfileResultModel(Base):
     functional_table_type = Column(String(50))
     sample_ratio = Column(Float)
 
+
+class DataTableCharsModel(Base):
+    # Read-only view of the table characteristics maintained by profiling and the data refresh
+    __tablename__ = "data_table_chars"
+    __table_args__ = {'schema': 'tgapp'}
+
+    table_id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    table_groups_id = Column(PGUUID(as_uuid=True))
+    schema_name = Column(String(50))
+    table_name = Column(String(120))
+    last_refresh_date = Column(TIMESTAMP)
+    record_ct = Column(BigInteger)
+    last_complete_profile_run_id = Column(PGUUID(as_uuid=True))
+
 def create_tables():
     # This function is for initial database setup.
     # If your schema 'tgapp' and tables already exist with data,
@@ -0,0 +1,80 @@
+import hashlib
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic_core import to_json
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+# Clients keep the response, but check with the ETag that it's still current before using it
+REVALIDATE = "private, no-cache"
+# For responses that only change when they are deleted, such as the results of a completed profiling run, which
+# pruning can remove: clients reuse them for a while, then revalidate them with the ETag
+COMPLETED_RUN_MAX_AGE_SECONDS = 300
+COMPLETED_RUN = f"private, max-age={COMPLETED_RUN_MAX_AGE_SECONDS}, must-revalidate"
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    Compresses responses, except event streams: the gzip encoder buffers their events until enough bytes add up,
+    which would hold back progress updates.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith("/events"):
+            await self.app(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
+
+
+def json_response(content: Any, headers: Optional[dict] = None) -> Response:
+    """
+    Serialises the content, pydantic models included, to JSON in one pass in pydantic-core, without validating it
+    again against the route's response_model. Bytes are taken as JSON already. NaN and infinite floats become null.
+    """
+    body = content if isinstance(content, bytes) else to_json(content, inf_nan_mode="null")
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def make_etag(*parts: Any) -> str:
+    # Weak, since the gzip middleware returns different bytes for the same representation
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" matches "x"
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def conditional_response(
+    request: Request, etag: str, get_content: Callable[[], Any], cache_control: str = REVALIDATE
+) -> Response:
+    """
+    Returns 304 Not Modified when the client already has the version identified by the ETag, without loading the
+    content. Otherwise, returns the content from get_content as JSON, with the ETag.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return json_response(get_content(), headers)
+
+
+def hashed_response(request: Request, content: Any, cache_control: str = REVALIDATE) -> Response:
+    """
+    Returns the content as JSON, with an ETag hashed from the JSON, or 304 Not Modified when the client already has
+    it. For responses that don't have a cheaper version marker: it saves the transfer, not the query.
+    """
+    body = to_json(content, inf_nan_mode="null")
+    etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return json_response(body, headers)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, UUID4
-from typing import Optional, Literal, List, Union
+from typing import Any, Optional, Literal, List, Union
 from uuid import UUID
 from datetime import datetime
 
@@ -110,6 +110,37 @@ class TestConnectionResponse(BaseModel):
     status: bool
     message: str
     details: Optional[str] = None
+    latency_ms: Optional[float] = None
+    # True when the outcome of a recent test of the same connection parameters was reused
+    cached: bool = False
+
+
+class BatchConnectionTestRequest(BaseModel):
+    # Saved connections to test, all of them when not given
+    connection_ids: Optional[List[int]] = None
+    refresh: bool = Field(False, description="Test again, even when a recent outcome is available")
+
+
+class ConnectionTestResult(TestConnectionResponse):
+    connection_id: int
+    connection_name: Optional[str] = None
+    checked_at: datetime
+
+
+class ConnectionHealthOut(BaseModel):
+    # Outcome of the last check of a saved connection, and the latency of its successful checks so far
+    connection_id: int
+    connection_name: Optional[str] = None
+    status: Optional[bool] = None
+    message: Optional[str] = None
+    details: Optional[str] = None
+    latency_ms: Optional[float] = None
+    checked_at: Optional[datetime] = None
+    check_ct: int
+    failure_ct: int
+    # Upper bounds of the histogram buckets, in milliseconds. The histogram has one more bucket for slower checks.
+    latency_buckets_ms: List[int]
+    latency_histogram: List[int]
 
 
 class TableGroupBase(BaseModel):
@@ -160,13 +191,23 @@ class TableGroupOut(TableGroupBase):
 
 class ConnectionProfilingRequest(BaseModel):
     # This model is specifically for the profiling endpoint input body
-    db_type: str # Should map to sql_flavor in backend service
-    db_hostname: str # Should map to project_host
-    db_port: int # Should map to project_port (str in DB, int in this model)
-    user: str # Should map to project_user
-    password: str # Should map to password input (encrypted as project_pw_encrypted)
-    database: str # Should map to project_db
-    project_code: str = "DEFAULT" # Should map to project_code
+    schema_name: str = Field(..., description="Schema of the table to profile")
+    table_name: str = Field(..., description="Table to profile")
+    columns: List[str] = Field(..., min_items=1, max_items=6, description="Columns to count the value combinations of")
+    max_rows: int = Field(1000, ge=1, le=10000, description="Maximum number of value combinations returned")
+    refresh: bool = Field(False, description="Run the counts again, even when a cached result is available")
+
+class ContingencyCountsOut(BaseModel):
+    # Value combinations of the requested columns, most frequent first, with their record count in freq_ct
+    connection_id: int
+    schema_name: str
+    table_name: str
+    columns: List[str]
+    rows: List[List[Any]]
+    row_count: int
+    truncated: bool
+    cached: bool
+    computed_at: datetime
 
 class ProfilingRunOut(BaseModel):
     id: UUID
@@ -268,9 +309,46 @@ class ProfileResultOut(BaseModel):
         orm_mode = True
         
         
+class GridSortItem(BaseModel):
+    # Sort and filter models of the profile results grid, as sent by the MUI DataGrid in server-side mode
+    field: str
+    sort: Literal["asc", "desc"] = "asc"
+
+class GridFilterItem(BaseModel):
+    field: str
+    operator: str
+    value: Optional[Any] = None
+
+class GridFilterModel(BaseModel):
+    items: List[GridFilterItem] = []
+    logicOperator: Literal["and", "or"] = "and"
+    quickFilterValues: List[str] = []
+
+class ProfileResultPage(BaseModel):
+    # One page of a run's profile results, with the requested fields only
+    rows: List[dict]
+    row_count: int
+
 class TriggerProfilingRequest(BaseModel):
     connection_id: int
     table_group_id: str
+
+class ProfilingRunHandleOut(BaseModel):
+    # A profiling job started from the API. Its step events are streamed from /run-profiling/{run_handle_id}/events
+    run_handle_id: str
+    connection_id: int
+    table_group_id: str
+    status: str
+    profile_run_id: Optional[str]
+    current_step: Optional[str]
+    step_count: int
+    message: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    ended_at: Optional[datetime]
+
+    class Config:
+        orm_mode = True
     
 class RunInfo(BaseModel):
     connection_id: int
@@ -278,17 +356,49 @@ class RunInfo(BaseModel):
     status: str
     table_groups_id: UUID
     created_at: datetime
+    table_ct: Optional[int]
+    column_ct: Optional[int]
+    anomaly_ct: Optional[int]
+    anomaly_table_ct: Optional[int]
+    anomaly_column_ct: Optional[int]
+    dq_affected_data_points: Optional[int]
+    dq_total_data_points: Optional[int]
+    dq_score_profiling: Optional[float]
+
+class StatusCount(BaseModel):
+    status: Optional[str]
+    count: int
 
 class DashboardStats(BaseModel):
     connections: int
     table_groups: int
     profiling_runs: int
+    # Number of runs by status, over all runs
+    status_counts: List[StatusCount]
+    # Most recent runs only, newest first
     runs: List[RunInfo]
-    
-    
+
+
+class ChartPoint(BaseModel):
+    name: str
+    value: int
+
+class ColumnPercent(BaseModel):
+    name: str
+    percent: float
+
+class ProfilingRunChartSeries(BaseModel):
+    # Chart series of a profiling run, aggregated from its profile results
+    column_count: int
+    column_types: List[ChartPoint]
+    pii_flags: List[ChartPoint]
+    top_null_columns: List[ColumnPercent]
+    top_cardinality_columns: List[ColumnPercent]
+
+
 class LatestProfilingRunDashboardData(BaseModel):
     latest_run: ProfilingRunOut
-    profile_results: List[ProfileResultOut]
+    charts: ProfilingRunChartSeries
 
     class Config:
         orm_mode = True
\ No newline at end of file
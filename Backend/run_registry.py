@@ -0,0 +1,212 @@
+import logging
+import multiprocessing
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from testgen import settings
+
+# Logging config
+LOG = logging.getLogger(__name__)
+
+# Finished runs kept in the registry, so that clients can still read their outcome
+MAX_FINISHED_RUNS = 100
+
+QUEUED = "Queued"
+RUNNING = "Running"
+COMPLETE = "Complete"
+ERROR = "Error"
+CANCELLED = "Cancelled"
+FINISHED_STATUSES = {COMPLETE, ERROR, CANCELLED}
+
+
+def _run_profiling_process(table_group_id: str, events: multiprocessing.Queue):
+    # Entry point of the profiling process: runs the profiling pipeline and reports its steps to the API process
+    from testgen.commands.run_profiling_bridge import run_profiling_queries
+    from testgen.common.database.database_service import install_cancel_handler, is_run_cancelled
+    from testgen.common.logs import configure_logging
+
+    configure_logging(level=logging.INFO)
+    install_cancel_handler()
+
+    def on_step(telemetry, step_name):
+        events.put({"type": "step", "profile_run_id": telemetry.run_id, "step": step_name})
+
+    try:
+        message = run_profiling_queries(table_group_id, on_step=on_step)
+    except Exception as e:
+        message = f"{type(e).__name__}: {e}"
+        outcome = "error"
+    else:
+        outcome = "complete"
+    if is_run_cancelled():
+        outcome = "cancelled"
+    events.put({"type": outcome, "message": message})
+
+
+@dataclass
+class ProfilingRunHandle:
+    run_handle_id: str
+    connection_id: int
+    table_group_id: str
+    status: str = QUEUED
+    profile_run_id: Optional[str] = None
+    current_step: Optional[str] = None
+    step_count: int = 0
+    message: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    events: List[dict] = field(default_factory=list, repr=False)
+    _process: Optional[multiprocessing.Process] = field(default=None, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def events_after(self, seq: int) -> List[dict]:
+        # Events are numbered from 1, in order
+        return self.events[seq:]
+
+
+class ProfilingRunRegistry:
+    """
+    Runs the profiling jobs started from the API, each in its own process, so that they don't compete with the API
+    worker's threads or share its connection state. A connection runs up to `max_runs_per_connection` jobs at a time,
+    and further jobs wait in a queue. The registry keeps the status and the step events of each job, by run handle.
+    """
+
+    def __init__(self, max_runs_per_connection: int):
+        self.max_runs_per_connection = max(1, max_runs_per_connection)
+        self._lock = threading.Lock()
+        self._handles: Dict[str, ProfilingRunHandle] = {}
+        self._queued: Dict[int, deque] = {}
+        self._running: Dict[int, int] = {}
+        self._context = multiprocessing.get_context("spawn")
+
+    def submit(self, connection_id: int, table_group_id: str) -> ProfilingRunHandle:
+        with self._lock:
+            for handle in self._handles.values():
+                if handle.table_group_id == table_group_id and not handle.is_finished:
+                    raise RunAlreadyActiveError(handle)
+
+            handle = ProfilingRunHandle(str(uuid4()), connection_id, table_group_id)
+            self._handles[handle.run_handle_id] = handle
+            self._add_event(handle, {"type": "status", "status": QUEUED})
+            self._queued.setdefault(connection_id, deque()).append(handle)
+            self._start_queued(connection_id)
+            self._prune()
+            return handle
+
+    def get(self, run_handle_id: str) -> Optional[ProfilingRunHandle]:
+        return self._handles.get(run_handle_id)
+
+    def list(self) -> List[ProfilingRunHandle]:
+        with self._lock:
+            return sorted(self._handles.values(), key=lambda handle: handle.created_at, reverse=True)
+
+    def cancel(self, run_handle_id: str) -> Optional[ProfilingRunHandle]:
+        with self._lock:
+            handle = self._handles.get(run_handle_id)
+            if not handle or handle.is_finished:
+                return handle
+            if handle.status == QUEUED:
+                self._queued[handle.connection_id].remove(handle)
+                self._finish(handle, CANCELLED, "Cancelled before it started")
+            elif handle._process is not None:
+                # The profiling process cancels its queries on SIGTERM and saves its partial results
+                handle._process.terminate()
+            return handle
+
+    def _start_queued(self, connection_id: int):
+        pending = self._queued.get(connection_id)
+        while pending and self._running.get(connection_id, 0) < self.max_runs_per_connection:
+            handle = pending.popleft()
+            events = self._context.Queue()
+            handle._process = self._context.Process(
+                target=_run_profiling_process,
+                args=(handle.table_group_id, events),
+                name=f"profiling-{handle.table_group_id}",
+                daemon=True,
+            )
+            handle._process.start()
+            handle.status = RUNNING
+            handle.started_at = datetime.now(timezone.utc)
+            self._running[connection_id] = self._running.get(connection_id, 0) + 1
+            self._add_event(handle, {"type": "status", "status": RUNNING})
+            threading.Thread(
+                target=self._monitor, args=(handle, events), name=f"monitor-{handle.run_handle_id}", daemon=True
+            ).start()
+
+    def _monitor(self, handle: ProfilingRunHandle, events: multiprocessing.Queue):
+        outcome = None
+        while outcome is None:
+            try:
+                event = events.get(timeout=1)
+            except queue.Empty:
+                if handle._process.is_alive():
+                    continue
+                # The last events can arrive just after the process exited
+                try:
+                    event = events.get(timeout=1)
+                except queue.Empty:
+                    break
+
+            with self._lock:
+                if event["type"] == "step":
+                    handle.profile_run_id = event["profile_run_id"]
+                    handle.current_step = event["step"]
+                    handle.step_count += 1
+                    self._add_event(handle, event)
+                else:
+                    outcome = event
+        handle._process.join()
+
+        with self._lock:
+            if outcome is None:
+                # Terminated, or exited without reporting
+                cancelled = handle._process.exitcode is not None and handle._process.exitcode < 0
+                self._finish(handle, CANCELLED if cancelled else ERROR, f"Exit code {handle._process.exitcode}")
+            elif outcome["type"] == "complete":
+                self._finish(handle, COMPLETE, outcome["message"])
+            elif outcome["type"] == "cancelled":
+                self._finish(handle, CANCELLED, outcome["message"])
+            else:
+                self._finish(handle, ERROR, outcome["message"])
+            self._running[handle.connection_id] -= 1
+            self._start_queued(handle.connection_id)
+
+    def _finish(self, handle: ProfilingRunHandle, status: str, message: Optional[str]):
+        handle.status = status
+        handle.message = message
+        handle.ended_at = datetime.now(timezone.utc)
+        handle._process = None
+        self._add_event(handle, {"type": "status", "status": status, "message": message})
+
+    def _add_event(self, handle: ProfilingRunHandle, event: dict):
+        handle.events.append({
+            **event,
+            "seq": len(handle.events) + 1,
+            "time": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def _prune(self):
+        finished = sorted(
+            (handle for handle in self._handles.values() if handle.is_finished),
+            key=lambda handle: handle.created_at,
+        )
+        for handle in finished[:-MAX_FINISHED_RUNS]:
+            del self._handles[handle.run_handle_id]
+
+
+class RunAlreadyActiveError(Exception):
+    def __init__(self, handle: ProfilingRunHandle):
+        super().__init__(f"Table group {handle.table_group_id} is already being profiled")
+        self.handle = handle
+
+
+profiling_run_registry = ProfilingRunRegistry(settings.PROFILING_MAX_RUNS_PER_CONNECTION)
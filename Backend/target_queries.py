@@ -0,0 +1,152 @@
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+
+from testgen.common.database.database_service import get_flavor_service
+from testgen.common.encrypt import DecryptText
+
+# Logging config
+LOG = logging.getLogger(__name__)
+
+# Target engines kept open, so that interactive queries reuse pooled connections instead of logging in again. Raised
+# to the number of saved connections by the health checks, which go through all of them in turn.
+MAX_TARGET_ENGINES = 16
+# Interactive requests shouldn't wait on an unreachable server as long as profiling runs do
+TARGET_CONNECT_TIMEOUT_SECONDS = 30
+
+_engines_lock = threading.Lock()
+_engines: "OrderedDict[TargetConnection, tuple]" = OrderedDict()
+_max_engines = MAX_TARGET_ENGINES
+
+
+class TargetConnectionError(Exception):
+    # The target database couldn't be reached or logged in to, as opposed to a failure of the query itself
+    pass
+
+
+@dataclass(frozen=True)
+class TargetConnection:
+    # Parameters of a target database connection. Equal parameters share the same engine and pool.
+    sql_flavor: str
+    project_host: Optional[str]
+    project_port: Optional[str]
+    project_db: Optional[str]
+    project_user: Optional[str]
+    password: Optional[str] = field(default=None, repr=False)
+    url: Optional[str] = None
+    connect_by_url: bool = False
+    connect_by_key: bool = False
+    # Encrypted, as stored in the connections table
+    private_key: Optional[bytes] = field(default=None, repr=False)
+    private_key_passphrase: Optional[bytes] = field(default=None, repr=False)
+    http_path: Optional[str] = None
+
+    @classmethod
+    def from_connection(cls, conn) -> "TargetConnection":
+        # From a saved connection, with its password decrypted
+        return cls(
+            sql_flavor=conn.sql_flavor,
+            project_host=conn.project_host,
+            project_port=str(conn.project_port) if conn.project_port is not None else None,
+            project_db=conn.project_db,
+            project_user=conn.project_user,
+            password=DecryptText(bytes(conn.project_pw_encrypted)) if conn.project_pw_encrypted else None,
+            url=conn.url,
+            connect_by_url=bool(conn.connect_by_url),
+            connect_by_key=bool(conn.connect_by_key),
+            private_key=bytes(conn.private_key) if conn.private_key else None,
+            private_key_passphrase=bytes(conn.private_key_passphrase) if conn.private_key_passphrase else None,
+            http_path=conn.http_path,
+        )
+
+
+def set_target_engine_capacity(connection_ct: int):
+    # Otherwise, a sweep over more connections than the cache holds would evict each engine before its next use
+    global _max_engines
+    with _engines_lock:
+        _max_engines = max(MAX_TARGET_ENGINES, connection_ct)
+
+
+def _get_target_engine(target: TargetConnection):
+    with _engines_lock:
+        if target in _engines:
+            _engines.move_to_end(target)
+            return _engines[target]
+
+        flavor_service = get_flavor_service(target.sql_flavor)
+        flavor_service.init({
+            "flavor": target.sql_flavor if target.sql_flavor != "redshift" else "postgresql",
+            "user": target.project_user,
+            "host": target.project_host,
+            "port": target.project_port,
+            "dbname": target.project_db,
+            "url": target.url,
+            "connect_by_url": target.connect_by_url,
+            "connect_by_key": target.connect_by_key,
+            # The flavor service decrypts the key when it's given as memoryview, as read by the UI
+            "private_key": memoryview(target.private_key) if target.private_key else None,
+            "private_key_passphrase": (
+                memoryview(target.private_key_passphrase) if target.private_key_passphrase else None
+            ),
+            "http_path": target.http_path,
+            "dbschema": None,
+        })
+        connect_args = {"connect_timeout": TARGET_CONNECT_TIMEOUT_SECONDS}
+        connect_args.update(flavor_service.get_connect_args())
+        engine = create_engine(
+            flavor_service.get_connection_string(target.password), connect_args=connect_args, pool_pre_ping=True
+        )
+
+        _engines[target] = (engine, flavor_service)
+        while len(_engines) > _max_engines:
+            _, (old_engine, _) = _engines.popitem(last=False)
+            old_engine.dispose()
+        return _engines[target]
+
+
+def run_target_query(
+    target: TargetConnection, sql_query: str, max_rows: int, timeout_seconds: int, dbschema: Optional[str] = None
+) -> Tuple[List[str], List[tuple], bool]:
+    """
+    Runs a query on a target database, over a pooled connection, and returns its column names, up to `max_rows` rows,
+    and whether the result had more rows than that. The database cancels the query after `timeout_seconds`.
+
+    The pre-connection queries of the flavor, some of which set the default schema, only run when `dbschema` is
+    given. Raises TargetConnectionError when the engine can't be set up or the connection fails.
+    """
+    try:
+        engine, flavor_service = _get_target_engine(target)
+        queries = flavor_service.get_statement_timeout_queries(timeout_seconds)
+        connection = engine.connect()
+    except Exception as e:
+        raise TargetConnectionError(str(e.args[0]) if e.args else str(e)) from e
+
+    with connection:
+        if dbschema:
+            # The engine's flavor service is shared by the threads using it, so the schema goes on a copy
+            session_flavor_service = copy.copy(flavor_service)
+            session_flavor_service.dbschema = dbschema
+            try:
+                queries = [*session_flavor_service.get_pre_connection_queries(), *queries]
+            except Exception:
+                LOG.warning(f"Failed preparing pre connection queries for schema `{dbschema}`", exc_info=True)
+
+        flavor_service.set_query_timeout(connection.connection.dbapi_connection, timeout_seconds)
+        for query in queries:
+            try:
+                connection.execute(text(query))
+            except Exception:
+                LOG.warning(f"Failed executing pre connection query: `{query}`", exc_info=True)
+
+        result = connection.execution_options(stream_results=True).execute(text(sql_query))
+        rows = result.fetchmany(max_rows + 1)
+        columns = list(result.keys())
+        result.close()
+
+    truncated = len(rows) > max_rows
+    return columns, [tuple(row) for row in rows[:max_rows]], truncated
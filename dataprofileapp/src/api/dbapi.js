@@ -3,6 +3,43 @@ import { baseURL } from '../utilities/constants';
 
 const BASE_URL = baseURL;
 
+// Responses of the read endpoints, by URL, with their ETag. Requests send the ETag back in If-None-Match and reuse
+// the cached data on 304 Not Modified. Responses marked immutable, such as the results of a completed profiling run,
+// are reused without a request.
+const RESPONSE_CACHE_SIZE = 50;
+const responseCache = new Map();
+
+const cachedGet = async (url) => {
+    const cached = responseCache.get(url);
+    if (cached && cached.immutable) {
+        // Refresh its position, so that the least recently used response is evicted first
+        responseCache.delete(url);
+        responseCache.set(url, cached);
+        return { data: cached.data, status: 200 };
+    }
+
+    const response = await axios.get(url, {
+        headers: cached ? { 'If-None-Match': cached.etag } : {},
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    });
+    if (response.status === 304 && cached) {
+        responseCache.delete(url);
+        responseCache.set(url, cached);
+        return { data: cached.data, status: 200 };
+    }
+
+    const etag = response.headers.etag;
+    responseCache.delete(url);
+    if (etag) {
+        const cacheControl = response.headers['cache-control'] || '';
+        responseCache.set(url, { etag, data: response.data, immutable: cacheControl.includes('immutable') });
+        if (responseCache.size > RESPONSE_CACHE_SIZE) {
+            responseCache.delete(responseCache.keys().next().value);
+        }
+    }
+    return response;
+};
+
 /**
  * Tests a database connection using the provided data.
  * @param {object} data - Connection details from the form (matches Pydantic TestConnectionRequest structure).
@@ -26,6 +63,29 @@ export const testConnection = async (data) => {
     }
 };
 
+/**
+ * Tests saved connections concurrently on the backend.
+ * @param {number[] | null} connectionIds - Connections to test, all of them when null.
+ * @param {boolean} refresh - Test again, even when a recent outcome is available.
+ * @returns {Promise<object[]>} - One result per connection (matches Pydantic ConnectionTestResult[]).
+ */
+export const testConnections = async (connectionIds = null, refresh = false) => {
+    const response = await axios.post(`${BASE_URL}/connections/test-batch`, {
+        connection_ids: connectionIds,
+        refresh,
+    });
+    return response.data;
+};
+
+/**
+ * Retrieves the outcome of the last background check of each saved connection, with its latency histogram.
+ * @returns {Promise<object[]>} - Matches Pydantic ConnectionHealthOut[].
+ */
+export const fetchConnectionHealth = async () => {
+    const response = await axios.get(`${BASE_URL}/connections/health`);
+    return response.data;
+};
+
 /**
  * Creates a new database connection.
  * @param {object} data - Connection details from the form (matches Pydantic DBConnectionCreate structure).
@@ -67,7 +127,7 @@ export const createConnection = async (data) => {
  */
 export const getAllConnections = async () => {
     try {
-        const response = await axios.get(`${BASE_URL}/connections`);
+        const response = await cachedGet(`${BASE_URL}/connections`);
         return response.data; // This will be an array of DBConnectionOut objects
     } catch (error) {
         console.error("Error getting all connections:", error);
@@ -364,7 +424,7 @@ export const updateTableGroup = async (connection_id, group_id, data) => {
  * Triggers a profiling job for a specific table group within a connection.
  * @param {number | string} connectionId - The connection ID (BIGINT or UUID).
  * @param {string} tableGroupId - The ID of the table group to profile.
- * @returns {Promise<object>} - The response data from the API (e.g., job ID or status).
+ * @returns {Promise<object>} - The run handle ({ run_handle_id, status, ... }), to follow its progress with subscribeProfilingRunEvents.
  */
 export const triggerProfiling = async (requestPayload) => {
     try {
@@ -387,21 +447,83 @@ export const triggerProfiling = async (requestPayload) => {
 
 
 
+/**
+ * Streams the progress of a profiling run started with triggerProfiling, using Server-Sent Events.
+ * @param {string} runHandleId - The run_handle_id returned by triggerProfiling.
+ * @param {function} onEvent - Called with each status or step event ({ type, seq, status, step, message, ... }).
+ * @returns {function} - Closes the stream. It is also closed when the run is finished.
+ */
+export const subscribeProfilingRunEvents = (runHandleId, onEvent) => {
+    const FINISHED_STATUSES = ['Complete', 'Error', 'Cancelled'];
+    const source = new EventSource(`${BASE_URL}/run-profiling/${runHandleId}/events`);
+    const handleEvent = (message) => {
+        const event = JSON.parse(message.data);
+        onEvent(event);
+        if (event.type === 'status' && FINISHED_STATUSES.includes(event.status)) {
+            source.close();
+        }
+    };
+    source.addEventListener('status', handleEvent);
+    source.addEventListener('step', handleEvent);
+    return () => source.close();
+};
+
+
+export const cancelProfilingRun = async (runHandleId) => {
+    const response = await axios.delete(`${BASE_URL}/run-profiling/${runHandleId}`);
+    return response.data;
+};
+
+
 export const fetchDashboardSummary = async () => {
-    const response = await axios.get(`${BASE_URL}/home`);
-    return response.data; // { connections: number, table_groups: number, profiling_runs: number, runs: [...] }
+    const response = await cachedGet(`${BASE_URL}/home`);
+    return response.data; // { connections: number, table_groups: number, profiling_runs: number, status_counts: [...], runs: [...] (most recent only) }
 };
 
 
 export const fetchProfileResult = async (conn_id, profileresult_id) => {
-    const response = await axios.get(
+    const response = await cachedGet(
         `${BASE_URL}/${conn_id}/profileresult/${profileresult_id}`
     );
     return response.data;
 };
 
 
+// One page of a run's profile results for the server-side grid: sorting, filtering and paging run in SQL.
+// sortModel and filterModel are the grid's models; fields limits the returned fields (the id is always included).
+export const fetchProfileResultsPage = async (conn_id, profileresult_id, { page = 0, pageSize = 100, sortModel, filterModel, fields } = {}) => {
+    const params = new URLSearchParams({ page, page_size: pageSize });
+    if (sortModel && sortModel.length > 0) params.set('sort_model', JSON.stringify(sortModel));
+    if (filterModel) params.set('filter_model', JSON.stringify(filterModel));
+    if (fields && fields.length > 0) params.set('fields', fields.join(','));
+    const response = await cachedGet(
+        `${BASE_URL}/${conn_id}/profileresult/${profileresult_id}/grid?${params.toString()}`
+    );
+    return response.data; // { rows: [...], row_count: number }
+};
+
+
 export const fetchLatestProfilingRun = async () => {
-    const response = await axios.get(`${BASE_URL}/latest-profiling-run`);
-    return response.data;
-}; 
\ No newline at end of file
+    const response = await cachedGet(`${BASE_URL}/latest-profiling-run`);
+    return response.data; // { latest_run: {...}, charts: {...} }
+};
+
+
+export const fetchProfilingRunCharts = async (run_id) => {
+    const response = await cachedGet(`${BASE_URL}/profiling-runs/${run_id}/charts`);
+    return response.data; // { column_count, column_types, pii_flags, top_null_columns, top_cardinality_columns }
+};
+
+
+// Counts the value combinations of the given columns in a table of the connection, most frequent first.
+// Repeat requests are served from the backend cache until the table's data changes, unless refresh is true.
+export const fetchContingencyCounts = async (connectionId, { schemaName, tableName, columns, maxRows = 1000, refresh = false }) => {
+    const response = await axios.post(`${BASE_URL}/connection/${connectionId}/profiling`, {
+        schema_name: schemaName,
+        table_name: tableName,
+        columns,
+        max_rows: maxRows,
+        refresh,
+    });
+    return response.data; // { columns, rows, row_count, truncated, cached, computed_at, ... }
+};
@@ -8,28 +8,20 @@ const ItemTypes = {
     CHART: 'chart',
 };
 
-const ColumnTypeDistributionChart = ({ id, index, displayedProfileResults, onChartClick, moveCard, COLORS }) => {
+const ColumnTypeDistributionChart = ({ id, index, displayedChartSeries, onChartClick, moveCard, COLORS }) => {
     const theme = useTheme();
     const ref = useRef(null); // Ref for the draggable element
 
     // State for Popover
     const [popoverAnchorEl, setPopoverAnchorEl] = useState(null);
 
-    // Data transformation for this specific chart
-    const columnTypeData = Object.entries(
-        displayedProfileResults.reduce((acc, cur) => {
-            // Ensure general_type exists
-            if (cur.general_type) {
-                acc[cur.general_type] = (acc[cur.general_type] || 0) + 1;
-            }
-            return acc;
-        }, {})
-    ).map(([type, count]) => ({ name: type, value: count }));
+    // Column counts by general type, aggregated by the backend
+    const columnTypeData = displayedChartSeries?.column_types || [];
 
     // Overview content generation for this specific chart
      const generateColumnTypeOverview = () => {
         if (columnTypeData.length === 0) return 'No column type data available.';
-        const totalColumns = displayedProfileResults.length;
+        const totalColumns = displayedChartSeries?.column_count || 0;
         const content = (
             <Box sx={{ p: 1 }}> {/* Added padding for popover content */}
                 <Typography variant="subtitle2" fontWeight="bold" gutterBottom>Column Type Distribution Overview</Typography>
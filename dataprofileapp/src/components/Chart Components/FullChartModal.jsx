@@ -33,20 +33,12 @@ const getColors = (theme) => [
 ];
 
 
-const FullChartModal = ({ open, onClose, chartType, chartData, displayedRunSummary, displayedProfileResults, COLORS }) => {
+const FullChartModal = ({ open, onClose, chartType, chartData, displayedRunSummary, displayedChartSeries, COLORS }) => {
     const theme = useTheme();
     const colors = COLORS || getColors(theme); // Use passed colors or generate
 
-    // Helper function to calculate percentage safely (needed for bar chart data)
-    const calculatePercentage = (numerator, denominator) => {
-        if (denominator === null || denominator === undefined || denominator === 0) {
-            return 0; // Avoid division by zero
-        }
-        return (numerator / denominator) * 100;
-    };
-
     // Data transformation specific to chart types if needed for full view
-    const getChartData = (type, runSummary, profileResults) => {
+    const getChartData = (type, runSummary, chartSeries) => {
         switch (type) {
             case 'anomaly':
                 return [
@@ -68,46 +60,19 @@ const FullChartModal = ({ open, onClose, chartType, chartData, displayedRunSumma
                     ]
                     : [];
              case 'column_type':
-                return Object.entries(
-                    profileResults.reduce((acc, cur) => {
-                        if (cur.general_type) {
-                            acc[cur.general_type] = (acc[cur.general_type] || 0) + 1;
-                        }
-                        return acc;
-                    }, {})
-                ).map(([type, count]) => ({ name: type, value: count }));
+                return chartSeries?.column_types || [];
             case 'pii_flag':
-                 return Object.entries(
-                    profileResults.reduce((acc, cur) => {
-                        const flag = cur.pii_flag && cur.pii_flag.trim() !== '' ? cur.pii_flag : 'Unknown';
-                        acc[flag] = (acc[flag] || 0) + 1;
-                        return acc;
-                    }, {})
-                ).map(([flag, count]) => ({ name: flag, value: count }));
+                return chartSeries?.pii_flags || [];
             case 'top_null':
-                return [...profileResults]
-                    .filter(p => p.null_value_ct !== null && p.record_ct !== null && p.record_ct > 0)
-                    .map(p => ({
-                        name: `${p.table_name}.${p.column_name}`,
-                        percent: calculatePercentage(p.null_value_ct, p.record_ct),
-                    }))
-                    .sort((a, b) => b.percent - a.percent)
-                    .slice(0, 10); // Show more in full view if desired (e.g., top 10)
+                return chartSeries?.top_null_columns || []; // Top 10, already sorted by the backend
             case 'top_cardinality':
-                 return [...profileResults]
-                    .filter(p => p.distinct_value_ct !== null && p.value_ct !== null && p.value_ct > 0)
-                    .map(p => ({
-                        name: `${p.table_name}.${p.column_name}`,
-                        percent: calculatePercentage(p.distinct_value_ct, p.value_ct),
-                    }))
-                    .sort((a, b) => b.percent - a.percent)
-                    .slice(0, 10); // Show more in full view if desired (e.g., top 10)
+                return chartSeries?.top_cardinality_columns || []; // Top 10, already sorted by the backend
             default:
                 return [];
         }
     };
 
-    const data = getChartData(chartType, displayedRunSummary, displayedProfileResults);
+    const data = getChartData(chartType, displayedRunSummary, displayedChartSeries);
 
     const renderChart = (type, data) => {
         switch (type) {
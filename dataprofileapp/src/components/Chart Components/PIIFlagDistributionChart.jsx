@@ -8,27 +8,20 @@ const ItemTypes = {
     CHART: 'chart',
 };
 
-const PIIFlagDistributionChart = ({ id, index, displayedProfileResults, onChartClick, moveCard, COLORS }) => {
+const PIIFlagDistributionChart = ({ id, index, displayedChartSeries, onChartClick, moveCard, COLORS }) => {
     const theme = useTheme();
     const ref = useRef(null); // Ref for the draggable element
 
     // State for Popover
     const [popoverAnchorEl, setPopoverAnchorEl] = useState(null);
 
-    // Data transformation for this specific chart
-    const piiFlagData = Object.entries(
-        displayedProfileResults.reduce((acc, cur) => {
-             // Ensure pii_flag exists, default to 'Unknown' if null/empty
-            const flag = cur.pii_flag && cur.pii_flag.trim() !== '' ? cur.pii_flag : 'Unknown';
-            acc[flag] = (acc[flag] || 0) + 1;
-            return acc;
-        }, {})
-    ).map(([flag, count]) => ({ name: flag, value: count }));
+    // Column counts by PII flag ('Unknown' if null/empty), aggregated by the backend
+    const piiFlagData = displayedChartSeries?.pii_flags || [];
 
     // Overview content generation for this specific chart
      const generatePiiFlagOverview = () => {
         if (piiFlagData.length === 0) return 'No PII flag data available.';
-        const totalColumns = displayedProfileResults.length;
+        const totalColumns = displayedChartSeries?.column_count || 0;
         const content = (
             <Box sx={{ p: 1 }}> {/* Added padding for popover content */}
                 <Typography variant="subtitle2" fontWeight="bold" gutterBottom>PII Flag Distribution Overview</Typography>
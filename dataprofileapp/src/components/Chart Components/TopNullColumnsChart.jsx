@@ -11,30 +11,15 @@ const ItemTypes = {
 };
 
 
-const TopNullColumnsChart = ({ id, index, displayedProfileResults, onChartClick, moveCard }) => {
+const TopNullColumnsChart = ({ id, index, displayedChartSeries, onChartClick, moveCard }) => {
     const theme = useTheme();
     const ref = useRef(null); // Ref for the draggable element
 
     // State for Popover
     const [popoverAnchorEl, setPopoverAnchorEl] = useState(null);
 
-     // Helper function to calculate percentage safely (moved here)
-    const calculatePercentage = (numerator, denominator) => {
-        if (denominator === null || denominator === undefined || denominator === 0) {
-            return 0; // Avoid division by zero
-        }
-        return (numerator / denominator) * 100;
-    };
-
-    // Data transformation for this specific chart
-    const topNullCols = [...displayedProfileResults]
-        .filter(p => p.null_value_ct !== null && p.record_ct !== null && p.record_ct > 0) // Filter out invalid data
-        .map(p => ({
-            name: `${p.table_name}.${p.column_name}`,
-            percent: calculatePercentage(p.null_value_ct, p.record_ct),
-        }))
-        .sort((a, b) => b.percent - a.percent) // Sort descending by percentage
-        .slice(0, MAX_TOP); // Take top N
+    // Top columns, sorted descending by percentage by the backend
+    const topNullCols = (displayedChartSeries?.top_null_columns || []).slice(0, MAX_TOP);
 
     // Overview content generation for this specific chart
     const generateTopNullColsOverview = () => {
@@ -273,7 +273,7 @@ import ChevronRightIcon from '@mui/icons-material/ChevronRight'; // Import colla
 import { DataGrid } from "@mui/x-data-grid";
 import AddCircleOutlineIcon from "@mui/icons-material/AddCircleOutline";
 // Import necessary APIs
-import { fetchDashboardSummary, fetchProfileResult } from "../api/dbapi";
+import { fetchDashboardSummary, fetchLatestProfilingRun, fetchProfilingRunCharts } from "../api/dbapi";
 import ProfilingResultsTable from "./ProfilingResultsTable"; 
 import NewProfilingRunDialog from "./NewProfilingRUnDialog"; 
 import ConnectionsDialog from "./ConnectionDialog"; 
@@ -378,7 +378,7 @@ const Home = () => {
 
     // State for the Profiling Run data currently displayed in Charts
     const [displayedRunSummary, setDisplayedRunSummary] = useState(null); // Summary of the currently displayed run
-    const [displayedProfileResults, setDisplayedProfileResults] = useState([]); // Detailed results for the currently displayed run
+    const [displayedChartSeries, setDisplayedChartSeries] = useState(null); // Chart series aggregated by the backend for the currently displayed run
 
     // Loading and Error States (combined for initial load)
     const [loading, setLoading] = useState(true);
@@ -392,7 +392,6 @@ const Home = () => {
     const [isConnectionDialogOpen, setIsConnectionDialogOpen] = useState(false);
     // State for showing the detailed results table below the charts (when clicking a history row)
     const [showResultsTable, setShowResultsTable] = useState(false);
-    const [profilingResultsDetailed, setProfilingResultsDetailed] = useState(null); // Data for detailed results table
 
     // State for Full Chart Modal
     const [isFullChartModalOpen, setIsFullChartModalOpen] = useState(false);
@@ -446,34 +445,34 @@ const Home = () => {
                 });
                 setRows(runs); // Populate the history table rows
 
-                // 2. Identify the most recent run from the fetched runs list
-                const latestRunSummary = runs.length > 0 ? runs[0] : null; // Assuming runs are returned in most recent order
+                // 2. Identify the most recent run from the fetched runs list (returned newest first)
+                const latestRunSummary = runs.length > 0 ? runs[0] : null;
 
-                // 3. Fetch detailed results for the most recent run (if any)
+                // 3. Fetch the precomputed chart series for the most recent run (if any)
                 if (latestRunSummary) {
                      try {
-                        const latestRunResults = await fetchProfileResult(latestRunSummary.connection_id, latestRunSummary.profiling_id);
+                        const latestRunData = await fetchLatestProfilingRun();
                         setDisplayedRunSummary(latestRunSummary);
-                        setDisplayedProfileResults(latestRunResults);
+                        setDisplayedChartSeries(latestRunData.charts);
                      } catch (fetchResultsError) {
-                         console.error("Failed to fetch detailed results for latest run:", fetchResultsError);
-                         // Display summary data but show an error for detailed results/charts
+                         console.error("Failed to fetch chart data for latest run:", fetchResultsError);
+                         // Display summary data but show an error for charts
                          setDisplayedRunSummary(latestRunSummary); // Still show summary info if available
-                         setDisplayedProfileResults([]); // No detailed results
+                         setDisplayedChartSeries(null);
                          setError('Failed to load detailed data for the latest run.');
                      }
                 } else {
                      // No runs found at all
                      setError('No profiling runs found. Run a profiling job to see the dashboard.');
                      setDisplayedRunSummary(null);
-                     setDisplayedProfileResults([]);
+                     setDisplayedChartSeries(null);
                 }
 
             } catch (err) {
                 console.error("Dashboard initial fetch failed", err);
                 setError('Failed to load dashboard data.');
                  setDisplayedRunSummary(null);
-                 setDisplayedProfileResults([]);
+                 setDisplayedChartSeries(null);
                  setRows([]);
                  setSummary({connections: 0, table_groups: 0, profiling_runs: 0});
             } finally {
@@ -499,34 +498,28 @@ const Home = () => {
              console.error("Could not find full run summary for clicked row:", clickedRowSummary);
              setError(`Could not find full data for run ${clickedRowSummary.id}.`);
              setDisplayedRunSummary(null);
-             setDisplayedProfileResults([]);
-             setProfilingResultsDetailed(null);
+             setDisplayedChartSeries(null);
              setShowResultsTable(false);
              return;
         }
 
         // Update charts to show data for the clicked run using the full summary data
         setDisplayedRunSummary(fullClickedRunSummary);
-        setDisplayedProfileResults([]); // Clear previous chart data while loading
+        setDisplayedChartSeries(null); // Clear previous chart data while loading
         setError(''); // Clear previous errors related to chart data
 
-        try {
-            // Fetch detailed results for the clicked run
-            const detailedResults = await fetchProfileResult(fullClickedRunSummary.connection_id, fullClickedRunSummary.profiling_id);
-            setDisplayedProfileResults(detailedResults); // Update chart data
-
-            // Also set data for the detailed results table below
-            setProfilingResultsDetailed(detailedResults);
-            setShowResultsTable(true); // Show the detailed table
+        // The detailed results table below fetches its own pages of results
+        setShowResultsTable(true);
 
+        try {
+            // Fetch chart series for the clicked run
+            const chartSeries = await fetchProfilingRunCharts(fullClickedRunSummary.profiling_id);
+            setDisplayedChartSeries(chartSeries); // Update chart data
         } catch (error) {
-            console.error("Failed to fetch detailed profiling result for row click", error);
-            // Keep the run summary but clear detailed results and show error for charts
-            setDisplayedProfileResults([]);
+            console.error("Failed to fetch chart series for row click", error);
+            // Keep the run summary but show an error for charts
+            setDisplayedChartSeries(null);
             setError(`Failed to load detailed data for run ${fullClickedRunSummary.id}.`);
-             // Also clear the detailed table data on error
-            setProfilingResultsDetailed(null);
-            setShowResultsTable(false);
         }
     };
 
@@ -626,7 +619,7 @@ const Home = () => {
     }
 
     // Determine if charts should be shown
-    const showCharts = displayedRunSummary && displayedProfileResults.length > 0;
+    const showCharts = displayedRunSummary && displayedChartSeries && displayedChartSeries.column_count > 0;
 
     return (
         // Wrap the main content with DndProvider
@@ -678,7 +671,7 @@ const Home = () => {
                     </Grid>
                 </Grid>
 
-                {/* Charts Section - Only render if displayedRunSummary and displayedProfileResults are available */}
+                {/* Charts Section - Only render if displayedRunSummary and displayedChartSeries are available */}
                 {showCharts ? (
                     <Grid container spacing={3} mb={4}>
                          {/* DQ Score (remains here as it's not a standard chart component) */}
@@ -737,7 +730,7 @@ const Home = () => {
                                         id={chartType} // Pass id for drag and drop
                                         index={index} // Pass index for drag and drop
                                         displayedRunSummary={displayedRunSummary}
-                                        displayedProfileResults={displayedProfileResults}
+                                        displayedChartSeries={displayedChartSeries}
                                         onChartClick={handleOpenFullChartModal} // Pass handler for full view
                                         moveCard={moveCard} // Pass move function for drag and drop
                                         COLORS={COLORS} // Pass COLORS array
@@ -855,13 +848,17 @@ const Home = () => {
                 </Paper>
 
                 {/* Detailed Profiling Results Section (appears when a history row is clicked) */}
-                {showResultsTable && profilingResultsDetailed && (
+                {showResultsTable && displayedRunSummary && (
                     <Box mt={4}>
                         <Typography variant="h6" gutterBottom>
                             Detailed Profiling Results for Run {displayedRunSummary?.id}
                         </Typography>
-                        {/* Assuming ProfilingResultsTable component is available and accepts profilingData prop */}
-                        <ProfilingResultsTable profilingData={profilingResultsDetailed} />
+                        {/* Server-side grid: keyed by run, so that its paging, sorting and filters start over for each run */}
+                        <ProfilingResultsTable
+                            key={displayedRunSummary.profiling_id}
+                            connectionId={displayedRunSummary.connection_id}
+                            profilingId={displayedRunSummary.profiling_id}
+                        />
                     </Box>
                 )}
 
@@ -881,7 +878,7 @@ const Home = () => {
                     onClose={handleCloseFullChartModal}
                     chartType={fullChartType}
                     displayedRunSummary={displayedRunSummary}
-                    displayedProfileResults={displayedProfileResults}
+                    displayedChartSeries={displayedChartSeries}
                     COLORS={COLORS} // Pass colors to the modal
                 />
             </Box>
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import {
   Dialog,
   DialogTitle,
@@ -13,9 +13,10 @@ import {
   CircularProgress,
   Typography,
   Box,
+  LinearProgress,
 } from '@mui/material';
 import CloseIcon from '@mui/icons-material/Close';
-import { getAllConnections, getTableGroups, triggerProfiling } from '../api/dbapi';
+import { cancelProfilingRun, getAllConnections, getTableGroups, subscribeProfilingRunEvents, triggerProfiling } from '../api/dbapi';
 
 const NewProfilingRunDialog = ({ open, onClose, onRunSuccess }) => {
   const [connections, setConnections] = useState([]);
@@ -25,6 +26,12 @@ const NewProfilingRunDialog = ({ open, onClose, onRunSuccess }) => {
   const [loadingConnections, setLoadingConnections] = useState(false);
   const [loadingTableGroups, setLoadingTableGroups] = useState(false);
   const [submitting, setSubmitting] = useState(false);
+  // Progress of the run started from this dialog, streamed from the backend
+  const [runHandle, setRunHandle] = useState(null);
+  const [runStatus, setRunStatus] = useState(null);
+  const [currentStep, setCurrentStep] = useState(null);
+  const [runMessage, setRunMessage] = useState(null);
+  const closeStreamRef = useRef(null);
 
   useEffect(() => {
     if (open) {
@@ -37,6 +44,14 @@ const NewProfilingRunDialog = ({ open, onClose, onRunSuccess }) => {
       setSelectedConnection('');
       setSelectedTableGroup('');
       setTableGroups([]);
+      setRunHandle(null);
+      setRunStatus(null);
+      setCurrentStep(null);
+      setRunMessage(null);
+      if (closeStreamRef.current) {
+        closeStreamRef.current();
+        closeStreamRef.current = null;
+      }
     }
   }, [open]);
   
@@ -80,22 +95,42 @@ const NewProfilingRunDialog = ({ open, onClose, onRunSuccess }) => {
     if (!selectedConnection || !selectedTableGroup) return;
     setSubmitting(true);
     try {
-      await triggerProfiling({
+      const handle = await triggerProfiling({
         connection_id: selectedConnection,
         table_group_id: selectedTableGroup,
       });
-      
-      if (onRunSuccess) {
-        onRunSuccess();
-      }
-      onClose();
+      setRunHandle(handle);
+      setRunStatus(handle.status);
+
+      closeStreamRef.current = subscribeProfilingRunEvents(handle.run_handle_id, (event) => {
+        if (event.type === 'step') {
+          setCurrentStep(event.step);
+        } else if (event.type === 'status') {
+          setRunStatus(event.status);
+          setRunMessage(event.message || null);
+          if (event.status === 'Complete' && onRunSuccess) {
+            onRunSuccess();
+          }
+        }
+      });
     } catch (error) {
       console.error('Failed to trigger profiling:', error);
+      setRunMessage(error.response?.data?.detail || 'Failed to start profiling.');
     } finally {
       setSubmitting(false);
     }
   };
 
+  const handleCancelRun = async () => {
+    try {
+      await cancelProfilingRun(runHandle.run_handle_id);
+    } catch (error) {
+      console.error('Failed to cancel profiling:', error);
+    }
+  };
+
+  const isRunActive = runStatus === 'Queued' || runStatus === 'Running';
+
   return (
     <Dialog open={open} onClose={onClose} fullWidth maxWidth="sm">
       <DialogTitle sx={{ m: 0, p: 2 }}>
@@ -147,16 +182,41 @@ const NewProfilingRunDialog = ({ open, onClose, onRunSuccess }) => {
               ))}
             </Select>
           </FormControl>
+
+          {(runStatus || runMessage) && (
+            <Box>
+              <Typography variant="subtitle2">
+                {runStatus ? `Status: ${runStatus}` : 'Status: Not started'}
+              </Typography>
+              {isRunActive && <LinearProgress sx={{ my: 1 }} />}
+              {currentStep && (
+                <Typography variant="body2" color="text.secondary">
+                  {isRunActive ? 'Current step' : 'Last step'}: {currentStep}
+                </Typography>
+              )}
+              {runMessage && (
+                <Typography variant="body2" color={runStatus === 'Complete' ? 'text.secondary' : 'error'}>
+                  {runMessage}
+                </Typography>
+              )}
+            </Box>
+          )}
         </Box>
       </DialogContent>
       <DialogActions>
-        <Button onClick={onClose} disabled={submitting}>
-          Cancel
-        </Button>
+        {isRunActive ? (
+          <Button onClick={handleCancelRun} color="error">
+            Cancel Run
+          </Button>
+        ) : (
+          <Button onClick={onClose} disabled={submitting}>
+            {runStatus ? 'Close' : 'Cancel'}
+          </Button>
+        )}
         <Button
           onClick={handleRunProfiling}
           variant="contained"
-          disabled={!selectedConnection || !selectedTableGroup || submitting}
+          disabled={!selectedConnection || !selectedTableGroup || submitting || isRunActive}
         >
           {submitting ? <CircularProgress size={24} /> : 'Run Profiling'}
         </Button>
@@ -1,14 +1,76 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import {
-  Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Paper,
-  Typography, LinearProgress, Chip, Dialog, DialogTitle, DialogContent, IconButton, Divider, Box, List, ListItem, Popover
+  Paper, Typography, LinearProgress, Chip, Dialog, DialogTitle, DialogContent, IconButton, Divider, Box, List, ListItem, Popover
 } from '@mui/material';
+import { DataGrid } from '@mui/x-data-grid';
 import CloseIcon from '@mui/icons-material/Close';
-import InfoOutlinedIcon from '@mui/icons-material/InfoOutlined';
+import { fetchProfileResultsPage } from '../api/dbapi';
 
 const getPercentage = (value, total) => total ? ((value / total) * 100).toFixed(1) : 0;
 
-const ProfilingResultsTable = ({ profilingData }) => {
+// Fields fetched for the grid rows. The detailed dialog fetches all the fields of its column on open.
+const GRID_FIELDS = [
+  'schema_name', 'table_name', 'column_name', 'column_type', 'general_type',
+  'record_ct', 'value_ct', 'null_value_ct', 'distinct_value_ct', 'pii_flag', 'datatype_suggestion',
+];
+const PAGE_SIZE_OPTIONS = [50, 100, 250];
+
+const PercentCell = ({ value, total, color }) => (
+  <Box width="100%">
+    {value} ({getPercentage(value, total)}%)
+    <LinearProgress
+      variant="determinate"
+      value={Number(getPercentage(value, total))}
+      color={color}
+      sx={{ bgcolor: '#757575' }} // Adjust progress bar background
+    />
+  </Box>
+);
+
+const gridColumns = [
+  {
+    field: 'column_name',
+    headerName: 'Column',
+    flex: 1,
+    minWidth: 150,
+    renderCell: (params) => <Typography fontWeight="bold" variant="body2" sx={{ lineHeight: 'inherit' }}>{params.value}</Typography>,
+  },
+  { field: 'table_name', headerName: 'Table', flex: 1, minWidth: 150 },
+  { field: 'column_type', headerName: 'Type', flex: 1 },
+  { field: 'general_type', headerName: 'Gen. Type', width: 100 },
+  {
+    field: 'null_value_ct',
+    headerName: 'Nulls',
+    type: 'number',
+    flex: 1,
+    renderCell: (params) => <PercentCell value={params.value} total={params.row.record_ct} color="error" />,
+  },
+  {
+    field: 'distinct_value_ct',
+    headerName: 'Distinct',
+    type: 'number',
+    flex: 1,
+    renderCell: (params) => <PercentCell value={params.value} total={params.row.value_ct} color="primary" />,
+  },
+  {
+    field: 'pii_flag',
+    headerName: 'PII',
+    width: 90,
+    renderCell: (params) => params.value ? <Chip label="PII" color="warning" size="small" /> : <Chip label="No" size="small" />,
+  },
+  { field: 'datatype_suggestion', headerName: 'Suggestion', flex: 1 },
+];
+
+// Sorting, filtering and paging run on the server, which only returns the rows of the current page. The grid
+// virtualises them, so that runs with many thousands of columns open without loading all their results.
+const ProfilingResultsTable = ({ connectionId, profilingId }) => {
+  const [rows, setRows] = useState([]);
+  const [rowCount, setRowCount] = useState(0);
+  const [loading, setLoading] = useState(false);
+  const [paginationModel, setPaginationModel] = useState({ page: 0, pageSize: 100 });
+  const [sortModel, setSortModel] = useState([]);
+  const [filterModel, setFilterModel] = useState({ items: [] });
+
   const [selectedColumn, setSelectedColumn] = useState(null);
   const [dialogOpen, setDialogOpen] = useState(false);
 
@@ -16,7 +78,39 @@ const ProfilingResultsTable = ({ profilingData }) => {
   const [popoverAnchorEl, setPopoverAnchorEl] = useState(null);
   const [popoverContent, setPopoverContent] = useState(null);
 
-  const handlePopoverOpen = (event, col) => {
+  useEffect(() => {
+    let active = true; // Ignores the responses of superseded requests
+    setLoading(true);
+    fetchProfileResultsPage(connectionId, profilingId, {
+      page: paginationModel.page,
+      pageSize: paginationModel.pageSize,
+      sortModel,
+      filterModel,
+      fields: GRID_FIELDS,
+    })
+      .then((data) => {
+        if (active) {
+          setRows(data.rows);
+          setRowCount(data.row_count);
+        }
+      })
+      .catch((error) => console.error("Error fetching profile results page:", error))
+      .finally(() => {
+        if (active) setLoading(false);
+      });
+    return () => {
+      active = false;
+    };
+  }, [connectionId, profilingId, paginationModel, sortModel, filterModel]);
+
+  const handleFilterModelChange = (model) => {
+    setFilterModel(model);
+    setPaginationModel((current) => ({ ...current, page: 0 }));
+  };
+
+  const handlePopoverOpen = (event) => {
+    const col = rows.find((row) => String(row.id) === event.currentTarget.dataset.id);
+    if (!col) return;
     setPopoverAnchorEl(event.currentTarget);
     setPopoverContent(col); // Store the column data for the popover
   };
@@ -26,10 +120,21 @@ const ProfilingResultsTable = ({ profilingData }) => {
     setPopoverContent(null); // Clear content on close
   };
 
-  const openDialog = (col) => {
+  const openDialog = async (col) => {
     setSelectedColumn(col);
     setDialogOpen(true);
     handlePopoverClose(); // Close popover if dialog is opened from hover
+    try {
+      const data = await fetchProfileResultsPage(connectionId, profilingId, {
+        pageSize: 1,
+        filterModel: { items: [{ field: 'id', operator: 'equals', value: col.id }] },
+      });
+      if (data.rows.length > 0) {
+        setSelectedColumn((current) => (current && current.id === col.id ? data.rows[0] : current));
+      }
+    } catch (error) {
+      console.error("Error fetching profile result details:", error);
+    }
   };
 
   const closeDialog = () => {
@@ -42,63 +147,40 @@ const ProfilingResultsTable = ({ profilingData }) => {
 
   return (
     <>
-      <TableContainer component={Paper} sx={{ bgcolor: '#424242', color: '#e0e0e0' }}> {/* Dark grey background */}
-        <Table>
-          <TableHead>
-            <TableRow sx={{ bgcolor: '#505050' }}> {/* Slightly lighter grey for head */}
-              <TableCell><Typography fontWeight="bold" sx={{ color: '#e0e0e0' }}>Column</Typography></TableCell>
-              <TableCell sx={{ color: '#e0e0e0' }}>Type</TableCell>
-              <TableCell sx={{ color: '#e0e0e0' }}>Gen. Type</TableCell>
-              <TableCell sx={{ color: '#e0e0e0' }}>Nulls</TableCell>
-              <TableCell sx={{ color: '#e0e0e0' }}>Distinct</TableCell>
-              <TableCell sx={{ color: '#e0e0e0' }}>PII</TableCell>
-              <TableCell sx={{ color: '#e0e0e0' }}>Suggestion</TableCell>
-            </TableRow>
-          </TableHead>
-          <TableBody>
-            {profilingData.map((col) => (
-              <TableRow
-                key={col.id}
-                hover
-                onClick={() => openDialog(col)}
-                onMouseEnter={(event) => handlePopoverOpen(event, col)}
-                onMouseLeave={handlePopoverClose}
-                sx={{ cursor: 'pointer', '&:hover': { bgcolor: '#616161' } }} // Darker grey on hover
-              >
-                <TableCell sx={{ color: '#e0e0e0' }}>{col.column_name}</TableCell>
-                <TableCell sx={{ color: '#e0e0e0' }}>{col.column_type}</TableCell>
-                <TableCell sx={{ color: '#e0e0e0' }}>{col.general_type}</TableCell>
-                <TableCell sx={{ color: '#e0e0e0' }}>
-                  {col.null_value_ct} ({getPercentage(col.null_value_ct, col.record_ct)}%)
-                  <LinearProgress
-                    variant="determinate"
-                    value={getPercentage(col.null_value_ct, col.record_ct)}
-                    color="error"
-                    sx={{ bgcolor: '#757575' }} // Adjust progress bar background
-                  />
-                </TableCell>
-                <TableCell sx={{ color: '#e0e0e0' }}>
-                  {col.distinct_value_ct} ({getPercentage(col.distinct_value_ct, col.value_ct)}%)
-                  <LinearProgress
-                    variant="determinate"
-                    value={getPercentage(col.distinct_value_ct, col.value_ct)}
-                    color="primary"
-                     sx={{ bgcolor: '#757575' }} // Adjust progress bar background
-                  />
-                </TableCell>
-                <TableCell sx={{ color: '#e0e0e0' }}>
-                  {col.pii_flag ? (
-                    <Chip label="PII" color="warning" size="small" />
-                  ) : (
-                    <Chip label="No" size="small" />
-                  )}
-                </TableCell>
-                <TableCell sx={{ color: '#e0e0e0' }}>{col.datatype_suggestion}</TableCell>
-              </TableRow>
-            ))}
-          </TableBody>
-        </Table>
-      </TableContainer>
+      <Paper sx={{ height: 600, bgcolor: '#424242', color: '#e0e0e0' }}> {/* Dark grey background */}
+        <DataGrid
+          rows={rows}
+          columns={gridColumns}
+          rowCount={rowCount}
+          loading={loading}
+          paginationMode="server"
+          sortingMode="server"
+          filterMode="server"
+          filterDebounceMs={300}
+          paginationModel={paginationModel}
+          onPaginationModelChange={setPaginationModel}
+          pageSizeOptions={PAGE_SIZE_OPTIONS}
+          sortModel={sortModel}
+          onSortModelChange={setSortModel}
+          filterModel={filterModel}
+          onFilterModelChange={handleFilterModelChange}
+          onRowClick={(params) => openDialog(params.row)}
+          disableRowSelectionOnClick
+          slotProps={{
+            row: {
+              onMouseEnter: handlePopoverOpen,
+              onMouseLeave: handlePopoverClose,
+            },
+          }}
+          sx={{
+            border: 'none',
+            color: '#e0e0e0',
+            '& .MuiDataGrid-columnHeaders': { bgcolor: '#505050' }, // Slightly lighter grey for head
+            '& .MuiDataGrid-row': { cursor: 'pointer', '&:hover': { bgcolor: '#616161' } }, // Darker grey on hover
+            '& .MuiDataGrid-footerContainer, & .MuiTablePagination-root': { color: '#e0e0e0' },
+          }}
+        />
+      </Paper>
 
       {/* Popover for Overview on Hover */}
       <Popover
@@ -1,3 +1,4 @@
+import json
 import logging
 import os
 import subprocess
@@ -11,6 +12,15 @@ from progress.spinner import MoonSpinner
 from trogon import tui
 
 from testgen import settings
+from testgen.commands.run_analyze_metadata_db import run_analyze_metadata_db
+from testgen.commands.run_benchmark import (
+    BenchmarkParameters,
+    compare_to_baseline,
+    load_benchmark_result,
+    run_benchmark,
+    save_benchmark_result,
+)
+from testgen.commands.run_execute_test_suites import run_multi_suite_execution
 from testgen.commands.run_execute_tests import run_execution_steps
 from testgen.commands.run_generate_tests import run_test_gen_queries
 from testgen.commands.run_get_entities import (
@@ -31,7 +41,10 @@ from testgen.commands.run_get_entities import (
 from testgen.commands.run_launch_db_config import run_launch_db_config
 from testgen.commands.run_observability_exporter import run_observability_exporter
 from testgen.commands.run_profiling_bridge import run_profiling_queries
+from testgen.commands.run_profiling_scheduler import get_profiling_schedule, run_profiling_schedule
 from testgen.commands.run_quick_start import run_quick_start, run_quick_start_increment
+from testgen.commands.run_result_retention import run_prune
+from testgen.commands.run_step_metrics import export_run_step_metrics
 from testgen.commands.run_upgrade_db_config import get_schema_revision, is_db_revision_up_to_date, run_upgrade_db_config
 from testgen.common import (
     configure_logging,
@@ -40,6 +53,7 @@ from testgen.common import (
     get_tg_db,
     get_tg_host,
     get_tg_schema,
+    install_cancel_handler,
     logs,
     version_service,
 )
@@ -58,10 +72,18 @@ class Configuration:
 pass_configuration = click.make_pass_decorator(Configuration)
 
 
+class CliGroup(click.Group):
+    # The version lookup and the schema revision query are only done when the help is displayed, not on every command
+    def format_help_text(self, ctx: Context, formatter: click.HelpFormatter) -> None:
+        self.help = (
+            f"This version: {settings.VERSION} \n\nLatest version: {version_service.get_latest_version()} "
+            f"\n\nSchema revision: {get_schema_revision()}"
+        )
+        super().format_help_text(ctx, formatter)
+
+
 @tui()
-@click.group(
-    help=f"This version: {settings.VERSION} \n\nLatest version: {version_service.get_latest_version()} \n\nSchema revision: {get_schema_revision()}"
-)
+@click.group(cls=CliGroup)
 @click.option(
     "-v",
     "--verbose",
@@ -108,10 +130,88 @@ def run_profile(configuration: Configuration, table_group_id: str):
     spinner = None
     if not configuration.verbose:
         spinner = MoonSpinner("Processing ... ")
+    install_cancel_handler()
     message = run_profiling_queries(table_group_id, spinner=spinner)
     click.echo("\n" + message)
 
 
+@cli.command("run-profile-all", help="Profiles the table groups of a project in parallel, stalest first.")
+@click.option(
+    "-pk",
+    "--project-key",
+    help="The identifier for a TestGen project. Use a project_key shown in list-projects.",
+    required=False,
+    type=click.STRING,
+    default=settings.PROJECT_KEY,
+)
+@click.option(
+    "-tg",
+    "--table-group-id",
+    help="Profiles only this table group. Repeat the option to profile several.",
+    required=False,
+    multiple=True,
+    type=click.STRING,
+)
+@click.option(
+    "--stale-hours",
+    help="Skips the table groups profiled less than this many hours ago.",
+    required=False,
+    type=click.FloatRange(min=0),
+    default=0,
+)
+@click.option(
+    "--max-parallel",
+    help="Maximum number of table groups profiled at the same time.",
+    required=False,
+    type=click.IntRange(min=1),
+    default=settings.PROFILING_MAX_PARALLEL_RUNS,
+)
+@click.option(
+    "--max-per-connection",
+    help="Maximum number of table groups profiled at the same time on each connection.",
+    required=False,
+    type=click.IntRange(min=1),
+    default=settings.PROFILING_MAX_RUNS_PER_CONNECTION,
+)
+@pass_configuration
+def run_profile_all(
+    configuration: Configuration,
+    project_key: str,
+    table_group_id: tuple[str, ...],
+    stale_hours: float,
+    max_parallel: int,
+    max_per_connection: int,
+):
+    try:
+        schedule = get_profiling_schedule(project_key, list(table_group_id), stale_hours)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--table-group-id") from e
+    if not schedule:
+        click.echo("No table groups to profile.")
+        return
+
+    click.echo(f"run-profile-all: {len(schedule)} table groups, up to {max_parallel} at a time")
+
+    def on_update(group):
+        if group.status == "Running":
+            click.echo(f"Started:   {group.table_groups_name} ({group.table_groups_id})")
+        else:
+            duration = f" in {group.seconds}s" if group.seconds is not None else ""
+            click.secho(
+                f"{group.status + ':':<10} {group.table_groups_name}{duration}",
+                fg="green" if group.status == "Complete" else "red",
+            )
+
+    schedule = run_profiling_schedule(schedule, max_parallel, max_per_connection, configuration.verbose, on_update)
+
+    failed = [group for group in schedule if group.status != "Complete"]
+    click.echo(f"\n{len(schedule) - len(failed)} of {len(schedule)} table groups profiled.")
+    for group in failed:
+        click.secho(f"{group.table_groups_name}: {group.status} - {group.message}", fg="red")
+    if failed:
+        sys.exit(1)
+
+
 @cli.command("run-test-generation", help="Generates or refreshes the tests for a table group.")
 @click.option(
     "-tg",
@@ -165,10 +265,53 @@ def run_tests(configuration: Configuration, project_key: str, test_suite_key: st
     spinner = None
     if not configuration.verbose:
         spinner = MoonSpinner("Processing ... ")
+    install_cancel_handler()
     message = run_execution_steps(project_key, test_suite_key, spinner=spinner)
     click.echo("\n" + message)
 
 
+@cli.command("run-test-suites", help="Performs the tests of several test suites, or of all the suites of a table group, in one run.")
+@click.option(
+    "-pk",
+    "--project-key",
+    help="The identifier for a TestGen project. Use a project_key shown in list-projects.",
+    required=False,
+    type=click.STRING,
+    default=settings.PROJECT_KEY,
+)
+@click.option(
+    "-ts",
+    "--test-suite-key",
+    help="The identifier for a test suite. Use a test_suite_key shown in list-test-suites. Repeat the option to run several.",
+    required=False,
+    multiple=True,
+    type=click.STRING,
+)
+@click.option(
+    "-tg",
+    "--table-group-id",
+    help="Runs all the test suites of this table group. Use a table_group_id shown in list-table-groups.",
+    required=False,
+    type=click.STRING,
+    default=None,
+)
+@pass_configuration
+def run_test_suites(configuration: Configuration, project_key: str, test_suite_key: tuple[str, ...], table_group_id: str):
+    if not test_suite_key and not table_group_id:
+        raise click.UsageError("Specify test suites with --test-suite-key, or a table group with --table-group-id.")
+    click.echo(f"run-test-suites for suites: {', '.join(test_suite_key) or '-'}, table group: {table_group_id or '-'}")
+    spinner = None
+    if not configuration.verbose:
+        spinner = MoonSpinner("Processing ... ")
+    install_cancel_handler()
+    messages = run_multi_suite_execution(project_key, list(test_suite_key), table_group_id, spinner=spinner)
+    click.echo("")
+    for test_suite, message in messages.items():
+        click.echo(f"{test_suite}: {message}")
+    if any("completed successfully" not in message for message in messages.values()):
+        sys.exit(1)
+
+
 @cli.command("list-profiles", help="Lists all profile runs for a table group.")
 @click.option(
     "-tg",
@@ -432,6 +575,140 @@ def setup_app_db(configuration: Configuration, delete_db: bool, yes: bool):
     click.echo("setup-system-db has successfully finished.")
 
 
+@cli.command("prune", help="Deletes the test and profiling results older than the retention period.")
+@click.option(
+    "--older-than",
+    help="Retention period, as a number followed by d, w, m or y (e.g. 90d, 18m). Rounded down to whole months.",
+    required=True,
+    type=click.STRING,
+)
+@click.option("--yes", "-y", default=False, is_flag=True, required=False, help="Force yes")
+def prune(older_than: str, yes: bool):
+    click.echo(f"prune older than: {older_than}")
+    if not yes:
+        message = f"Are you SURE you want to delete the test and profiling results older than {older_than}?"
+        if not click.confirm(click.style(message, fg="red")):
+            click.echo("Exiting without any operation performed.")
+            return
+
+    try:
+        summary = run_prune(older_than)
+    except ValueError as e:
+        click.secho(str(e), fg="red")
+        sys.exit(1)
+
+    click.echo(
+        f"Pruned results before {summary['cutoff']}: {summary['dropped_partitions']} partitions dropped, "
+        f"{summary['test_runs']} test runs and {summary['profiling_runs']} profiling runs deleted."
+    )
+
+
+@cli.command(
+    "analyze-metadata-db",
+    help="Runs EXPLAIN ANALYZE on the hot queries of the TestGen system database and reports sequential scans.",
+)
+@click.option("--budget-ms", type=click.FLOAT, default=500, show_default=True, help="Execution time to flag as slow.")
+def analyze_metadata_db(budget_ms: float):
+    click.echo("analyze-metadata-db command")
+    reports = run_analyze_metadata_db()
+
+    flagged = 0
+    for report in reports:
+        if report.error:
+            click.echo(click.style(f"{report.query_name}: ", bold=True) + click.style(report.error, fg="yellow"))
+            continue
+
+        is_slow = report.execution_ms > budget_ms
+        flagged += bool(is_slow or report.seq_scans)
+        click.echo(
+            click.style(f"{report.query_name}: ", bold=True)
+            + click.style(f"{report.execution_ms:.1f} ms", fg="red" if is_slow else "green")
+            + f" (planning: {report.planning_ms:.1f} ms, buffers hit: {report.shared_hit_blocks}, read: {report.shared_read_blocks})"
+        )
+        for seq_scan in report.seq_scans:
+            click.secho(f"  Seq Scan on {seq_scan.relation}: {seq_scan.rows_scanned} rows", fg="red")
+
+    click.echo(f"\n{flagged} of {len(reports)} queries flagged.")
+
+
+@cli.command(
+    "benchmark",
+    help="Generates a synthetic schema in the target database and times profiling, test generation and test execution on it.",
+)
+@click.option("--tables", type=click.IntRange(min=1), default=1, show_default=True, help="Number of tables to generate.")
+@click.option("--columns", type=click.IntRange(min=1), default=20, show_default=True, help="Columns per table.")
+@click.option("--rows", type=click.IntRange(min=1), default=100000, show_default=True, help="Rows per table.")
+@click.option(
+    "--cardinality", type=click.IntRange(min=1), default=10, show_default=True, help="Distinct values per code column."
+)
+@click.option("--schema", default="tg_benchmark", show_default=True, help="Target schema for the generated tables.")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="Results file to compare against.")
+@click.option("--save-baseline", type=click.Path(dir_okay=False), help="Saves the results to this file.")
+@click.option(
+    "--tolerance", type=click.FLOAT, default=20, show_default=True, help="Slowdown percentage to report as a regression."
+)
+def benchmark(
+    tables: int,
+    columns: int,
+    rows: int,
+    cardinality: int,
+    schema: str,
+    baseline: str | None,
+    save_baseline: str | None,
+    tolerance: float,
+):
+    click.echo("benchmark command")
+    result = run_benchmark(BenchmarkParameters(tables, columns, rows, cardinality, schema))
+
+    for name, metrics in result.steps.items():
+        click.echo(
+            click.style(f"{name}: ", bold=True)
+            + f"{metrics.seconds:.2f} s, {metrics.queries} queries, {metrics.rows} rows, "
+            + f"metadata growth: {metrics.metadata_growth_bytes / 1024:.0f} KB"
+        )
+
+    if save_baseline:
+        save_benchmark_result(result, save_baseline)
+        click.echo(f"Results saved to {save_baseline}")
+
+    if baseline:
+        regressions = 0
+        click.echo(f"\nCompared to {baseline}:")
+        for comparison in compare_to_baseline(result, load_benchmark_result(baseline)):
+            if comparison.change_pct is None:
+                click.echo(f"{comparison.step}: no baseline")
+                continue
+            is_regression = comparison.change_pct > tolerance
+            regressions += is_regression
+            click.echo(
+                f"{comparison.step}: {comparison.baseline_seconds:.2f} s -> {comparison.seconds:.2f} s "
+                + click.style(f"({comparison.change_pct:+.1f}%)", fg="red" if is_regression else "green")
+            )
+        if regressions:
+            click.secho(f"{regressions} steps slower than the {tolerance}% tolerance.", fg="red")
+            sys.exit(1)
+
+
+@cli.command(
+    "export-run-telemetry", help="Exports the step metrics of a profiling or test run as OpenTelemetry JSON."
+)
+@click.option("-r", "--run-id", required=True, type=click.STRING, help="The ID of a profiling run or test run.")
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="File to write to, instead of the terminal.")
+def export_run_telemetry(run_id: str, output: str | None):
+    trace = export_run_step_metrics(run_id)
+    if not trace["resourceSpans"][0]["scopeSpans"][0]["spans"]:
+        click.secho(f"No step metrics found for run {run_id}.", fg="red")
+        sys.exit(1)
+
+    trace_json = json.dumps(trace, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(trace_json)
+        click.echo(f"Run telemetry written to {output}")
+    else:
+        click.echo(trace_json)
+
+
 @cli.command(
     "upgrade-system-version", help="Upgrades your system and services to match the current DataOps TestGen version."
 )
@@ -639,6 +916,28 @@ def run(debug: bool):
             stdout.close()
 
 
+@ui.command("import-time", help="Check the cold start import time of the browser application against a budget")
+@click.option("--budget-ms", type=click.INT, default=3000, show_default=True, help="Maximum import time allowed.")
+@click.option("--module", type=click.STRING, default="testgen.ui.app", show_default=True, help="Module to import.")
+def check_ui_import_time(budget_ms: int, module: str):
+    from testgen.ui.scripts import import_time
+
+    report = import_time.measure(module)
+    click.echo(click.style(f"{report.module}: ", bold=True) + f"{report.total_ms:.0f} ms (budget: {budget_ms} ms)")
+    for name, self_ms in report.slowest:
+        click.echo(f"  {self_ms:>8.1f} ms  {name}")
+
+    failed = False
+    if report.deferred_imported:
+        click.secho(f"Modules that should be loaded on demand were imported: {', '.join(report.deferred_imported)}", fg="red")
+        failed = True
+    if report.total_ms > budget_ms:
+        click.secho("Import time is over budget.", fg="red")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
 @ui.command("plugins", help="List installed application plugins")
 def list_ui_plugins():
     installed_plugins = list(plugins.discover())
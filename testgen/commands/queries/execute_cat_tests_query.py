@@ -3,7 +3,7 @@ import typing
 from testgen.commands.queries.rollup_scores_query import CRollupScoresSQL
 from testgen.common import date_service, read_template_sql_file
 from testgen.common.database import database_service
-from testgen.common.read_file import replace_templated_functions
+from testgen.common.read_file import compile_template
 
 
 class CCATExecutionSQL:
@@ -43,34 +43,27 @@ class CCATExecutionSQL:
         return self._rollup_scores_sql
 
     def _ReplaceParms(self, strInputString):
-        strInputString = strInputString.replace("{MAX_QUERY_CHARS}", str(self.max_query_chars))
-        strInputString = strInputString.replace("{TEST_RUN_ID}", self.test_run_id)
-        strInputString = strInputString.replace("{PROJECT_CODE}", self.project_code)
-        strInputString = strInputString.replace("{TEST_SUITE}", self.test_suite)
-        strInputString = strInputString.replace("{TEST_SUITE_ID}", self.test_suite_id)
-        strInputString = strInputString.replace("{TABLE_GROUPS_ID}", self.table_groups_id)
-
-        strInputString = strInputString.replace("{SQL_FLAVOR}", self.flavor)
-        strInputString = strInputString.replace("{ID_SEPARATOR}", "`" if self.flavor == "databricks" else '"')
-        strInputString = strInputString.replace("{CONCAT_OPERATOR}", self.concat_operator)
-
-        strInputString = strInputString.replace("{SCHEMA_NAME}", self.target_schema)
-        strInputString = strInputString.replace("{TABLE_NAME}", self.target_table)
-
-        strInputString = strInputString.replace("{RUN_DATE}", self.run_date)
-        strInputString = strInputString.replace("{NOW_DATE}", "GETDATE()")
-        strInputString = strInputString.replace("{START_TIME}", self.today)
-        strInputString = strInputString.replace(
-            "{NOW}", date_service.get_now_as_string_with_offset(self.minutes_offset)
-        )
-        strInputString = strInputString.replace("{EXCEPTION_MESSAGE}", self.exception_message.strip())
-
-        for parm, value in self.dctTestParms.items():
-            strInputString = strInputString.replace("{" + parm.upper() + "}", str(value))
-
-        strInputString = strInputString.replace("{RUN_DATE}", self.run_date)
-
-        strInputString = replace_templated_functions(strInputString, self.flavor)
+        dctParms = {parm.upper(): value for parm, value in self.dctTestParms.items()}
+        dctParms.update({
+            "MAX_QUERY_CHARS": self.max_query_chars,
+            "TEST_RUN_ID": self.test_run_id,
+            "PROJECT_CODE": self.project_code,
+            "TEST_SUITE": self.test_suite,
+            "TEST_SUITE_ID": self.test_suite_id,
+            "TABLE_GROUPS_ID": self.table_groups_id,
+            "SQL_FLAVOR": self.flavor,
+            "ID_SEPARATOR": "`" if self.flavor == "databricks" else '"',
+            "CONCAT_OPERATOR": self.concat_operator,
+            "SCHEMA_NAME": self.target_schema,
+            "TABLE_NAME": self.target_table,
+            "RUN_DATE": self.run_date,
+            "NOW_DATE": "GETDATE()",
+            "START_TIME": self.today,
+            "NOW": date_service.get_now_as_string_with_offset(self.minutes_offset),
+            "EXCEPTION_MESSAGE": self.exception_message.strip(),
+        })
+
+        strInputString = compile_template(strInputString).render(dctParms, self.flavor)
 
         if self.flavor != "databricks":
             # Adding escape character where ':' is referenced
@@ -97,6 +90,19 @@ class CCATExecutionSQL:
         strQ = self._ReplaceParms(read_template_sql_file("ex_cat_test_query.sql", "exec_cat_tests"))
         return strQ
 
+    def PrepCombinedCATQuerySQL(self, intBatch, lstCATParms):
+        # Combines aggregate test records against the target table, e.g. of several test runs, into one query
+        self.dctTestParms = {
+            "cat_batch": intBatch,
+            "test_columns": ",\n       ".join(
+                f"{dctCATParms['test_measures']} as measure_results_{i}, "
+                f"{dctCATParms['test_conditions']} as test_results_{i}"
+                for i, dctCATParms in enumerate(lstCATParms)
+            ),
+        }
+        strQ = self._ReplaceParms(read_template_sql_file("ex_cat_combined_test_query.sql", "exec_cat_tests"))
+        return strQ
+
     def GetCATResultsParseSQL(self):
         strQ = self._ReplaceParms(read_template_sql_file("ex_cat_results_parse.sql", "exec_cat_tests"))
         return strQ
@@ -1,6 +1,7 @@
 import typing
 
 from testgen.common import AddQuotesToIdentifierCSV, CleanSQL, ConcatColumnList, date_service, read_template_sql_file
+from testgen.common.read_file import compile_template
 
 
 class CTestExecutionSQL:
@@ -42,22 +43,6 @@ class CTestExecutionSQL:
         return str_parms
 
     def _ReplaceParms(self, strInputString: str):
-        strInputString = strInputString.replace("{PROJECT_CODE}", self.project_code)
-        strInputString = strInputString.replace("{TEST_SUITE_ID}", self.test_suite_id)
-        strInputString = strInputString.replace("{TEST_SUITE}", self.test_suite)
-        strInputString = strInputString.replace("{SQL_FLAVOR}", self.flavor)
-        strInputString = strInputString.replace("{TEST_RUN_ID}", self.test_run_id)
-        strInputString = strInputString.replace("{INPUT_PARAMETERS}", self._AssembleDisplayParameters())
-
-        strInputString = strInputString.replace("{RUN_DATE}", self.run_date)
-        strInputString = strInputString.replace("{EXCEPTION_MESSAGE}", self.exception_message)
-        strInputString = strInputString.replace("{START_TIME}", self.today)
-        strInputString = strInputString.replace("{PROCESS_ID}", str(self.process_id))
-        strInputString = strInputString.replace("{VARCHAR_TYPE}", "STRING" if self.flavor == "databricks" else "VARCHAR")
-        strInputString = strInputString.replace(
-            "{NOW}", date_service.get_now_as_string_with_offset(self.minutes_offset)
-        )
-
         column_designators = [
             "COLUMN_NAME",
             # "COLUMN_NAMES",
@@ -68,26 +53,47 @@ class CTestExecutionSQL:
             # "MATCH_SUM_COLUMNS",
         ]
 
+        dctParms = {}
         for parm, value in self.dctTestParms.items():
             if value:
                 if parm.upper() in column_designators:
-                    strInputString = strInputString.replace("{" + parm.upper() + "}", AddQuotesToIdentifierCSV(value))
+                    dctParms[parm.upper()] = AddQuotesToIdentifierCSV(value)
                 else:
-                    strInputString = strInputString.replace("{" + parm.upper() + "}", value)
+                    dctParms[parm.upper()] = value
             else:
-                strInputString = strInputString.replace("{" + parm.upper() + "}", "")
+                dctParms[parm.upper()] = ""
             if parm == "column_name":
                 # Shows contents without double-quotes for display and aggregate expressions
-                strInputString = strInputString.replace("{COLUMN_NAME_NO_QUOTES}", value if value else "")
+                dctParms["COLUMN_NAME_NO_QUOTES"] = value if value else ""
                 # Concatenates column list into single expression for relative entropy
                 str_value = ConcatColumnList(value, "<NULL>")
-                strInputString = strInputString.replace("{CONCAT_COLUMNS}", str_value if str_value else "")
+                dctParms["CONCAT_COLUMNS"] = str_value if str_value else ""
             if parm == "match_groupby_names":
                 # Concatenates column list into single expression for relative entropy
                 str_value = ConcatColumnList(value, "<NULL>")
-                strInputString = strInputString.replace("{CONCAT_MATCH_GROUPBY}", str_value if str_value else "")
+                dctParms["CONCAT_MATCH_GROUPBY"] = str_value if str_value else ""
             if parm == "subset_condition":
-                strInputString = strInputString.replace("{SUBSET_DISPLAY}", value.replace("'", "''") if value else "")
+                dctParms["SUBSET_DISPLAY"] = value.replace("'", "''") if value else ""
+
+        dctParms.update({
+            "PROJECT_CODE": self.project_code,
+            "TEST_SUITE_ID": self.test_suite_id,
+            "TEST_SUITE": self.test_suite,
+            "SQL_FLAVOR": self.flavor,
+            "TEST_RUN_ID": self.test_run_id,
+            "INPUT_PARAMETERS": self._AssembleDisplayParameters(),
+            "RUN_DATE": self.run_date,
+            "EXCEPTION_MESSAGE": self.exception_message,
+            "START_TIME": self.today,
+            "PROCESS_ID": self.process_id,
+            "VARCHAR_TYPE": "STRING" if self.flavor == "databricks" else "VARCHAR",
+            "NOW": date_service.get_now_as_string_with_offset(self.minutes_offset),
+        })
+        if "schema_name" in self.dctTestParms:
+            # Also covers the parm within the CUSTOM_QUERY parm, rendered as a nested placeholder
+            dctParms["DATA_SCHEMA"] = self.dctTestParms["schema_name"]
+
+        strInputString = compile_template(strInputString).render(dctParms)
 
         if self.flavor != "databricks":
             # Adding escape character where ':' is referenced
@@ -156,8 +162,6 @@ class CTestExecutionSQL:
             raise ValueError(f"No query template assigned to test_type {strTestType}")
 
         strQ = self._GetTestQueryFromTemplate(strTemplate)
-        # Final replace to cover parm within CUSTOM_QUERY parm
-        strQ = strQ.replace("{DATA_SCHEMA}", self.dctTestParms["schema_name"])
 
         if booClean:
             strQ = CleanSQL(strQ)
@@ -2,6 +2,7 @@ import logging
 import typing
 
 from testgen.common import CleanSQL, date_service, get_template_files, read_template_sql_file
+from testgen.common.read_file import compile_template
 
 LOG = logging.getLogger("testgen")
 
@@ -30,21 +31,22 @@ class CDeriveTestsSQL:
         self.dctTestParms = {}
 
     def ReplaceParms(self, strInputString):
-        for parm, value in self.dctTestParms.items():
-            strInputString = strInputString.replace("{" + parm.upper() + "}", value)
-
-        strInputString = strInputString.replace("{PROJECT_CODE}", self.project_code)
-        strInputString = strInputString.replace("{SQL_FLAVOR}", self.sql_flavor)
-        strInputString = strInputString.replace("{CONNECTION_ID}", self.connection_id)
-        strInputString = strInputString.replace("{TABLE_GROUPS_ID}", self.table_groups_id)
-        strInputString = strInputString.replace("{RUN_DATE}", self.run_date)
-        strInputString = strInputString.replace("{TEST_SUITE}", self.test_suite)
-        strInputString = strInputString.replace("{TEST_SUITE_ID}", self.test_suite_id)
-        strInputString = strInputString.replace("{GENERATION_SET}", self.generation_set)
-        strInputString = strInputString.replace("{AS_OF_DATE}", self.as_of_date)
-        strInputString = strInputString.replace("{DATA_SCHEMA}", self.data_schema)
-
-        return strInputString
+        dctParms = {
+            "PROJECT_CODE": self.project_code,
+            "SQL_FLAVOR": self.sql_flavor,
+            "CONNECTION_ID": self.connection_id,
+            "TABLE_GROUPS_ID": self.table_groups_id,
+            "RUN_DATE": self.run_date,
+            "TEST_SUITE": self.test_suite,
+            "TEST_SUITE_ID": self.test_suite_id,
+            "GENERATION_SET": self.generation_set,
+            "AS_OF_DATE": self.as_of_date,
+            "DATA_SCHEMA": self.data_schema,
+        }
+        # Test parameters take precedence
+        dctParms.update({parm.upper(): value for parm, value in self.dctTestParms.items()})
+
+        return compile_template(strInputString).render(dctParms)
 
     def GetInsertTestSuiteSQL(self, booClean):
         strQuery = self.ReplaceParms(read_template_sql_file("gen_insert_test_suite.sql", "generation"))
@@ -3,7 +3,7 @@ import typing
 from testgen.commands.queries.refresh_data_chars_query import CRefreshDataCharsSQL
 from testgen.commands.queries.rollup_scores_query import CRollupScoresSQL
 from testgen.common import date_service, read_template_sql_file, read_template_yaml_file
-from testgen.common.read_file import replace_templated_functions
+from testgen.common.read_file import compile_template
 
 
 class CProfilingSQL:
@@ -96,38 +96,43 @@ class CProfilingSQL:
     
         return self._rollup_scores_sql
 
-    def ReplaceParms(self, strInputString):
-        strInputString = strInputString.replace("{PROJECT_CODE}", self.project_code)
-        strInputString = strInputString.replace("{CONNECTION_ID}", self.connection_id)
-        strInputString = strInputString.replace("{TABLE_GROUPS_ID}", self.table_groups_id)
-        strInputString = strInputString.replace("{RUN_DATE}", self.run_date)
-        strInputString = strInputString.replace("{DATA_SCHEMA}", self.data_schema)
-        strInputString = strInputString.replace("{DATA_TABLE}", self.data_table)
-        strInputString = strInputString.replace("{COL_NAME}", self.col_name)
-        strInputString = strInputString.replace("{COL_NAME_SANITIZED}", self.col_name.replace("'", "''"))
-        strInputString = strInputString.replace("{COL_GEN_TYPE}", self.col_gen_type)
-        strInputString = strInputString.replace("{COL_TYPE}", self.col_type)
-        strInputString = strInputString.replace("{COL_POS}", str(self.col_ordinal_position))
-        strInputString = strInputString.replace("{TOP_FREQ}", self.col_top_freq_update)
-        strInputString = strInputString.replace("{PROFILE_RUN_ID}", self.profile_run_id)
-        strInputString = strInputString.replace("{PROFILE_ID_COLUMN_MASK}", self.profile_id_column_mask)
-        strInputString = strInputString.replace("{PROFILE_SK_COLUMN_MASK}", self.profile_sk_column_mask)
-        strInputString = strInputString.replace("{START_TIME}", self.today)
-        strInputString = strInputString.replace("{NOW}", date_service.get_now_as_string())
-        strInputString = strInputString.replace("{EXCEPTION_MESSAGE}", self.exception_message)
-        strInputString = strInputString.replace("{SAMPLING_TABLE}", self.sampling_table)
-        strInputString = strInputString.replace("{SAMPLE_SIZE}", str(self.parm_sample_size))
-        strInputString = strInputString.replace("{PROFILE_USE_SAMPLING}", self.profile_use_sampling)
-        strInputString = strInputString.replace("{PROFILE_SAMPLE_PERCENT}", self.profile_sample_percent)
-        strInputString = strInputString.replace("{PROFILE_SAMPLE_MIN_COUNT}", str(self.profile_sample_min_count))
-        strInputString = strInputString.replace("{PROFILE_SAMPLE_RATIO}", str(self.sample_ratio))
-        strInputString = strInputString.replace("{PARM_MAX_PATTERN_LENGTH}", str(self.parm_max_pattern_length))
-        strInputString = strInputString.replace("{CONTINGENCY_COLUMNS}", self.contingency_columns)
-        strInputString = strInputString.replace("{CONTINGENCY_MAX_VALUES}", self.contingency_max_values)
-        strInputString = strInputString.replace("{PROCESS_ID}", str(self.process_id))
-        strInputString = replace_templated_functions(strInputString, self.flavor.lower())
-
-        return strInputString
+    def _get_params(self) -> dict:
+        return {
+            "PROJECT_CODE": self.project_code,
+            "CONNECTION_ID": self.connection_id,
+            "TABLE_GROUPS_ID": self.table_groups_id,
+            "RUN_DATE": self.run_date,
+            "DATA_SCHEMA": self.data_schema,
+            "DATA_TABLE": self.data_table,
+            "COL_NAME": self.col_name,
+            "COL_NAME_SANITIZED": self.col_name.replace("'", "''"),
+            "COL_GEN_TYPE": self.col_gen_type,
+            "COL_TYPE": self.col_type,
+            "COL_POS": self.col_ordinal_position,
+            "TOP_FREQ": self.col_top_freq_update,
+            "PROFILE_RUN_ID": self.profile_run_id,
+            "PROFILE_ID_COLUMN_MASK": self.profile_id_column_mask,
+            "PROFILE_SK_COLUMN_MASK": self.profile_sk_column_mask,
+            "START_TIME": self.today,
+            "NOW": date_service.get_now_as_string(),
+            "EXCEPTION_MESSAGE": self.exception_message,
+            "SAMPLING_TABLE": self.sampling_table,
+            "SAMPLE_SIZE": self.parm_sample_size,
+            "PROFILE_USE_SAMPLING": self.profile_use_sampling,
+            "PROFILE_SAMPLE_PERCENT": self.profile_sample_percent,
+            "PROFILE_SAMPLE_MIN_COUNT": self.profile_sample_min_count,
+            "PROFILE_SAMPLE_RATIO": self.sample_ratio,
+            "PARM_MAX_PATTERN_LENGTH": self.parm_max_pattern_length,
+            "CONTINGENCY_COLUMNS": self.contingency_columns,
+            "CONTINGENCY_MAX_VALUES": self.contingency_max_values,
+            "PROCESS_ID": self.process_id,
+        }
+
+    def ReplaceParms(self, strInputString, dctExtraParms=None):
+        dctParms = self._get_params()
+        if dctExtraParms:
+            dctParms = {**dctParms, **dctExtraParms}
+        return compile_template(strInputString).render(dctParms, self.flavor.lower())
 
     def GetSecondProfilingColumnsQuery(self):
         # Runs on DK Postgres Server
@@ -204,10 +209,14 @@ class CProfilingSQL:
                 strQ = read_template_sql_file("profile_anomalies_screen_variants.sql", sub_directory="profiling")
 
         if strQ:
-            strQ = strQ.replace("{ANOMALY_ID}", dct_test_type["id"])
-            strQ = strQ.replace("{DETAIL_EXPRESSION}", dct_test_type["detail_expression"])
-            strQ = strQ.replace("{ANOMALY_CRITERIA}", dct_test_type["anomaly_criteria"])
-            strQ = self.ReplaceParms(strQ)
+            strQ = self.ReplaceParms(
+                strQ,
+                {
+                    "ANOMALY_ID": dct_test_type["id"],
+                    "DETAIL_EXPRESSION": dct_test_type["detail_expression"],
+                    "ANOMALY_CRITERIA": dct_test_type["anomaly_criteria"],
+                },
+            )
 
         return strQ
 
@@ -215,10 +224,12 @@ class CProfilingSQL:
         # Runs on DK Postgres Server
         strQ = read_template_sql_file("profile_anomaly_scoring.sql", sub_directory="profiling")
         if strQ:
-            strQ = strQ.replace("{PROFILE_RUN_ID}", self.profile_run_id)
-            strQ = strQ.replace("{ANOMALY_ID}", dct_test_type["id"])
-            strQ = strQ.replace("{PREV_FORMULA}", dct_test_type["dq_score_prevalence_formula"])
-            strQ = strQ.replace("{RISK}", dct_test_type["dq_score_risk_factor"])
+            strQ = compile_template(strQ).render({
+                "PROFILE_RUN_ID": self.profile_run_id,
+                "ANOMALY_ID": dct_test_type["id"],
+                "PREV_FORMULA": dct_test_type["dq_score_prevalence_formula"],
+                "RISK": dct_test_type["dq_score_risk_factor"],
+            })
         return strQ
 
 
@@ -251,6 +262,10 @@ class CProfilingSQL:
         # Runs on Project DB
         return self._get_data_chars_sql().GetDDFQuery()
 
+    def GetDataCharsSQL(self) -> CRefreshDataCharsSQL:
+        # Generator of the table group's DDF queries, e.g. for the DDF cache
+        return self._get_data_chars_sql()
+
     def GetProfilingQuery(self):
         # Runs on Project DB
         if not self.dctSnippetTemplate:
@@ -1,4 +1,5 @@
 from testgen.common import read_template_sql_file
+from testgen.common.read_file import compile_template, has_template_file
 from testgen.utils import chunk_queries
 
 
@@ -30,13 +31,15 @@ class CRefreshDataCharsSQL:
         self.profiling_include_mask = params["profiling_include_mask"]
         self.profiling_exclude_mask = params["profiling_exclude_mask"]
 
-    def _replace_params(self, sql_query: str) -> str:
-        sql_query = sql_query.replace("{PROJECT_CODE}", self.project_code)
-        sql_query = sql_query.replace("{DATA_SCHEMA}", self.table_group_schema)
-        sql_query = sql_query.replace("{TABLE_GROUPS_ID}", self.table_group_id)
-        sql_query = sql_query.replace("{RUN_DATE}", self.run_date)
-        sql_query = sql_query.replace("{SOURCE_TABLE}", self.source_table)
-        return sql_query
+    def _replace_params(self, sql_query: str, extra_params: dict | None = None) -> str:
+        return compile_template(sql_query).render({
+            "PROJECT_CODE": self.project_code,
+            "DATA_SCHEMA": self.table_group_schema,
+            "TABLE_GROUPS_ID": self.table_group_id,
+            "RUN_DATE": self.run_date,
+            "SOURCE_TABLE": self.source_table,
+            **(extra_params or {}),
+        })
     
     def _get_mask_query(self, mask: str, is_include: bool) -> str:
         sub_query = ""
@@ -53,21 +56,50 @@ class CRefreshDataCharsSQL:
     
     def GetDDFQuery(self) -> str:
         # Runs on Project DB
-        sql_query = self._replace_params(
-            read_template_sql_file(
-                f"schema_ddf_query_{self.sql_flavor}.sql", sub_directory=f"flavors/{self.sql_flavor.lower()}/data_chars"
-            )
-        )
-
         table_criteria = ""
         if self.profiling_table_set:
             table_criteria += f" AND c.table_name IN ({self.profiling_table_set})"
         table_criteria += self._get_mask_query(self.profiling_include_mask, is_include=True)
         table_criteria += self._get_mask_query(self.profiling_exclude_mask, is_include=False)
-        sql_query = sql_query.replace("{TABLE_CRITERIA}", table_criteria)
 
-        return sql_query
+        return self._replace_params(
+            read_template_sql_file(
+                f"schema_ddf_query_{self.sql_flavor}.sql", sub_directory=f"flavors/{self.sql_flavor.lower()}/data_chars"
+            ),
+            {"TABLE_CRITERIA": table_criteria},
+        )
     
+    def GetDDFSignalQuery(self) -> str | None:
+        # Runs on Project DB. None for the flavors without a change signal, whose DDF is read on every run.
+        template_name = f"schema_ddf_signal_{self.sql_flavor}.sql"
+        sub_directory = f"flavors/{self.sql_flavor.lower()}/data_chars"
+        if not has_template_file(template_name, sub_directory):
+            return None
+        return self._replace_params(read_template_sql_file(template_name, sub_directory=sub_directory))
+
+    def GetDDFCacheQuery(self, ddf_query_hash: str, change_signal: str, max_age_hours: int) -> str:
+        # Runs on DK Postgres Server
+        sql_query = read_template_sql_file("ddf_cache_get.sql", sub_directory="data_chars")
+        return compile_template(sql_query).render({
+            "TABLE_GROUPS_ID": self.table_group_id,
+            "DDF_QUERY_HASH": ddf_query_hash,
+            "CHANGE_SIGNAL": change_signal,
+            "MAX_AGE_HOURS": max_age_hours,
+        })
+
+    def GetDDFCacheSaveQuery(
+        self, ddf_query_hash: str, change_signal: str, snapshot_id: str, max_age_hours: int
+    ) -> str:
+        # Runs on DK Postgres Server
+        sql_query = read_template_sql_file("ddf_cache_save_snapshot.sql", sub_directory="data_chars")
+        return compile_template(sql_query).render({
+            "TABLE_GROUPS_ID": self.table_group_id,
+            "DDF_QUERY_HASH": ddf_query_hash,
+            "CHANGE_SIGNAL": change_signal,
+            "SNAPSHOT_ID": snapshot_id,
+            "MAX_AGE_HOURS": max_age_hours,
+        })
+
     def GetRecordCountQueries(self, schema_tables: list[str]) -> list[str]:
         count_queries = [
             f"SELECT '{item}', COUNT(*) FROM {item}"
@@ -1,6 +1,7 @@
 import typing
 
 from testgen.common import CleanSQL, date_service, read_template_sql_file
+from testgen.common.read_file import compile_template
 
 
 class CTestParamValidationSQL:
@@ -24,21 +25,21 @@ class CTestParamValidationSQL:
         self.today = date_service.get_now_as_string()
 
     def _ReplaceParms(self, strInputString):
-        strInputString = strInputString.replace("{TEST_SUITE_ID}", self.test_suite_id)
-        strInputString = strInputString.replace("{RUN_DATE}", self.run_date)
-        strInputString = strInputString.replace("{TEST_RUN_ID}", self.test_run_id)
-        strInputString = strInputString.replace("{FLAG}", self.flag_val)
-        strInputString = strInputString.replace("{TEST_SCHEMAS}", self.test_schemas)
-        strInputString = strInputString.replace("{EXCEPTION_MESSAGE}", self.exception_message)
-        strInputString = strInputString.replace("{MESSAGE}", self.message)
-        strInputString = strInputString.replace("{CAT_TEST_IDS}", ", ".join(map(str, self.test_ids)))
-        strInputString = strInputString.replace("{START_TIME}", self.today)
-        strInputString = strInputString.replace("{NOW}", date_service.get_now_as_string())
-
-        for parm, value in self.dctTestParms.items():
-            strInputString = strInputString.replace("{" + parm.upper() + "}", value)
-
-        return strInputString
+        dctParms = {parm.upper(): value for parm, value in self.dctTestParms.items()}
+        dctParms.update({
+            "TEST_SUITE_ID": self.test_suite_id,
+            "RUN_DATE": self.run_date,
+            "TEST_RUN_ID": self.test_run_id,
+            "FLAG": self.flag_val,
+            "TEST_SCHEMAS": self.test_schemas,
+            "EXCEPTION_MESSAGE": self.exception_message,
+            "MESSAGE": self.message,
+            "CAT_TEST_IDS": ", ".join(map(str, self.test_ids)),
+            "START_TIME": self.today,
+            "NOW": date_service.get_now_as_string(),
+        })
+
+        return compile_template(strInputString).render(dctParms)
 
     def ClearTestParms(self):
         # Test Set Parameters
@@ -0,0 +1,93 @@
+import json
+import logging
+from dataclasses import dataclass, field
+
+from testgen.common import RetrieveDBResultsToDictList, RetrieveDBResultsToList, get_template_files, read_template_sql_file
+from testgen.common.credentials import get_tg_schema
+from testgen.common.database.database_service import replace_params
+
+LOG = logging.getLogger("testgen")
+
+# Sequential scans over fewer rows than this are cheaper than an index lookup and are not reported
+SEQ_SCAN_MIN_ROWS = 1000
+
+
+@dataclass
+class SeqScan:
+    relation: str
+    rows_scanned: int
+
+
+@dataclass
+class QueryPlanReport:
+    query_name: str
+    execution_ms: float | None = None
+    planning_ms: float | None = None
+    shared_hit_blocks: int = 0
+    shared_read_blocks: int = 0
+    seq_scans: list[SeqScan] = field(default_factory=list)
+    error: str | None = None
+
+
+def _get_sample_parameters(schema: str) -> dict:
+    query = replace_params(read_template_sql_file("get_sample_parameters.sql", "analyze_metadata"), {"SCHEMA_NAME": schema})
+    rows = RetrieveDBResultsToDictList("DKTG", query)
+    params = {key.upper(): value for key, value in rows[0].items()} if rows else {}
+    return {"SCHEMA_NAME": schema, **params}
+
+
+def _collect_seq_scans(plan: dict, seq_scans: list[SeqScan]) -> None:
+    if plan.get("Node Type") == "Seq Scan":
+        loops = plan.get("Actual Loops", 1) or 1
+        rows_scanned = (plan.get("Actual Rows", 0) + plan.get("Rows Removed by Filter", 0)) * loops
+        if rows_scanned >= SEQ_SCAN_MIN_ROWS:
+            seq_scans.append(SeqScan(plan.get("Relation Name", "?"), int(rows_scanned)))
+    for child in plan.get("Plans", []):
+        _collect_seq_scans(child, seq_scans)
+
+
+def _explain(query_name: str, query: str) -> QueryPlanReport:
+    report = QueryPlanReport(query_name)
+    try:
+        rows, _ = RetrieveDBResultsToList("DKTG", f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.rstrip().rstrip(';')}")
+    except Exception as e:
+        LOG.warning("EXPLAIN failed for %s", query_name, exc_info=True)
+        report.error = str(e).splitlines()[0]
+        return report
+
+    explain_output = rows[0][0]
+    if isinstance(explain_output, str):
+        explain_output = json.loads(explain_output)
+    result = explain_output[0]
+    plan = result["Plan"]
+
+    report.execution_ms = result.get("Execution Time")
+    report.planning_ms = result.get("Planning Time")
+    report.shared_hit_blocks = plan.get("Shared Hit Blocks", 0)
+    report.shared_read_blocks = plan.get("Shared Read Blocks", 0)
+    _collect_seq_scans(plan, report.seq_scans)
+    return report
+
+
+def run_analyze_metadata_db() -> list[QueryPlanReport]:
+    """
+    Runs EXPLAIN (ANALYZE, BUFFERS) on the catalogue of hot metadata queries in template/analyze_metadata/hot_queries,
+    using the latest runs as representative parameters.
+
+    Queries whose parameters can't be resolved (e.g. no test run exists yet) are reported as skipped.
+    """
+    params_mapping = _get_sample_parameters(get_tg_schema())
+
+    reports = []
+    for query_file in sorted(get_template_files(r"^.*sql$", "analyze_metadata/hot_queries"), key=lambda file: file.name):
+        query_name = query_file.name.removesuffix(".sql")
+        query = query_file.read_text(encoding="utf-8")
+        missing_params = [key for key, value in params_mapping.items() if value is None and f"{{{key}}}" in query]
+        if missing_params:
+            reports.append(QueryPlanReport(query_name, error=f"Skipped, no sample value for {', '.join(missing_params)}"))
+            continue
+
+        LOG.info("CurrentStep: Analyzing %s", query_name)
+        reports.append(_explain(query_name, replace_params(query, params_mapping)))
+
+    return reports
@@ -0,0 +1,250 @@
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from testgen import settings
+from testgen.commands.run_execute_tests import run_execution_steps
+from testgen.commands.run_generate_tests import run_test_gen_queries
+from testgen.commands.run_profiling_bridge import run_profiling_queries
+from testgen.commands.run_refresh_score_cards_results import run_refresh_score_cards_results
+from testgen.common import RetrieveSingleResultValue, RunActionQueryList, read_template_sql_file
+from testgen.common.credentials import get_tg_schema
+from testgen.common.database.database_service import AssignConnectParms, replace_params
+from testgen.common.encrypt import EncryptText
+
+LOG = logging.getLogger("testgen")
+
+BENCHMARK_CONNECTION = "benchmark"
+BENCHMARK_TABLE_GROUP = "benchmark"
+BENCHMARK_TEST_SUITE = "benchmark"
+
+# Kinds of synthetic columns, cycled through to reach the requested width
+_COLUMN_EXPRESSIONS = (
+    ("code", "'C' || ((g * {SEED}) % {CARDINALITY})::VARCHAR"),
+    ("amount", "ROUND((((g * {SEED}) % 100000) / 100.0)::NUMERIC, 2)"),
+    ("event", "DATE '2024-01-01' + ((g * {SEED}) % 730)::INTEGER"),
+    ("label", "MD5(((g * {SEED}) % ({CARDINALITY} * 100))::VARCHAR)"),
+    ("flag", "CASE WHEN (g * {SEED}) % 10 = 0 THEN NULL ELSE 'Y' END"),
+    ("qty", "((g * {SEED}) % {CARDINALITY})::INTEGER"),
+)
+# Small primes, so that columns of the same kind don't hold identical values
+_SEEDS = (7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47)
+
+
+@dataclass
+class BenchmarkParameters:
+    tables: int = 1
+    columns: int = 20
+    rows: int = 100000
+    cardinality: int = 10
+    schema: str = "tg_benchmark"
+
+
+@dataclass
+class StepMetrics:
+    seconds: float = 0
+    queries: int = 0
+    rows: int = 0
+    metadata_growth_bytes: int = 0
+
+
+@dataclass
+class BenchmarkResult:
+    parameters: BenchmarkParameters
+    steps: dict[str, StepMetrics] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BenchmarkResult":
+        return cls(
+            parameters=BenchmarkParameters(**data["parameters"]),
+            steps={name: StepMetrics(**metrics) for name, metrics in data["steps"].items()},
+        )
+
+
+@dataclass
+class StepComparison:
+    step: str
+    seconds: float
+    baseline_seconds: float | None
+
+    @property
+    def change_pct(self) -> float | None:
+        if not self.baseline_seconds:
+            return None
+        return (self.seconds - self.baseline_seconds) / self.baseline_seconds * 100
+
+
+class _QueryCounter:
+    """
+    Counts the statements executed, and the rows they return or change, on every SQLAlchemy engine.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.rows = 0
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):  # noqa: ARG002
+        with self._lock:
+            self.queries += 1
+            # rowcount is -1 when the driver doesn't know it
+            self.rows += max(cursor.rowcount or 0, 0)
+
+    def __enter__(self):
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(Engine, "after_cursor_execute", self._after_cursor_execute)
+
+
+def _get_params_mapping(parameters: BenchmarkParameters) -> dict:
+    return {
+        "SCHEMA_NAME": get_tg_schema(),
+        "PROJECT_CODE": settings.PROJECT_KEY,
+        "BENCHMARK_SCHEMA": parameters.schema,
+        "TABLE_GROUPS_NAME": BENCHMARK_TABLE_GROUP,
+        # The benchmark data is created in the project database, so the table group must use a connection to it
+        "CONNECTION_NAME": BENCHMARK_CONNECTION,
+        "SQL_FLAVOR": settings.PROJECT_SQL_FLAVOR,
+        "PROJECT_HOST": settings.PROJECT_DATABASE_HOST,
+        "PROJECT_PORT": settings.PROJECT_DATABASE_PORT,
+        "PROJECT_DB": settings.PROJECT_DATABASE_NAME,
+        "PROJECT_USER": settings.PROJECT_DATABASE_USER,
+        "PROJECT_PW_ENCRYPTED": EncryptText(settings.PROJECT_DATABASE_PASSWORD),
+        "MAX_THREADS": settings.PROJECT_CONNECTION_MAX_THREADS,
+        "MAX_QUERY_CHARS": settings.PROJECT_CONNECTION_MAX_QUERY_CHAR,
+        "ROW_COUNT": parameters.rows,
+        "CARDINALITY": parameters.cardinality,
+    }
+
+
+def _get_column_expressions(column_count: int, cardinality: int) -> str:
+    expressions = []
+    for position in range(column_count):
+        kind, expression = _COLUMN_EXPRESSIONS[position % len(_COLUMN_EXPRESSIONS)]
+        seed = _SEEDS[position % len(_SEEDS)]
+        expression = replace_params(expression, {"SEED": seed, "CARDINALITY": cardinality})
+        expressions.append(f"{expression} AS {kind}_{position + 1:03d}")
+    return ",\n       ".join(expressions)
+
+
+def _create_benchmark_data(parameters: BenchmarkParameters, params_mapping: dict) -> None:
+    AssignConnectParms(
+        settings.PROJECT_KEY,
+        None,
+        settings.PROJECT_DATABASE_HOST,
+        settings.PROJECT_DATABASE_PORT,
+        settings.PROJECT_DATABASE_NAME,
+        parameters.schema,
+        settings.DATABASE_ADMIN_USER,
+        settings.PROJECT_SQL_FLAVOR,
+        None,
+        None,
+        False,
+        None,
+        None,
+        None,
+        "PROJECT",
+    )
+
+    template = read_template_sql_file("create_benchmark_table.sql", "benchmark")
+    column_expressions = _get_column_expressions(parameters.columns, parameters.cardinality)
+    queries = [
+        replace_params(
+            template,
+            {**params_mapping, "TABLE_NAME": f"bench_{table:03d}", "COLUMN_EXPRESSIONS": column_expressions},
+        )
+        for table in range(1, parameters.tables + 1)
+    ]
+    RunActionQueryList(
+        "PROJECT",
+        queries,
+        user_override=settings.DATABASE_ADMIN_USER,
+        pwd_override=settings.DATABASE_ADMIN_PASSWORD,
+    )
+
+
+def _get_metadata_db_size(params_mapping: dict) -> int:
+    query = replace_params(read_template_sql_file("get_metadata_db_size.sql", "benchmark"), params_mapping)
+    return RetrieveSingleResultValue("DKTG", query) or 0
+
+
+def _measure_step(name: str, step: Callable[[], object], params_mapping: dict) -> StepMetrics:
+    LOG.info("CurrentStep: Benchmarking %s", name)
+    size_before = _get_metadata_db_size(params_mapping)
+    with _QueryCounter() as counter:
+        start_time = time.perf_counter()
+        step()
+        seconds = time.perf_counter() - start_time
+    return StepMetrics(
+        seconds=round(seconds, 3),
+        queries=counter.queries,
+        rows=counter.rows,
+        metadata_growth_bytes=_get_metadata_db_size(params_mapping) - size_before,
+    )
+
+
+def run_benchmark(parameters: BenchmarkParameters) -> BenchmarkResult:
+    """
+    Generates a synthetic schema in the target database and times profiling, test generation, test execution and the
+    scorecard refresh against it, end to end.
+
+    Each step records its wall time, the statements executed on any database, the rows they returned or changed, and
+    the growth of the TestGen system database.
+    """
+    params_mapping = _get_params_mapping(parameters)
+    result = BenchmarkResult(parameters)
+
+    LOG.info("CurrentStep: Creating %s benchmark tables in %s", parameters.tables, parameters.schema)
+    _create_benchmark_data(parameters, params_mapping)
+
+    connection_query = replace_params(
+        read_template_sql_file("get_or_create_connection.sql", "benchmark"), params_mapping
+    )
+    connection_id = RunActionQueryList("DKTG", [connection_query])[0]
+    # The existing benchmark table group is moved to the connection and schema of this run
+    table_group_query = replace_params(
+        read_template_sql_file("get_or_create_table_group.sql", "benchmark"),
+        {**params_mapping, "CONNECTION_ID": connection_id},
+    )
+    table_group_id = RunActionQueryList("DKTG", [table_group_query])[0]
+
+    steps = {
+        "profiling": lambda: run_profiling_queries(table_group_id),
+        "test_generation": lambda: run_test_gen_queries(table_group_id, BENCHMARK_TEST_SUITE),
+        "test_execution": lambda: run_execution_steps(settings.PROJECT_KEY, BENCHMARK_TEST_SUITE),
+        "score_refresh": lambda: run_refresh_score_cards_results(project_code=settings.PROJECT_KEY),
+    }
+    for name, step in steps.items():
+        result.steps[name] = _measure_step(name, step, params_mapping)
+
+    return result
+
+
+def load_benchmark_result(path: str | Path) -> BenchmarkResult:
+    return BenchmarkResult.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def save_benchmark_result(result: BenchmarkResult, path: str | Path) -> None:
+    Path(path).write_text(json.dumps(result.to_dict(), indent=2), encoding="utf-8")
+
+
+def compare_to_baseline(result: BenchmarkResult, baseline: BenchmarkResult) -> list[StepComparison]:
+    if result.parameters != baseline.parameters:
+        LOG.warning("Benchmark parameters differ from the baseline: %s", baseline.parameters)
+    return [
+        StepComparison(name, metrics.seconds, baseline_metrics.seconds if baseline_metrics else None)
+        for name, metrics in result.steps.items()
+        for baseline_metrics in [baseline.steps.get(name)]
+    ]
@@ -3,12 +3,14 @@ import logging
 from testgen.commands.queries.execute_cat_tests_query import CCATExecutionSQL
 from testgen.commands.run_refresh_score_cards_results import run_refresh_score_cards_results
 from testgen.common import (
+    BatchedDBWriter,
     RetrieveDBResultsToDictList,
+    RetrieveTableCosts,
     RunActionQueryList,
     RunThreadedRetrievalQueryList,
-    WriteListToDB,
     date_service,
 )
+from testgen.common.database.database_service import get_run_cancelled_message, raise_if_run_cancelled
 
 LOG = logging.getLogger("testgen")
 
@@ -61,6 +63,7 @@ def ParseCATResults(clsCATExecute):
 
 
 def FinalizeTestRun(clsCATExecute: CCATExecutionSQL):
+    clsCATExecute.exception_message = get_run_cancelled_message(clsCATExecute.exception_message)
     lstQueries = [clsCATExecute.FinalizeTestResultsSQL(),
                   clsCATExecute.PushTestRunStatusUpdateSQL(),
                   clsCATExecute.FinalizeTestSuiteUpdateSQL(),
@@ -94,9 +97,8 @@ def run_cat_test_queries(
     if spinner:
         spinner.next()
 
-    lstAllResults = []
-
     try:
+        raise_if_run_cancelled()
         # Retrieve distinct target tables from metadata
         LOG.info("CurrentStep: Retrieving Target Tables")
         lstTables = RetrieveTargetTables(clsCATExecute)
@@ -115,14 +117,19 @@ def run_cat_test_queries(
             lstCATQueries = PrepCATQueries(clsCATExecute, lstCATParms)
             if lstCATQueries:
                 LOG.info("CurrentStep: Performing CAT Tests")
-                lstAllResults, lstResultColumnNames, intErrors = RunThreadedRetrievalQueryList(
-                    "PROJECT", lstCATQueries, dctParms["max_threads"], spinner
-                )
-
-                if lstAllResults:
+                dctTableCosts = RetrieveTableCosts(dctParms["table_groups_id"])
+                lstCATCosts = [
+                    dctTableCosts.get((dctCATQuery["schema_name"], dctCATQuery["table_name"]), 0)
+                    for dctCATQuery in lstCATParms
+                ]
+                # Write aggregate result records to aggregate result table at dk db, as the queries finish
+                with BatchedDBWriter("working_agg_cat_results") as clsResultWriter:
+                    _, _, intErrors = RunThreadedRetrievalQueryList(
+                        "PROJECT", lstCATQueries, dctParms["max_threads"], spinner, lstCATCosts, clsWriter=clsResultWriter
+                    )
                     LOG.info("CurrentStep: Saving CAT Results")
-                    # Write aggregate result records to aggregate result table at dk db
-                    WriteListToDB("DKTG", lstAllResults, lstResultColumnNames, "working_agg_cat_results")
+
+                if clsResultWriter.row_count:
                     LOG.info("CurrentStep: Parsing CAT Results")
                     ParseCATResults(clsCATExecute)
                     LOG.info("Test results successfully parsed.")
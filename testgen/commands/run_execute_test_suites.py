@@ -0,0 +1,370 @@
+import logging
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+
+from progress.spinner import Spinner
+
+import testgen.common.process_service as process_service
+from testgen.commands.queries.execute_cat_tests_query import CCATExecutionSQL
+from testgen.commands.queries.execute_tests_query import CTestExecutionSQL
+from testgen.common import (
+    AssignConnectParms,
+    BatchedDBWriter,
+    RetrieveDBResultsToDictList,
+    RetrieveTableCosts,
+    RetrieveTestExecParms,
+    RunActionQueryList,
+    RunThreadedRetrievalQueryList,
+    date_service,
+    read_template_sql_file,
+)
+from testgen.common.database.database_service import is_run_cancelled, raise_if_run_cancelled
+from testgen.common.run_telemetry import RunTelemetry
+
+from .run_execute_cat_tests import (
+    AggregateTableTests,
+    FinalizeTestRun,
+    ParseCATResults,
+    RetrieveTargetTables,
+    RetrieveTestParms,
+)
+from .run_execute_tests import PrepNonCATQueries
+from .run_refresh_data_chars import run_refresh_data_chars_queries
+from .run_result_retention import ensure_result_partitions
+from .run_step_metrics import save_run_step_metrics
+from .run_test_parameter_validation import run_parameter_validation_queries
+
+LOG = logging.getLogger("testgen")
+
+CAT_RESULT_COLUMNS = ["test_run_id", "schema_name", "table_name", "cat_sequence", "measure_results", "test_results"]
+
+
+@dataclass
+class SuiteRun:
+    test_suite: str
+    params: dict
+    test_run_id: str
+    execute_sql: CTestExecutionSQL | None = None
+    cat_sql: CCATExecutionSQL | None = None
+    has_errors: bool = False
+    error_msg: str = ""
+    finalized: bool = False
+
+
+def RetrieveTableGroupTestSuites(strProjectCode, strTableGroupsID) -> list[str]:
+    strSQL = read_template_sql_file("parms_table_group_test_suites.sql", "parms")
+    strSQL = strSQL.replace("{PROJECT_CODE}", strProjectCode)
+    strSQL = strSQL.replace("{TABLE_GROUPS_ID}", str(uuid.UUID(strTableGroupsID)))
+    return [row["test_suite"] for row in RetrieveDBResultsToDictList("DKTG", strSQL)]
+
+
+def PackCATParms(lstCATParms, max_query_chars) -> list[list[dict]]:
+    # Groups the aggregate test records of all the runs by table, and packs those of a table into as few queries as
+    # fit in max_query_chars, so that each query scans its table once for several runs
+    dctByTable = defaultdict(list)
+    for dctCATParms in lstCATParms:
+        dctByTable[(dctCATParms["schema_name"], dctCATParms["table_name"])].append(dctCATParms)
+
+    intMaxChars = int(max_query_chars) if max_query_chars else 0
+    lstBatches = []
+    for lstTableParms in dctByTable.values():
+        lstBatch = []
+        intBatchChars = 0
+        for dctCATParms in lstTableParms:
+            intChars = len(dctCATParms["test_measures"]) + len(dctCATParms["test_conditions"])
+            if lstBatch and intMaxChars and intBatchChars + intChars > intMaxChars:
+                lstBatches.append(lstBatch)
+                lstBatch = []
+                intBatchChars = 0
+            lstBatch.append(dctCATParms)
+            intBatchChars += intChars
+        if lstBatch:
+            lstBatches.append(lstBatch)
+    return lstBatches
+
+
+class CombinedCATResultWriter:
+    """
+    Splits each result row of a combined CAT query back into the aggregate result records of its runs, and passes
+    them on to the writer of working_agg_cat_results.
+    """
+
+    def __init__(self, lstBatches: list[list[dict]], clsWriter: BatchedDBWriter):
+        self.lstBatches = lstBatches
+        self.clsWriter = clsWriter
+
+    def add(self, lstRows, lstColumns) -> None:  # noqa: ARG002
+        lstSplitRows = []
+        for row in lstRows:
+            for i, dctCATParms in enumerate(self.lstBatches[int(row[0])]):
+                lstSplitRows.append([
+                    dctCATParms["run"].test_run_id,
+                    dctCATParms["schema_name"],
+                    dctCATParms["table_name"],
+                    dctCATParms["cat_sequence"],
+                    row[1 + 2 * i],
+                    row[2 + 2 * i],
+                ])
+        self.clsWriter.add(lstSplitRows, CAT_RESULT_COLUMNS)
+
+
+def _start_suite_runs(lstRuns: list[SuiteRun], strTestTime, strProjectCode, minutes_offset):
+    for run in lstRuns:
+        run.execute_sql = CTestExecutionSQL(
+            strProjectCode, run.params["sql_flavor"], run.params["test_suite_id"], run.test_suite, minutes_offset
+        )
+        run.execute_sql.run_date = strTestTime
+        run.execute_sql.test_run_id = run.test_run_id
+        run.execute_sql.process_id = process_service.get_current_process_id()
+        RunActionQueryList("DKTG", [run.execute_sql.AddTestRecordtoTestRunTable()])
+
+        run.cat_sql = CCATExecutionSQL(
+            strProjectCode,
+            run.params["test_suite_id"],
+            run.test_suite,
+            run.params["sql_flavor"],
+            run.params["max_query_chars"],
+            minutes_offset,
+        )
+        run.cat_sql.test_run_id = run.test_run_id
+        run.cat_sql.run_date = strTestTime
+        run.cat_sql.table_groups_id = run.params["table_groups_id"]
+
+
+def _run_non_cat_tests(lstRuns: list[SuiteRun], dctTableCosts, intMaxThreads, spinner=None):
+    # The non-CAT tests of all the runs share one pool of threads, so that the budget of the connection holds for the
+    # batch, and the most costly tests start first whichever suite they belong to
+    LOG.info("CurrentStep: Preparing Non-CAT Tests")
+    lstTestQueries = []
+    lstTestCosts = []
+    lstQueryRuns = []
+    for run in lstRuns:
+        lstTestSet = RetrieveDBResultsToDictList("DKTG", run.execute_sql.GetTestsNonCAT(False))
+        lstQueries, lstCosts = PrepNonCATQueries(run.execute_sql, lstTestSet, dctTableCosts, spinner)
+        lstTestQueries.extend(lstQueries)
+        lstTestCosts.extend(lstCosts)
+        lstQueryRuns.extend([run] * len(lstQueries))
+
+    if not lstTestQueries:
+        LOG.info("No tests found")
+        return
+
+    LOG.info("CurrentStep: Executing Non-CAT Test Queries")
+    dctErrors = {}
+    with BatchedDBWriter("test_results") as clsResultWriter:
+        RunThreadedRetrievalQueryList(
+            "PROJECT", lstTestQueries, intMaxThreads, spinner, lstTestCosts, dctErrors, clsResultWriter
+        )
+        LOG.info("CurrentStep: Saving Non-CAT Test Results")
+
+    dctRunErrors = defaultdict(int)
+    for i in dctErrors:
+        dctRunErrors[lstQueryRuns[i].test_run_id] += 1
+    for run in lstRuns:
+        if intErrors := dctRunErrors.get(run.test_run_id):
+            run.has_errors = True
+            run.error_msg = (
+                f"Errors were encountered executing Referential Tests. ({intErrors} errors occurred.) "
+                "Please check log. "
+            )
+            LOG.warning(f"Test suite {run.test_suite}: {run.error_msg}")
+
+
+def _run_cat_tests(lstRuns: list[SuiteRun], dctTableCosts, intMaxThreads, spinner=None):
+    LOG.info("CurrentStep: Aggregating CAT Tests per Table")
+    lstCATParms = []
+    for run in lstRuns:
+        run.cat_sql.exception_message += run.error_msg
+        for dctTable in RetrieveTargetTables(run.cat_sql):
+            run.cat_sql.target_schema = dctTable["schema_name"]
+            run.cat_sql.target_table = dctTable["table_name"]
+            AggregateTableTests(run.cat_sql)
+        lstCATParms.extend({**dctCATParms, "run": run} for dctCATParms in RetrieveTestParms(run.cat_sql))
+
+    if not lstCATParms:
+        LOG.info("No valid tests were available to perform")
+        return
+
+    LOG.info("CurrentStep: Preparing CAT Queries")
+    clsCATExecute = lstRuns[0].cat_sql
+    lstBatches = PackCATParms(lstCATParms, lstRuns[0].params["max_query_chars"])
+    lstCATQueries = []
+    for intBatch, lstBatch in enumerate(lstBatches):
+        clsCATExecute.target_schema = lstBatch[0]["schema_name"]
+        clsCATExecute.target_table = lstBatch[0]["table_name"]
+        lstCATQueries.append(clsCATExecute.PrepCombinedCATQuerySQL(intBatch, lstBatch))
+    lstCATCosts = [
+        dctTableCosts.get((lstBatch[0]["schema_name"], lstBatch[0]["table_name"]), 0) for lstBatch in lstBatches
+    ]
+    LOG.info("CAT queries: %s, combined from %s aggregate test records", len(lstCATQueries), len(lstCATParms))
+
+    LOG.info("CurrentStep: Performing CAT Tests")
+    dctErrors = {}
+    with BatchedDBWriter("working_agg_cat_results") as clsResultWriter:
+        RunThreadedRetrievalQueryList(
+            "PROJECT",
+            lstCATQueries,
+            intMaxThreads,
+            spinner,
+            lstCATCosts,
+            dctErrors,
+            CombinedCATResultWriter(lstBatches, clsResultWriter),
+        )
+        LOG.info("CurrentStep: Saving CAT Results")
+
+    dctRunErrors = defaultdict(int)
+    for i in dctErrors:
+        for run_id in {dctCATParms["run"].test_run_id for dctCATParms in lstBatches[i]}:
+            dctRunErrors[run_id] += 1
+
+    LOG.info("CurrentStep: Parsing CAT Results")
+    for run in lstRuns:
+        ParseCATResults(run.cat_sql)
+        if intErrors := dctRunErrors.get(run.test_run_id):
+            run.has_errors = True
+            cat_error_msg = (
+                f"Errors were encountered executing aggregate tests. ({intErrors} errors occurred.) Please check log."
+            )
+            LOG.warning(f"Test suite {run.test_suite}: {cat_error_msg}")
+            run.cat_sql.exception_message += cat_error_msg
+
+
+def _finalize_suite_runs(lstRuns: list[SuiteRun], exception: Exception | None = None):
+    for run in lstRuns:
+        # Runs that weren't started have no test run record to update
+        if run.finalized or run.cat_sql is None:
+            continue
+        if exception is not None:
+            run.has_errors = True
+            sqlsplit = str(exception.args[0]).split("[SQL", 1) if exception.args else []
+            errorline = sqlsplit[0].replace("'", "''") if len(sqlsplit) > 0 else "unknown error"
+            run.cat_sql.exception_message += f"{type(exception).__name__}: {errorline}"
+        LOG.info(f"Finalizing test run of suite {run.test_suite}")
+        try:
+            FinalizeTestRun(run.cat_sql)
+            run.finalized = True
+        except Exception:
+            LOG.exception(f"Failed to finalize the test run of suite {run.test_suite}")
+
+
+def run_table_group_suites(
+    lstRuns: list[SuiteRun], strTestTime, strProjectCode, minutes_offset=0, spinner: Spinner = None
+):
+    # Runs suites of the same table group: data characteristics are refreshed once, the target columns are read once
+    # for validation, and the tests of all the suites run together
+    dctParms = lstRuns[0].params
+
+    LOG.info("CurrentStep: Assigning Connection Parms")
+    AssignConnectParms(
+        dctParms["project_code"],
+        dctParms["connection_id"],
+        dctParms["project_host"],
+        dctParms["project_port"],
+        dctParms["project_db"],
+        dctParms["table_group_schema"],
+        dctParms["project_user"],
+        dctParms["sql_flavor"],
+        dctParms["url"],
+        dctParms["connect_by_url"],
+        dctParms["connect_by_key"],
+        dctParms["private_key"],
+        dctParms["private_key_passphrase"],
+        dctParms["http_path"],
+        "PROJECT",
+    )
+
+    telemetry = RunTelemetry("test_batch", str(uuid.uuid4()))
+    telemetry.start()
+    try:
+        telemetry.start_step("Execute Step - Data Characteristics Refresh")
+        try:
+            run_refresh_data_chars_queries(dctParms, strTestTime, spinner)
+        except Exception:
+            LOG.warning("Data Characteristics Refresh failed", exc_info=True, stack_info=True)
+
+        raise_if_run_cancelled()
+        telemetry.start_step("Execute Step - Test Validation")
+        dctProjectColumns = {}
+        for run in lstRuns:
+            run_parameter_validation_queries(
+                run.params, run.test_run_id, strTestTime, run.test_suite, dctProjectColumns
+            )
+
+        _start_suite_runs(lstRuns, strTestTime, strProjectCode, minutes_offset)
+        dctTableCosts = RetrieveTableCosts(dctParms["table_groups_id"])
+
+        raise_if_run_cancelled()
+        telemetry.start_step("Execute Step - Test Execution")
+        _run_non_cat_tests(lstRuns, dctTableCosts, dctParms["max_threads"], spinner)
+
+        raise_if_run_cancelled()
+        telemetry.start_step("Execute Step - CAT Test Execution")
+        _run_cat_tests(lstRuns, dctTableCosts, dctParms["max_threads"], spinner)
+    except Exception as e:
+        telemetry.record_error(f"{type(e).__name__}: {e}")
+        _finalize_suite_runs(lstRuns, e)
+        raise
+    else:
+        _finalize_suite_runs(lstRuns)
+    finally:
+        telemetry.finish()
+        save_run_step_metrics(telemetry)
+
+
+def run_multi_suite_execution(
+    project_code: str,
+    test_suites: list[str] | None = None,
+    table_group_id: str | None = None,
+    minutes_offset: int = 0,
+    spinner: Spinner = None,
+) -> dict[str, str]:
+    """
+    Executes several test suites in one coordinated run: the given suites, and those of the given table group.
+
+    Each suite gets its own test run, as with run_execution_steps. The suites are run by table group: each group's data
+    characteristics are refreshed once, and the tests of its suites share the connection's thread budget, with the
+    aggregate (CAT) tests of all its suites against a table combined into single scans.
+
+    Returns a message for each suite, by name.
+    """
+    lstSuites = list(dict.fromkeys(test_suites or []))
+    if table_group_id:
+        lstSuites.extend(
+            suite for suite in RetrieveTableGroupTestSuites(project_code, table_group_id) if suite not in lstSuites
+        )
+    if not lstSuites:
+        raise ValueError("No test suites to execute")
+
+    test_time = date_service.get_now_as_string_with_offset(minutes_offset)
+
+    LOG.info("CurrentStep: Retrieving TestExec Parameters")
+    dctGroupRuns: dict[str, list[SuiteRun]] = defaultdict(list)
+    for test_suite in lstSuites:
+        params = RetrieveTestExecParms(project_code, test_suite)
+        dctGroupRuns[params["table_groups_id"]].append(SuiteRun(test_suite, params, str(uuid.uuid4())))
+
+    try:
+        ensure_result_partitions()
+    except Exception:
+        LOG.warning("Result partitions could not be created", exc_info=True, stack_info=True)
+
+    dctMessages = {}
+    for strTableGroupsID, lstRuns in dctGroupRuns.items():
+        if is_run_cancelled():
+            for run in lstRuns:
+                dctMessages[run.test_suite] = "Test Execution cancelled before it started."
+            continue
+        LOG.info(f"CurrentStep: Executing {len(lstRuns)} test suites of table group {strTableGroupsID}")
+        try:
+            run_table_group_suites(lstRuns, test_time, project_code, minutes_offset, spinner)
+        except Exception as e:
+            LOG.exception(f"Test execution failed for table group {strTableGroupsID}")
+            for run in lstRuns:
+                dctMessages[run.test_suite] = f"Test Execution failed: {type(e).__name__}: {e}"
+            continue
+
+        for run in lstRuns:
+            error_status = "with errors. Check log for details." if run.has_errors else "successfully."
+            dctMessages[run.test_suite] = f"Test Execution completed {error_status}"
+    return dctMessages
@@ -10,22 +10,41 @@ from testgen import settings
 from testgen.commands.queries.execute_tests_query import CTestExecutionSQL
 from testgen.common import (
     AssignConnectParms,
+    BatchedDBWriter,
     RetrieveDBResultsToDictList,
+    RetrieveTableCosts,
     RetrieveTestExecParms,
     RunActionQueryList,
     RunThreadedRetrievalQueryList,
-    WriteListToDB,
     date_service,
 )
-from testgen.common.database.database_service import empty_cache
+from testgen.common.database.database_service import empty_cache, raise_if_run_cancelled
+from testgen.common.run_telemetry import RunTelemetry
 
 from .run_execute_cat_tests import run_cat_test_queries
 from .run_refresh_data_chars import run_refresh_data_chars_queries
+from .run_result_retention import ensure_result_partitions
+from .run_step_metrics import save_run_step_metrics
 from .run_test_parameter_validation import run_parameter_validation_queries
 
 LOG = logging.getLogger("testgen")
 
 
+def PrepNonCATQueries(clsExecute, lstTestSet, dctTableCosts, spinner=None):
+    # Prepares the query of each non-CAT test, with the estimated cost of its table
+    lstTestQueries = []
+    lstTestCosts = []
+    for dctTest in lstTestSet:
+        # Set Test Parms
+        clsExecute.ClearTestParms()
+        clsExecute.dctTestParms = dctTest
+        lstTestQueries.append(clsExecute.GetTestQuery(False))
+        lstTestCosts.append(dctTableCosts.get((dctTest["schema_name"], dctTest["table_name"]), 0))
+        if spinner:
+            spinner.next()
+    return lstTestQueries, lstTestCosts
+
+
 def run_test_queries(dctParms, strTestRunID, strTestTime, strProjectCode, strTestSuite, minutes_offset=0, spinner=None):
     booErrors = False
     error_msg = ""
@@ -54,25 +73,17 @@ def run_test_queries(dctParms, strTestRunID, strTestTime, strProjectCode, strTes
 
         if lstTestSet:
             LOG.info("CurrentStep: Preparing Non-CAT Tests")
-            lstTestQueries = []
-            for dctTest in lstTestSet:
-                # Set Test Parms
-                clsExecute.ClearTestParms()
-                clsExecute.dctTestParms = dctTest
-                lstTestQueries.append(clsExecute.GetTestQuery(booClean))
-                if spinner:
-                    spinner.next()
+            dctTableCosts = RetrieveTableCosts(dctParms["table_groups_id"])
+            lstTestQueries, lstTestCosts = PrepNonCATQueries(clsExecute, lstTestSet, dctTableCosts, spinner)
 
             # Execute list, returning test results
             LOG.info("CurrentStep: Executing Non-CAT Test Queries")
-            lstTestResults, colResultNames, intErrors = RunThreadedRetrievalQueryList(
-                "PROJECT", lstTestQueries, dctParms["max_threads"], spinner
-            )
-
-            # Copy test results to DK DB
-            LOG.info("CurrentStep: Saving Non-CAT Test Results")
-            if lstTestResults:
-                WriteListToDB("DKTG", lstTestResults, colResultNames, "test_results")
+            # Test results are copied to DK DB as the queries finish
+            with BatchedDBWriter("test_results") as clsResultWriter:
+                _, _, intErrors = RunThreadedRetrievalQueryList(
+                    "PROJECT", lstTestQueries, dctParms["max_threads"], spinner, lstTestCosts, clsWriter=clsResultWriter
+                )
+                LOG.info("CurrentStep: Saving Non-CAT Test Results")
             if intErrors > 0:
                 booErrors = True
                 error_msg = (
@@ -149,25 +160,42 @@ def run_execution_steps(project_code: str, test_suite: str, minutes_offset: int=
     )
 
     try:
-        LOG.info("CurrentStep: Execute Step - Data Characteristics Refresh")
-        run_refresh_data_chars_queries(test_exec_params, test_time, spinner)
+        ensure_result_partitions()
     except Exception:
-        LOG.warning("Data Characteristics Refresh failed", exc_info=True, stack_info=True)
-        pass
+        LOG.warning("Result partitions could not be created", exc_info=True, stack_info=True)
 
-    LOG.info("CurrentStep: Execute Step - Test Validation")
-    run_parameter_validation_queries(test_exec_params, test_run_id, test_time, test_suite)
-
-    LOG.info("CurrentStep: Execute Step - Test Execution")
-    has_errors, error_msg = run_test_queries(
-        test_exec_params, test_run_id, test_time, project_code, test_suite, minutes_offset, spinner
-    )
+    telemetry = RunTelemetry("test", test_run_id)
+    telemetry.start()
+    try:
+        telemetry.start_step("Execute Step - Data Characteristics Refresh")
+        try:
+            run_refresh_data_chars_queries(test_exec_params, test_time, spinner)
+        except Exception:
+            LOG.warning("Data Characteristics Refresh failed", exc_info=True, stack_info=True)
+            pass
+
+        raise_if_run_cancelled()
+        telemetry.start_step("Execute Step - Test Validation")
+        run_parameter_validation_queries(test_exec_params, test_run_id, test_time, test_suite)
+
+        raise_if_run_cancelled()
+        telemetry.start_step("Execute Step - Test Execution")
+        has_errors, error_msg = run_test_queries(
+            test_exec_params, test_run_id, test_time, project_code, test_suite, minutes_offset, spinner
+        )
 
-    LOG.info("CurrentStep: Execute Step - CAT Test Execution")
-    if run_cat_test_queries(
-        test_exec_params, test_run_id, test_time, project_code, test_suite, error_msg, minutes_offset, spinner
-    ):
-        has_errors = True
+        # Not checked for cancellation here: the CAT step finalizes the test run record, with the Cancelled status
+        telemetry.start_step("Execute Step - CAT Test Execution")
+        if run_cat_test_queries(
+            test_exec_params, test_run_id, test_time, project_code, test_suite, error_msg, minutes_offset, spinner
+        ):
+            has_errors = True
+    except Exception as e:
+        telemetry.record_error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        telemetry.finish()
+        save_run_step_metrics(telemetry)
 
     if has_errors:
         error_status = "with errors. Check log for details."
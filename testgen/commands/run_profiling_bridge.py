@@ -9,17 +9,26 @@ import testgen.common.process_service as process_service
 from testgen import settings
 from testgen.commands.queries.profiling_query import CProfilingSQL
 from testgen.commands.run_refresh_score_cards_results import run_refresh_score_cards_results
+from testgen.commands.run_result_retention import ensure_result_partitions
+from testgen.commands.run_schema_ddf_cache import RetrieveSchemaDDF
+from testgen.commands.run_step_metrics import save_run_step_metrics
 from testgen.common import (
+    ActionQueryStep,
     AssignConnectParms,
+    BatchedDBWriter,
     QuoteCSVItems,
     RetrieveDBResultsToDictList,
     RetrieveProfilingParms,
+    RetrieveTableCosts,
+    RunActionQueryDAG,
     RunActionQueryList,
     RunThreadedRetrievalQueryList,
     WriteListToDB,
     date_service,
 )
-from testgen.common.database.database_service import empty_cache
+from testgen.common.database.database_service import empty_cache, get_run_cancelled_message, raise_if_run_cancelled
+from testgen.common.run_telemetry import RunTelemetry
+from testgen.utils.contingency import find_contingency_rules
 
 booClean = True
 LOG = logging.getLogger("testgen")
@@ -29,91 +38,40 @@ def InitializeProfilingSQL(strProject, strSQLFlavor):
     return CProfilingSQL(strProject, strSQLFlavor)
 
 
-def CompileAnomalyTestQueries(clsProfiling, lst_tests):
-    # Get queries for each test
-    lst_queries = []
+def CompileAnomalyTestSteps(clsProfiling, lst_tests):
+    # Get queries for each test. Each type inserts its own rows, so they can run concurrently.
+    lst_steps = []
     for dct_test_type in lst_tests:
         str_query = clsProfiling.GetAnomalyTestQuery(dct_test_type)
         if str_query:
-            lst_queries.append(str_query)
+            lst_steps.append(ActionQueryStep(
+                f"anomaly_test_{dct_test_type['anomaly_type']}",
+                str_query,
+                reads=("profile_results",),
+                writes=(f"profile_anomaly_results:{dct_test_type['id']}",),
+            ))
 
-    return lst_queries
+    return lst_steps
 
 
-def CompileAnomalyScoringQueries(clsProfiling, lst_tests):
-    # Get queries for each test
-    lst_queries = []
+def CompileAnomalyScoringSteps(clsProfiling, lst_tests):
+    # Get queries for each test. Each type scores its own rows, after they are inserted.
+    lst_steps = []
     for dct_test_type in lst_tests:
         if dct_test_type["dq_score_prevalence_formula"]:
             str_query = clsProfiling.GetAnomalyScoringQuery(dct_test_type)
             if str_query:
-                lst_queries.append(str_query)
+                lst_steps.append(ActionQueryStep(
+                    f"anomaly_scoring_{dct_test_type['anomaly_type']}",
+                    str_query,
+                    reads=("profile_results",),
+                    writes=(f"profile_anomaly_results:{dct_test_type['id']}",),
+                ))
 
-    return lst_queries
+    return lst_steps
 
 
-def save_contingency_rules(df_merged, threshold_ratio):
-    # Prep rows to save
-    lst_rules = []
-    for row in df_merged.itertuples():
-        # First causes second: almost all of first coincide with second value
-        if row.pair_to_first_ratio >= threshold_ratio:
-            profiling_run_id = row.profiling_run_id
-            schema_name = row.schema_name
-            table_name = row.table_name
-            cause_column_name = row.first_column_name
-            cause_column_value = getattr(row, row.first_column_name)
-            effect_column_name = row.second_column_name
-            effect_column_value = getattr(row, row.second_column_name)
-            pair_count = row.pair_count
-            cause_column_total = row.first_column_overall_count
-            effect_column_total = row.second_column_overall_count
-            rule_ratio = row.pair_to_first_ratio
-            lst_rules.append(
-                [
-                    profiling_run_id,
-                    schema_name,
-                    table_name,
-                    cause_column_name,
-                    cause_column_value,
-                    effect_column_name,
-                    effect_column_value,
-                    pair_count,
-                    cause_column_total,
-                    effect_column_total,
-                    rule_ratio,
-                ]
-            )
-
-        # Second causes first: almost all of second coincide with first value
-        if row.pair_to_second_ratio >= threshold_ratio:
-            profiling_run_id = row.profiling_run_id
-            schema_name = row.schema_name
-            table_name = row.table_name
-            cause_column_name = row.second_column_name
-            cause_column_value = getattr(row, row.second_column_name)
-            effect_column_name = row.first_column_name
-            effect_column_value = getattr(row, row.first_column_name)
-            pair_count = row.pair_count
-            cause_column_total = row.second_column_overall_count
-            effect_column_total = row.first_column_overall_count
-            rule_ratio = row.pair_to_second_ratio
-            lst_rules.append(
-                [
-                    profiling_run_id,
-                    schema_name,
-                    table_name,
-                    cause_column_name,
-                    cause_column_value,
-                    effect_column_name,
-                    effect_column_value,
-                    pair_count,
-                    cause_column_total,
-                    effect_column_total,
-                    rule_ratio,
-                ]
-            )
-
+def save_contingency_rules(lst_rules):
     WriteListToDB(
         "DKTG",
         lst_rules,
@@ -134,6 +92,33 @@ def save_contingency_rules(df_merged, threshold_ratio):
     )
 
 
+def SaveFailedColumns(clsProfiling, dctParms, lst_failed_columns):
+    # Columns whose profiling query failed, timed out or was cancelled are saved without results, with the error
+    lst_columns = [
+        "project_code", "connection_id", "table_groups_id", "profile_run_id", "schema_name", "run_date",
+        "table_name", "position", "column_name", "column_type", "general_type", "query_error",
+    ]
+    lst_rows = [
+        [
+            dctParms["project_code"],
+            dctParms["connection_id"],
+            clsProfiling.table_groups_id,
+            clsProfiling.profile_run_id,
+            dct_column["table_schema"],
+            clsProfiling.run_date,
+            dct_column["table_name"],
+            dct_column["ordinal_position"],
+            dct_column["column_name"],
+            dct_column["data_type"],
+            dct_column["general_type"],
+            str_error[:1000],
+        ]
+        for dct_column, str_error in lst_failed_columns
+    ]
+    LOG.warning("Profiling failed for %s columns", len(lst_rows))
+    WriteListToDB("DKTG", lst_rows, lst_columns, "profile_results")
+
+
 def RunPairwiseContingencyCheck(clsProfiling, threshold_ratio):
     # Goal: identify pairs of values that represent IF X=A THEN Y=B rules
 
@@ -150,84 +135,24 @@ def RunPairwiseContingencyCheck(clsProfiling, threshold_ratio):
     lst_tables = RetrieveDBResultsToDictList("DKTG", str_query)
 
     # Retrieve record counts per column combination
-    df_merged = None
-    if lst_tables:
-        for dct_table in lst_tables:
-            df_merged = None
-            clsProfiling.data_schema = dct_table["schema_name"]
-            clsProfiling.data_table = dct_table["table_name"]
-            clsProfiling.contingency_columns = QuoteCSVItems(dct_table["contingency_columns"])
-            str_query = clsProfiling.GetContingencyCounts()
-            lst_counts = RetrieveDBResultsToDictList("PROJECT", str_query)
-            if lst_counts:
-                df = pd.DataFrame(lst_counts)
-                # Get list of columns
-                columns = dct_table["contingency_columns"].lower().split(",")
-
-                # Calculate overall counts for each column
-                overall_counts = {col: df.groupby(col)["freq_ct"].sum() for col in columns}
-
-                # Prepare to aggregate the data
-                contingency_table = []
-                for i, col1 in enumerate(columns):
-                    for col2 in columns[i + 1 :]:
-                        # Create a pivot table for each pair
-                        pivot = df.pivot_table(index=col1, columns=col2, values="freq_ct", aggfunc="sum", fill_value=0)
-                        pivot = pivot.stack().reset_index()
-                        pivot.rename(columns={0: "pair_count"}, inplace=True)
-
-                        # Add overall counts
-                        pivot["first_column_overall_count"] = pivot[col1].map(overall_counts[col1])
-                        pivot["second_column_overall_count"] = pivot[col2].map(overall_counts[col2])
-
-                        # Add column names
-                        pivot["first_column_name"] = col1
-                        pivot["second_column_name"] = col2
-
-                        contingency_table.append(pivot)
-
-                # Combine all pairs into a single DataFrame
-                contingency_table = pd.concat(contingency_table, ignore_index=True)
-
-                # Calculate the ratios
-                contingency_table["pair_to_first_ratio"] = (
-                    contingency_table["pair_count"] / contingency_table["first_column_overall_count"]
-                )
-                contingency_table["pair_to_second_ratio"] = (
-                    contingency_table["pair_count"] / contingency_table["second_column_overall_count"]
-                )
-
-                # Include rows where both cols meet minimum threshold count (max of 30 or 5%)
-                total_observations = contingency_table["pair_count"].sum()
-                threshold_min = max(total_observations * 0.05, 30)
-                contingency_table = contingency_table[
-                    (contingency_table["first_column_overall_count"] >= threshold_min)
-                    & (contingency_table["second_column_overall_count"] >= threshold_min)
-                ]
-                # Drop rows where neither ratio meets the threshold ratio (keep if either meets it)
-                #   -- note we still have to check individual columns when saving pairs
-                contingency_table = contingency_table[
-                    ~(
-                        (contingency_table["pair_to_first_ratio"] < threshold_ratio)
-                        & (contingency_table["pair_to_second_ratio"] < threshold_ratio)
-                    )
-                ]
-
-                # Add table name
-                contingency_table["profiling_run_id"] = clsProfiling.profile_run_id
-                contingency_table["schema_name"] = dct_table["schema_name"]
-                contingency_table["table_name"] = dct_table["table_name"]
-
-                # Combine with previous tables
-                if df_merged == None:
-                    df_merged = contingency_table
-                else:
-                    df_merged = pd.concat([df_merged, contingency_table], ignore_index=True)
-
-        if df_merged is not None:
-            if not df_merged.empty:
-                save_contingency_rules(df_merged, threshold_ratio)
+    lst_rules = []
+    for dct_table in lst_tables:
+        clsProfiling.data_schema = dct_table["schema_name"]
+        clsProfiling.data_table = dct_table["table_name"]
+        clsProfiling.contingency_columns = QuoteCSVItems(dct_table["contingency_columns"])
+        str_query = clsProfiling.GetContingencyCounts()
+        lst_counts = RetrieveDBResultsToDictList("PROJECT", str_query)
+        if lst_counts:
+            # Count columns are in the same order as the contingency columns
+            df = pd.DataFrame(lst_counts)
+            columns = dct_table["contingency_columns"].lower().split(",")
+            lst_rules.extend(
+                [clsProfiling.profile_run_id, dct_table["schema_name"], dct_table["table_name"], *rule]
+                for rule in find_contingency_rules(df, columns, threshold_ratio)
+            )
 
+    if lst_rules:
+        save_contingency_rules(lst_rules)
 
 
 def run_profiling_in_background(table_group_id):
@@ -244,7 +169,8 @@ def run_profiling_in_background(table_group_id):
 
 
 
-def run_profiling_queries(strTableGroupsID, spinner=None):
+def run_profiling_queries(strTableGroupsID, spinner=None, on_step=None):
+    # on_step is called at the start of each step, with the run's RunTelemetry and the step name
     if strTableGroupsID is None:
         raise ValueError("Table Group ID was not specified")
 
@@ -257,6 +183,11 @@ def run_profiling_queries(strTableGroupsID, spinner=None):
 
     dctParms = RetrieveProfilingParms(strTableGroupsID)
 
+    try:
+        ensure_result_partitions()
+    except Exception:
+        LOG.warning("Result partitions could not be created", exc_info=True, stack_info=True)
+
     LOG.info("CurrentStep: Initializing Query Generator")
     clsProfiling = InitializeProfilingSQL(dctParms["project_code"], dctParms["sql_flavor"])
 
@@ -308,12 +239,13 @@ def run_profiling_queries(strTableGroupsID, spinner=None):
     lstProfileRunQuery = [strProfileRunQuery]
     RunActionQueryList("DKTG", lstProfileRunQuery)
     message = "Profiling completed "
+    telemetry = RunTelemetry("profiling", strProfileRunID, on_step=on_step)
+    telemetry.start()
     try:
         # Retrieve Column Metadata
-        LOG.info("CurrentStep: Getting DDF from project")
+        telemetry.start_step("Getting DDF from project")
 
-        strQuery = clsProfiling.GetDDFQuery()
-        lstResult = RetrieveDBResultsToDictList("PROJECT", strQuery)
+        lstResult = RetrieveSchemaDDF(clsProfiling.GetDataCharsSQL())
 
         if len(lstResult) == 0:
             LOG.warning("SQL retrieved 0 records")
@@ -348,8 +280,11 @@ def run_profiling_queries(strTableGroupsID, spinner=None):
                     )
 
             # Assemble profiling queries
-            LOG.info("CurrentStep: Assembling profiling queries, round 1")
+            raise_if_run_cancelled()
+            telemetry.start_step("Assembling profiling queries, round 1")
+            dctTableCosts = RetrieveTableCosts(strTableGroupsID)
             lstQueries = []
+            lstCosts = []
             for dctColumnRecord in lstResult:
                 # Set Column Parms
                 clsProfiling.data_schema = dctColumnRecord["table_schema"]
@@ -378,22 +313,36 @@ def run_profiling_queries(strTableGroupsID, spinner=None):
 
                 strQuery = clsProfiling.GetProfilingQuery()
                 lstQueries.append(strQuery)
+                lstCosts.append(dctTableCosts.get((clsProfiling.data_schema, clsProfiling.data_table), 0))
 
             # Run Profiling Queries and save results
-            LOG.info("CurrentStep: Profiling Round 1")
+            telemetry.start_step("Profiling Round 1")
             LOG.debug("Running %s profiling queries", len(lstQueries))
 
-            lstProfiles, colProfileNames, intErrors = RunThreadedRetrievalQueryList(
-                "PROJECT", lstQueries, dctParms["max_threads"]
-            )
-            if intErrors > 0:
-                booErrors = True
-                LOG.warning(
-                    f"Errors were encountered executing profiling queries. ({intErrors} errors occurred.) Please check log."
+            dctQueryErrors = {}
+            # Results are saved in batches as the queries finish, and those that finished are saved even if the run
+            # was cancelled
+            with BatchedDBWriter("profile_results") as clsProfileWriter:
+                _, colProfileNames, intErrors = RunThreadedRetrievalQueryList(
+                    "PROJECT",
+                    lstQueries,
+                    dctParms["max_threads"],
+                    lstCosts=lstCosts,
+                    dctErrors=dctQueryErrors,
+                    clsWriter=clsProfileWriter,
+                )
+                if intErrors > 0:
+                    booErrors = True
+                    LOG.warning(
+                        f"Errors were encountered executing profiling queries. ({intErrors} errors occurred.) Please check log."
+                    )
+                telemetry.start_step("Saving Round 1 profiling results to Metadata")
+            if dctQueryErrors:
+                SaveFailedColumns(
+                    clsProfiling, dctParms, [(lstResult[i], strError) for i, strError in dctQueryErrors.items()]
                 )
-            LOG.info("CurrentStep: Saving Round 1 profiling results to Metadata")
-            WriteListToDB("DKTG", lstProfiles, colProfileNames, "profile_results")
 
+            raise_if_run_cancelled()
             if clsProfiling.profile_use_sampling == "Y":
                 lstQueries = []
                 for table_name, value in dctSampleTables.items():
@@ -405,18 +354,19 @@ def run_profiling_queries(strTableGroupsID, spinner=None):
 
                 RunActionQueryList("DKTG", lstQueries)
 
+            intUpdates = 0
             if clsProfiling.parm_do_freqs == "Y":
-                lstUpdates = []
                 # Get secondary profiling columns
-                LOG.info("CurrentStep: Selecting columns for frequency analysis")
+                telemetry.start_step("Selecting columns for frequency analysis")
                 strQuery = clsProfiling.GetSecondProfilingColumnsQuery()
                 lstResult = RetrieveDBResultsToDictList("DKTG", strQuery)
 
                 if lstResult:
                     # Assemble secondary profiling queries
                     #  - Freqs for columns not already freq'd, but with max actual value length under threshold
-                    LOG.info("CurrentStep: Generating frequency queries")
+                    telemetry.start_step("Generating frequency queries")
                     lstQueries = []
+                    lstCosts = []
                     for dctColumnRecord in lstResult:
                         clsProfiling.data_schema = dctColumnRecord["schema_name"]
                         clsProfiling.data_table = dctColumnRecord["table_name"]
@@ -424,63 +374,103 @@ def run_profiling_queries(strTableGroupsID, spinner=None):
 
                         strQuery = clsProfiling.GetSecondProfilingQuery()
                         lstQueries.append(strQuery)
+                        lstCosts.append(dctTableCosts.get((clsProfiling.data_schema, clsProfiling.data_table), 0))
                     # Run secondary profiling queries
-                    LOG.info("CurrentStep: Retrieving %s frequency results from project", len(lstQueries))
-                    lstUpdates, colProfileNames, intErrors = RunThreadedRetrievalQueryList(
-                        "PROJECT", lstQueries, dctParms["max_threads"]
-                    )
-                    if intErrors > 0:
-                        booErrors = True
-                        LOG.warning(
-                            f"Errors were encountered executing frequency queries. ({intErrors} errors occurred.) Please check log."
+                    telemetry.start_step("Retrieving frequency results from project")
+                    LOG.debug("Running %s frequency queries", len(lstQueries))
+                    # Secondary results are copied to DQ staging as the queries finish
+                    with BatchedDBWriter("stg_secondary_profile_updates") as clsUpdateWriter:
+                        _, colProfileNames, intErrors = RunThreadedRetrievalQueryList(
+                            "PROJECT", lstQueries, dctParms["max_threads"], lstCosts=lstCosts, clsWriter=clsUpdateWriter
                         )
-
-                    if lstUpdates:
-                        # Copy secondary results to DQ staging
-                        LOG.info("CurrentStep: Writing frequency results to Staging")
-                        WriteListToDB("DKTG", lstUpdates, colProfileNames, "stg_secondary_profile_updates")
-
-            LOG.info("CurrentStep: Generating profiling update queries")
-
-            lstQueries = []
+                        if intErrors > 0:
+                            booErrors = True
+                            LOG.warning(
+                                f"Errors were encountered executing frequency queries. ({intErrors} errors occurred.) Please check log."
+                            )
+                        telemetry.start_step("Writing frequency results to Staging")
+                    intUpdates = clsUpdateWriter.row_count
+
+            raise_if_run_cancelled()
+            telemetry.start_step("Generating profiling update queries")
+
+            lstSteps = []
             lstAnomalyTypes = []
 
-            if lstUpdates:
+            if intUpdates:
                 # Run single update query, then delete from staging
-                strQuery = clsProfiling.GetSecondProfilingUpdateQuery()
-                lstQueries.append(strQuery)
-                strQuery = clsProfiling.GetSecondProfilingStageDeleteQuery()
-                lstQueries.append(strQuery)
-            strQuery = clsProfiling.GetDataTypeSuggestionUpdateQuery()
-            lstQueries.append(strQuery)
-            strQuery = clsProfiling.GetFunctionalDataTypeUpdateQuery()
-            lstQueries.append(strQuery)
-            strQuery = clsProfiling.GetFunctionalTableTypeStageQuery()
-            lstQueries.append(strQuery)
-            strQuery = clsProfiling.GetFunctionalTableTypeUpdateQuery()
-            lstQueries.append(strQuery)
-            strQuery = clsProfiling.GetPIIFlagUpdateQuery()
-            lstQueries.append(strQuery)
+                lstSteps.append(ActionQueryStep(
+                    "secondary_profiling_update",
+                    clsProfiling.GetSecondProfilingUpdateQuery(),
+                    reads=("stg_secondary_profile_updates",),
+                    writes=("profile_results",),
+                ))
+                lstSteps.append(ActionQueryStep(
+                    "secondary_profiling_delete",
+                    clsProfiling.GetSecondProfilingStageDeleteQuery(),
+                    writes=("stg_secondary_profile_updates",),
+                ))
+            lstSteps.append(ActionQueryStep(
+                "datatype_suggestions", clsProfiling.GetDataTypeSuggestionUpdateQuery(), writes=("profile_results",)
+            ))
+            lstSteps.append(ActionQueryStep(
+                "functional_datatype", clsProfiling.GetFunctionalDataTypeUpdateQuery(), writes=("profile_results",)
+            ))
+            lstSteps.append(ActionQueryStep(
+                "functional_tabletype_stage",
+                clsProfiling.GetFunctionalTableTypeStageQuery(),
+                reads=("profile_results",),
+                writes=("stg_functional_table_updates",),
+            ))
+            lstSteps.append(ActionQueryStep(
+                "functional_tabletype_update",
+                clsProfiling.GetFunctionalTableTypeUpdateQuery(),
+                reads=("stg_functional_table_updates",),
+                writes=("profile_results",),
+            ))
+            lstSteps.append(ActionQueryStep(
+                "pii_flag", clsProfiling.GetPIIFlagUpdateQuery(), writes=("profile_results",)
+            ))
 
             strQuery = clsProfiling.GetAnomalyTestTypesQuery()
             lstAnomalyTypes = RetrieveDBResultsToDictList("DKTG", strQuery)
-            lstQueries.extend(CompileAnomalyTestQueries(clsProfiling, lstAnomalyTypes))
-            lstQueries.extend(CompileAnomalyScoringQueries(clsProfiling, lstAnomalyTypes))
-            strQuery = clsProfiling.GetAnomalyStatsRefreshQuery()
-            lstQueries.append(strQuery)
-
-            # Always runs last
-            strQuery = clsProfiling.GetDataCharsRefreshQuery()
-            lstQueries.append(strQuery)
+            lstSteps.extend(CompileAnomalyTestSteps(clsProfiling, lstAnomalyTypes))
+            lstSteps.extend(CompileAnomalyScoringSteps(clsProfiling, lstAnomalyTypes))
+            lstSteps.append(ActionQueryStep(
+                "refresh_anomalies",
+                clsProfiling.GetAnomalyStatsRefreshQuery(),
+                reads=("profile_results", "profile_anomaly_results"),
+                writes=("profiling_runs:anomaly_counts",),
+            ))
+
+            # v_latest_profile_results only reads the run start times from profiling_runs
+            lstSteps.append(ActionQueryStep(
+                "data_chars_refresh",
+                clsProfiling.GetDataCharsRefreshQuery(),
+                reads=("profile_results", "profiling_runs:start_times", "stg_data_chars_updates"),
+                writes=("data_table_chars", "data_column_chars"),
+            ))
             if clsProfiling.profile_flag_cdes:
-                strQuery = clsProfiling.GetCDEFlaggerQuery()
-                lstQueries.append(strQuery)
-
-            LOG.info("CurrentStep: Running profiling update queries")
-            RunActionQueryList("DKTG", lstQueries)
+                lstSteps.append(ActionQueryStep(
+                    "cde_flagger",
+                    clsProfiling.GetCDEFlaggerQuery(),
+                    reads=("profile_results",),
+                    writes=("data_column_chars",),
+                ))
+
+            telemetry.start_step("Running profiling update queries")
+            dctDurations = RunActionQueryDAG("DKTG", lstSteps, settings.APP_DB_ACTION_MAX_THREADS)
+            LOG.info(
+                "Slowest profiling update queries: %s",
+                ", ".join(
+                    f"{name} ({duration:.2f} s)"
+                    for name, duration in sorted(dctDurations.items(), key=lambda item: item[1], reverse=True)[:5]
+                ),
+            )
 
+            raise_if_run_cancelled()
             if dctParms["profile_do_pair_rules"] == "Y":
-                LOG.info("CurrentStep: Compiling pairwise contingency rules")
+                telemetry.start_step("Compiling pairwise contingency rules")
                 RunPairwiseContingencyCheck(clsProfiling, dctParms["profile_pair_rule_pct"])
         else:
             LOG.info("No columns were selected to profile.")
@@ -489,20 +479,26 @@ def run_profiling_queries(strTableGroupsID, spinner=None):
         sqlsplit = e.args[0].split("[SQL", 1)
         errorline = sqlsplit[0].replace("'", "''") if len(sqlsplit) > 0 else "unknown error"
         clsProfiling.exception_message = f"{type(e).__name__}: {errorline}"
+        telemetry.record_error(clsProfiling.exception_message)
         raise
     finally:
-        LOG.info("Updating the profiling run record")
-        lstProfileRunQuery = [
-            clsProfiling.GetProfileRunInfoRecordUpdateQuery(),
-            clsProfiling.GetAnomalyScoringRollupRunQuery(),
-            clsProfiling.GetAnomalyScoringRollupTableGroupQuery(),
-        ]
-        RunActionQueryList("DKTG", lstProfileRunQuery)
-        run_refresh_score_cards_results(
-            project_code=dctParms["project_code"],
-            add_history_entry=True,
-            refresh_date=date_service.parse_now(clsProfiling.run_date),
-        )
+        telemetry.start_step("Updating the profiling run record")
+        clsProfiling.exception_message = get_run_cancelled_message(clsProfiling.exception_message)
+        try:
+            lstProfileRunQuery = [
+                clsProfiling.GetProfileRunInfoRecordUpdateQuery(),
+                clsProfiling.GetAnomalyScoringRollupRunQuery(),
+                clsProfiling.GetAnomalyScoringRollupTableGroupQuery(),
+            ]
+            RunActionQueryList("DKTG", lstProfileRunQuery)
+            run_refresh_score_cards_results(
+                project_code=dctParms["project_code"],
+                add_history_entry=True,
+                refresh_date=date_service.parse_now(clsProfiling.run_date),
+            )
+        finally:
+            telemetry.finish()
+            save_run_step_metrics(telemetry)
 
         if booErrors:
             str_error_status = "with errors. Check log for details."
@@ -0,0 +1,254 @@
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from testgen.common import RetrieveDBResultsToDictList, read_template_sql_file
+from testgen.common.database.database_service import replace_params
+
+LOG = logging.getLogger("testgen")
+
+POLL_SECONDS = 1
+# Workers of a connection that may exit without taking a table group before its queued groups are given up on
+MAX_WORKER_START_ATTEMPTS = 3
+
+
+@dataclass
+class ScheduledTableGroup:
+    table_groups_id: str
+    table_groups_name: str
+    connection_id: int
+    status: str = "Queued"
+    message: str | None = None
+    seconds: float | None = None
+
+
+@dataclass
+class _ConnectionQueue:
+    # Table groups of one connection, in priority order, and the workers profiling them
+    connection_id: int
+    priority: int
+    tasks: multiprocessing.Queue
+    pending_ct: int
+    workers: list = field(default_factory=list)
+    failed_start_ct: int = 0
+
+
+def get_profiling_schedule(
+    project_code: str | None = None, table_group_ids: list[str] | None = None, stale_hours: float = 0
+) -> list[ScheduledTableGroup]:
+    """
+    Returns the table groups to profile, in priority order: never profiled first, then the stalest, and the largest
+    among those profiled on the same day. Groups profiled less than `stale_hours` ago are left out.
+    """
+    if table_group_ids:
+        # Raises ValueError on anything that isn't a UUID, before it gets into the query
+        id_list = ", ".join(f"'{uuid.UUID(table_group_id)}'::UUID" for table_group_id in table_group_ids)
+        table_group_condition = f"tg.id IN ({id_list})"
+    else:
+        table_group_condition = "TRUE"
+
+    query = replace_params(
+        read_template_sql_file("parms_profiling_schedule.sql", "parms"),
+        {
+            "PROJECT_CODE": (project_code or "").replace("'", "''"),
+            "TABLE_GROUP_CONDITION": table_group_condition,
+            "STALE_HOURS": float(stale_hours),
+        },
+    )
+    return [
+        ScheduledTableGroup(row["table_groups_id"], row["table_groups_name"], row["connection_id"])
+        for row in RetrieveDBResultsToDictList("DKTG", query)
+    ]
+
+
+def _profile_table_groups_process(tasks: multiprocessing.Queue, results: multiprocessing.Queue, verbose: bool):
+    # Entry point of a worker process: profiles table groups of one connection, one after the other, until the queue
+    # is empty. The groups share the process's engine, connection pool and loaded templates.
+    from testgen.commands.run_profiling_bridge import run_profiling_queries
+    from testgen.common.database.database_service import install_cancel_handler, is_run_cancelled
+    from testgen.common.logs import configure_logging
+
+    configure_logging(level=logging.DEBUG if verbose else logging.INFO)
+    install_cancel_handler()
+    # Ctrl+C reaches the whole process group: the parent cancels the batch, with SIGTERM to each worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    while not is_run_cancelled():
+        try:
+            table_groups_id = tasks.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            break
+
+        results.put({"table_groups_id": table_groups_id, "status": "Running", "pid": os.getpid()})
+        start = time.monotonic()
+        try:
+            message = run_profiling_queries(table_groups_id)
+            status = "Complete"
+        except Exception as e:
+            LOG.exception(f"Profiling failed for table group {table_groups_id}")
+            message = f"{type(e).__name__}: {e}"
+            status = "Error"
+        if is_run_cancelled():
+            status = "Cancelled"
+        results.put({
+            "table_groups_id": table_groups_id,
+            "status": status,
+            "message": message,
+            "seconds": round(time.monotonic() - start, 1),
+        })
+
+
+def run_profiling_schedule(
+    schedule: list[ScheduledTableGroup],
+    max_parallel: int,
+    max_per_connection: int,
+    verbose: bool = False,
+    on_update=None,
+) -> list[ScheduledTableGroup]:
+    """
+    Profiles the table groups of the schedule with at most `max_parallel` runs at a time overall, and at most
+    `max_per_connection` at a time on each connection.
+
+    Each run slot is a worker process that profiles the groups of one connection, in priority order, until none are
+    left. A new worker goes to the connection with the highest priority group still queued. Since profiling state is
+    global to a process, groups don't share a process with other runs, but consecutive groups of a connection reuse
+    its process and engine.
+
+    on_update is called with the scheduled group each time its status changes. SIGTERM and SIGINT cancel the batch:
+    the running groups save their partial results, and the queued ones are skipped.
+
+    A group whose worker exits before reporting its outcome is recorded as an Error, and not profiled again. Workers of
+    a connection that exit without taking a group are replaced up to MAX_WORKER_START_ATTEMPTS times, after which
+    the queued groups of the connection are recorded as Errors.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    groups = {group.table_groups_id: group for group in schedule}
+    # Process id of the worker that took each group
+    claims: dict[str, int] = {}
+
+    connection_queues: dict[int, _ConnectionQueue] = {}
+    for priority, group in enumerate(schedule):
+        if group.connection_id not in connection_queues:
+            connection_queues[group.connection_id] = _ConnectionQueue(group.connection_id, priority, context.Queue(), 0)
+        connection_queue = connection_queues[group.connection_id]
+        connection_queue.tasks.put(group.table_groups_id)
+        connection_queue.pending_ct += 1
+
+    cancelled = False
+
+    def on_cancel(signum, frame):  # noqa: ARG001
+        nonlocal cancelled
+        LOG.warning("Cancelling the profiling batch")
+        cancelled = True
+        for connection_queue in connection_queues.values():
+            for worker in connection_queue.workers:
+                worker.terminate()
+
+    previous_handlers = {sig: signal.signal(sig, on_cancel) for sig in (signal.SIGTERM, signal.SIGINT)}
+
+    def update(event: dict):
+        group = groups[event["table_groups_id"]]
+        group.status = event["status"]
+        group.message = event.get("message")
+        group.seconds = event.get("seconds")
+        if group.status == "Running":
+            claims[group.table_groups_id] = event["pid"]
+            connection_queues[group.connection_id].pending_ct -= 1
+        if on_update:
+            on_update(group)
+
+    def set_error(group: ScheduledTableGroup, message: str):
+        group.status = "Cancelled" if cancelled else "Error"
+        group.message = message
+        if on_update:
+            on_update(group)
+
+    def reconcile_exited_worker(connection_queue: _ConnectionQueue, worker):
+        claimed = [group_id for group_id, pid in claims.items() if pid == worker.pid]
+        for group_id in claimed:
+            if groups[group_id].status == "Running":
+                set_error(groups[group_id], f"Worker process exited with code {worker.exitcode}")
+        if claimed or cancelled or connection_queue.pending_ct <= 0:
+            return
+
+        # Exited before taking a group, e.g. failing to start: replaced a limited number of times
+        connection_queue.failed_start_ct += 1
+        LOG.warning(
+            f"Profiling worker of connection {connection_queue.connection_id} exited with code {worker.exitcode} "
+            f"before taking a table group ({connection_queue.failed_start_ct} of {MAX_WORKER_START_ATTEMPTS})"
+        )
+        if connection_queue.failed_start_ct >= MAX_WORKER_START_ATTEMPTS:
+            for group in schedule:
+                if group.connection_id == connection_queue.connection_id and group.status == "Queued":
+                    set_error(group, "Worker processes exited before profiling the table group")
+            connection_queue.pending_ct = 0
+
+    def drain_results():
+        while True:
+            try:
+                update(results.get_nowait())
+            except queue.Empty:
+                return
+
+    try:
+        while True:
+            # The events of exited workers are applied first, so that they are judged on everything they reported
+            drain_results()
+            for connection_queue in connection_queues.values():
+                alive_workers = []
+                for worker in connection_queue.workers:
+                    if worker.is_alive():
+                        alive_workers.append(worker)
+                    else:
+                        reconcile_exited_worker(connection_queue, worker)
+                connection_queue.workers = alive_workers
+            running_ct = sum(len(connection_queue.workers) for connection_queue in connection_queues.values())
+
+            # Fills the free slots, highest priority connection first
+            waiting = sorted(
+                (
+                    connection_queue
+                    for connection_queue in connection_queues.values()
+                    if connection_queue.pending_ct > len(connection_queue.workers)
+                    and len(connection_queue.workers) < max_per_connection
+                ),
+                key=lambda connection_queue: connection_queue.priority,
+            )
+            for connection_queue in waiting:
+                if cancelled or running_ct >= max_parallel:
+                    break
+                worker = context.Process(
+                    target=_profile_table_groups_process,
+                    args=(connection_queue.tasks, results, verbose),
+                    name=f"profiling-connection-{connection_queue.connection_id}",
+                )
+                worker.start()
+                connection_queue.workers.append(worker)
+                running_ct += 1
+
+            try:
+                update(results.get(timeout=POLL_SECONDS))
+                continue
+            except queue.Empty:
+                pass
+
+            if running_ct == 0 and (cancelled or not any(q.pending_ct for q in connection_queues.values())):
+                break
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+
+    for group in schedule:
+        if group.status in ("Queued", "Running"):
+            # Skipped after a cancellation, or its process exited without reporting
+            group.status = "Cancelled" if cancelled else "Error"
+            group.message = group.message or ("Not started" if group.status == "Cancelled" else "Worker process exited")
+            if on_update:
+                on_update(group)
+    return schedule
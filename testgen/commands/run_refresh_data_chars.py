@@ -3,8 +3,8 @@ import logging
 from progress.spinner import Spinner
 
 from testgen.commands.queries.refresh_data_chars_query import CRefreshDataCharsSQL
+from testgen.commands.run_schema_ddf_cache import RetrieveSchemaDDF
 from testgen.common.database.database_service import (
-    RetrieveDBResultsToDictList,
     RunActionQueryList,
     RunThreadedRetrievalQueryList,
     WriteListToDB,
@@ -19,8 +19,7 @@ def run_refresh_data_chars_queries(params: dict, run_date: str, spinner: Spinner
     sql_generator = CRefreshDataCharsSQL(params, run_date, STAGING_TABLE)
 
     LOG.info("CurrentStep: Getting DDF for table group")
-    ddf_query = sql_generator.GetDDFQuery()
-    ddf_results = RetrieveDBResultsToDictList("PROJECT", ddf_query)
+    ddf_results = RetrieveSchemaDDF(sql_generator)
 
     distinct_tables = {
         f"{item['table_schema']}.{item['table_name']}"
@@ -52,7 +51,8 @@ def run_refresh_data_chars_queries(params: dict, run_date: str, spinner: Spinner
         "column_type",
         "record_ct",
     ]
-    staging_records = [
+    # Generated while they are written, so that the staging records are never all held in memory
+    staging_records = (
         [
             item["project_code"],
             params["table_groups_id"],
@@ -66,7 +66,7 @@ def run_refresh_data_chars_queries(params: dict, run_date: str, spinner: Spinner
             count_map.get(f"{item['table_schema']}.{item['table_name']}", 0),
         ]
         for item in ddf_results
-    ]
+    )
 
     LOG.info("CurrentStep: Writing data characteristics to staging")
     WriteListToDB("DKTG", staging_records, staging_columns, STAGING_TABLE)
@@ -0,0 +1,80 @@
+import logging
+import re
+
+from testgen.common import (
+    RetrieveDBResultsToList,
+    RetrieveSingleResultValue,
+    RunActionQueryList,
+    read_template_sql_file,
+)
+from testgen.common.credentials import get_tg_schema
+from testgen.common.database.database_service import replace_params
+
+LOG = logging.getLogger("testgen")
+
+PARTITION_MONTHS_AHEAD = 2
+
+_RETENTION_PATTERN = re.compile(r"^\s*(\d+)\s*([dwmy])\s*$", re.IGNORECASE)
+_RETENTION_UNITS = {"d": "days", "w": "weeks", "m": "months", "y": "years"}
+
+
+def parse_retention_interval(older_than: str) -> str:
+    """
+    Converts a retention period such as `90d`, `12w`, `18m` or `2y` to a Postgres interval.
+    """
+    match = _RETENTION_PATTERN.match(older_than or "")
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid retention period '{older_than}'. Use a number followed by d, w, m or y, e.g. 90d.")
+    return f"{int(match.group(1))} {_RETENTION_UNITS[match.group(2).lower()]}"
+
+
+def ensure_result_partitions():
+    """
+    Creates the monthly partitions of the result tables up to PARTITION_MONTHS_AHEAD months from now.
+    """
+    query = read_template_sql_file("ensure_result_partitions.sql", "retention")
+    query = replace_params(query, {"SCHEMA_NAME": get_tg_schema(), "MONTHS_AHEAD": PARTITION_MONTHS_AHEAD})
+    created_ct = RetrieveSingleResultValue("DKTG", query)
+    if created_ct:
+        LOG.info("Created %s result table partitions", created_ct)
+
+
+def run_prune(older_than: str) -> dict:
+    """
+    Deletes the test and profiling results older than the retention period, dropping whole monthly partitions.
+
+    The cutoff is rounded down to the start of the month. The latest complete run of each test suite and table group
+    is kept with its results: the partitions holding them are not dropped, only the other runs in them are deleted.
+    """
+    params_mapping = {
+        "SCHEMA_NAME": get_tg_schema(),
+        "OLDER_THAN": parse_retention_interval(older_than),
+    }
+
+    cutoff_query = replace_params(read_template_sql_file("get_prune_cutoff.sql", "retention"), params_mapping)
+    params_mapping["CUTOFF"] = RetrieveSingleResultValue("DKTG", cutoff_query).isoformat(sep=" ")
+    LOG.info("CurrentStep: Pruning results before %s", params_mapping["CUTOFF"])
+
+    runs_query = replace_params(read_template_sql_file("get_prune_runs.sql", "retention"), params_mapping)
+    runs, _ = RetrieveDBResultsToList("DKTG", runs_query)
+
+    drop_query = replace_params(read_template_sql_file("drop_result_partitions.sql", "retention"), params_mapping)
+    dropped_ct = RetrieveSingleResultValue("DKTG", drop_query) or 0
+
+    # Rows in the DEFAULT partitions and in the partitions kept for the latest runs are deleted per run
+    delete_templates = {
+        "test": read_template_sql_file("delete_test_run.sql", "retention"),
+        "profiling": read_template_sql_file("delete_profiling_run.sql", "retention"),
+    }
+    delete_queries = [
+        replace_params(delete_templates[run_type], {**params_mapping, "RUN_ID": run_id})
+        for run_type, run_id in runs
+    ]
+    RunActionQueryList("DKTG", delete_queries)
+
+    return {
+        "cutoff": params_mapping["CUTOFF"],
+        "dropped_partitions": dropped_ct,
+        "test_runs": sum(1 for run_type, _ in runs if run_type == "test"),
+        "profiling_runs": sum(1 for run_type, _ in runs if run_type == "profiling"),
+    }
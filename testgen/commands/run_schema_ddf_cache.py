@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import time
+import uuid
+
+from testgen import settings
+from testgen.commands.queries.refresh_data_chars_query import CRefreshDataCharsSQL
+from testgen.common.database.database_service import (
+    RetrieveDBResultsToDictList,
+    RetrieveSingleResultValue,
+    RunActionQueryList,
+    WriteListToDB,
+)
+
+LOG = logging.getLogger("testgen")
+
+DDF_CACHE_TABLE = "schema_ddf_cache"
+DDF_CACHE_COLUMNS = [
+    "snapshot_id",
+    "table_groups_id",
+    "project_code",
+    "table_schema",
+    "table_name",
+    "column_name",
+    "data_type",
+    "character_maximum_length",
+    "ordinal_position",
+    "general_type",
+    "is_decimal",
+]
+
+# The DDF retrieved by a run serves its test validation, which follows the data characteristics refresh
+RETRIEVED_DDF_MAX_AGE_SECONDS = 3600
+
+# Time of retrieval and lowercase schema.table.column names of the DDF last retrieved in this process, by table group
+_dctRetrievedColumns: dict[str, tuple[float, set[str]]] = {}
+
+
+def RetrieveSchemaDDF(sql_generator: CRefreshDataCharsSQL) -> list:
+    """
+    Returns the column metadata (DDF) of the table group, as its DDF query does.
+
+    The last snapshot of the same DDF query, saved in the TestGen database, is returned instead when it is less than
+    SCHEMA_DDF_CACHE_MAX_AGE_HOURS old and the change signal of the schema, a cheap catalog query of the flavor, is
+    the same as when it was saved. Otherwise, the DDF query runs on the target database and its results are saved as
+    the new snapshot. Flavors without a change signal template are not cached.
+    """
+    strDDFQuery = sql_generator.GetDDFQuery()
+    intMaxAgeHours = settings.SCHEMA_DDF_CACHE_MAX_AGE_HOURS
+    strQueryHash = hashlib.sha1(strDDFQuery.encode()).hexdigest()
+
+    # The signal is read before the DDF: a change made in between makes the next run read the DDF again
+    strSignal = None
+    strSignalQuery = sql_generator.GetDDFSignalQuery() if intMaxAgeHours > 0 else None
+    if strSignalQuery:
+        try:
+            valSignal = RetrieveSingleResultValue("PROJECT", strSignalQuery)
+            if valSignal is not None:
+                strSignal = hashlib.sha1(str(valSignal).encode()).hexdigest()
+        except Exception:
+            LOG.warning("Schema change signal could not be retrieved, reading the DDF", exc_info=True)
+
+    if strSignal:
+        lstCached = RetrieveDBResultsToDictList(
+            "DKTG", sql_generator.GetDDFCacheQuery(strQueryHash, strSignal, intMaxAgeHours)
+        )
+        if lstCached:
+            LOG.info("Schema unchanged since the last DDF snapshot: %s columns from the cache", len(lstCached))
+            _RememberColumns(sql_generator.table_group_id, lstCached)
+            return lstCached
+
+    lstResults = RetrieveDBResultsToDictList("PROJECT", strDDFQuery)
+    if strSignal and lstResults:
+        try:
+            _SaveSnapshot(sql_generator, strQueryHash, strSignal, lstResults)
+        except Exception:
+            LOG.warning("DDF snapshot could not be saved", exc_info=True)
+    _RememberColumns(sql_generator.table_group_id, lstResults)
+    return lstResults
+
+
+def GetRetrievedDDFColumns(strTableGroupsID) -> set[str] | None:
+    # Lowercase schema.table.column names of the table group's DDF, if it was retrieved recently in this process
+    fltRetrievedAt, setColumns = _dctRetrievedColumns.get(str(strTableGroupsID), (0, None))
+    if time.monotonic() - fltRetrievedAt > RETRIEVED_DDF_MAX_AGE_SECONDS:
+        return None
+    return setColumns
+
+
+def _RememberColumns(strTableGroupsID, lstDDF):
+    _dctRetrievedColumns[str(strTableGroupsID)] = (
+        time.monotonic(),
+        {f"{item['table_schema']}.{item['table_name']}.{item['column_name']}".lower() for item in lstDDF},
+    )
+
+
+def _SaveSnapshot(sql_generator: CRefreshDataCharsSQL, strQueryHash, strSignal, lstResults):
+    # Columns are written under a new snapshot id, then the snapshot is switched to them: readers never see a partial
+    # snapshot, even when two runs of the table group save one at the same time
+    strSnapshotID = str(uuid.uuid4())
+    lstRecords = (
+        [
+            strSnapshotID,
+            sql_generator.table_group_id,
+            item["project_code"],
+            item["table_schema"],
+            item["table_name"],
+            item["column_name"],
+            item["data_type"],
+            item["character_maximum_length"],
+            item["ordinal_position"],
+            item["general_type"],
+            None if item["is_decimal"] is None else bool(item["is_decimal"]),
+        ]
+        for item in lstResults
+    )
+    WriteListToDB("DKTG", lstRecords, DDF_CACHE_COLUMNS, DDF_CACHE_TABLE)
+    RunActionQueryList(
+        "DKTG",
+        [
+            sql_generator.GetDDFCacheSaveQuery(
+                strQueryHash, strSignal, strSnapshotID, settings.SCHEMA_DDF_CACHE_MAX_AGE_HOURS
+            )
+        ],
+    )
@@ -0,0 +1,104 @@
+import logging
+from datetime import UTC, datetime, timedelta
+
+from testgen.common import RetrieveDBResultsToDictList, WriteListToDB, read_template_sql_file
+from testgen.common.credentials import get_tg_schema
+from testgen.common.database.database_service import replace_params
+from testgen.common.run_telemetry import RUN_STEP_METRICS_COLUMNS, RunTelemetry
+
+LOG = logging.getLogger("testgen")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_SPAN_ATTRIBUTES = (
+    ("wall_seconds", "testgen.wall_seconds"),
+    ("target_db_seconds", "testgen.target_db_seconds"),
+    ("metadata_db_seconds", "testgen.metadata_db_seconds"),
+    ("query_ct", "testgen.query_count"),
+    ("row_ct", "testgen.row_count"),
+    ("byte_ct", "testgen.bytes_sent"),
+    ("retry_ct", "testgen.retry_count"),
+)
+
+
+def save_run_step_metrics(telemetry: RunTelemetry) -> None:
+    """
+    Saves the steps of a run to run_step_metrics. Failures are logged, so that they don't fail the run.
+    """
+    if not telemetry.steps:
+        return
+    try:
+        WriteListToDB("DKTG", telemetry.to_rows(), RUN_STEP_METRICS_COLUMNS, "run_step_metrics")
+    except Exception:
+        LOG.warning("Run step metrics could not be saved", exc_info=True)
+
+
+def get_run_step_metrics(run_id: str) -> list[dict]:
+    query = read_template_sql_file("get_run_step_metrics.sql", "run_telemetry")
+    query = replace_params(query, {"SCHEMA_NAME": get_tg_schema(), "RUN_ID": run_id})
+    return [dict(row) for row in RetrieveDBResultsToDictList("DKTG", query)]
+
+
+def _to_unix_nano(value: datetime) -> str:
+    # Timestamps are stored in UTC without a time zone
+    return str((value.replace(tzinfo=UTC) - _EPOCH) // timedelta(microseconds=1) * 1000)
+
+
+def _to_attribute(key: str, value) -> dict:
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, str):
+        return {"key": key, "value": {"stringValue": value}}
+    return {"key": key, "value": {"doubleValue": float(value)}}
+
+
+def export_run_step_metrics(run_id: str) -> dict:
+    """
+    Returns the steps of a run as an OpenTelemetry (OTLP/JSON) trace, with a root span for the run and a child span
+    per step. The trace id is the run id.
+    """
+    steps = get_run_step_metrics(run_id)
+    trace_id = run_id.replace("-", "")
+    root_span_id = trace_id[:16]
+    spans = []
+
+    for step in steps:
+        span = {
+            "traceId": trace_id,
+            "spanId": f"{step['step_seq']:016x}",
+            "parentSpanId": root_span_id,
+            "name": step["step_name"],
+            "kind": 1,
+            "startTimeUnixNano": _to_unix_nano(step["step_starttime"]),
+            "endTimeUnixNano": _to_unix_nano(step["step_endtime"] or step["step_starttime"]),
+            "attributes": [
+                _to_attribute(attribute, step[column]) for column, attribute in _SPAN_ATTRIBUTES
+                if step[column] is not None
+            ],
+            "status": {"code": 2, "message": step["error_message"]} if step["error_message"] else {"code": 1},
+        }
+        spans.append(span)
+
+    if steps:
+        has_errors = any(step["error_message"] for step in steps)
+        spans.insert(0, {
+            "traceId": trace_id,
+            "spanId": root_span_id,
+            "name": f"{steps[0]['run_type']}_run",
+            "kind": 1,
+            "startTimeUnixNano": spans[0]["startTimeUnixNano"],
+            "endTimeUnixNano": spans[-1]["endTimeUnixNano"],
+            "attributes": [
+                _to_attribute("testgen.run_type", steps[0]["run_type"]),
+                _to_attribute("testgen.run_id", run_id),
+            ],
+            "status": {"code": 2 if has_errors else 1},
+        })
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [_to_attribute("service.name", "dataops-testgen")]},
+                "scopeSpans": [{"scope": {"name": "testgen.run_telemetry"}, "spans": spans}],
+            }
+        ]
+    }
@@ -3,6 +3,7 @@ from collections import defaultdict
 from itertools import chain
 
 from testgen.commands.queries.test_parameter_validation_query import CTestParamValidationSQL
+from testgen.commands.run_schema_ddf_cache import GetRetrievedDDFColumns
 from testgen.common import (
     RetrieveDBResultsToDictList,
     RetrieveDBResultsToList,
@@ -12,9 +13,25 @@ from testgen.common import (
 LOG = logging.getLogger("testgen")
 
 
+def _AreColumnsInDDF(test_columns, setDDFColumns: set[str] | None) -> bool:
+    # Table-level tests have no column name: only their table has to be in the DDF
+    if not setDDFColumns:
+        return False
+    setDDFTables = {column.rsplit(".", 1)[0] for column in setDDFColumns}
+    for column_name, _ in test_columns:
+        table_name, column = column_name.lower().rsplit(".", 1)
+        if (column_name.lower() not in setDDFColumns) if column else (table_name not in setDDFTables):
+            return False
+    return True
+
+
 def run_parameter_validation_queries(
-    dctParms, test_run_id="", test_time="", strTestSuite=""
+    dctParms, test_run_id="", test_time="", strTestSuite="", dctProjectColumns: dict[str, set[str]] | None = None
 ):
+    # dctProjectColumns caches the columns of the target schemas, by schema, so that suites validated one after the
+    # other against the same schemas read them from the target database only once
+    if dctProjectColumns is None:
+        dctProjectColumns = {}
 
     LOG.info("CurrentStep: Initializing Test Parameter Validation")
     clsExecute = CTestParamValidationSQL(dctParms["sql_flavor"], dctParms["test_suite_id"])
@@ -29,6 +46,11 @@ def run_parameter_validation_queries(
     strColumnList = clsExecute.GetTestValidationColumns(booClean)
     test_columns, _ = RetrieveDBResultsToList("DKTG", strColumnList)
 
+    if test_columns and _AreColumnsInDDF(test_columns, GetRetrievedDDFColumns(dctParms["table_groups_id"])):
+        # The DDF was just retrieved for this run, e.g. by the data characteristics refresh
+        LOG.info("Validation Successful: All tested columns are in the DDF of the table group.")
+        return
+
     if not test_columns:
         LOG.warning(f"No test columns are present to validate in Test Suite {strTestSuite}")
         missing_columns = []
@@ -37,23 +59,34 @@ def run_parameter_validation_queries(
         # Derive test schema list -- make CSV string from list of columns
         #  to be used as criteria for retrieving data dictionary
         setSchemas = {col.split(".")[0] for col, _ in test_columns}
-        strSchemas = ", ".join([f"'{value}'" for value in setSchemas])
-
-        # Retrieve Current Project Column list
-        LOG.info("CurrentStep: Retrieve Current Columns for Validation")
-        clsExecute.test_schemas = strSchemas
-        strProjectColumnList = clsExecute.GetProjectTestValidationColumns()
-        if "where table_schema in ()" in strProjectColumnList:
-            raise ValueError("No schema specified in Validation Columns check")
-        lstProjectTestColumns = RetrieveDBResultsToDictList("PROJECT", strProjectColumnList)
-
-        if len(lstProjectTestColumns) == 0:
-            LOG.info("Current Test Column list is empty")
+        setMissingSchemas = setSchemas - dctProjectColumns.keys()
+        if setMissingSchemas:
+            strSchemas = ", ".join([f"'{value}'" for value in setMissingSchemas])
+
+            # Retrieve Current Project Column list
+            LOG.info("CurrentStep: Retrieve Current Columns for Validation")
+            clsExecute.test_schemas = strSchemas
+            strProjectColumnList = clsExecute.GetProjectTestValidationColumns()
+            if "where table_schema in ()" in strProjectColumnList:
+                raise ValueError("No schema specified in Validation Columns check")
+            lstProjectTestColumns = RetrieveDBResultsToDictList("PROJECT", strProjectColumnList)
+
+            if len(lstProjectTestColumns) == 0:
+                LOG.info("Current Test Column list is empty")
+
+            dctMissingSchemas = {schema.lower(): schema for schema in setMissingSchemas}
+            for schema in setMissingSchemas:
+                dctProjectColumns[schema] = set()
+            for item in lstProjectTestColumns:
+                column = item["columns"].lower()
+                schema = dctMissingSchemas.get(column.split(".")[0])
+                if schema is not None:
+                    dctProjectColumns[schema].add(column)
 
         LOG.info("CurrentStep: Compare column sets")
         # load results into sets
         result_set1 = {col.lower() for col, _ in test_columns}
-        result_set2 = {item["columns"].lower() for item in set(lstProjectTestColumns)}
+        result_set2 = set().union(*(dctProjectColumns[schema] for schema in setSchemas))
 
         # Check if all columns exist in the table
         missing_columns = result_set1.difference(result_set2)
@@ -1,13 +1,41 @@
+import concurrent.futures
+import hashlib
 import logging
+import re
+from collections import defaultdict
 
 from testgen import settings
-from testgen.common import RetrieveSingleResultValue, RunActionQueryList, read_template_sql_file
+from testgen.common import (
+    CleanSQL,
+    RetrieveDBResultsToDictList,
+    RetrieveSingleResultValue,
+    RunTimedActionQueryList,
+    SplitSQLStatements,
+    read_template_sql_file,
+)
 from testgen.common.credentials import get_tg_schema
 from testgen.common.database.database_service import replace_params
 from testgen.common.read_file import get_template_files
 
 LOG = logging.getLogger("testgen")
 
+# Refreshed after every upgrade, skipped when the rendered script and the schema did not change since the last run
+STATIC_REFRESH_SCRIPTS = [
+    "050_populate_new_schema_metadata.sql",  # Static metadata -- shouldn't affect user data
+    "060_create_standard_views.sql",
+    "075_grant_role_rights.sql",
+]
+INDEX_BUILD_MAX_THREADS = 4
+POSTGRES_MAX_IDENTIFIER_LENGTH = 63
+SLOWEST_STATEMENTS_REPORTED = 10
+
+# Plain index builds are taken out of the script transaction and run with CONCURRENTLY, so they don't lock the table
+# UNIQUE indexes stay in the transaction (later statements may rely on them), and so do explicit ON ONLY statements
+_INDEX_STATEMENT_PATTERN = re.compile(
+    r"^CREATE\s+INDEX\s+(?!CONCURRENTLY\b)(?:IF\s+NOT\s+EXISTS\s+)?(?P<index>[\w.\"]+)\s+ON\s+(?!ONLY\b)(?P<table>[\w.\"]+)",
+    flags=re.IGNORECASE,
+)
+
 
 def _get_params_mapping() -> dict:
     return {
@@ -55,71 +83,258 @@ def _get_upgrade_scripts(sub_directory: str, params_mapping: dict, mask: str = r
     files = sorted(get_template_files(mask=mask, sub_directory=sub_directory), key=lambda key: str(key))
 
     max_prefix = ""
-    queries = []
+    scripts = []
     for file in files:
         if file.name > min_val:
             template = file.read_text("utf-8")
             query = replace_params(template, params_mapping)
-            queries.append(query)
+            scripts.append((file.name, query))
             max_prefix = file.name[0:4]
 
-    if len(queries) == 0:
+    if len(scripts) == 0:
         LOG.debug(f"No sql files were found for the mask {mask} in subdirectory {sub_directory}")
 
-    return queries, max_prefix
+    return scripts, max_prefix
+
+
+def _get_checksum(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _get_upgrade_log(params_mapping) -> tuple[dict[str, str], set[str]]:
+    # Returns the checksum of each applied script, and the scripts whose statements were committed but whose
+    # concurrent index builds did not all succeed
+    strQuery = replace_params(read_template_sql_file("create_upgrade_log.sql", "dbupgrade_helpers"), params_mapping)
+    _run_admin_queries(params_mapping, [strQuery])
+
+    strQuery = replace_params(read_template_sql_file("get_upgrade_log.sql", "dbupgrade_helpers"), params_mapping)
+    lstLog = RetrieveDBResultsToDictList("DKTG", strQuery)
+    applied_checksums = {row["script_name"]: row["checksum"] for row in lstLog}
+    pending_index_scripts = {row["script_name"] for row in lstLog if row["index_builds_pending"]}
+    return applied_checksums, pending_index_scripts
 
 
-def _execute_upgrade_scripts(params_mapping, lstScripts):
+def _get_upgrade_log_query(
+    params_mapping, script_name: str, checksum: str, duration: float, index_builds_pending: bool = False
+) -> str:
+    strQuery = read_template_sql_file("set_upgrade_log_entry.sql", "dbupgrade_helpers")
+    strQuery = strQuery.replace("{SCRIPT_NAME}", script_name)
+    strQuery = strQuery.replace("{CHECKSUM}", checksum)
+    strQuery = strQuery.replace("{DURATION_MS}", str(int(duration * 1000)))
+    strQuery = strQuery.replace("{INDEX_BUILDS_PENDING}", "TRUE" if index_builds_pending else "FALSE")
+    return replace_params(strQuery, params_mapping)
+
+
+def _get_revision_query(params_mapping, revision_prefix: str) -> str:
+    strQuery = read_template_sql_file("080_set_current_revision.sql", "dbsetup")
+    strQuery = strQuery.replace("{DB_REVISION}", str(int(revision_prefix)))
+    return replace_params(strQuery, params_mapping)
+
+
+def _run_admin_queries(params_mapping, lstQueries, autocommit=False) -> list[float]:
     # Run scripts using admin credentials
-    RunActionQueryList(
+    return RunTimedActionQueryList(
         "DKTG",
-        lstScripts,
+        lstQueries,
         "S",
         user_override=params_mapping["TESTGEN_ADMIN_USER"],
         pwd_override=params_mapping["TESTGEN_ADMIN_PASSWORD"],
+        autocommit=autocommit,
     )
-    return True
 
 
-def _refresh_static_metadata(params_mapping):
-    # Refresh static metadata -- shouldn't affect user data
-    strQueryMetadata = read_template_sql_file("050_populate_new_schema_metadata.sql", "dbsetup")
-    strQueryMetadata = replace_params(strQueryMetadata, params_mapping)
-    # Recreate standard views
-    strQueryViews = read_template_sql_file("060_create_standard_views.sql", "dbsetup")
-    strQueryViews = replace_params(strQueryViews, params_mapping)
-    # Reassign rights to standard roles
-    strQueryRights = read_template_sql_file("075_grant_role_rights.sql", "dbsetup")
-    strQueryRights = replace_params(strQueryRights, params_mapping)
+def _describe_statement(statement: str) -> str:
+    description = CleanSQL(statement)
+    return description if len(description) <= 100 else f"{description[:97]}..."
 
-    RunActionQueryList(
-        "DKTG",
-        [strQueryMetadata, strQueryViews, strQueryRights],
-        "S",
-        user_override=params_mapping["TESTGEN_ADMIN_USER"],
-        pwd_override=params_mapping["TESTGEN_ADMIN_PASSWORD"],
-    )
 
+def _split_index_builds(query: str) -> tuple[list[str], list[tuple[str, str, str]]]:
+    statements = []
+    index_builds = []
+    for statement in SplitSQLStatements(query):
+        if match := _INDEX_STATEMENT_PATTERN.match(CleanSQL(statement)):
+            # The columns, method and predicate of the index, which its partition indexes share
+            definition = CleanSQL(statement)[match.end():].strip().rstrip(";")
+            index_builds.append((match.group("table"), match.group("index"), definition))
+        else:
+            statements.append(statement)
+    return statements, index_builds
 
-def _update_revision_number(params_mapping, latest_prefix_applied):
-    # Update extant revision number to highest script prefix applied
-    strQuery = read_template_sql_file("080_set_current_revision.sql", "dbsetup")
-    strQuery = strQuery.replace("{DB_REVISION}", str(int(latest_prefix_applied)))
-    strQuery = replace_params(strQuery, params_mapping)
 
-    RunActionQueryList(
-        "DKTG",
-        [strQuery],
-        "S",
-        user_override=params_mapping["TESTGEN_ADMIN_USER"],
-        pwd_override=params_mapping["TESTGEN_ADMIN_PASSWORD"],
+def _get_partitioned_tables(params_mapping) -> set[str]:
+    strQuery = replace_params(read_template_sql_file("get_partitioned_tables.sql", "dbupgrade_helpers"), params_mapping)
+    return {row["table_name"] for row in RetrieveDBResultsToDictList("DKTG", strQuery)}
+
+
+def _get_partition_indexes(params_mapping, table_name: str, index_name: str) -> list[dict]:
+    strQuery = replace_params(
+        read_template_sql_file("get_partition_indexes.sql", "dbupgrade_helpers"),
+        {**params_mapping, "TABLE_NAME": table_name, "INDEX_NAME": index_name},
     )
+    return RetrieveDBResultsToDictList("DKTG", strQuery)
+
+
+def _get_partition_index_name(index_name: str, partition_name: str) -> str:
+    partition_index_name = f"{index_name}_{partition_name}"
+    if len(partition_index_name) > POSTGRES_MAX_IDENTIFIER_LENGTH:
+        # Postgres would truncate the name, so it is kept unique with a hash of the partition instead
+        suffix = hashlib.sha256(partition_name.encode()).hexdigest()[:8]
+        partition_index_name = f"{index_name[:POSTGRES_MAX_IDENTIFIER_LENGTH - len(suffix) - 1]}_{suffix}"
+    return partition_index_name
+
+
+def _build_indexes_concurrently(params_mapping, index_builds) -> list[tuple[str, float]]:
+    if not index_builds:
+        return []
+
+    schema_name = params_mapping["SCHEMA_NAME"]
+    partitioned_tables = _get_partitioned_tables(params_mapping)
+
+    def _run_build(statement: str, index_name: str) -> float:
+        try:
+            return _run_admin_queries(params_mapping, [f"SET SEARCH_PATH TO {schema_name};", statement], autocommit=True)[-1]
+        except Exception:
+            # A failed concurrent build leaves an INVALID index behind, which IF NOT EXISTS would skip on retry
+            LOG.exception(f"Concurrent index build failed: {statement}")
+            _run_admin_queries(params_mapping, [f"DROP INDEX CONCURRENTLY IF EXISTS {schema_name}.{index_name};"], autocommit=True)
+            raise
+
+    def _build_partitioned_index(table_name: str, index_name: str, definition: str) -> list[tuple[str, float]]:
+        # CONCURRENTLY is not supported on partitioned tables. The parent index is created ON ONLY the parent, which
+        # leaves it INVALID without touching the partitions. Each partition index is then built concurrently and attached,
+        # and the parent index turns valid once all the partitions have theirs. A resumed build skips the partitions
+        # already attached, so an upgrade that failed halfway through picks up where it stopped.
+        timings = []
+        statement = f"CREATE INDEX IF NOT EXISTS {index_name} ON ONLY {table_name} {definition};"
+        timings.append((statement, _run_admin_queries(params_mapping, [f"SET SEARCH_PATH TO {schema_name};", statement])[-1]))
+
+        for partition in _get_partition_indexes(params_mapping, table_name, index_name):
+            if partition["attached_index_name"]:
+                continue
+            partition_name = partition["partition_name"]
+            partition_index_name = _get_partition_index_name(index_name, partition_name)
+            if partition_index_name in (partition["invalid_index_names"] or []):
+                # Left behind by a build that was interrupted before it could clean up
+                _run_admin_queries(
+                    params_mapping,
+                    [f"DROP INDEX CONCURRENTLY IF EXISTS {schema_name}.{partition_index_name};"],
+                    autocommit=True,
+                )
+
+            statement = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index_name} ON {partition_name} {definition};"
+            timings.append((statement, _run_build(statement, partition_index_name)))
+
+            statement = f"ALTER INDEX {index_name} ATTACH PARTITION {partition_index_name};"
+            timings.append((statement, _run_admin_queries(params_mapping, [f"SET SEARCH_PATH TO {schema_name};", statement])[-1]))
+        return timings
+
+    def _build_table_indexes(builds):
+        timings = []
+        for table_name, index_name, definition in builds:
+            if table_name in partitioned_tables:
+                timings.extend(_build_partitioned_index(table_name, index_name, definition))
+            else:
+                # IF NOT EXISTS, so that resuming after a failed build skips the indexes already built
+                statement = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} {definition};"
+                timings.append((statement, _run_build(statement, index_name)))
+        return timings
+
+    # Builds on the same table conflict with each other, so they run in sequence while separate tables run in parallel
+    builds_by_table = defaultdict(list)
+    for table_name, index_name, definition in index_builds:
+        table_name = table_name.split(".")[-1].strip('"').lower()
+        index_name = index_name.split(".")[-1].strip('"')
+        builds_by_table[table_name].append((table_name, index_name, definition))
+
+    timings = []
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(INDEX_BUILD_MAX_THREADS, len(builds_by_table)))
+    ) as executor:
+        for future in [executor.submit(_build_table_indexes, builds) for builds in builds_by_table.values()]:
+            timings.extend(future.result())
+    return timings
+
+
+def _execute_upgrade_scripts(params_mapping, scripts, applied_checksums, pending_index_scripts) -> list[tuple[str, float]]:
+    timings = []
+    for script_name, query in scripts:
+        checksum = _get_checksum(query)
+        if applied_checksums.get(script_name) not in (None, checksum):
+            LOG.warning(f"Upgrade script {script_name} changed since it was last applied.")
+
+        statements, index_builds = _split_index_builds(query)
+        revision_query = _get_revision_query(params_mapping, script_name[0:4])
+
+        if script_name in pending_index_scripts:
+            # The statements were committed by a previous upgrade, which failed building the indexes
+            LOG.info(f"Resuming upgrade script {script_name}: {len(index_builds)} concurrent index builds")
+            script_timings = []
+        else:
+            LOG.info(
+                f"Applying upgrade script {script_name}: {len(statements)} statements, "
+                f"{len(index_builds)} concurrent index builds"
+            )
+            # The script and its checksum are committed together, and so is the revision number when there are no
+            # index builds. Otherwise, the log entry stays pending until the builds succeed: a failed build makes the
+            # next upgrade resume from them, without applying the statements again.
+            durations = _run_admin_queries(
+                params_mapping,
+                [
+                    *statements,
+                    _get_upgrade_log_query(params_mapping, script_name, checksum, 0, bool(index_builds)),
+                    *([] if index_builds else [revision_query]),
+                ],
+            )
+            script_timings = list(zip(statements, durations, strict=False))
+
+        script_timings.extend(_build_indexes_concurrently(params_mapping, index_builds))
+
+        script_duration = sum(duration for _, duration in script_timings)
+        _run_admin_queries(
+            params_mapping,
+            [
+                _get_upgrade_log_query(params_mapping, script_name, checksum, script_duration),
+                *([revision_query] if index_builds else []),
+            ],
+        )
+        LOG.info(f"Upgrade script {script_name} applied in {script_duration:.2f}s")
+
+        timings.extend((f"{script_name}: {_describe_statement(statement)}", duration) for statement, duration in script_timings)
+    return timings
+
+
+def _refresh_static_metadata(params_mapping, applied_checksums, force: bool) -> list[tuple[str, float]]:
+    timings = []
+    for script_name in STATIC_REFRESH_SCRIPTS:
+        query = replace_params(read_template_sql_file(script_name, "dbsetup"), params_mapping)
+        checksum = _get_checksum(query)
+        if not force and applied_checksums.get(script_name) == checksum:
+            LOG.info(f"Skipping {script_name}: unchanged since the last refresh")
+            continue
+
+        durations = _run_admin_queries(
+            params_mapping,
+            [query, _get_upgrade_log_query(params_mapping, script_name, checksum, 0)],
+        )
+        _run_admin_queries(params_mapping, [_get_upgrade_log_query(params_mapping, script_name, checksum, durations[0])])
+        LOG.info(f"Refreshed {script_name} in {durations[0]:.2f}s")
+        timings.append((script_name, durations[0]))
+    return timings
+
+
+def _report_timings(timings: list[tuple[str, float]]) -> None:
+    if not timings:
+        return
+    LOG.info(f"Upgrade statements: {len(timings)}, total time: {sum(duration for _, duration in timings):.2f}s")
+    for description, duration in sorted(timings, key=lambda item: item[1], reverse=True)[:SLOWEST_STATEMENTS_REPORTED]:
+        LOG.info(f"  {duration:>9.2f}s  {description}")
 
 
 def run_upgrade_db_config() -> bool:
     LOG.info("Running run_upgrade_db_config")
 
     params_mapping = _get_params_mapping()
+    applied_checksums, pending_index_scripts = _get_upgrade_log(params_mapping)
 
     # Look for prefix one higher than last revision extant in db
     strNextPrefix = _format_revision_prefix(_get_next_revision_prefix(params_mapping))
@@ -127,18 +342,17 @@ def run_upgrade_db_config() -> bool:
     upgrade_dir = _get_upgrade_template_directory()
 
     # Retrieve and execute upgrade scripts, if any
-    lstQueries, max_prefix = _get_upgrade_scripts(upgrade_dir, params_mapping, min_val=strNextPrefix)
-    LOG.info(f"Updating db config qty of queries: {len(lstQueries)}. New prefix: {max_prefix}. Queries: {lstQueries}")
-    if len(lstQueries) > 0:
-        has_been_upgraded = _execute_upgrade_scripts(params_mapping, lstQueries)
-    else:
-        has_been_upgraded = False
+    lstScripts, max_prefix = _get_upgrade_scripts(upgrade_dir, params_mapping, min_val=strNextPrefix)
+    LOG.info(f"Updating db config qty of scripts: {len(lstScripts)}. New prefix: {max_prefix}. Scripts: {[name for name, _ in lstScripts]}")
+    # Each script updates the revision number once applied with its indexes, so a failure resumes from the failed script
+    timings = _execute_upgrade_scripts(params_mapping, lstScripts, applied_checksums, pending_index_scripts)
+    has_been_upgraded = len(lstScripts) > 0
 
-    _refresh_static_metadata(params_mapping)
+    # Views and grants are recreated whenever the schema changed
+    timings.extend(_refresh_static_metadata(params_mapping, applied_checksums, force=has_been_upgraded))
+    _report_timings(timings)
 
     if has_been_upgraded:
-        # Update revision number to max prefix found in update scripts
-        _update_revision_number(params_mapping, max_prefix)
         LOG.info("Application data was successfully upgraded, and static metadata was refreshed.")
     else:
         LOG.info("Database upgrade was not required. Static metadata was refreshed.")
@@ -152,5 +366,5 @@ def is_db_revision_up_to_date():
     upgrade_dir = _get_upgrade_template_directory()
 
     # Retrieve and execute upgrade scripts, if any
-    lstQueries, max_prefix = _get_upgrade_scripts(upgrade_dir, params_mapping, min_val=strNextPrefix)
-    return len(lstQueries) == 0
+    lstScripts, max_prefix = _get_upgrade_scripts(upgrade_dir, params_mapping, min_val=strNextPrefix)
+    return len(lstScripts) == 0
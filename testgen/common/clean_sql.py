@@ -1,4 +1,4 @@
-__all__ = ["AddQuotesToIdentifierCSV", "CleanSQL", "ConcatColumnList"]
+__all__ = ["AddQuotesToIdentifierCSV", "CleanSQL", "ConcatColumnList", "SplitSQLStatements"]
 
 import re
 
@@ -51,3 +51,33 @@ def ConcatColumnList(str_column_list, str_null_value):
         else:
             str_expression = str_column_list
     return str_expression
+
+
+def SplitSQLStatements(strInput: str) -> list[str]:
+    # Splits a script on top-level semicolons, skipping the ones inside quotes, comments and $tag$ bodies
+    lstStatements = []
+    intStart = 0
+    i = 0
+    n = len(strInput)
+    while i < n:
+        c = strInput[i]
+        if c in "'\"":
+            i = strInput.find(c, i + 1)
+            i = n if i == -1 else i + 1
+        elif strInput.startswith("--", i):
+            i = strInput.find("\n", i)
+            i = n if i == -1 else i + 1
+        elif strInput.startswith("/*", i):
+            i = strInput.find("*/", i + 2)
+            i = n if i == -1 else i + 2
+        elif c == "$" and (match := re.match(r"\$[A-Za-z_]?\w*\$", strInput[i:])):
+            i = strInput.find(match.group(), i + len(match.group()))
+            i = n if i == -1 else i + len(match.group())
+        elif c == ";":
+            lstStatements.append(strInput[intStart : i + 1])
+            i += 1
+            intStart = i
+        else:
+            i += 1
+    lstStatements.append(strInput[intStart:])
+    return [stmt.strip() for stmt in lstStatements if CleanSQL(stmt).strip(" ;")]
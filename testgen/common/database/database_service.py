@@ -1,16 +1,24 @@
 import concurrent.futures
+import contextvars
 import csv
 import importlib
 import logging
 import queue as qu
+import signal
 import threading
+import time
+from collections.abc import Iterable, Iterator
 from contextlib import suppress
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
 from urllib.parse import quote_plus
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 
 from testgen import settings
+from testgen.common import run_telemetry
 from testgen.common.credentials import (
     get_tg_db,
     get_tg_host,
@@ -20,11 +28,35 @@ from testgen.common.credentials import (
     get_tg_username,
 )
 from testgen.common.database import FilteredStringIO
+from testgen.common.database.flavor.flavor_service import FlavorService
 from testgen.common.encrypt import DecryptText
 from testgen.common.read_file import get_template_files
 
 LOG = logging.getLogger("testgen")
 
+# Adaptive concurrency of RunThreadedRetrievalQueryList
+ADAPTIVE_INITIAL_THREADS = 4
+ADAPTIVE_LATENCY_TOLERANCE = 2.0
+ADAPTIVE_LATENCY_SMOOTHING = 0.2
+
+# Rows fetched from a streamed result, or written by a single COPY, at a time
+STREAM_BATCH_SIZE = 10000
+
+# Queries running on target databases, by cursor, to cancel them on the server when the run is cancelled
+_dctInFlightQueries: dict[int, tuple] = {}
+_lockInFlightQueries = threading.Lock()
+_evtRunCancelled = threading.Event()
+
+
+class RunCancelledError(Exception):
+    pass
+
+
+def _submit_in_context(executor: concurrent.futures.Executor, fn, *args) -> concurrent.futures.Future:
+    # Worker threads don't inherit context variables: each task runs in a copy of the caller's context, so that its
+    # statements count towards the telemetry of the caller's run
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
 
 class CConnectParms:
     connectname = ""
@@ -76,6 +108,67 @@ def empty_cache():
     dctDBEngines = {}
 
 
+def _track_target_query(flavor_service, conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+    with _lockInFlightQueries:
+        _dctInFlightQueries[id(cursor)] = (flavor_service, conn.connection.dbapi_connection, cursor)
+
+
+def _untrack_target_query(conn, cursor, *args):  # noqa: ARG001
+    with _lockInFlightQueries:
+        _dctInFlightQueries.pop(id(cursor), None)
+
+
+def _untrack_failed_target_query(exception_context):
+    if exception_context.cursor is not None:
+        _untrack_target_query(exception_context.connection, exception_context.cursor)
+
+
+def cancel_target_queries():
+    """
+    Cancels the run: queries running on the target database are cancelled on the server, the threaded queries that
+    haven't started are skipped, and any later target query raises RunCancelledError. Results of the queries that
+    already finished are returned as usual, so that they can be saved.
+    """
+    _evtRunCancelled.set()
+    with _lockInFlightQueries:
+        lstInFlight = list(_dctInFlightQueries.values())
+
+    LOG.info("Cancelling run: %s queries in progress on the target database", len(lstInFlight))
+    for flavor_service, dbapi_connection, cursor in lstInFlight:
+        try:
+            flavor_service.cancel_query(dbapi_connection, cursor)
+        except Exception:
+            LOG.warning("Failed to cancel query on the target database", exc_info=True)
+
+
+def is_run_cancelled() -> bool:
+    return _evtRunCancelled.is_set()
+
+
+def raise_if_run_cancelled():
+    # Called between the steps of a run, so that it stops after the current step even when that step only uses the
+    # TestGen database
+    if _evtRunCancelled.is_set():
+        raise RunCancelledError("The run was cancelled")
+
+
+def get_run_cancelled_message(strExceptionMessage: str) -> str:
+    # The exception message of a cancelled run, which the run record updates turn into the Cancelled status
+    if not _evtRunCancelled.is_set() or RunCancelledError.__name__ in strExceptionMessage:
+        return strExceptionMessage
+    return f"{strExceptionMessage} {RunCancelledError.__name__}: The run was cancelled".strip()
+
+
+def install_cancel_handler():
+    # process_service.kill_process sends SIGTERM to cancel a run: its queries are cancelled instead of exiting
+    # mid-query, the run stops after the current step, and its record is updated with the Cancelled status
+    def _on_terminate(signum, frame):  # noqa: ARG001
+        LOG.warning("Run cancellation requested")
+        threading.Thread(target=cancel_target_queries, name="cancel-target-queries").start()
+
+    signal.signal(signal.SIGTERM, _on_terminate)
+
+
 def AssignConnectParms(
     projectcode,
     connectid,
@@ -96,6 +189,21 @@ def AssignConnectParms(
 ):
     global clsConnectParms
 
+    lstNewParms = [
+        connectname, projectcode, connectid, host, port, dbname, schema, user, flavor, password, url, connect_by_url,
+        connect_by_key, private_key, private_key_passphrase, http_path,
+    ]
+    lstOldParms = [
+        clsConnectParms.connectname, clsConnectParms.projectcode, clsConnectParms.connectid, clsConnectParms.hostname,
+        clsConnectParms.port, clsConnectParms.dbname, clsConnectParms.schemaname, clsConnectParms.username,
+        clsConnectParms.sql_flavor, clsConnectParms.password, clsConnectParms.url, clsConnectParms.connect_by_url,
+        clsConnectParms.connect_by_key, clsConnectParms.private_key, clsConnectParms.private_key_passphrase,
+        clsConnectParms.http_path,
+    ]
+    if lstNewParms != lstOldParms and connectname in dctDBEngines:
+        # The engine was created for other parameters, e.g. by the previous table group profiled in this process
+        dctDBEngines.pop(connectname).dispose()
+
     clsConnectParms.connectname = connectname
     clsConnectParms.projectcode = projectcode
     clsConnectParms.connectid = connectid
@@ -213,6 +321,9 @@ def get_flavor_service(flavor):
 
 
 def _InitDBConnection(strCredentialSet, strRaw="N", strAdmin="N", user_override=None, pwd_override=None):
+    if strCredentialSet != "DKTG" and _evtRunCancelled.is_set():
+        raise RunCancelledError("The run was cancelled")
+
     # Get DB Credentials
     dctCredentials = _GetDBCredentials(strCredentialSet)
 
@@ -265,6 +376,7 @@ def _InitDBConnection_appdb(
         try:
             # Timeout in seconds:  1 hour = 60 * 60 second = 3600
             dbEngine = create_engine(strConnect, connect_args={"connect_timeout": 3600})
+            run_telemetry.register_metadata_engine(dbEngine)
             dctDBEngines[strCredentialSet] = dbEngine
 
         except SQLAlchemyError as e:
@@ -292,6 +404,14 @@ def _InitDBConnection_appdb(
     return con
 
 
+def _SetQueryTimeout(flavor_service, dbapi_connection):
+    if settings.TARGET_QUERY_TIMEOUT_SECONDS > 0:
+        try:
+            flavor_service.set_query_timeout(dbapi_connection, settings.TARGET_QUERY_TIMEOUT_SECONDS)
+        except Exception:
+            LOG.warning("Failed to set the query timeout", exc_info=settings.IS_DEBUG)
+
+
 def _InitDBConnection_target_db(flavor_service, strCredentialSet, strRaw="N", user_override=None, pwd_override=None):
     # Get DBEngine using credentials
     if strCredentialSet in dctDBEngines:
@@ -318,7 +438,13 @@ def _InitDBConnection_target_db(flavor_service, strCredentialSet, strRaw="N", us
 
         try:
             # Timeout in seconds:  1 hour = 60 * 60 second = 3600
-            dbEngine = create_engine(strConnect, connect_args=connect_args)
+            # The pool must hold a connection for each concurrent query
+            dbEngine = create_engine(
+                strConnect, connect_args=connect_args, max_overflow=max(10, flavor_service.max_concurrency)
+            )
+            event.listen(dbEngine, "before_cursor_execute", partial(_track_target_query, flavor_service))
+            event.listen(dbEngine, "after_cursor_execute", _untrack_target_query)
+            event.listen(dbEngine, "handle_error", _untrack_failed_target_query)
             dctDBEngines[strCredentialSet] = dbEngine
 
         except SQLAlchemyError as e:
@@ -326,8 +452,11 @@ def _InitDBConnection_target_db(flavor_service, strCredentialSet, strRaw="N", us
 
     # Second, create a connection from our engine
     queries = flavor_service.get_pre_connection_queries()
+    if settings.TARGET_QUERY_TIMEOUT_SECONDS > 0:
+        queries = [*queries, *flavor_service.get_statement_timeout_queries(settings.TARGET_QUERY_TIMEOUT_SECONDS)]
     if strRaw == "N":
         connection = dbEngine.connect()
+        _SetQueryTimeout(flavor_service, connection.connection.dbapi_connection)
         for query in queries:
             try:
                 connection.execute(text(query))
@@ -339,6 +468,7 @@ def _InitDBConnection_target_db(flavor_service, strCredentialSet, strRaw="N", us
                 )
     else:
         connection = dbEngine.raw_connection()
+        _SetQueryTimeout(flavor_service, connection.dbapi_connection)
         with connection.cursor() as cur:
             for query in queries:
                 try:
@@ -418,6 +548,108 @@ def RunActionQueryList(strCredentialSet, lstQueries, strAdminNDS="N", user_overr
     return lstInsertedIds
 
 
+def RunTimedActionQueryList(
+    strCredentialSet, lstQueries, strAdminNDS="N", user_override=None, pwd_override=None, autocommit=False
+) -> list[float]:
+    # Runs the queries in a single transaction, or each on its own with autocommit (e.g. CREATE INDEX CONCURRENTLY)
+    # Returns the duration of each query in seconds
+    LOG.info("CurrentDB Operation: RunTimedActionQueryList. Creds: %s", strCredentialSet)
+
+    lstDurations = []
+    with _InitDBConnection(
+        strCredentialSet, strAdmin=strAdminNDS, user_override=user_override, pwd_override=pwd_override
+    ) as con:
+        if autocommit:
+            con = con.execution_options(isolation_level="AUTOCOMMIT")
+            for q in lstQueries:
+                LOG.debug(f"LastQuery = {q}")
+                start_time = time.perf_counter()
+                con.execute(text(q))
+                lstDurations.append(time.perf_counter() - start_time)
+        else:
+            with con.begin():
+                for q in lstQueries:
+                    LOG.debug(f"LastQuery = {q}")
+                    start_time = time.perf_counter()
+                    con.execute(text(q))
+                    lstDurations.append(time.perf_counter() - start_time)
+
+    return lstDurations
+
+
+@dataclass
+class ActionQueryStep:
+    """
+    An action query with the tables it reads and writes. Resources may be qualified, e.g. `profile_anomaly_results:ID`,
+    in which case they conflict with the unqualified name but not with other qualifiers.
+    """
+
+    name: str
+    query: str
+    reads: tuple[str, ...] = ()
+    writes: tuple[str, ...] = ()
+
+
+def _resources_conflict(lstResources: tuple[str, ...], lstOtherResources: tuple[str, ...]) -> bool:
+    for resource in lstResources:
+        for other in lstOtherResources:
+            if resource == other or resource.startswith(f"{other}:") or other.startswith(f"{resource}:"):
+                return True
+    return False
+
+
+def _get_step_dependencies(lstSteps: list[ActionQueryStep]) -> list[set[int]]:
+    # A step depends on every earlier step it conflicts with, so the result is the same as running them in order
+    lstDependencies = []
+    for i, step in enumerate(lstSteps):
+        lstDependencies.append({
+            j
+            for j, earlier in enumerate(lstSteps[:i])
+            if _resources_conflict(step.reads + step.writes, earlier.writes)
+            or _resources_conflict(step.writes, earlier.reads)
+        })
+    return lstDependencies
+
+
+def RunActionQueryDAG(strCredentialSet, lstSteps: list[ActionQueryStep], intMaxThreads: int) -> dict[str, float]:
+    # Runs independent steps concurrently, each in its own transaction, and the others once their dependencies are done
+    # Returns the duration of each step in seconds
+    LOG.info("CurrentDB Operation: RunActionQueryDAG. Creds: %s", strCredentialSet)
+
+    lstDependencies = _get_step_dependencies(lstSteps)
+    lstPending = list(range(len(lstSteps)))
+    setDone = set()
+    dctDurations = {}
+
+    def _run_step(step: ActionQueryStep) -> float:
+        with _InitDBConnection(strCredentialSet) as con:
+            LOG.debug(f"LastQuery = {step.query}")
+            start_time = time.perf_counter()
+            with con.begin():
+                con.execute(text(step.query))
+            return time.perf_counter() - start_time
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, intMaxThreads)) as executor:
+        dctRunning = {}
+        while lstPending or dctRunning:
+            for i in [i for i in lstPending if lstDependencies[i] <= setDone]:
+                lstPending.remove(i)
+                dctRunning[_submit_in_context(executor, _run_step, lstSteps[i])] = i
+
+            finished, _ = concurrent.futures.wait(dctRunning, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                i = dctRunning.pop(future)
+                try:
+                    dctDurations[lstSteps[i].name] = future.result()
+                except Exception:
+                    for running in dctRunning:
+                        running.cancel()
+                    raise
+                setDone.add(i)
+                LOG.info("(Processed step %s: %.2f s)", lstSteps[i].name, dctDurations[lstSteps[i].name])
+
+    return dctDurations
+
 
 def RunRetrievalQueryList(strCredentialSet, lstQueries):
     LOG.info("CurrentDB Operation: RunRetrievalQueryList. Creds: %s", strCredentialSet)
@@ -455,7 +687,7 @@ class _CThreadedFetch:
     def __call__(self, strQuery):
         colNames = None
         lstResult = None
-        booError = False
+        strError = None
 
         with self.count_lock:
             self.count += 1
@@ -469,58 +701,204 @@ class _CThreadedFetch:
                     if not colNames:
                         colNames = exQ.keys()
                     LOG.info("(Processed Threaded Query %s on thread %s)", i, threading.current_thread().name)
-                except Exception:
+                except Exception as e:
                     LOG.exception(f"Failed Query. LastQuery: {strQuery}")
-                    booError = True
+                    # The first line holds the database error, the rest is the query
+                    strError = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        except RunCancelledError:
+            return None, None, "Cancelled"
         except Exception as e:
             LOG.info("LastQuery: %s", strQuery)
             raise ValueError(f"Failed to execute threaded query: {e}") from e
         else:
-            return lstResult, colNames, booError
+            return lstResult, colNames, strError
+
+
+class _AdaptiveConcurrencyLimit:
+    """
+    Number of queries to run at once. It grows by one after each round of `limit` queries, is halved when queries fail,
+    and shrinks by a quarter when the latency of the last round rises well above its long-term average, a sign that
+    the database or warehouse is queueing the queries.
+    """
+
+    def __init__(self, intInitial: int, intMaximum: int):
+        self.maximum = max(1, intMaximum)
+        self.limit = max(1, min(intInitial, self.maximum))
+        self._lstRoundLatencies: list[float] = []
+        self._intRoundErrors = 0
+        self._fltLongTermLatency: float | None = None
+
+    def on_complete(self, fltSeconds: float, booError: bool) -> None:
+        self._lstRoundLatencies.append(fltSeconds)
+        self._intRoundErrors += booError
+        if len(self._lstRoundLatencies) < self.limit:
+            return
+
+        fltRoundLatency = sum(self._lstRoundLatencies) / len(self._lstRoundLatencies)
+        intPrevious = self.limit
+        if self._intRoundErrors:
+            self.limit = max(1, self.limit // 2)
+        elif self._fltLongTermLatency and fltRoundLatency > self._fltLongTermLatency * ADAPTIVE_LATENCY_TOLERANCE:
+            self.limit = max(1, self.limit - max(1, self.limit // 4))
+        else:
+            self.limit = min(self.maximum, self.limit + 1)
+        if self.limit != intPrevious:
+            LOG.debug("Concurrency limit changed from %s to %s", intPrevious, self.limit)
+
+        if self._fltLongTermLatency is None:
+            self._fltLongTermLatency = fltRoundLatency
+        else:
+            self._fltLongTermLatency += (fltRoundLatency - self._fltLongTermLatency) * ADAPTIVE_LATENCY_SMOOTHING
+        self._lstRoundLatencies = []
+        self._intRoundErrors = 0
 
 
-def RunThreadedRetrievalQueryList(strCredentialSet, lstQueries, intMaxThreads):
+def _GetConcurrencyBudget(strCredentialSet, intMaxThreads) -> int:
+    # The connection's max threads, within the limit of its flavor
+    if strCredentialSet == "PROJECT":
+        intCeiling = get_flavor_service(_GetDBCredentials(strCredentialSet)["dbtype"]).max_concurrency
+    else:
+        intCeiling = FlavorService.max_concurrency
+    if not intMaxThreads or intMaxThreads < 1:
+        intMaxThreads = settings.PROJECT_CONNECTION_MAX_THREADS
+    return min(intMaxThreads, intCeiling)
+
+
+class BatchedDBWriter:
+    """
+    Writes rows to a table of the TestGen database in batches of STREAM_BATCH_SIZE, as they are added, so that the
+    results of a run don't have to be held in memory until its end. Remaining rows are written when the writer exits.
+    """
+
+    def __init__(self, strDBTable: str, intBatchSize: int = STREAM_BATCH_SIZE):
+        self.strDBTable = strDBTable
+        self.intBatchSize = intBatchSize
+        self.lstColumns = None
+        self.row_count = 0
+        self._lstBuffer = []
+
+    def add(self, lstRows, lstColumns) -> None:
+        if self.lstColumns is None:
+            self.lstColumns = list(lstColumns)
+        self._lstBuffer.extend(lstRows)
+        self.row_count += len(lstRows)
+        if len(self._lstBuffer) >= self.intBatchSize:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lstBuffer:
+            WriteListToDB("DKTG", self._lstBuffer, self.lstColumns, self.strDBTable)
+            self._lstBuffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        # Rows already retrieved are saved even when the run fails or is cancelled
+        self.flush()
+
+
+def RunThreadedRetrievalQueryList(
+    strCredentialSet,
+    lstQueries,
+    intMaxThreads,
+    spinner=None,
+    lstCosts=None,
+    dctErrors: dict | None = None,
+    clsWriter: BatchedDBWriter | None = None,
+):
+    # Queries with a higher estimated cost run first, so that the largest tables don't become the tail of the run.
+    # Results are returned in the order of lstQueries. When dctErrors is given, it gets the error of each failed or
+    # cancelled query, by its index in lstQueries. When clsWriter is given, results are passed to it as each query
+    # finishes, in no particular order, instead of being returned.
     LOG.info("CurrentDB Operation: RunThreadedRetrievalQueryList. Creds: %s", strCredentialSet)
+    if strCredentialSet != "DKTG" and _evtRunCancelled.is_set():
+        raise RunCancelledError("The run was cancelled")
 
-    lstResults = []
-    colNames = []
     intErrors = 0
+    colNames = []
+    lstSlots: list[list | None] = [None] * len(lstQueries)
 
-    if intMaxThreads is None:
-        intMaxThreads = 4
-    elif intMaxThreads < 1 or intMaxThreads > 10:
-        intMaxThreads = 4
+    intBudget = _GetConcurrencyBudget(strCredentialSet, intMaxThreads)
+    if settings.PROJECT_CONNECTION_ADAPTIVE_THREADS:
+        clsLimit = _AdaptiveConcurrencyLimit(ADAPTIVE_INITIAL_THREADS, intBudget)
+    else:
+        clsLimit = _AdaptiveConcurrencyLimit(intBudget, intBudget)
+    LOG.info("Running %s queries with up to %s threads", len(lstQueries), intBudget)
 
+    lstOrder = list(range(len(lstQueries)))
+    if lstCosts:
+        lstOrder.sort(key=lambda i: lstCosts[i] or 0, reverse=True)
     qq = qu.Queue()
-
-    for query in lstQueries:
-        qq.put(query)
+    for i in lstOrder:
+        qq.put(i)
 
     # Initialize count and lock
     count_lock = threading.Lock()
 
     clsThreadedFetch = _CThreadedFetch(strCredentialSet, count_lock)
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=intMaxThreads) as executor:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=intBudget) as executor:
+        dctPending = {}
+        intCurrent = None
+        blnWriting = False
         try:
-            futures = []
-            while not qq.empty():
-                query = qq.get()
-                futures.append(executor.submit(clsThreadedFetch, query))
-
-            for future in futures:
-                lstOneResult, colName, booError = future.result()
-                # if spinner:
-                #     spinner.next()
-                intErrors += 1 if booError else 0
-                if lstOneResult:
-                    lstResults.append(lstOneResult)
-                    colNames = colName
+            while True:
+                # No new queries start once the run is cancelled
+                while not qq.empty() and len(dctPending) < clsLimit.limit and not _evtRunCancelled.is_set():
+                    i = qq.get()
+                    dctPending[_submit_in_context(executor, clsThreadedFetch, lstQueries[i])] = (i, time.perf_counter())
+                if not dctPending:
+                    break
+
+                setDone, _ = concurrent.futures.wait(dctPending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in setDone:
+                    i, fltStartTime = dctPending.pop(future)
+                    intCurrent = i
+                    lstOneResult, colName, strError = future.result()
+                    clsLimit.on_complete(time.perf_counter() - fltStartTime, strError is not None)
+                    if spinner:
+                        spinner.next()
+                    if strError is not None:
+                        intCurrent = None
+                        intErrors += 1
+                        if dctErrors is not None:
+                            dctErrors[i] = strError
+                    if lstOneResult:
+                        colNames = colName
+                        if clsWriter:
+                            blnWriting = True
+                            clsWriter.add(lstOneResult, colName)
+                            blnWriting = False
+                        else:
+                            lstSlots[i] = lstOneResult
+                    intCurrent = None
 
-        except Exception:
+        except Exception as e:
             LOG.exception("Failed to execute threaded queries")
-
-    lstResults = [element for sublist in lstResults for element in sublist]
+            # The query being processed and the ones still running are counted as failed, their results are dropped
+            lstFailed = [intCurrent] if intCurrent is not None else []
+            for future, (j, _) in dctPending.items():
+                future.cancel()
+                lstFailed.append(j)
+            for j in lstFailed:
+                intErrors += 1
+                if dctErrors is not None:
+                    dctErrors[j] = f"Failed: {e}"
+            # The results buffered by the writer are lost, so its failure fails the whole list
+            if blnWriting:
+                raise
+
+    # Queries left over after a cancellation or a failure
+    if not qq.empty():
+        LOG.warning("%s queries were not run", qq.qsize())
+    while not qq.empty():
+        i = qq.get()
+        intErrors += 1
+        if dctErrors is not None:
+            dctErrors[i] = "Cancelled" if _evtRunCancelled.is_set() else "Not run"
+
+    lstResults = [element for sublist in lstSlots if sublist for element in sublist]
 
     return lstResults, colNames, intErrors
 
@@ -539,6 +917,22 @@ def RetrieveDBResultsToList(strCredentialSet, strRunSQL):
         return lstResults, colNames
 
 
+def StreamDBResults(strCredentialSet, strRunSQL, intBatchSize=STREAM_BATCH_SIZE) -> Iterator[list]:
+    # Yields the rows in batches, fetched with a server-side cursor where the driver supports one, so that large
+    # results are never held in memory at once. Rows are addressable by position, by attribute or through _mapping.
+    # The connection stays open until the generator is exhausted or closed.
+    LOG.info("CurrentDB Operation: StreamDBResults. Creds: %s", strCredentialSet)
+
+    with _InitDBConnection(strCredentialSet) as con:
+        LOG.debug("Last Query='%s'", strRunSQL)
+        exQ = con.execution_options(stream_results=True).execute(text(strRunSQL))
+        intRows = 0
+        for lstBatch in exQ.partitions(intBatchSize):
+            intRows += len(lstBatch)
+            yield lstBatch
+        LOG.debug("%s records retrieved.", intRows)
+
+
 def RetrieveDBResultsToDictList(strCredentialSet, strRunSQL):
     LOG.info("CurrentDB Operation: RetrieveDBResultsToDictList. Creds: %s", strCredentialSet)
     LOG.info("(Processing Query)")
@@ -579,27 +973,40 @@ def RetrieveSingleResultValue(strCredentialSet, strRunSQL):
             LOG.debug("Single result NOT retrieved.")
 
 
+def _IterBatches(lstData: Iterable, intBatchSize: int) -> Iterator[list]:
+    itData = iter(lstData)
+    while lstBatch := list(islice(itData, intBatchSize)):
+        yield lstBatch
+
+
 def WriteListToDB(strCredentialSet, lstData, lstColumns, strDBTable):
+    # lstData can be any iterable of rows, e.g. a generator: it is written in batches of STREAM_BATCH_SIZE rows,
+    # within a single transaction, so only one batch is held in memory at a time
     LOG.info("CurrentDB Operation: WriteListToDB. Creds: %s", strCredentialSet)
-    LOG.debug("(Processing ingestion query: %s records)", lstData)
 
     # List should have same column names as destination table, though not all columns in table are required
     # Use COPY for DKTG database, otherwise executemany()
     con = _InitDBConnection(strCredentialSet, "Y")
     cur = con.cursor()
+    intRows = 0
     if strCredentialSet == "DKTG":
-        # Write List to CSV in memory
-        sio = FilteredStringIO(["\x00"])
-        writer = csv.writer(sio, quoting=csv.QUOTE_MINIMAL)
-        writer.writerows(lstData)
-        sio.seek(0)
-
         # Get list of column names for COPY statement
         strColumnNames = ", ".join(lstColumns)
         strCopySQL = f"COPY {strDBTable} ({strColumnNames}) FROM STDIN WITH (FORMAT CSV)"
         LOG.debug("Last Query='%s'", strCopySQL)
 
-        cur.copy_expert(strCopySQL, sio)
+        for lstBatch in _IterBatches(lstData, STREAM_BATCH_SIZE):
+            # Write batch to CSV in memory
+            sio = FilteredStringIO(["\x00"])
+            writer = csv.writer(sio, quoting=csv.QUOTE_MINIMAL)
+            writer.writerows(lstBatch)
+            intBytes = sio.tell()
+            sio.seek(0)
+
+            start_time = time.perf_counter()
+            cur.copy_expert(strCopySQL, sio)
+            run_telemetry.record_statement(time.perf_counter() - start_time, len(lstBatch), intBytes, True)
+            intRows += len(lstBatch)
         con.commit()
     else:
         # Get list of column names and column names formatted as parms
@@ -607,15 +1014,16 @@ def WriteListToDB(strCredentialSet, lstData, lstColumns, strDBTable):
         lstColumnParms = [":" + column_name for column_name in lstColumns]
         strColumnParms = ", ".join(lstColumnParms)
 
-        # Prep data as list of dictionaries
-        lstRowDicts = [dict(row) for row in lstData]
-
         strInsertSQL = "INSERT INTO " + strDBTable + "(" + strColumnNames + ")" + " VALUES (" + strColumnParms + ")"
         LOG.debug("Last Query='%s'", strInsertSQL)
 
-        exQ = con.execute(text(strInsertSQL), lstRowDicts)
+        for lstBatch in _IterBatches(lstData, STREAM_BATCH_SIZE):
+            # Prep data as list of dictionaries
+            lstRowDicts = [dict(row) for row in lstBatch]
+            con.execute(text(strInsertSQL), lstRowDicts)
+            intRows += len(lstBatch)
         con.commit()
-        LOG.debug("%s records saved", exQ.rowcount)
+    LOG.debug("%s records saved", intRows)
     con.close()
 
 
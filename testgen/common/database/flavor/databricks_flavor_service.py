@@ -4,6 +4,10 @@ from testgen.common.database.flavor.flavor_service import FlavorService
 
 
 class DatabricksFlavorService(FlavorService):
+
+    # Warehouses queue the queries beyond their own concurrency, rather than slowing down
+    max_concurrency = 50
+
     def __init__(self):
         self.http_path = None
 
@@ -21,5 +25,8 @@ class DatabricksFlavorService(FlavorService):
     def get_pre_connection_queries(self):
         return []
 
+    def get_statement_timeout_queries(self, timeout_seconds: int) -> list[str]:
+        return [f"SET STATEMENT_TIMEOUT = {timeout_seconds}"]
+
     def get_connect_args(self, is_password_overwritten: bool = False):  # NOQA ARG002
         return {}
@@ -19,6 +19,8 @@ class FlavorService:
     private_key_passphrase = None
     http_path = None
     catalog = None
+    # Upper limit of concurrent queries, whatever the maximum threads of the connection
+    max_concurrency = 10
 
     def init(self, connection_params: dict):
         self.url = connection_params.get("url", None)
@@ -60,6 +62,17 @@ class FlavorService:
     def get_concat_operator(self):
         return "||"
 
+    def get_statement_timeout_queries(self, timeout_seconds: int) -> list[str]:  # NOQA ARG002
+        return []
+
+    def set_query_timeout(self, dbapi_connection, timeout_seconds: int) -> None:  # NOQA ARG002
+        # For drivers that enforce the timeout on the client, instead of a session setting
+        pass
+
+    def cancel_query(self, dbapi_connection, cursor) -> None:  # NOQA ARG002
+        # Sends a cancel to the server for the query running on the cursor
+        cursor.cancel()
+
     def get_connection_string(self, strPW, is_password_overwritten: bool = False):
         if self.connect_by_url:
             header = self.get_connection_string_head(strPW)
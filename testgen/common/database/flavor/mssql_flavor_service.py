@@ -30,5 +30,12 @@ class MssqlFlavorService(FlavorService):
             "SET TRANSACTION ISOLATION LEVEL READ UNCOMMITTED;",
         ]
 
+    def get_statement_timeout_queries(self, timeout_seconds: int) -> list[str]:
+        return [f"SET LOCK_TIMEOUT {timeout_seconds * 1000};"]
+
+    def set_query_timeout(self, dbapi_connection, timeout_seconds: int) -> None:
+        # SQL Server has no statement timeout setting, pyodbc cancels the query when it times out
+        dbapi_connection.timeout = timeout_seconds
+
     def get_concat_operator(self):
         return "+"
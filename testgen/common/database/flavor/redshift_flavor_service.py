@@ -23,5 +23,12 @@ class RedshiftFlavorService(FlavorService):
             "SET SEARCH_PATH = '" + self.dbschema + "'",
         ]
 
+    def get_statement_timeout_queries(self, timeout_seconds: int) -> list[str]:
+        return [f"SET statement_timeout = {timeout_seconds * 1000}"]
+
+    def cancel_query(self, dbapi_connection, cursor) -> None:  # NOQA ARG002
+        # psycopg2 cancels the running query of the connection, not of the cursor
+        dbapi_connection.cancel()
+
     def get_connect_args(self, is_password_overwritten: bool = False):  # NOQA ARG002
         return {}
@@ -1,18 +1,21 @@
 from urllib.parse import quote_plus
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-
 from testgen.common.database.flavor.flavor_service import FlavorService
 
 
 class SnowflakeFlavorService(FlavorService):
 
+    # Warehouses queue the queries beyond their own concurrency, rather than slowing down
+    max_concurrency = 50
+
     def get_connect_args(self, is_password_overwritten: bool = False):
         connect_args = super().get_connect_args(is_password_overwritten)
 
         if self.connect_by_key and not is_password_overwritten:
             # https://docs.snowflake.com/en/developer-guide/python-connector/sqlalchemy#key-pair-authentication-support
+            from cryptography.hazmat.backends import default_backend
+            from cryptography.hazmat.primitives import serialization
+
             private_key_passphrase = self.private_key_passphrase.encode() if self.private_key_passphrase else None
             private_key = serialization.load_pem_private_key(
                 self.private_key.encode(),
@@ -67,3 +70,10 @@ class SnowflakeFlavorService(FlavorService):
             "ALTER SESSION SET MULTI_STATEMENT_COUNT = 0;",
             "ALTER SESSION SET WEEK_START = 7;",
         ]
+
+    def get_statement_timeout_queries(self, timeout_seconds: int) -> list[str]:
+        return [f"ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS = {timeout_seconds};"]
+
+    def cancel_query(self, dbapi_connection, cursor) -> None:  # NOQA ARG002
+        # The query id is only known once the query returns, so all queries of the session are cancelled
+        dbapi_connection.cursor().execute(f"SELECT SYSTEM$CANCEL_ALL_QUERIES({dbapi_connection.session_id})")
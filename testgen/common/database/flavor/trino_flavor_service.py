@@ -17,5 +17,8 @@ class TrinoFlavorService(FlavorService):
             "USE " + self.catalog + "." + self.dbschema,
         ]
 
+    def get_statement_timeout_queries(self, timeout_seconds: int) -> list[str]:
+        return [f"SET SESSION query_max_run_time = '{timeout_seconds}s'"]
+
     def get_connect_args(self, is_password_overwritten: bool = False):  # NOQA ARG002
         return {}
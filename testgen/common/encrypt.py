@@ -1,10 +1,9 @@
 import base64
 
-#import streamlit_authenticator as stauth
 from Crypto.Cipher import AES
 from Crypto.Protocol.KDF import PBKDF2
 from Crypto.Random import get_random_bytes
-import streamlit_authenticator as stauth
+
 from testgen import settings
 
 
@@ -51,5 +50,8 @@ def DecryptText(baEncrypted):
 
 
 def encrypt_ui_password(plain_password):
+    # Deferred: every database connection goes through this module, but only user management needs the authenticator
+    import streamlit_authenticator as stauth
+
     hashed_passwords = stauth.Hasher([plain_password]).generate()
     return hashed_passwords.pop()
@@ -57,3 +57,12 @@ def RetrieveTestExecParms(strProjectCode, strTestSuite):
         raise ValueError("Test Execution parameters returned too many records")
 
     return lstParms[0]
+
+
+def RetrieveTableCosts(strTableGroupsID) -> dict[tuple[str, str], int]:
+    # Tables that were never profiled or counted have no cost, and run last
+    strSQL = read_template_sql_file("parms_table_costs.sql", "parms")
+    strSQL = strSQL.replace("{TABLE_GROUPS_ID}", strTableGroupsID)
+
+    lstCosts = RetrieveDBResultsToDictList("DKTG", strSQL)
+    return {(row["schema_name"], row["table_name"]): row["table_cost"] for row in lstCosts}
@@ -7,7 +7,6 @@ from testgen import settings
 
 LOG = logging.getLogger("testgen")
 
-
 def get_current_process_id():
     return os.getpid()
 
@@ -43,9 +42,9 @@ def kill_process(process_id, keywords=None):
                     LOG.error(f"kill_process: {message}")
                     return False, message
 
+        # Returns right away: the run cancels its queries, saves the results it has and exits after the current step
         process.terminate()
-        process.wait(timeout=10)
-        message = f"Process {process_id} has been terminated."
+        message = f"Process {process_id} has been asked to terminate."
     except psutil.NoSuchProcess:
         message = f"No such process with PID {process_id}."
         LOG.exception(f"kill_process: {message}")
@@ -55,9 +54,5 @@ def kill_process(process_id, keywords=None):
         message = f"Access denied when trying to terminate process {process_id}."
         LOG.exception(f"kill_process: {message}")
         return False, message
-    except psutil.TimeoutExpired:
-        message = f"Process {process_id} did not terminate within the timeout period."
-        LOG.exception(f"kill_process: {message}")
-        return False, message
     LOG.info(f"kill_process: Success. {message}")
     return True, message
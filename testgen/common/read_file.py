@@ -1,9 +1,16 @@
-__all__ = ["get_template_files", "read_template_sql_file", "read_template_yaml_file"]
+__all__ = [
+    "SQLTemplate",
+    "compile_template",
+    "get_template_files",
+    "has_template_file",
+    "read_template_sql_file",
+    "read_template_yaml_file",
+]
 
 import logging
 import re
-from collections.abc import Generator
-from functools import cache
+from collections.abc import Generator, Mapping
+from functools import cache, lru_cache
 from importlib.abc import Traversable
 from importlib.resources import as_file, files
 
@@ -13,6 +20,10 @@ LOG = logging.getLogger("testgen")
 
 DK_FUNCTIONS_PATTERN = re.compile(r"<%(\w+)(?:;(.+?))?%>")
 DK_FUNCTIONS_ARG_REPL_PATTERN = re.compile(r"\{\$(\d+)\}")
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Z][A-Z0-9_]*)\}")
+
+# Values that contain placeholders themselves (e.g. custom queries) are rendered again, up to this depth
+MAX_RENDER_DEPTH = 5
 
 def _get_template_package_resource(
     template_file_name: str | None = None,
@@ -44,6 +55,15 @@ def read_template_sql_file(template_file_name: str, sub_directory: str | None =
     return contents
 
 
+@cache
+def has_template_file(template_file_name: str, sub_directory: str | None = None) -> bool:
+    # For the templates that only some flavors have, without going through the error of a missing file
+    try:
+        return _get_template_package_resource(template_file_name, sub_directory).is_file()
+    except ModuleNotFoundError:
+        return False
+
+
 def get_template_files(mask: str, sub_directory: str | None = None, path: str | None = None) -> Generator[Traversable, None, None]:
     folder = _get_template_package_resource(template_file_name=None, sub_directory=sub_directory, path=path)
     LOG.debug("Reading SQL folder resource: %s", str(folder))
@@ -83,6 +103,114 @@ def read_template_yaml_function(function_name: str, db_flavour: str) -> str:
     return template
 
 
+@cache
+def _compile_yaml_function(function_name: str, db_flavour: str) -> tuple[list[str], list[int]]:
+    function_template = read_template_yaml_function(function_name, db_flavour)
+    literals, arg_indexes = [], []
+    end_pos = 0
+    for arg_match in DK_FUNCTIONS_ARG_REPL_PATTERN.finditer(function_template):
+        literals.append(function_template[end_pos:arg_match.start()])
+        arg_indexes.append(int(arg_match.group(1)) - 1)
+        end_pos = arg_match.end()
+    literals.append(function_template[end_pos:])
+    return literals, arg_indexes
+
+
+class SQLTemplate:
+    """
+    SQL text parsed once into literal, `{PLACEHOLDER}` and `<%FUNCTION;args%>` tokens, rendered in a single pass.
+
+    Rendering matches the former chained `str.replace` calls: substituted values that contain placeholders are rendered
+    too, and templated functions are expanded after their arguments are rendered. Placeholders missing from the
+    parameters are kept as-is and reported, or raise a ValueError with `strict`.
+    """
+
+    __slots__ = ("_tokens", "placeholders")
+
+    def __init__(self, source: str):
+        self._tokens: list[tuple[str, str, SQLTemplate | None]] = []
+        end_pos = 0
+        for func_match in DK_FUNCTIONS_PATTERN.finditer(source):
+            self._tokenize(source[end_pos:func_match.start()])
+            function_name, args_str = func_match.groups()
+            self._tokens.append(("func", function_name, SQLTemplate(args_str) if args_str else None))
+            end_pos = func_match.end()
+        self._tokenize(source[end_pos:])
+
+        self.placeholders = frozenset(
+            name for kind, name, args in self._tokens if kind == "param"
+        ).union(*(args.placeholders for kind, _, args in self._tokens if kind == "func" and args))
+
+    def _tokenize(self, text: str) -> None:
+        end_pos = 0
+        for param_match in PLACEHOLDER_PATTERN.finditer(text):
+            if param_match.start() > end_pos:
+                self._tokens.append(("text", text[end_pos:param_match.start()], None))
+            self._tokens.append(("param", param_match.group(1), None))
+            end_pos = param_match.end()
+        if end_pos < len(text):
+            self._tokens.append(("text", text[end_pos:], None))
+
+    def render(self, params: Mapping[str, object], db_flavour: str | None = None, strict: bool = False) -> str:
+        """
+        Renders the template with `params`. Templated functions are expanded only when `db_flavour` is given.
+        """
+        missing: set[str] = set()
+        query = self._render(params, db_flavour, missing, 0)
+        if missing:
+            message = f"SQL template has unresolved placeholders: {', '.join(sorted(missing))}"
+            if strict:
+                raise ValueError(message)
+            _warn_once(message)
+        return query
+
+    def _render(self, params: Mapping[str, object], db_flavour: str | None, missing: set[str], depth: int) -> str:
+        parts = []
+        for kind, name, args in self._tokens:
+            if kind == "text":
+                parts.append(name)
+            elif kind == "param":
+                if name not in params:
+                    missing.add(name)
+                    parts.append(f"{{{name}}}")
+                    continue
+                value = str(params[name])
+                if depth < MAX_RENDER_DEPTH and ("{" in value or "<%" in value):
+                    value = compile_template(value)._render(params, db_flavour, missing, depth + 1)
+                parts.append(value)
+            else:
+                args_str = args._render(params, db_flavour, missing, depth) if args else None
+                parts.append(_render_function(name, args_str, db_flavour))
+        return "".join(parts)
+
+
+def _render_function(function_name: str, args_str: str | None, db_flavour: str | None) -> str:
+    if not db_flavour:
+        return f"<%{function_name};{args_str}%>" if args_str is not None else f"<%{function_name}%>"
+
+    literals, arg_indexes = _compile_yaml_function(function_name, db_flavour)
+    args = args_str.split(";") if args_str is not None else []
+    parts = [literals[0]]
+    for arg_index, literal in zip(arg_indexes, literals[1:], strict=True):
+        try:
+            parts.append(args[arg_index])
+        except IndexError:
+            call = f"<%{function_name};{args_str}%>" if args_str is not None else f"<%{function_name}%>"
+            raise ValueError(f"Templated function call missing required arguments: {call}") from None
+        parts.append(literal)
+    return "".join(parts)
+
+
+@cache
+def _warn_once(message: str) -> None:
+    LOG.warning(message)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str) -> SQLTemplate:
+    return SQLTemplate(source)
+
+
 def replace_templated_functions(query: str, db_flavour: str) -> str:
 
     # Arguments in the template yaml take the form {$<index>} like {$1}
@@ -94,25 +222,10 @@ def replace_templated_functions(query: str, db_flavour: str) -> str:
     query_parts = []
     end_pos = 0
     for func_match in DK_FUNCTIONS_PATTERN.finditer(query):
-
-        query_parts.append(query[end_pos:func_match.span(0)[0]])
-        end_pos = func_match.span(0)[1]
-
+        query_parts.append(query[end_pos:func_match.start()])
+        end_pos = func_match.end()
         function_name, args_str = func_match.groups()
-        function_template = read_template_yaml_function(function_name, db_flavour)
-        args = args_str.split(";")
-
-        tpl_end_pos = 0
-        for arg_match in DK_FUNCTIONS_ARG_REPL_PATTERN.finditer(function_template):
-            query_parts.append(function_template[tpl_end_pos:arg_match.span(0)[0]])
-            tpl_end_pos = arg_match.span(0)[1]
-            try:
-                query_parts.append(args[int(arg_match.group(1)) - 1])
-            except IndexError:
-                raise ValueError(
-                    f"Templated function call missing required arguments: {query[slice(*func_match.span(0))]}"
-                ) from None
-        query_parts.append(function_template[tpl_end_pos:])
+        query_parts.append(_render_function(function_name, args_str, db_flavour))
 
     query_parts.append(query[end_pos:])
     return "".join(query_parts)
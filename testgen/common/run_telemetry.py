@@ -0,0 +1,183 @@
+import contextvars
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LOG = logging.getLogger("testgen")
+
+RUN_STEP_METRICS_COLUMNS = (
+    "run_type",
+    "run_id",
+    "step_seq",
+    "step_name",
+    "step_starttime",
+    "step_endtime",
+    "wall_seconds",
+    "target_db_seconds",
+    "metadata_db_seconds",
+    "query_ct",
+    "row_ct",
+    "byte_ct",
+    "retry_ct",
+    "error_message",
+)
+
+_lock = threading.Lock()
+# The run of the current thread or context. Threads started by the run inherit it when given a copy of its context.
+_current_run: contextvars.ContextVar["RunTelemetry | None"] = contextvars.ContextVar("telemetry_run", default=None)
+_metadata_engines: weakref.WeakSet = weakref.WeakSet()
+
+
+@dataclass
+class StepSpan:
+    seq: int
+    name: str
+    started_at: datetime
+    ended_at: datetime | None = None
+    wall_seconds: float = 0
+    target_db_seconds: float = 0
+    metadata_db_seconds: float = 0
+    query_ct: int = 0
+    row_ct: int = 0
+    byte_ct: int = 0
+    retry_ct: int = 0
+    error_message: str | None = None
+    _start_counter: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def python_seconds(self) -> float:
+        # Only meaningful for sequential steps: concurrent queries can add up to more DB time than wall time
+        return max(self.wall_seconds - self.target_db_seconds - self.metadata_db_seconds, 0)
+
+
+class RunTelemetry:
+    """
+    Records a span per step of a profiling or test run: wall time, time spent in the target and the metadata
+    databases, and the statements, rows, bytes and retries of that step.
+
+    Steps are sequential: starting a step ends the previous one. While the run is started, the statements executed
+    through SQLAlchemy in its context are counted towards its current step: those of the thread that started it, and
+    of the worker threads given a copy of its context, as the threaded query functions of database_service do.
+
+    When given, on_step is called with the telemetry and the new step's name at the start of each step, e.g. to report
+    the progress of the run. Its errors are logged and don't affect the run.
+    """
+
+    def __init__(self, run_type: str, run_id: str, on_step: Callable[["RunTelemetry", str], None] | None = None):
+        self.run_type = run_type
+        self.run_id = run_id
+        self.on_step = on_step
+        self.steps: list[StepSpan] = []
+        self._current: StepSpan | None = None
+        self._token: contextvars.Token | None = None
+
+    def start(self) -> None:
+        self._token = _current_run.set(self)
+
+    def start_step(self, name: str) -> None:
+        LOG.info("CurrentStep: %s", name)
+        with _lock:
+            self._end_current()
+            self._current = StepSpan(len(self.steps) + 1, name, datetime.now(UTC))
+            self.steps.append(self._current)
+        if self.on_step:
+            try:
+                self.on_step(self, name)
+            except Exception:
+                LOG.warning("Failed to report the step of the run", exc_info=True)
+
+    def record_error(self, error_message: str) -> None:
+        with _lock:
+            if self._current:
+                self._current.error_message = error_message[:1000]
+
+    def finish(self) -> None:
+        with _lock:
+            self._end_current()
+        if self._token is not None:
+            _current_run.reset(self._token)
+            self._token = None
+
+    def to_rows(self) -> list[tuple]:
+        return [
+            (
+                self.run_type,
+                self.run_id,
+                step.seq,
+                step.name,
+                step.started_at.replace(tzinfo=None),
+                step.ended_at.replace(tzinfo=None) if step.ended_at else None,
+                round(step.wall_seconds, 3),
+                round(step.target_db_seconds, 3),
+                round(step.metadata_db_seconds, 3),
+                step.query_ct,
+                step.row_ct,
+                step.byte_ct,
+                step.retry_ct,
+                step.error_message,
+            )
+            for step in self.steps
+        ]
+
+    def _end_current(self) -> None:
+        if self._current:
+            self._current.ended_at = datetime.now(UTC)
+            self._current.wall_seconds = time.perf_counter() - self._current._start_counter
+            self._current = None
+
+
+def _record(run: RunTelemetry, **increments) -> None:
+    with _lock:
+        if step := run._current:
+            for name, value in increments.items():
+                setattr(step, name, getattr(step, name) + value)
+
+
+def register_metadata_engine(engine: Engine) -> None:
+    """
+    Marks an engine as connected to the TestGen system database, so that its time is not counted as target time.
+    """
+    _metadata_engines.add(engine)
+
+
+def record_statement(seconds: float, row_ct: int, byte_ct: int, is_metadata_db: bool) -> None:
+    """
+    Counts a statement run outside of SQLAlchemy's execute, e.g. a COPY on a raw connection, towards the current step
+    of the run of the current context.
+    """
+    if run := _current_run.get():
+        db_time = "metadata_db_seconds" if is_metadata_db else "target_db_seconds"
+        _record(run, **{db_time: seconds}, query_ct=1, row_ct=row_ct, byte_ct=byte_ct)
+
+
+def record_retry() -> None:
+    if run := _current_run.get():
+        _record(run, retry_ct=1)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+    # The start time goes on the execution context of the statement, which no other statement shares
+    if context is not None and _current_run.get():
+        context._telemetry_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+    start_time = getattr(context, "_telemetry_start_time", None)
+    if start_time is None:
+        return
+    record_statement(
+        time.perf_counter() - start_time,
+        # rowcount is -1 when the driver doesn't know it
+        max(cursor.rowcount or 0, 0),
+        len(statement.encode()),
+        conn.engine in _metadata_engines,
+    )
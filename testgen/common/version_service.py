@@ -1,4 +1,5 @@
 import logging
+import threading
 
 import requests
 
@@ -6,6 +7,10 @@ from testgen import settings
 
 LOG = logging.getLogger("testgen")
 
+_latest_version_lock = threading.Lock()
+_latest_version_thread: threading.Thread | None = None
+_latest_version: str | None = None
+
 
 def get_latest_version() -> str:
     try:
@@ -18,6 +23,30 @@ def get_latest_version() -> str:
         return "unknown"
 
 
+def get_latest_version_in_background() -> str | None:
+    """
+    Non-blocking variant of `get_latest_version` for the UI.
+
+    The first call starts the lookup in a daemon thread. Returns `None` until it finishes, and the cached value after.
+    """
+    global _latest_version_thread
+
+    with _latest_version_lock:
+        if _latest_version_thread is None:
+            _latest_version_thread = threading.Thread(
+                target=_fetch_latest_version,
+                name="testgen-version-check",
+                daemon=True,
+            )
+            _latest_version_thread.start()
+    return _latest_version
+
+
+def _fetch_latest_version() -> None:
+    global _latest_version
+    _latest_version = get_latest_version()
+
+
 def _get_last_pypi_release() -> str:
     response = requests.get("https://pypi.org/pypi/dataops-testgen/json", timeout=3)
     if response.status_code != 200:
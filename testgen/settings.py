@@ -204,6 +204,72 @@ from env variable: `PROJECT_CONNECTION_MAX_THREADS`
 defaults to: `4`
 """
 
+TARGET_QUERY_TIMEOUT_SECONDS: int = int(os.getenv("TG_TARGET_QUERY_TIMEOUT_SECONDS", "1800"))
+"""
+Maximum duration of a single query on the project database, enforced by
+the database as a statement timeout. Queries that time out are counted
+as errors and the run continues with the remaining queries. Set to `0`
+to disable the timeout.
+
+from env variable: `TG_TARGET_QUERY_TIMEOUT_SECONDS`
+defaults to: `1800`
+"""
+
+PROJECT_CONNECTION_ADAPTIVE_THREADS: bool = os.getenv("TG_PROJECT_CONNECTION_ADAPTIVE_THREADS", "yes").lower() == "yes"
+"""
+When set to `yes`, queries on the project database start with a few
+concurrent threads and adjust to the observed latency and errors, up to
+the connection's maximum threads. Set to `no` to always use the
+connection's maximum threads.
+
+from env variable: `TG_PROJECT_CONNECTION_ADAPTIVE_THREADS`
+defaults to: `yes`
+"""
+
+APP_DB_ACTION_MAX_THREADS: int = int(os.getenv("TG_APP_DB_ACTION_MAX_THREADS", "4"))
+"""
+Maximum number of concurrent update queries executed on the TestGen
+application database when post-processing profiling results. Only
+queries that don't depend on each other run concurrently. Set to `1`
+to run them one at a time.
+
+from env variable: `TG_APP_DB_ACTION_MAX_THREADS`
+defaults to: `4`
+"""
+
+PROFILING_MAX_RUNS_PER_CONNECTION: int = int(os.getenv("TG_PROFILING_MAX_RUNS_PER_CONNECTION", "2"))
+"""
+Maximum number of profiling runs started from the API, or by the
+`run-profile-all` command, that run at the same time on a connection.
+Further runs are queued until a slot is free. Each run executes in its
+own process.
+
+from env variable: `TG_PROFILING_MAX_RUNS_PER_CONNECTION`
+defaults to: `2`
+"""
+
+PROFILING_MAX_PARALLEL_RUNS: int = int(os.getenv("TG_PROFILING_MAX_PARALLEL_RUNS", "4"))
+"""
+Maximum number of table groups profiled at the same time by the
+`run-profile-all` command, over all connections. The runs on each
+connection are also limited by `PROFILING_MAX_RUNS_PER_CONNECTION`.
+
+from env variable: `TG_PROFILING_MAX_PARALLEL_RUNS`
+defaults to: `4`
+"""
+
+SCHEMA_DDF_CACHE_MAX_AGE_HOURS: int = int(os.getenv("TG_SCHEMA_DDF_CACHE_MAX_AGE_HOURS", "24"))
+"""
+Number of hours the column metadata (DDF) of a table group, read from
+the target database's catalog, is reused by profiling, test validation
+and the data characteristics refresh, as long as the catalog shows no
+table changes in the schema. Older snapshots are read again. Set to `0`
+to always read the catalog.
+
+from env variable: `TG_SCHEMA_DDF_CACHE_MAX_AGE_HOURS`
+defaults to: `24`
+"""
+
 PROJECT_CONNECTION_MAX_QUERY_CHAR: int = int(os.getenv("PROJECT_CONNECTION_MAX_QUERY_CHAR", "5000"))
 """
 Determine how many tests are grouped together in a single query.
@@ -460,6 +526,45 @@ from env variable: `TESTGEN_VERSION`
 defaults to: `unknown`
 """
 
+ISSUE_REPORT_MAX_WORKERS: int = int(os.getenv("TG_ISSUE_REPORT_MAX_WORKERS", "4"))
+"""
+Maximum number of worker processes used to lay out PDF issue reports
+when several of them are downloaded together in a zip file. It also
+limits how many target connections are queried concurrently for the
+reports' source data. Set to `1` to generate the reports one at a time.
+
+from env variable: `TG_ISSUE_REPORT_MAX_WORKERS`
+defaults to: `4`
+"""
+
+SOURCE_DATA_LOOKUP_CACHE_SECONDS: int = int(os.getenv("TG_SOURCE_DATA_LOOKUP_CACHE_SECONDS", "300"))
+"""
+Number of seconds the source data of a hygiene issue or test result is
+kept in memory after being looked up in the target database, so that
+repeated views of the same issue don't query it again. Set to `0` to
+disable the cache.
+
+from env variable: `TG_SOURCE_DATA_LOOKUP_CACHE_SECONDS`
+defaults to: `300`
+"""
+
+SOURCE_DATA_LOOKUP_CACHE_SIZE: int = int(os.getenv("TG_SOURCE_DATA_LOOKUP_CACHE_SIZE", "128"))
+"""
+Maximum number of source data lookups kept in memory.
+
+from env variable: `TG_SOURCE_DATA_LOOKUP_CACHE_SIZE`
+defaults to: `128`
+"""
+
+TARGET_ENGINE_IDLE_SECONDS: int = int(os.getenv("TG_TARGET_ENGINE_IDLE_SECONDS", "600"))
+"""
+Number of seconds a connection pool to a target database is kept open
+after its last use by the source data lookups.
+
+from env variable: `TG_TARGET_ENGINE_IDLE_SECONDS`
+defaults to: `600`
+"""
+
 SSL_CERT_FILE: str = os.getenv("SSL_CERT_FILE", "")
 SSL_KEY_FILE: str = os.getenv("SSL_KEY_FILE", "")
 """
@@ -0,0 +1,43 @@
+-- Representative parameters: the latest runs and their most populated table and column
+WITH latest_test_run
+   AS (SELECT id, test_suite_id
+         FROM {SCHEMA_NAME}.test_runs
+        WHERE status = 'Complete'
+       ORDER BY test_starttime DESC
+        LIMIT 1),
+test_sample
+   AS (SELECT r.table_name, r.column_names, r.test_type, COUNT(*) AS result_ct
+         FROM {SCHEMA_NAME}.test_results r
+       INNER JOIN latest_test_run lr
+          ON (r.test_run_id = lr.id)
+       GROUP BY r.table_name, r.column_names, r.test_type
+       ORDER BY result_ct DESC
+        LIMIT 1),
+latest_profiling_run
+   AS (SELECT id, table_groups_id
+         FROM {SCHEMA_NAME}.profiling_runs
+        WHERE status = 'Complete'
+       ORDER BY profiling_starttime DESC
+        LIMIT 1),
+anomaly_sample
+   AS (SELECT a.table_name, a.column_name, COUNT(*) AS anomaly_ct
+         FROM {SCHEMA_NAME}.profile_anomaly_results a
+       INNER JOIN latest_profiling_run lp
+          ON (a.profile_run_id = lp.id)
+       GROUP BY a.table_name, a.column_name
+       ORDER BY anomaly_ct DESC
+        LIMIT 1)
+SELECT ltr.id::VARCHAR AS test_run_id,
+       ltr.test_suite_id::VARCHAR AS test_suite_id,
+       ts.table_name AS test_table_name,
+       ts.column_names AS test_column_names,
+       ts.test_type,
+       lpr.id::VARCHAR AS profile_run_id,
+       lpr.table_groups_id::VARCHAR AS table_groups_id,
+       ans.table_name AS anomaly_table_name,
+       ans.column_name AS anomaly_column_name
+  FROM (SELECT 1) dummy
+LEFT JOIN latest_test_run ltr ON TRUE
+LEFT JOIN test_sample ts ON TRUE
+LEFT JOIN latest_profiling_run lpr ON TRUE
+LEFT JOIN anomaly_sample ans ON TRUE;
@@ -0,0 +1,9 @@
+-- Data Catalog: hygiene issues of a column
+SELECT anomaly_results.column_name, anomaly_types.anomaly_name, anomaly_results.detail
+  FROM {SCHEMA_NAME}.profile_anomaly_results anomaly_results
+LEFT JOIN {SCHEMA_NAME}.profile_anomaly_types anomaly_types
+   ON (anomaly_types.id = anomaly_results.anomaly_id)
+ WHERE anomaly_results.profile_run_id = '{PROFILE_RUN_ID}'::UUID
+   AND anomaly_results.table_name = '{ANOMALY_TABLE_NAME}'
+   AND anomaly_results.column_name = '{ANOMALY_COLUMN_NAME}'
+   AND COALESCE(anomaly_results.disposition, 'Confirmed') = 'Confirmed';
@@ -0,0 +1,4 @@
+-- Hygiene Issues and scoring: latest anomalies of a table group
+SELECT id, table_name, column_name, anomaly_name
+  FROM {SCHEMA_NAME}.v_latest_profile_anomalies
+ WHERE table_groups_id = '{TABLE_GROUPS_ID}'::UUID;
@@ -0,0 +1,4 @@
+-- Data Catalog and scoring: latest profiling results of a table group
+SELECT id, table_name, column_name, record_ct
+  FROM {SCHEMA_NAME}.v_latest_profile_results
+ WHERE table_groups_id = '{TABLE_GROUPS_ID}'::UUID;
@@ -0,0 +1,5 @@
+-- Profiling Runs page: runs of a table group, latest first
+SELECT id, profiling_starttime, status
+  FROM {SCHEMA_NAME}.profiling_runs
+ WHERE table_groups_id = '{TABLE_GROUPS_ID}'::UUID
+ORDER BY profiling_starttime DESC;
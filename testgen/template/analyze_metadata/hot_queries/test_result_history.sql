@@ -0,0 +1,9 @@
+-- Test Results page: history of an auto-generated test
+SELECT test_date, test_type, result_measure, result_status
+  FROM {SCHEMA_NAME}.v_test_results
+ WHERE test_suite_id = '{TEST_SUITE_ID}'::UUID
+   AND table_name = '{TEST_TABLE_NAME}'
+   AND column_names = '{TEST_COLUMN_NAMES}'
+   AND test_type = '{TEST_TYPE}'
+   AND auto_gen = TRUE
+ORDER BY test_date DESC;
@@ -0,0 +1,15 @@
+-- Test Results page: results of a run, joined to the current auto-generated definitions
+SELECT r.id, r.result_status, tt.test_name_short, d.id AS test_definition_id_current
+  FROM {SCHEMA_NAME}.test_results r
+INNER JOIN {SCHEMA_NAME}.test_types tt
+   ON (r.test_type = tt.test_type)
+LEFT JOIN {SCHEMA_NAME}.test_definitions rd
+   ON (r.test_definition_id = rd.id)
+LEFT JOIN {SCHEMA_NAME}.test_definitions d
+   ON (r.test_suite_id = d.test_suite_id
+  AND  r.table_name = d.table_name
+  AND  r.column_names = COALESCE(d.column_name, 'N/A')
+  AND  r.test_type = d.test_type
+  AND  r.auto_gen = TRUE
+  AND  d.last_auto_gen_date IS NOT NULL)
+ WHERE r.test_run_id = '{TEST_RUN_ID}'::UUID;
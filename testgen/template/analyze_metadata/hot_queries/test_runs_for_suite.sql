@@ -0,0 +1,5 @@
+-- Test Runs page: runs of a test suite, latest first
+SELECT id, test_starttime, status
+  FROM {SCHEMA_NAME}.test_runs
+ WHERE test_suite_id = '{TEST_SUITE_ID}'::UUID
+ORDER BY test_starttime DESC;
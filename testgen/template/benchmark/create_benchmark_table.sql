@@ -0,0 +1,10 @@
+CREATE SCHEMA IF NOT EXISTS {BENCHMARK_SCHEMA};
+
+DROP TABLE IF EXISTS {BENCHMARK_SCHEMA}.{TABLE_NAME} CASCADE;
+
+CREATE TABLE {BENCHMARK_SCHEMA}.{TABLE_NAME} AS
+SELECT g AS record_id,
+       {COLUMN_EXPRESSIONS}
+  FROM GENERATE_SERIES(1, {ROW_COUNT}) g;
+
+ANALYZE {BENCHMARK_SCHEMA}.{TABLE_NAME};
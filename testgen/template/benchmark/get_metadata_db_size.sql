@@ -0,0 +1,6 @@
+SELECT COALESCE(SUM(PG_TOTAL_RELATION_SIZE(c.oid)), 0)::BIGINT AS size_bytes
+  FROM pg_class c
+INNER JOIN pg_namespace n
+   ON (c.relnamespace = n.oid)
+ WHERE n.nspname = '{SCHEMA_NAME}'
+   AND c.relkind IN ('r', 'm');
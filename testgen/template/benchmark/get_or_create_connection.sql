@@ -0,0 +1,22 @@
+WITH existing
+   AS (SELECT connection_id
+         FROM {SCHEMA_NAME}.connections
+        WHERE project_code = '{PROJECT_CODE}'
+          AND sql_flavor = '{SQL_FLAVOR}'
+          AND project_host = '{PROJECT_HOST}'
+          AND project_port = '{PROJECT_PORT}'
+          AND project_db = '{PROJECT_DB}'
+          AND NOT COALESCE(connect_by_url, FALSE)
+       ORDER BY connection_id
+        LIMIT 1),
+inserted
+   AS (INSERT INTO {SCHEMA_NAME}.connections
+         (project_code, sql_flavor, project_host, project_port, project_user, project_db,
+          connection_name, project_pw_encrypted, max_threads, max_query_chars)
+       SELECT '{PROJECT_CODE}', '{SQL_FLAVOR}', '{PROJECT_HOST}', '{PROJECT_PORT}', '{PROJECT_USER}', '{PROJECT_DB}',
+              '{CONNECTION_NAME}', '{PROJECT_PW_ENCRYPTED}', {MAX_THREADS}, {MAX_QUERY_CHARS}
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+       RETURNING connection_id)
+SELECT connection_id FROM existing
+UNION ALL
+SELECT connection_id FROM inserted;
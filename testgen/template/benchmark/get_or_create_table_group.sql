@@ -0,0 +1,21 @@
+WITH updated
+   AS (UPDATE {SCHEMA_NAME}.table_groups
+          SET connection_id = {CONNECTION_ID},
+              table_group_schema = '{BENCHMARK_SCHEMA}'
+        WHERE project_code = '{PROJECT_CODE}'
+          AND table_groups_name = '{TABLE_GROUPS_NAME}'
+       RETURNING id),
+inserted
+   AS (INSERT INTO {SCHEMA_NAME}.table_groups
+         (project_code, connection_id, table_groups_name, table_group_schema,
+          profiling_include_mask, profiling_exclude_mask, profile_use_sampling)
+       SELECT '{PROJECT_CODE}', {CONNECTION_ID}, '{TABLE_GROUPS_NAME}', '{BENCHMARK_SCHEMA}', '%', NULL, 'N'
+        WHERE NOT EXISTS (SELECT 1 FROM updated)
+       RETURNING id),
+suites
+   AS (UPDATE {SCHEMA_NAME}.test_suites
+          SET connection_id = {CONNECTION_ID}
+        WHERE table_groups_id IN (SELECT id FROM updated))
+SELECT id::VARCHAR FROM updated
+UNION ALL
+SELECT id::VARCHAR FROM inserted;
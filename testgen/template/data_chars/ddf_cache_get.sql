@@ -0,0 +1,19 @@
+-- Columns of the table group's DDF snapshot, if it was read with the same query, recently enough, and the schema
+-- hasn't changed since
+SELECT c.project_code,
+       c.table_schema,
+       c.table_name,
+       c.column_name,
+       c.data_type,
+       c.character_maximum_length,
+       c.ordinal_position,
+       c.general_type,
+       c.is_decimal
+  FROM schema_ddf_snapshots s
+INNER JOIN schema_ddf_cache c
+   ON (s.snapshot_id = c.snapshot_id)
+ WHERE s.table_groups_id = '{TABLE_GROUPS_ID}'::UUID
+   AND s.ddf_query_hash = '{DDF_QUERY_HASH}'
+   AND s.change_signal = '{CHANGE_SIGNAL}'
+   AND s.refreshed_at > NOW() - INTERVAL '{MAX_AGE_HOURS} hours'
+ORDER BY c.table_schema, c.table_name, c.ordinal_position;
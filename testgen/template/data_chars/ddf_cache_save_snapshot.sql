@@ -0,0 +1,19 @@
+-- Points the table group's snapshot for the DDF query to the columns just written, and deletes the columns of
+-- replaced and expired snapshots
+INSERT INTO schema_ddf_snapshots
+       (table_groups_id, ddf_query_hash, snapshot_id, change_signal, refreshed_at)
+VALUES ('{TABLE_GROUPS_ID}'::UUID, '{DDF_QUERY_HASH}', '{SNAPSHOT_ID}'::UUID, '{CHANGE_SIGNAL}', NOW())
+ON CONFLICT (table_groups_id, ddf_query_hash) DO UPDATE
+   SET snapshot_id = EXCLUDED.snapshot_id,
+       change_signal = EXCLUDED.change_signal,
+       refreshed_at = EXCLUDED.refreshed_at;
+
+DELETE FROM schema_ddf_snapshots
+ WHERE table_groups_id = '{TABLE_GROUPS_ID}'::UUID
+   AND refreshed_at < NOW() - INTERVAL '{MAX_AGE_HOURS} hours';
+
+DELETE FROM schema_ddf_cache c
+ WHERE c.table_groups_id = '{TABLE_GROUPS_ID}'::UUID
+   AND NOT EXISTS (SELECT 1
+                     FROM schema_ddf_snapshots s
+                    WHERE s.snapshot_id = c.snapshot_id);
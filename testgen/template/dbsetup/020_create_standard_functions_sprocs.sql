@@ -306,3 +306,87 @@ CREATE AGGREGATE {SCHEMA_NAME}.sum_ln (double precision) (
     FINALFUNC = sum_ln_agg_final,
     INITCOND  = '0'
 );
+
+
+-- Monthly range partitions of test_results, profile_results and profile_anomaly_results
+-- Partitions are named <table>_pYYYYMM; owned by the schema admin so the runtime roles can call these functions
+
+CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.create_partition_unique_indexes(p_table_name TEXT, p_partition_name TEXT)
+RETURNS VOID
+AS $$
+BEGIN
+   -- Unique indexes must include the partition key on a partitioned table, so they are kept at partition level
+   EXECUTE FORMAT('CREATE UNIQUE INDEX IF NOT EXISTS %I ON {SCHEMA_NAME}.%I (id)',
+                  p_partition_name || '_id_uix', p_partition_name);
+   IF p_table_name = 'profile_results' THEN
+      EXECUTE FORMAT('CREATE UNIQUE INDEX IF NOT EXISTS %I ON {SCHEMA_NAME}.%I (table_groups_id, table_name, column_name, profile_run_id)',
+                     p_partition_name || '_tg_t_c_prun_uix', p_partition_name);
+   END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = {SCHEMA_NAME};
+
+
+CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.create_monthly_partitions(p_table_name TEXT, p_from TIMESTAMP, p_until TIMESTAMP)
+RETURNS INTEGER
+AS $$
+DECLARE
+   v_month          DATE;
+   v_partition_name TEXT;
+   v_created_ct     INTEGER := 0;
+BEGIN
+   -- Continue after the latest monthly partition, p_from only applies when there is none yet
+   SELECT (MAX(TO_DATE(SUBSTRING(c.relname FROM '_p([0-9]{6})$'), 'YYYYMM')) + INTERVAL '1 month')::DATE
+     INTO v_month
+     FROM pg_inherits i
+   INNER JOIN pg_class c
+      ON (i.inhrelid = c.oid)
+    WHERE i.inhparent = ('{SCHEMA_NAME}.' || p_table_name)::REGCLASS
+      AND c.relname ~ '_p[0-9]{6}$';
+   v_month := COALESCE(v_month, DATE_TRUNC('month', p_from)::DATE);
+
+   WHILE v_month <= p_until LOOP
+      v_partition_name := p_table_name || '_p' || TO_CHAR(v_month, 'YYYYMM');
+      EXECUTE FORMAT('CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.%I PARTITION OF {SCHEMA_NAME}.%I FOR VALUES FROM (%L) TO (%L)',
+                     v_partition_name, p_table_name, v_month, (v_month + INTERVAL '1 month')::DATE);
+      PERFORM {SCHEMA_NAME}.create_partition_unique_indexes(p_table_name, v_partition_name);
+      v_created_ct := v_created_ct + 1;
+      v_month := (v_month + INTERVAL '1 month')::DATE;
+   END LOOP;
+
+   RETURN v_created_ct;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = {SCHEMA_NAME};
+
+
+CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.drop_monthly_partitions(p_table_name TEXT, p_before TIMESTAMP, p_run_column TEXT, p_keep_run_ids UUID[])
+RETURNS INTEGER
+AS $$
+DECLARE
+   v_partition_name TEXT;
+   v_has_kept_runs  BOOLEAN;
+   v_dropped_ct     INTEGER := 0;
+BEGIN
+   -- Only partitions whose whole month is before the cutoff are dropped
+   FOR v_partition_name IN
+      SELECT c.relname
+        FROM pg_inherits i
+      INNER JOIN pg_class c
+         ON (i.inhrelid = c.oid)
+       WHERE i.inhparent = ('{SCHEMA_NAME}.' || p_table_name)::REGCLASS
+         AND c.relname ~ '_p[0-9]{6}$'
+         AND TO_DATE(SUBSTRING(c.relname FROM '_p([0-9]{6})$'), 'YYYYMM') + INTERVAL '1 month' <= p_before
+   LOOP
+      -- Partitions holding results of the kept runs stay, their other runs are deleted row by row
+      EXECUTE FORMAT('SELECT EXISTS (SELECT 1 FROM {SCHEMA_NAME}.%I WHERE %I = ANY($1))', v_partition_name, p_run_column)
+         INTO v_has_kept_runs
+         USING p_keep_run_ids;
+      CONTINUE WHEN v_has_kept_runs;
+
+      EXECUTE FORMAT('ALTER TABLE {SCHEMA_NAME}.%I DETACH PARTITION {SCHEMA_NAME}.%I', p_table_name, v_partition_name);
+      EXECUTE FORMAT('DROP TABLE {SCHEMA_NAME}.%I', v_partition_name);
+      v_dropped_ct := v_dropped_ct + 1;
+   END LOOP;
+
+   RETURN v_dropped_ct;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = {SCHEMA_NAME};
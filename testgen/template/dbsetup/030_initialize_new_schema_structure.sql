@@ -81,6 +81,25 @@ CREATE TABLE connections (
    http_path              VARCHAR(200)
 );
 
+-- Outcome of the latest probe of each saved connection, shared by the API workers
+CREATE TABLE connection_health (
+   connection_id        BIGINT NOT NULL
+      CONSTRAINT connection_health_connection_id_pk
+         PRIMARY KEY
+      CONSTRAINT connection_health_connections_connection_id_fk
+         REFERENCES connections
+         ON DELETE CASCADE,
+   connection_name      VARCHAR(40),
+   successful           BOOLEAN,
+   message              VARCHAR(200),
+   details              TEXT,
+   latency_ms           DOUBLE PRECISION,
+   checked_at           TIMESTAMPTZ,
+   check_ct             INTEGER NOT NULL DEFAULT 0,
+   failure_ct           INTEGER NOT NULL DEFAULT 0,
+   latency_histogram    INTEGER[] NOT NULL
+);
+
 CREATE TABLE table_groups
 (
     id                       UUID DEFAULT gen_random_uuid(),
@@ -214,13 +233,12 @@ CREATE TABLE test_definitions (
 
 ALTER SEQUENCE test_definitions_cat_test_id_seq OWNED BY test_definitions.cat_test_id;
 
+CREATE SEQUENCE profile_results_dk_id_seq;
+
+-- Range partitioned by month on run_date: unique indexes are created per partition by create_partition_unique_indexes
 CREATE TABLE profile_results (
-   id                    UUID DEFAULT gen_random_uuid()
-      CONSTRAINT profile_results_id_pk
-         PRIMARY KEY,
-   dk_id                 BIGINT GENERATED ALWAYS AS IDENTITY,
---       CONSTRAINT profile_results_dk_id_pk
---          PRIMARY KEY,
+   id                    UUID DEFAULT gen_random_uuid(),
+   dk_id                 BIGINT DEFAULT nextval('profile_results_dk_id_seq'),
    column_id             UUID,
    project_code          VARCHAR(30),
    connection_id         BIGINT
@@ -291,11 +309,14 @@ CREATE TABLE profile_results (
    pii_flag              VARCHAR(50),
    functional_data_type  VARCHAR(50),
    functional_table_type VARCHAR(50),
-   sample_ratio          FLOAT
-);
+   sample_ratio          FLOAT,
+   query_error           VARCHAR(1000)
+) PARTITION BY RANGE (run_date);
 
 ALTER SEQUENCE profile_results_dk_id_seq OWNED BY profile_results.dk_id;
 
+CREATE TABLE profile_results_default PARTITION OF profile_results DEFAULT;
+
 
 CREATE TABLE profile_anomaly_types (
    id                  VARCHAR(10)  NOT NULL
@@ -314,10 +335,9 @@ CREATE TABLE profile_anomaly_types (
    dq_dimension        VARCHAR(50)
 );
 
+-- Range partitioned by month on insert_date
 CREATE TABLE profile_anomaly_results (
-    id             UUID DEFAULT gen_random_uuid() NOT NULL
-        CONSTRAINT pk_anomaly_results_id
-            PRIMARY KEY,
+    id             UUID DEFAULT gen_random_uuid() NOT NULL,
    project_code    VARCHAR(30),
    table_groups_id UUID,
    profile_run_id  UUID,
@@ -329,8 +349,11 @@ CREATE TABLE profile_anomaly_results (
    anomaly_id      VARCHAR(10),
    detail          VARCHAR,
    disposition     VARCHAR(20), -- Confirmed, Dismissed, Inactive
-   dq_prevalence   FLOAT
-);
+   dq_prevalence   FLOAT,
+   insert_date     TIMESTAMP DEFAULT NOW()
+) PARTITION BY RANGE (insert_date);
+
+CREATE TABLE profile_anomaly_results_default PARTITION OF profile_anomaly_results DEFAULT;
 
 
 CREATE TABLE profile_pair_rules (
@@ -512,9 +535,56 @@ CREATE TABLE test_runs (
       FOREIGN KEY (test_suite_id) REFERENCES test_suites
 );
 
+CREATE TABLE run_step_metrics (
+   id                   UUID DEFAULT gen_random_uuid()
+      CONSTRAINT run_step_metrics_id_pk
+         PRIMARY KEY,
+   run_type             VARCHAR(20) NOT NULL,
+   run_id               UUID NOT NULL,
+   step_seq             INTEGER NOT NULL,
+   step_name            VARCHAR(100) NOT NULL,
+   step_starttime       TIMESTAMP,
+   step_endtime         TIMESTAMP,
+   wall_seconds         NUMERIC(12, 3),
+   target_db_seconds    NUMERIC(12, 3),
+   metadata_db_seconds  NUMERIC(12, 3),
+   query_ct             INTEGER,
+   row_ct               BIGINT,
+   byte_ct              BIGINT,
+   retry_ct             INTEGER,
+   error_message        VARCHAR(1000)
+);
+
+CREATE TABLE schema_ddf_snapshots (
+   table_groups_id      UUID NOT NULL,
+   ddf_query_hash       VARCHAR(40) NOT NULL,
+   snapshot_id          UUID NOT NULL,
+   change_signal        VARCHAR(40),
+   refreshed_at         TIMESTAMP,
+   CONSTRAINT schema_ddf_snapshots_tg_hash_pk
+      PRIMARY KEY (table_groups_id, ddf_query_hash)
+);
+
+CREATE TABLE schema_ddf_cache (
+   snapshot_id              UUID NOT NULL,
+   table_groups_id          UUID NOT NULL,
+   project_code             VARCHAR(30),
+   table_schema             VARCHAR(120),
+   table_name               VARCHAR(120),
+   column_name              VARCHAR(120),
+   data_type                TEXT,
+   character_maximum_length BIGINT,
+   ordinal_position         INTEGER,
+   general_type             VARCHAR(1),
+   is_decimal               BOOLEAN
+);
+
+CREATE SEQUENCE test_results_result_id_seq;
+
+-- Range partitioned by month on test_time
 CREATE TABLE test_results (
    id                     UUID DEFAULT gen_random_uuid(),
-   result_id              BIGINT GENERATED ALWAYS AS IDENTITY,
+   result_id              BIGINT DEFAULT nextval('test_results_result_id_seq'),
    test_type              VARCHAR(50)
       CONSTRAINT test_results_test_types_test_type_fk
          REFERENCES test_types,
@@ -548,7 +618,11 @@ CREATE TABLE test_results (
    observability_status   VARCHAR(10),
    CONSTRAINT test_results_test_suites_project_code_test_suite_fk
       FOREIGN KEY (test_suite_id) REFERENCES test_suites
-);
+) PARTITION BY RANGE (test_time);
+
+ALTER SEQUENCE test_results_result_id_seq OWNED BY test_results.result_id;
+
+CREATE TABLE test_results_default PARTITION OF test_results DEFAULT;
 
 CREATE TABLE working_agg_cat_tests (
    test_run_id       UUID NOT NULL,
@@ -744,6 +818,10 @@ CREATE INDEX ix_td_tg
 CREATE INDEX ix_td_ts_tc
    ON test_definitions(test_suite_id, table_name, column_name, test_type);
 
+CREATE INDEX ix_td_ts_tc_autogen
+   ON test_definitions(test_suite_id, table_name, column_name, test_type)
+   WHERE last_auto_gen_date IS NOT NULL;
+
 -- Index test_runs
 CREATE INDEX ix_trun_ts_fk
    ON test_runs(test_suite_id);
@@ -755,9 +833,6 @@ CREATE INDEX ix_trun_time
    ON test_runs USING BRIN (test_starttime);
 
 -- Index test_results
-CREATE UNIQUE INDEX uix_tr_id
-   ON test_results(id);
-
 CREATE INDEX ix_tr_pc_ts
    ON test_results(test_suite_id);
 
@@ -773,6 +848,10 @@ CREATE INDEX ix_tr_pc_sctc_tt
 CREATE INDEX ix_tr_ts_tctt
    ON test_results(test_suite_id, table_name, column_names, test_type);
 
+CREATE INDEX ix_tr_ts_tctt_time_autogen
+   ON test_results(test_suite_id, table_name, column_names, test_type, test_time)
+   WHERE auto_gen = TRUE;
+
 -- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 -- PROFILING OPTIMIZATION
 -- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -784,6 +863,19 @@ CREATE INDEX ix_prun_pc_con
 CREATE INDEX ix_prun_tg
    ON profiling_runs(table_groups_id);
 
+CREATE INDEX ix_prun_tg_time
+   ON profiling_runs(table_groups_id, profiling_starttime);
+
+
+-- Index run_step_metrics
+CREATE INDEX ix_rsm_run
+   ON run_step_metrics(run_id, step_seq);
+
+
+-- Index schema_ddf_cache
+CREATE INDEX ix_sddfc_snapshot
+   ON schema_ddf_cache(snapshot_id);
+
 
 -- Index profile_anomaly_types
 CREATE UNIQUE INDEX uix_pat_at
@@ -797,9 +889,6 @@ CREATE INDEX ix_pr_prun
 CREATE INDEX ix_pr_pc_con
    ON profile_results(project_code, connection_id);
 
-CREATE UNIQUE INDEX uix_pr_tg_t_c_prun
-   ON profile_results(table_groups_id, table_name, column_name, profile_run_id);
-
 
 -- Index profile_pair_rules
 CREATE INDEX ix_pro_pair_prun
@@ -862,5 +951,14 @@ CREATE INDEX shlast_runs_pro_run
 CREATE INDEX shlast_runs_tst_run
    ON score_history_latest_runs(last_test_run_id);
 
+-- Partitions of the result tables
+SELECT create_partition_unique_indexes('test_results', 'test_results_default');
+SELECT create_partition_unique_indexes('profile_results', 'profile_results_default');
+SELECT create_partition_unique_indexes('profile_anomaly_results', 'profile_anomaly_results_default');
+
+SELECT create_monthly_partitions('test_results', NOW()::TIMESTAMP, (NOW() + INTERVAL '1 month')::TIMESTAMP);
+SELECT create_monthly_partitions('profile_results', NOW()::TIMESTAMP, (NOW() + INTERVAL '1 month')::TIMESTAMP);
+SELECT create_monthly_partitions('profile_anomaly_results', NOW()::TIMESTAMP, (NOW() + INTERVAL '1 month')::TIMESTAMP);
+
 INSERT INTO tg_revision (component, revision)
 VALUES  ('metadata_db', 0);
@@ -23,10 +23,14 @@ GRANT SELECT, INSERT, DELETE, UPDATE ON
     {SCHEMA_NAME}.stg_secondary_profile_updates,
     {SCHEMA_NAME}.stg_data_chars_updates,
     {SCHEMA_NAME}.test_runs,
+    {SCHEMA_NAME}.run_step_metrics,
+    {SCHEMA_NAME}.schema_ddf_snapshots,
+    {SCHEMA_NAME}.schema_ddf_cache,
     {SCHEMA_NAME}.working_agg_cat_results,
     {SCHEMA_NAME}.working_agg_cat_tests,
     {SCHEMA_NAME}.functional_test_results,
     {SCHEMA_NAME}.connections,
+    {SCHEMA_NAME}.connection_health,
     {SCHEMA_NAME}.table_groups,
     {SCHEMA_NAME}.projects,
     {SCHEMA_NAME}.data_table_chars,
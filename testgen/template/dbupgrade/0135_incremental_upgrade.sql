@@ -0,0 +1,183 @@
+SET SEARCH_PATH TO {SCHEMA_NAME};
+
+-- Range partitioning of test_results, profile_results and profile_anomaly_results by month
+-- The existing tables are kept as they are and attached as the DEFAULT partition of the new partitioned tables:
+-- no data is copied, and their existing indexes are attached to the partitioned indexes instead of being rebuilt.
+-- 0136 constrains the old rows so that monthly partitions can be added without scanning them.
+
+
+-- Monthly range partitions of test_results, profile_results and profile_anomaly_results
+-- Partitions are named <table>_pYYYYMM; owned by the schema admin so the runtime roles can call these functions
+
+CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.create_partition_unique_indexes(p_table_name TEXT, p_partition_name TEXT)
+RETURNS VOID
+AS $$
+BEGIN
+   -- Unique indexes must include the partition key on a partitioned table, so they are kept at partition level
+   EXECUTE FORMAT('CREATE UNIQUE INDEX IF NOT EXISTS %I ON {SCHEMA_NAME}.%I (id)',
+                  p_partition_name || '_id_uix', p_partition_name);
+   IF p_table_name = 'profile_results' THEN
+      EXECUTE FORMAT('CREATE UNIQUE INDEX IF NOT EXISTS %I ON {SCHEMA_NAME}.%I (table_groups_id, table_name, column_name, profile_run_id)',
+                     p_partition_name || '_tg_t_c_prun_uix', p_partition_name);
+   END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = {SCHEMA_NAME};
+
+
+CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.create_monthly_partitions(p_table_name TEXT, p_from TIMESTAMP, p_until TIMESTAMP)
+RETURNS INTEGER
+AS $$
+DECLARE
+   v_month          DATE;
+   v_partition_name TEXT;
+   v_created_ct     INTEGER := 0;
+BEGIN
+   -- Continue after the latest monthly partition, p_from only applies when there is none yet
+   SELECT (MAX(TO_DATE(SUBSTRING(c.relname FROM '_p([0-9]{6})$'), 'YYYYMM')) + INTERVAL '1 month')::DATE
+     INTO v_month
+     FROM pg_inherits i
+   INNER JOIN pg_class c
+      ON (i.inhrelid = c.oid)
+    WHERE i.inhparent = ('{SCHEMA_NAME}.' || p_table_name)::REGCLASS
+      AND c.relname ~ '_p[0-9]{6}$';
+   v_month := COALESCE(v_month, DATE_TRUNC('month', p_from)::DATE);
+
+   WHILE v_month <= p_until LOOP
+      v_partition_name := p_table_name || '_p' || TO_CHAR(v_month, 'YYYYMM');
+      EXECUTE FORMAT('CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.%I PARTITION OF {SCHEMA_NAME}.%I FOR VALUES FROM (%L) TO (%L)',
+                     v_partition_name, p_table_name, v_month, (v_month + INTERVAL '1 month')::DATE);
+      PERFORM {SCHEMA_NAME}.create_partition_unique_indexes(p_table_name, v_partition_name);
+      v_created_ct := v_created_ct + 1;
+      v_month := (v_month + INTERVAL '1 month')::DATE;
+   END LOOP;
+
+   RETURN v_created_ct;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = {SCHEMA_NAME};
+
+
+CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.drop_monthly_partitions(p_table_name TEXT, p_before TIMESTAMP)
+RETURNS INTEGER
+AS $$
+DECLARE
+   v_partition_name TEXT;
+   v_dropped_ct     INTEGER := 0;
+BEGIN
+   -- Only partitions whose whole month is before the cutoff are dropped
+   FOR v_partition_name IN
+      SELECT c.relname
+        FROM pg_inherits i
+      INNER JOIN pg_class c
+         ON (i.inhrelid = c.oid)
+       WHERE i.inhparent = ('{SCHEMA_NAME}.' || p_table_name)::REGCLASS
+         AND c.relname ~ '_p[0-9]{6}$'
+         AND TO_DATE(SUBSTRING(c.relname FROM '_p([0-9]{6})$'), 'YYYYMM') + INTERVAL '1 month' <= p_before
+   LOOP
+      EXECUTE FORMAT('ALTER TABLE {SCHEMA_NAME}.%I DETACH PARTITION {SCHEMA_NAME}.%I', p_table_name, v_partition_name);
+      EXECUTE FORMAT('DROP TABLE {SCHEMA_NAME}.%I', v_partition_name);
+      v_dropped_ct := v_dropped_ct + 1;
+   END LOOP;
+
+   RETURN v_dropped_ct;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = {SCHEMA_NAME};
+
+
+CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.tmp_convert_to_partitioned(p_table_name TEXT, p_partition_key TEXT, p_identity_column TEXT)
+RETURNS VOID
+AS $$
+DECLARE
+   v_default_name TEXT := p_table_name || '_default';
+   v_index_name   TEXT;
+   v_sequence     TEXT;
+   v_next_value   BIGINT;
+BEGIN
+   EXECUTE FORMAT('ALTER TABLE %I RENAME TO %I', p_table_name, v_default_name);
+
+   -- Free the index names for the partitioned table, matching indexes get attached when created on the parent
+   FOR v_index_name IN SELECT indexname FROM pg_indexes WHERE schemaname = '{SCHEMA_NAME}' AND tablename = v_default_name LOOP
+      EXECUTE FORMAT('ALTER INDEX %I RENAME TO %I', v_index_name, LEFT(v_index_name, 55) || '_default');
+   END LOOP;
+
+   -- Identity columns are not supported on partitioned tables, switch to a sequence default
+   IF p_identity_column IS NOT NULL THEN
+      v_sequence := pg_get_serial_sequence(v_default_name, p_identity_column);
+      IF v_sequence IS NOT NULL THEN
+         EXECUTE FORMAT('SELECT last_value + 1 FROM %s', v_sequence) INTO v_next_value;
+         EXECUTE FORMAT('ALTER TABLE %I ALTER COLUMN %I DROP IDENTITY IF EXISTS', v_default_name, p_identity_column);
+      END IF;
+      EXECUTE FORMAT('CREATE SEQUENCE IF NOT EXISTS %I START WITH %s',
+                     p_table_name || '_' || p_identity_column || '_seq', COALESCE(v_next_value, 1));
+   END IF;
+
+   EXECUTE FORMAT('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING GENERATED) PARTITION BY RANGE (%I)',
+                  p_table_name, v_default_name, p_partition_key);
+
+   IF p_identity_column IS NOT NULL THEN
+      EXECUTE FORMAT('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT nextval(%L)',
+                     p_table_name, p_identity_column, p_table_name || '_' || p_identity_column || '_seq');
+      EXECUTE FORMAT('ALTER SEQUENCE %I OWNED BY %I.%I',
+                     p_table_name || '_' || p_identity_column || '_seq', p_table_name, p_identity_column);
+   END IF;
+
+   EXECUTE FORMAT('ALTER TABLE %I ATTACH PARTITION %I DEFAULT', p_table_name, v_default_name);
+END;
+$$ LANGUAGE plpgsql;
+
+
+ALTER TABLE profile_anomaly_results ADD COLUMN insert_date TIMESTAMP;
+ALTER TABLE profile_anomaly_results ALTER COLUMN insert_date SET DEFAULT NOW();
+
+SELECT tmp_convert_to_partitioned('test_results', 'test_time', 'result_id');
+SELECT tmp_convert_to_partitioned('profile_results', 'run_date', 'dk_id');
+SELECT tmp_convert_to_partitioned('profile_anomaly_results', 'insert_date', NULL);
+
+DROP FUNCTION tmp_convert_to_partitioned(TEXT, TEXT, TEXT);
+
+ALTER TABLE test_results ADD CONSTRAINT test_results_test_types_test_type_fk
+   FOREIGN KEY (test_type) REFERENCES test_types;
+ALTER TABLE test_results ADD CONSTRAINT test_results_test_suites_test_suite_id_fk
+   FOREIGN KEY (test_suite_id) REFERENCES test_suites;
+ALTER TABLE profile_results ADD CONSTRAINT profile_results_connections_connection_id_fk
+   FOREIGN KEY (connection_id) REFERENCES connections;
+
+-- Index test_results
+CREATE INDEX ix_tr_pc_ts
+   ON test_results(test_suite_id);
+
+CREATE INDEX ix_tr_trun
+   ON test_results(test_run_id);
+
+CREATE INDEX ix_tr_tt
+   ON test_results(test_type);
+
+CREATE INDEX ix_tr_pc_sctc_tt
+   ON test_results(test_suite_id, schema_name, table_name, column_names, test_type);
+
+CREATE INDEX ix_tr_ts_tctt
+   ON test_results(test_suite_id, table_name, column_names, test_type);
+
+CREATE INDEX idx_test_results_filter_join
+  ON test_results (test_run_id, table_groups_id, table_name, column_names)
+  WHERE dq_prevalence IS NOT NULL
+    AND (disposition IS NULL OR disposition = 'Confirmed');
+
+CREATE INDEX cix_tr_pc_ts
+   ON test_results(test_suite_id) WHERE observability_status = 'Queued';
+
+-- Index profile_results
+CREATE INDEX profile_results_tgid_sn_tn_cn
+    ON profile_results (table_groups_id, schema_name, table_name, column_name);
+
+CREATE INDEX ix_pr_prun
+   ON profile_results(profile_run_id);
+
+CREATE INDEX ix_pr_pc_con
+   ON profile_results(project_code, connection_id);
+
+-- Index profile_anomaly_results
+CREATE INDEX ix_ares_prun
+   ON profile_anomaly_results(profile_run_id, table_name, column_name);
+
+CREATE INDEX ix_ares_anid
+   ON profile_anomaly_results(anomaly_id);
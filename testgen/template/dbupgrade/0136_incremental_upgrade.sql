@@ -0,0 +1,25 @@
+SET SEARCH_PATH TO {SCHEMA_NAME};
+
+-- The rows from before partitioning stay in the DEFAULT partitions. A validated CHECK constraint bounding them lets
+-- Postgres add monthly partitions without scanning the DEFAULT partition.
+-- Validation runs in its own transaction after 0135, it only takes a SHARE UPDATE EXCLUSIVE lock on the table.
+
+DO $$
+DECLARE
+   v_cutoff TIMESTAMP := DATE_TRUNC('month', NOW()) + INTERVAL '1 month';
+BEGIN
+   EXECUTE FORMAT('ALTER TABLE test_results_default ADD CONSTRAINT test_results_default_before_partitions
+                      CHECK (test_time < %L OR test_time IS NULL) NOT VALID', v_cutoff);
+   EXECUTE FORMAT('ALTER TABLE profile_results_default ADD CONSTRAINT profile_results_default_before_partitions
+                      CHECK (run_date < %L OR run_date IS NULL) NOT VALID', v_cutoff);
+   EXECUTE FORMAT('ALTER TABLE profile_anomaly_results_default ADD CONSTRAINT profile_anomaly_results_default_before_partitions
+                      CHECK (insert_date < %L OR insert_date IS NULL) NOT VALID', v_cutoff);
+END $$;
+
+ALTER TABLE test_results_default VALIDATE CONSTRAINT test_results_default_before_partitions;
+ALTER TABLE profile_results_default VALIDATE CONSTRAINT profile_results_default_before_partitions;
+ALTER TABLE profile_anomaly_results_default VALIDATE CONSTRAINT profile_anomaly_results_default_before_partitions;
+
+SELECT create_monthly_partitions('test_results', DATE_TRUNC('month', NOW()) + INTERVAL '1 month', (NOW() + INTERVAL '2 months')::TIMESTAMP);
+SELECT create_monthly_partitions('profile_results', DATE_TRUNC('month', NOW()) + INTERVAL '1 month', (NOW() + INTERVAL '2 months')::TIMESTAMP);
+SELECT create_monthly_partitions('profile_anomaly_results', DATE_TRUNC('month', NOW()) + INTERVAL '1 month', (NOW() + INTERVAL '2 months')::TIMESTAMP);
@@ -0,0 +1,15 @@
+SET SEARCH_PATH TO {SCHEMA_NAME};
+
+-- Test Results: matching results to the current auto-generated test definitions
+CREATE INDEX ix_td_ts_tc_autogen
+   ON test_definitions(test_suite_id, table_name, column_name, test_type)
+   WHERE last_auto_gen_date IS NOT NULL;
+
+-- Test Results: history of an auto-generated test
+CREATE INDEX ix_tr_ts_tctt_time_autogen
+   ON test_results(test_suite_id, table_name, column_names, test_type, test_time)
+   WHERE auto_gen = TRUE;
+
+-- Latest profiling run per table group (v_latest_profile_results, v_latest_profile_anomalies)
+CREATE INDEX ix_prun_tg_time
+   ON profiling_runs(table_groups_id, profiling_starttime);
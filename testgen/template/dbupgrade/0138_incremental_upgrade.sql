@@ -0,0 +1,24 @@
+SET SEARCH_PATH TO {SCHEMA_NAME};
+
+CREATE TABLE run_step_metrics (
+   id                   UUID DEFAULT gen_random_uuid()
+      CONSTRAINT run_step_metrics_id_pk
+         PRIMARY KEY,
+   run_type             VARCHAR(20) NOT NULL,
+   run_id               UUID NOT NULL,
+   step_seq             INTEGER NOT NULL,
+   step_name            VARCHAR(100) NOT NULL,
+   step_starttime       TIMESTAMP,
+   step_endtime         TIMESTAMP,
+   wall_seconds         NUMERIC(12, 3),
+   target_db_seconds    NUMERIC(12, 3),
+   metadata_db_seconds  NUMERIC(12, 3),
+   query_ct             INTEGER,
+   row_ct               BIGINT,
+   byte_ct              BIGINT,
+   retry_ct             INTEGER,
+   error_message        VARCHAR(1000)
+);
+
+CREATE INDEX ix_rsm_run
+   ON run_step_metrics(run_id, step_seq);
@@ -0,0 +1,5 @@
+SET SEARCH_PATH TO {SCHEMA_NAME};
+
+-- Columns whose profiling query failed, timed out or was cancelled
+ALTER TABLE profile_results
+   ADD COLUMN query_error VARCHAR(1000);
@@ -0,0 +1,29 @@
+SET SEARCH_PATH TO {SCHEMA_NAME};
+
+-- Last column metadata (DDF) read from the target database for each table group
+CREATE TABLE schema_ddf_snapshots (
+   table_groups_id      UUID NOT NULL,
+   ddf_query_hash       VARCHAR(40) NOT NULL,
+   snapshot_id          UUID NOT NULL,
+   change_signal        VARCHAR(40),
+   refreshed_at         TIMESTAMP,
+   CONSTRAINT schema_ddf_snapshots_tg_hash_pk
+      PRIMARY KEY (table_groups_id, ddf_query_hash)
+);
+
+CREATE TABLE schema_ddf_cache (
+   snapshot_id              UUID NOT NULL,
+   table_groups_id          UUID NOT NULL,
+   project_code             VARCHAR(30),
+   table_schema             VARCHAR(120),
+   table_name               VARCHAR(120),
+   column_name              VARCHAR(120),
+   data_type                TEXT,
+   character_maximum_length BIGINT,
+   ordinal_position         INTEGER,
+   general_type             VARCHAR(1),
+   is_decimal               BOOLEAN
+);
+
+CREATE INDEX ix_sddfc_snapshot
+   ON schema_ddf_cache(snapshot_id);
@@ -0,0 +1,37 @@
+SET SEARCH_PATH TO {SCHEMA_NAME};
+
+-- Pruning keeps the partitions holding results of the latest complete runs
+DROP FUNCTION IF EXISTS {SCHEMA_NAME}.drop_monthly_partitions(TEXT, TIMESTAMP);
+
+CREATE OR REPLACE FUNCTION {SCHEMA_NAME}.drop_monthly_partitions(p_table_name TEXT, p_before TIMESTAMP, p_run_column TEXT, p_keep_run_ids UUID[])
+RETURNS INTEGER
+AS $$
+DECLARE
+   v_partition_name TEXT;
+   v_has_kept_runs  BOOLEAN;
+   v_dropped_ct     INTEGER := 0;
+BEGIN
+   -- Only partitions whose whole month is before the cutoff are dropped
+   FOR v_partition_name IN
+      SELECT c.relname
+        FROM pg_inherits i
+      INNER JOIN pg_class c
+         ON (i.inhrelid = c.oid)
+       WHERE i.inhparent = ('{SCHEMA_NAME}.' || p_table_name)::REGCLASS
+         AND c.relname ~ '_p[0-9]{6}$'
+         AND TO_DATE(SUBSTRING(c.relname FROM '_p([0-9]{6})$'), 'YYYYMM') + INTERVAL '1 month' <= p_before
+   LOOP
+      -- Partitions holding results of the kept runs stay, their other runs are deleted row by row
+      EXECUTE FORMAT('SELECT EXISTS (SELECT 1 FROM {SCHEMA_NAME}.%I WHERE %I = ANY($1))', v_partition_name, p_run_column)
+         INTO v_has_kept_runs
+         USING p_keep_run_ids;
+      CONTINUE WHEN v_has_kept_runs;
+
+      EXECUTE FORMAT('ALTER TABLE {SCHEMA_NAME}.%I DETACH PARTITION {SCHEMA_NAME}.%I', p_table_name, v_partition_name);
+      EXECUTE FORMAT('DROP TABLE {SCHEMA_NAME}.%I', v_partition_name);
+      v_dropped_ct := v_dropped_ct + 1;
+   END LOOP;
+
+   RETURN v_dropped_ct;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = {SCHEMA_NAME};
@@ -0,0 +1,20 @@
+SET SEARCH_PATH TO {SCHEMA_NAME};
+
+-- Outcome of the latest probe of each saved connection, shared by the API workers
+CREATE TABLE connection_health (
+   connection_id        BIGINT NOT NULL
+      CONSTRAINT connection_health_connection_id_pk
+         PRIMARY KEY
+      CONSTRAINT connection_health_connections_connection_id_fk
+         REFERENCES connections
+         ON DELETE CASCADE,
+   connection_name      VARCHAR(40),
+   successful           BOOLEAN,
+   message              VARCHAR(200),
+   details              TEXT,
+   latency_ms           DOUBLE PRECISION,
+   checked_at           TIMESTAMPTZ,
+   check_ct             INTEGER NOT NULL DEFAULT 0,
+   failure_ct           INTEGER NOT NULL DEFAULT 0,
+   latency_histogram    INTEGER[] NOT NULL
+);
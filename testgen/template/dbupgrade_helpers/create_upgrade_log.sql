@@ -0,0 +1,12 @@
+CREATE TABLE IF NOT EXISTS {SCHEMA_NAME}.tg_upgrade_log (
+   script_name VARCHAR(100) NOT NULL
+      CONSTRAINT tg_upgrade_log_script_name_pk
+         PRIMARY KEY,
+   checksum    VARCHAR(64)  NOT NULL,
+   applied_at  TIMESTAMP    NOT NULL DEFAULT NOW(),
+   duration_ms BIGINT,
+   index_builds_pending BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+ALTER TABLE {SCHEMA_NAME}.tg_upgrade_log
+   ADD COLUMN IF NOT EXISTS index_builds_pending BOOLEAN NOT NULL DEFAULT FALSE;
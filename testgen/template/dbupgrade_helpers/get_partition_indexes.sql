@@ -0,0 +1,24 @@
+-- Partitions of a partitioned table, with the state of their index for the parent index:
+--   attached_index_name: index of the partition already attached to the parent index, if any
+--   invalid_index_names: INVALID indexes of the partition, left behind by failed concurrent builds
+SELECT child.relname AS partition_name,
+       (SELECT ci.relname
+          FROM pg_inherits ii
+        INNER JOIN pg_class pi ON (ii.inhparent = pi.oid)
+        INNER JOIN pg_index cx ON (ii.inhrelid = cx.indexrelid)
+        INNER JOIN pg_class ci ON (cx.indexrelid = ci.oid)
+         WHERE pi.relname = '{INDEX_NAME}'
+           AND pi.relnamespace = n.oid
+           AND cx.indrelid = child.oid) AS attached_index_name,
+       ARRAY(SELECT ci.relname
+               FROM pg_index cx
+             INNER JOIN pg_class ci ON (cx.indexrelid = ci.oid)
+              WHERE cx.indrelid = child.oid
+                AND NOT cx.indisvalid) AS invalid_index_names
+  FROM pg_inherits i
+INNER JOIN pg_class parent ON (i.inhparent = parent.oid)
+INNER JOIN pg_class child ON (i.inhrelid = child.oid)
+INNER JOIN pg_namespace n ON (parent.relnamespace = n.oid)
+ WHERE n.nspname = '{SCHEMA_NAME}'
+   AND parent.relname = '{TABLE_NAME}'
+ORDER BY child.relname;
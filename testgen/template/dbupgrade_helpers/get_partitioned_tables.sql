@@ -0,0 +1,7 @@
+SELECT c.relname AS table_name
+  FROM pg_partitioned_table p
+INNER JOIN pg_class c
+   ON (p.partrelid = c.oid)
+INNER JOIN pg_namespace n
+   ON (c.relnamespace = n.oid)
+ WHERE n.nspname = '{SCHEMA_NAME}';
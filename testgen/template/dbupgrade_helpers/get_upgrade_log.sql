@@ -0,0 +1,2 @@
+SELECT script_name, checksum, index_builds_pending
+  FROM {SCHEMA_NAME}.tg_upgrade_log;
@@ -0,0 +1,7 @@
+INSERT INTO {SCHEMA_NAME}.tg_upgrade_log (script_name, checksum, applied_at, duration_ms, index_builds_pending)
+VALUES ('{SCRIPT_NAME}', '{CHECKSUM}', NOW(), {DURATION_MS}, {INDEX_BUILDS_PENDING})
+    ON CONFLICT (script_name) DO UPDATE
+   SET checksum = EXCLUDED.checksum,
+       applied_at = EXCLUDED.applied_at,
+       duration_ms = EXCLUDED.duration_ms,
+       index_builds_pending = EXCLUDED.index_builds_pending;
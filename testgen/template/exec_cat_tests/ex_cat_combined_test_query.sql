@@ -0,0 +1,4 @@
+-- Aggregate tests of several test runs against the same table, in one scan: one pair of result columns per run
+SELECT {CAT_BATCH} as cat_batch,
+       {TEST_COLUMNS}
+  FROM {SCHEMA_NAME}.{TABLE_NAME}
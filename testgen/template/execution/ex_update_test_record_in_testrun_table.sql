@@ -11,7 +11,9 @@ WITH stats
          WHERE r.id = '{TEST_RUN_ID}'::UUID
         GROUP BY r.id )
 UPDATE test_runs
-   SET status = CASE WHEN length('{EXCEPTION_MESSAGE}') = 0 then 'Complete' else 'Error' end,
+   SET status = CASE WHEN length('{EXCEPTION_MESSAGE}') = 0 then 'Complete'
+                     WHEN '{EXCEPTION_MESSAGE}' LIKE '%RunCancelledError%' then 'Cancelled'
+                     else 'Error' end,
        test_endtime = '{NOW}',
        log_message = '{EXCEPTION_MESSAGE}',
        duration = TO_CHAR('{NOW}' - r.test_starttime, 'HH24:MI:SS'),
@@ -0,0 +1,4 @@
+-- Changes whenever a table or view of the schema is created, dropped or altered
+SELECT CONCAT(COUNT(*), '-', COALESCE(CAST(MAX(t.last_altered) AS STRING), ''))
+  FROM information_schema.tables t
+ WHERE t.table_schema = '{DATA_SCHEMA}'
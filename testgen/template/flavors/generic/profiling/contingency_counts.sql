@@ -1,3 +1,4 @@
 SELECT {CONTINGENCY_COLUMNS}, COUNT(*) as freq_ct
   FROM {DATA_SCHEMA}.{DATA_TABLE}
-GROUP BY {CONTINGENCY_COLUMNS};
+GROUP BY {CONTINGENCY_COLUMNS}
+ORDER BY freq_ct DESC;
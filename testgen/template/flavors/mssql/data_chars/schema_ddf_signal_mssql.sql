@@ -0,0 +1,7 @@
+-- Changes whenever a table or view of the schema is created, dropped or altered
+SELECT CAST(COUNT(*) AS VARCHAR(20)) + '-' + COALESCE(CONVERT(VARCHAR(30), MAX(o.modify_date), 126), '')
+  FROM sys.objects o
+INNER JOIN sys.schemas s
+   ON (o.schema_id = s.schema_id)
+ WHERE s.name = '{DATA_SCHEMA}'
+   AND o.type IN ('U', 'V')
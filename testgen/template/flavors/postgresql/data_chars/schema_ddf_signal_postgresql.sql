@@ -0,0 +1,13 @@
+-- Changes whenever a table, view or column of the schema is created, dropped, renamed or retyped.
+-- Reads the system catalog, which is much faster than information_schema.columns.
+SELECT COUNT(*) || '-' || MD5(STRING_AGG(c.oid || '.' || c.relname || '.' || a.attnum || '.' || a.attname
+                                         || '.' || a.atttypid || '.' || a.atttypmod, ',' ORDER BY c.oid, a.attnum))
+  FROM pg_catalog.pg_class c
+INNER JOIN pg_catalog.pg_namespace n
+   ON (c.relnamespace = n.oid)
+INNER JOIN pg_catalog.pg_attribute a
+   ON (c.oid = a.attrelid)
+ WHERE n.nspname = '{DATA_SCHEMA}'
+   AND c.relkind IN ('r', 'v', 'm', 'f', 'p')
+   AND a.attnum > 0
+   AND NOT a.attisdropped
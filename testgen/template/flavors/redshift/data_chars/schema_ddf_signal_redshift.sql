@@ -0,0 +1,13 @@
+-- Changes whenever a table, view or column of the schema is created, dropped or retyped, and with most renames.
+-- Reads the system catalog on the leader node, which is much faster than information_schema.columns.
+SELECT COUNT(*) || '-' || SUM(c.oid) || '-' || SUM(a.attnum) || '-' || SUM(a.atttypid) || '-' || SUM(a.atttypmod)
+       || '-' || SUM(LEN(c.relname)) || '-' || SUM(LEN(a.attname))
+  FROM pg_catalog.pg_class c
+INNER JOIN pg_catalog.pg_namespace n
+   ON (c.relnamespace = n.oid)
+INNER JOIN pg_catalog.pg_attribute a
+   ON (c.oid = a.attrelid)
+ WHERE n.nspname = '{DATA_SCHEMA}'
+   AND c.relkind IN ('r', 'v')
+   AND a.attnum > 0
+   AND NOT a.attisdropped
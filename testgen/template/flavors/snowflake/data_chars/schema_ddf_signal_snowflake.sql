@@ -0,0 +1,5 @@
+-- Changes whenever a table or view of the schema is created, dropped or altered: LAST_DDL is only updated by DDL,
+-- unlike LAST_ALTERED, which data loads also update
+SELECT COUNT(*) || '-' || COALESCE(TO_VARCHAR(MAX(COALESCE(t.last_ddl, t.created))), '')
+  FROM information_schema.tables t
+ WHERE t.table_schema = '{DATA_SCHEMA}'
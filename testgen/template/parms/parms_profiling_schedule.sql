@@ -0,0 +1,23 @@
+-- Table groups to profile in a batch, stalest first: never profiled, then by the day of their last complete profile.
+-- Within a day, the largest groups start first, so that the longest runs don't end up last in the batch.
+SELECT tg.id::VARCHAR AS table_groups_id,
+       tg.table_groups_name,
+       tg.connection_id,
+       pr.profiling_endtime AS last_profiled,
+       COALESCE(dtc.group_cost, 0) AS group_cost
+  FROM table_groups tg
+LEFT JOIN profiling_runs pr
+       ON (tg.last_complete_profile_run_id = pr.id)
+LEFT JOIN (SELECT table_groups_id,
+                  SUM(COALESCE(data_point_ct, record_ct, 0)) AS group_cost
+             FROM data_table_chars
+            WHERE drop_date IS NULL
+           GROUP BY table_groups_id) dtc
+       ON (tg.id = dtc.table_groups_id)
+ WHERE ('{PROJECT_CODE}' = '' OR tg.project_code = '{PROJECT_CODE}')
+   AND {TABLE_GROUP_CONDITION}
+   AND (pr.profiling_endtime IS NULL
+        OR pr.profiling_endtime < NOW() - INTERVAL '{STALE_HOURS} hours')
+ORDER BY DATE_TRUNC('day', pr.profiling_endtime) NULLS FIRST,
+         group_cost DESC,
+         pr.profiling_endtime;
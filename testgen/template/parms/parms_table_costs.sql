@@ -0,0 +1,7 @@
+-- Estimated cost of querying each table: record count x column count from the latest profiling or test run
+SELECT schema_name,
+       table_name,
+       COALESCE(data_point_ct, record_ct, 0) AS table_cost
+  FROM data_table_chars
+ WHERE table_groups_id = '{TABLE_GROUPS_ID}'::UUID
+   AND drop_date IS NULL;
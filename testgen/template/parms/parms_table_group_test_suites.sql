@@ -0,0 +1,6 @@
+-- Test suites of a table group, executed together by run-test-suites
+SELECT test_suite
+  FROM test_suites
+ WHERE project_code = '{PROJECT_CODE}'
+   AND table_groups_id = '{TABLE_GROUPS_ID}'::UUID
+ORDER BY test_suite;
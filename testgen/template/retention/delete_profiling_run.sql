@@ -0,0 +1,6 @@
+-- Results left in the DEFAULT partition (rows from before partitioning or with no run date)
+DELETE FROM {SCHEMA_NAME}.profile_anomaly_results WHERE profile_run_id = '{RUN_ID}'::UUID;
+DELETE FROM {SCHEMA_NAME}.profile_results WHERE profile_run_id = '{RUN_ID}'::UUID;
+DELETE FROM {SCHEMA_NAME}.profile_pair_rules WHERE profile_run_id = '{RUN_ID}'::UUID;
+DELETE FROM {SCHEMA_NAME}.run_step_metrics WHERE run_id = '{RUN_ID}'::UUID;
+DELETE FROM {SCHEMA_NAME}.profiling_runs WHERE id = '{RUN_ID}'::UUID;
@@ -0,0 +1,6 @@
+-- Results left in the DEFAULT partition (rows from before partitioning or with no test time)
+DELETE FROM {SCHEMA_NAME}.test_results WHERE test_run_id = '{RUN_ID}'::UUID;
+DELETE FROM {SCHEMA_NAME}.working_agg_cat_results WHERE test_run_id = '{RUN_ID}'::UUID;
+DELETE FROM {SCHEMA_NAME}.working_agg_cat_tests WHERE test_run_id = '{RUN_ID}'::UUID;
+DELETE FROM {SCHEMA_NAME}.run_step_metrics WHERE run_id = '{RUN_ID}'::UUID;
+DELETE FROM {SCHEMA_NAME}.test_runs WHERE id = '{RUN_ID}'::UUID;
@@ -0,0 +1,11 @@
+-- The latest complete runs that test suites and table groups point to keep their results
+SELECT {SCHEMA_NAME}.drop_monthly_partitions(
+          'test_results', '{CUTOFF}', 'test_run_id',
+          ARRAY(SELECT last_complete_test_run_id FROM {SCHEMA_NAME}.test_suites WHERE last_complete_test_run_id IS NOT NULL))
+       + {SCHEMA_NAME}.drop_monthly_partitions(
+          'profile_results', '{CUTOFF}', 'profile_run_id',
+          ARRAY(SELECT last_complete_profile_run_id FROM {SCHEMA_NAME}.table_groups WHERE last_complete_profile_run_id IS NOT NULL))
+       + {SCHEMA_NAME}.drop_monthly_partitions(
+          'profile_anomaly_results', '{CUTOFF}', 'profile_run_id',
+          ARRAY(SELECT last_complete_profile_run_id FROM {SCHEMA_NAME}.table_groups WHERE last_complete_profile_run_id IS NOT NULL))
+       AS dropped_ct;
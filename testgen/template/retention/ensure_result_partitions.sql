@@ -0,0 +1,4 @@
+SELECT {SCHEMA_NAME}.create_monthly_partitions('test_results', NOW()::TIMESTAMP, (NOW() + INTERVAL '{MONTHS_AHEAD} month')::TIMESTAMP)
+       + {SCHEMA_NAME}.create_monthly_partitions('profile_results', NOW()::TIMESTAMP, (NOW() + INTERVAL '{MONTHS_AHEAD} month')::TIMESTAMP)
+       + {SCHEMA_NAME}.create_monthly_partitions('profile_anomaly_results', NOW()::TIMESTAMP, (NOW() + INTERVAL '{MONTHS_AHEAD} month')::TIMESTAMP)
+       AS created_ct;
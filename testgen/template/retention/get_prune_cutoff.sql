@@ -0,0 +1,2 @@
+-- Rounded down to the start of the month, so that only whole partitions are dropped
+SELECT DATE_TRUNC('month', NOW() - INTERVAL '{OLDER_THAN}')::TIMESTAMP AS cutoff;
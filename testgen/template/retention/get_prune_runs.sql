@@ -0,0 +1,10 @@
+-- Runs before the cutoff, except the latest complete runs that test suites and table groups point to
+SELECT 'test' AS run_type, r.id::VARCHAR AS run_id
+  FROM {SCHEMA_NAME}.test_runs r
+ WHERE r.test_starttime < '{CUTOFF}'
+   AND NOT EXISTS (SELECT 1 FROM {SCHEMA_NAME}.test_suites s WHERE s.last_complete_test_run_id = r.id)
+UNION ALL
+SELECT 'profiling' AS run_type, r.id::VARCHAR AS run_id
+  FROM {SCHEMA_NAME}.profiling_runs r
+ WHERE r.profiling_starttime < '{CUTOFF}'
+   AND NOT EXISTS (SELECT 1 FROM {SCHEMA_NAME}.table_groups g WHERE g.last_complete_profile_run_id = r.id);
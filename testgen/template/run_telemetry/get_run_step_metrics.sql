@@ -0,0 +1,17 @@
+SELECT run_type,
+       run_id::VARCHAR AS run_id,
+       step_seq,
+       step_name,
+       step_starttime,
+       step_endtime,
+       wall_seconds,
+       target_db_seconds,
+       metadata_db_seconds,
+       query_ct,
+       row_ct,
+       byte_ct,
+       retry_ct,
+       error_message
+  FROM {SCHEMA_NAME}.run_step_metrics
+ WHERE run_id = '{RUN_ID}'::UUID
+ORDER BY step_seq;
@@ -2,6 +2,7 @@ import dataclasses
 import importlib
 import inspect
 import logging
+import typing
 
 import streamlit as st
 
@@ -9,45 +10,66 @@ from testgen import settings
 from testgen.commands.run_upgrade_db_config import get_schema_revision
 from testgen.common import configure_logging, version_service
 from testgen.ui.assets import get_asset_path
-from testgen.ui.navigation.menu import Menu, Version
-from testgen.ui.navigation.page import Page
+from testgen.ui.navigation.menu import Menu, MenuItem, Version
+from testgen.ui.navigation.page import LazyPage, Page
 from testgen.ui.navigation.router import Router
+from testgen.ui.services import user_session_service
 from testgen.ui.session import session
-from testgen.ui.views.connections import ConnectionsPage
-from testgen.ui.views.data_catalog import DataCatalogPage
-from testgen.ui.views.hygiene_issues import HygieneIssuesPage
-from testgen.ui.views.login import LoginPage
-from testgen.ui.views.profiling_results import ProfilingResultsPage
-from testgen.ui.views.profiling_runs import DataProfilingPage
-from testgen.ui.views.project_dashboard import ProjectDashboardPage
-from testgen.ui.views.project_settings import ProjectSettingsPage
-from testgen.ui.views.quality_dashboard import QualityDashboardPage
-from testgen.ui.views.score_details import ScoreDetailsPage
-from testgen.ui.views.score_explorer import ScoreExplorerPage
-from testgen.ui.views.table_groups import TableGroupsPage
-from testgen.ui.views.test_definitions import TestDefinitionsPage
-from testgen.ui.views.test_results import TestResultsPage
-from testgen.ui.views.test_runs import TestRunsPage
-from testgen.ui.views.test_suites import TestSuitesPage
 from testgen.utils import plugins, singleton
 
-BUILTIN_PAGES: list[type[Page]] = [
-    LoginPage,
-    ProjectDashboardPage,
-    QualityDashboardPage,
-    ScoreDetailsPage,
-    ScoreExplorerPage,
-    DataCatalogPage,
-    DataProfilingPage,
-    ProfilingResultsPage,
-    HygieneIssuesPage,
-    TestRunsPage,
-    TestResultsPage,
-    ConnectionsPage,
-    TableGroupsPage,
-    TestSuitesPage,
-    TestDefinitionsPage,
-    ProjectSettingsPage,
+NON_CATALOG_ROLES = [ role for role in typing.get_args(user_session_service.RoleType) if role != "catalog" ]
+
+# View modules are imported on the first visit to their route, they pull in pandas, ReportLab, XlsxWriter and friends
+BUILTIN_PAGES: list[LazyPage] = [
+    LazyPage("", "testgen.ui.views.login:LoginPage"),
+    LazyPage(
+        "project-dashboard",
+        "testgen.ui.views.project_dashboard:ProjectDashboardPage",
+        MenuItem(icon="home", label="Project Dashboard", order=0, roles=NON_CATALOG_ROLES),
+    ),
+    LazyPage(
+        "quality-dashboard",
+        "testgen.ui.views.quality_dashboard:QualityDashboardPage",
+        MenuItem(icon="readiness_score", label="Quality Dashboard", order=1, roles=NON_CATALOG_ROLES),
+    ),
+    LazyPage("quality-dashboard:score-details", "testgen.ui.views.score_details:ScoreDetailsPage"),
+    LazyPage("quality-dashboard:explorer", "testgen.ui.views.score_explorer:ScoreExplorerPage"),
+    LazyPage(
+        "data-catalog",
+        "testgen.ui.views.data_catalog:DataCatalogPage",
+        MenuItem(icon="dataset", label="Data Catalog", section="Data Profiling", order=0),
+    ),
+    LazyPage(
+        "profiling-runs",
+        "testgen.ui.views.profiling_runs:DataProfilingPage",
+        MenuItem(
+            icon="data_thresholding",
+            label="Profiling Runs",
+            section="Data Profiling",
+            order=1,
+            roles=NON_CATALOG_ROLES,
+        ),
+    ),
+    LazyPage("profiling-runs:results", "testgen.ui.views.profiling_results:ProfilingResultsPage"),
+    LazyPage("profiling-runs:hygiene", "testgen.ui.views.hygiene_issues:HygieneIssuesPage"),
+    LazyPage(
+        "test-runs",
+        "testgen.ui.views.test_runs:TestRunsPage",
+        MenuItem(icon="labs", label="Test Runs", section="Data Quality Testing", order=0, roles=NON_CATALOG_ROLES),
+    ),
+    LazyPage("test-runs:results", "testgen.ui.views.test_results:TestResultsPage"),
+    LazyPage("connections:table-groups", "testgen.ui.views.table_groups.page:TableGroupsPage"),
+    LazyPage(
+        "test-suites",
+        "testgen.ui.views.test_suites:TestSuitesPage",
+        MenuItem(icon="rule", label="Test Suites", section="Data Quality Testing", order=1, roles=NON_CATALOG_ROLES),
+    ),
+    LazyPage("test-suites:definitions", "testgen.ui.views.test_definitions:TestDefinitionsPage"),
+    LazyPage(
+        "settings",
+        "testgen.ui.views.project_settings:ProjectSettingsPage",
+        MenuItem(icon="settings", label="Project Settings", section="Settings", order=0, roles=[ "admin" ]),
+    ),
 ]
 
 LOG = logging.getLogger("testgen")
@@ -72,23 +94,24 @@ class Application(singleton.Singleton):
         self.logger = logger
 
     def get_version(self) -> Version:
-        latest_version = self.menu.version.latest
+        # The lookup runs in a background thread, the menu keeps showing the placeholder until it finishes
         if not session.latest_version:
-            latest_version = version_service.get_latest_version()
+            session.latest_version = version_service.get_latest_version_in_background()
 
         return Version(
             current=settings.VERSION,
-            latest=latest_version,
+            latest=session.latest_version or self.menu.version.latest,
             schema=get_schema_revision(),
         )
 
 
 def run(log_level: int = logging.INFO) -> Application:
-    pages = [*BUILTIN_PAGES]
+    pages: list[type[Page] | LazyPage] = [*BUILTIN_PAGES]
     installed_plugins = plugins.discover()
 
     configure_logging(level=log_level)
     logo_class = Logo
+    version_service.get_latest_version_in_background()
 
     for plugin in installed_plugins:
         module = importlib.import_module(plugin.package)
@@ -1,33 +1,78 @@
+import multiprocessing
 import tempfile
 from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from zipfile import ZipFile
 
 import streamlit as st
 
+from testgen import settings
+
 PROGRESS_UPDATE_TYPE = Callable[[float], None]
 
 FILE_DATA_TYPE = tuple[str, str, str|bytes]
 
+PREFETCH_PROGRESS_SHARE = 0.5
+
+
+def _ignore_progress(_: float) -> None:
+    # Worker processes can't reach the Streamlit progress bar; progress is reported as each file completes
+    pass
+
+
 def zip_multi_file_data(
     zip_file_name: str,
     file_data_func: Callable[[PROGRESS_UPDATE_TYPE, ...], FILE_DATA_TYPE],
     args_list: list[Iterable],
+    prefetch_func: Callable[[PROGRESS_UPDATE_TYPE, list[Iterable]], list[Iterable]] | None = None,
+    max_workers: int = settings.ISSUE_REPORT_MAX_WORKERS,
 ) -> Callable[[PROGRESS_UPDATE_TYPE, ...], FILE_DATA_TYPE]:
+    """
+    Build a file content function that zips together the files generated by `file_data_func` for each args item.
+
+    When `prefetch_func` is given, it runs first in the calling process and returns the args list to be used for
+    generating the files. That's where the database lookups should happen, so `file_data_func` can run in a pool of
+    `max_workers` processes. For that, `file_data_func` and its args must be picklable.
+    """
 
     def _file_content_func(update_main_progress, *args):
 
         progress = 0.0
-        step = 1.0 / len(args_list)
+        file_args_list = args_list
+
+        if prefetch_func:
+            file_args_list = prefetch_func(
+                lambda f_progress: update_main_progress(PREFETCH_PROGRESS_SHARE * f_progress),
+                args_list,
+            )
+            progress = PREFETCH_PROGRESS_SHARE
+
+        step = (1.0 - progress) / len(file_args_list)
 
         def _update_progress(f_progress):
             update_main_progress(progress + step * f_progress)
 
         with tempfile.NamedTemporaryFile() as zip_file:
             with ZipFile(zip_file.name, "w") as zip_writer:
-                for args in args_list:
-                    file_name, _, file_data = file_data_func(_update_progress, *args)
-                    zip_writer.writestr(file_name, file_data)
-                    progress += step
+                if max_workers > 1 and len(file_args_list) > 1:
+                    with ProcessPoolExecutor(
+                        max_workers=min(max_workers, len(file_args_list)),
+                        mp_context=multiprocessing.get_context("spawn"),
+                    ) as executor:
+                        futures = [
+                            executor.submit(file_data_func, _ignore_progress, *file_args)
+                            for file_args in file_args_list
+                        ]
+                        for future in as_completed(futures):
+                            file_name, _, file_data = future.result()
+                            zip_writer.writestr(file_name, file_data)
+                            progress += step
+                            update_main_progress(min(progress, 1.0))
+                else:
+                    for file_args in file_args_list:
+                        file_name, _, file_data = file_data_func(_update_progress, *file_args)
+                        zip_writer.writestr(file_name, file_data)
+                        progress += step
             zip_content = zip_file.read()
 
         return zip_file_name, "application/zip", zip_content
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import abc
+import dataclasses
+import importlib
 import logging
+import threading
 import typing
 
 import streamlit as st
@@ -71,3 +74,45 @@ class Page(abc.ABC):
     @abc.abstractmethod
     def render(self, **kwargs) -> None:
         raise NotImplementedError
+
+
+@dataclasses.dataclass(frozen=True)
+class LazyPage:
+    """
+    Registry entry for a page whose view module is only imported the first time its route is visited.
+
+    `import_path` points to the `Page` subclass as `"package.module:ClassName"`. The menu item lives in the entry so
+    that the sidebar can be built without importing the views.
+    """
+
+    path: str
+    import_path: str
+    menu_item: MenuItem | None = None
+
+    def __call__(self, router: testgen.ui.navigation.router.Router) -> LazyRoute:
+        return LazyRoute(self, router)
+
+
+class LazyRoute:
+    def __init__(self, page: LazyPage, router: testgen.ui.navigation.router.Router) -> None:
+        self.path = page.path
+        self.import_path = page.import_path
+        self.router = router
+        self.streamlit_page = st.Page(self._navigate, url_path=self.path, title=self.path, default=not self.path)
+        self._page: Page | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Page:
+        if self._page is None:
+            with self._lock:
+                if self._page is None:
+                    module_name, class_name = self.import_path.split(":")
+                    page_class = getattr(importlib.import_module(module_name), class_name)
+                    if page_class.path != self.path:
+                        raise ValueError(f"Lazy page '{self.import_path}' is registered as '{self.path}' but defines path '{page_class.path}'")
+                    LOG.debug(f"Loaded page '{self.path}' from {self.import_path}")
+                    self._page = page_class(self.router)
+        return self._page
+
+    def _navigate(self) -> None:
+        self.load()._navigate()
@@ -14,12 +14,12 @@ COOKIES_READY_RERUNS = 2
 
 
 class Router(Singleton):
-    _routes: dict[str, testgen.ui.navigation.page.Page]
+    _routes: dict[str, testgen.ui.navigation.page.Page | testgen.ui.navigation.page.LazyRoute]
 
     def __init__(
         self,
         /,
-        routes: list[type[testgen.ui.navigation.page.Page]] | None = None,
+        routes: list[type[testgen.ui.navigation.page.Page] | testgen.ui.navigation.page.LazyPage] | None = None,
     ) -> None:
         self._routes = {route.path: route(self) for route in routes} if routes else {}
         self._pending_navigation: dict | None = None
@@ -1,4 +1,5 @@
 from collections.abc import Iterable
+from functools import lru_cache
 from math import nan
 
 import pandas
@@ -63,6 +64,19 @@ TABLE_STYLE_DATA = TableStyle(
 )
 
 
+@lru_cache(maxsize=16384)
+def _calc_text_width(text, font_name, font_size):
+    """
+    Return the width of the widest word and the width of the whole text in a single line.
+
+    It's cached because the same values show up over and over in the data tables, especially when several reports are
+    generated in a batch.
+    """
+    space_width = stringWidth(" ", font_name, font_size)
+    words_width = [stringWidth(word, font_name, font_size) for word in text.split(" ")]
+    return max(words_width), sum(words_width) + space_width * (len(words_width) - 1)
+
+
 class VerticalHeaderCell(Flowable):
     """
     Wrap a Paragraph rotating it 90 degrees.
@@ -155,7 +169,7 @@ class DataFrameTableBuilder:
 
         table_data = (
             header,
-            *(data.tolist() for _, data in self.table_data.iterrows()),
+            *self.table_data.to_numpy().tolist(),
         )
 
         return Table(table_data, **kwargs)
@@ -245,13 +259,8 @@ class DataFrameTableBuilder:
 
         The min width considers wrapping only at the spaces, while the max width considers no wrapping.
         """
-        font_name = cell.style.fontName
-        font_size = cell.style.fontSize
-        space_width = stringWidth(" ", font_name, font_size)
-        words_width = [stringWidth(word, font_name, font_size) for word in cell.text.split(" ")]
-        min_width = max(words_width) + self.col_padding
-        max_width = sum(words_width) + self.col_padding + space_width * (len(words_width) - 1)
-        return min_width, max_width
+        min_text_width, max_text_width = _calc_text_width(cell.text, cell.style.fontName, cell.style.fontSize)
+        return min_text_width + self.col_padding, max_text_width + self.col_padding
 
     def _calc_col_width(self, col):
         col_width = col.map(self._calc_cell_width)
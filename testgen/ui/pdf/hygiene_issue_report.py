@@ -151,7 +151,12 @@ def build_sql_query_content(sample_data_tuple):
         return Paragraph("No sample data lookup query registered for this issue.")
 
 
-def get_report_content(document, hi_data):
+def get_report_lookups(hi_data):
+    """Run the database lookups of a report, so the PDF can be laid out without database access."""
+    return get_source_data(hi_data)
+
+
+def get_report_content(document, hi_data, sample_data_tuple):
     yield Paragraph("TestGen Hygiene Issue Report", PARA_STYLE_TITLE)
     yield build_summary_table(document, hi_data)
 
@@ -159,8 +164,6 @@ def get_report_content(document, hi_data):
     yield Paragraph("Suggested Action", style=PARA_STYLE_H1)
     yield Paragraph(hi_data["suggested_action"], style=PARA_STYLE_TEXT)
 
-    sample_data_tuple = get_source_data(hi_data)
-
     yield CondPageBreak(SECTION_MIN_AVAILABLE_HEIGHT)
     yield Paragraph("Sample Data", PARA_STYLE_H1)
     yield from build_sample_data_content(document, sample_data_tuple)
@@ -171,6 +174,8 @@ def get_report_content(document, hi_data):
     ])
 
 
-def create_report(filename, hi_data):
+def create_report(filename, hi_data, lookups=None):
+    if lookups is None:
+        lookups = get_report_lookups(hi_data)
     doc = DatakitchenTemplate(filename)
-    doc.build(flowables=list(get_report_content(doc, hi_data)))
+    doc.build(flowables=list(get_report_content(doc, hi_data, lookups)))
@@ -0,0 +1,39 @@
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from testgen import settings
+
+
+def prefetch_report_lookups(
+    lookup_func: Callable[[dict], object],
+) -> Callable[[Callable[[float], None], list[Iterable]], list[Iterable]]:
+    """
+    Build a `prefetch_func` for `zip_multi_file_data` that runs the report lookups before the PDFs are laid out.
+
+    The issues are batched by connection: each batch runs its lookups one after another over the warm engine of its
+    target database, while batches of different connections run concurrently. The lookup result is appended to each
+    args item.
+    """
+
+    def _prefetch(update_progress, args_list):
+        batches = defaultdict(list)
+        for idx, args in enumerate(args_list):
+            batches[args[0]["connection_id"]].append(idx)
+
+        def _run_batch(indexes):
+            return [(idx, lookup_func(args_list[idx][0])) for idx in indexes]
+
+        lookups = [None] * len(args_list)
+        done_count = 0
+        with ThreadPoolExecutor(max_workers=max(1, settings.ISSUE_REPORT_MAX_WORKERS)) as executor:
+            futures = [executor.submit(_run_batch, indexes) for indexes in batches.values()]
+            for future in as_completed(futures):
+                for idx, lookup in future.result():
+                    lookups[idx] = lookup
+                    done_count += 1
+                update_progress(done_count / len(args_list))
+
+        return [(*args, lookup) for args, lookup in zip(args_list, lookups, strict=True)]
+
+    return _prefetch
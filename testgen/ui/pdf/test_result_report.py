@@ -136,9 +136,7 @@ def build_summary_table(document, tr_data):
     return Table(summary_table_data, style=summary_table_style, hAlign="LEFT", colWidths=summary_table_col_widths)
 
 
-def build_history_table(document, tr_data):
-    history_data = get_test_result_history(get_schema(), tr_data)
-
+def build_history_table(document, tr_data, history_data):
     history_table_style = TableStyle(
         (
             ("ALIGN", (3, 0), (3, -1), "CENTER"),
@@ -199,7 +197,19 @@ def build_sql_query_content(sample_data_tuple):
         return Paragraph("No sample data lookup query registered for this test.")
 
 
-def get_report_content(document, tr_data):
+def get_report_lookups(tr_data):
+    """Run the database lookups of a report, so the PDF can be laid out without database access."""
+    history_data = get_test_result_history(get_schema(), tr_data)
+    if tr_data["test_type"] == "CUSTOM":
+        sample_data_tuple = do_source_data_lookup_custom(get_schema(), tr_data)
+    else:
+        sample_data_tuple = do_source_data_lookup(get_schema(), tr_data)
+    return history_data, sample_data_tuple
+
+
+def get_report_content(document, tr_data, lookups):
+    history_data, sample_data_tuple = lookups
+
     yield Paragraph("TestGen Test Issue Report", PARA_STYLE_TITLE)
     yield build_summary_table(document, tr_data)
 
@@ -210,12 +220,7 @@ def get_report_content(document, tr_data):
 
     yield CondPageBreak(SECTION_MIN_AVAILABLE_HEIGHT)
     yield Paragraph("Result History", PARA_STYLE_H1)
-    yield build_history_table(document, tr_data)
-
-    if tr_data["test_type"] == "CUSTOM":
-        sample_data_tuple = do_source_data_lookup_custom(get_schema(), tr_data)
-    else:
-        sample_data_tuple = do_source_data_lookup(get_schema(), tr_data)
+    yield build_history_table(document, tr_data, history_data)
 
     yield CondPageBreak(SECTION_MIN_AVAILABLE_HEIGHT)
     yield Paragraph("Sample Data", PARA_STYLE_H1)
@@ -227,6 +232,8 @@ def get_report_content(document, tr_data):
     ])
 
 
-def create_report(filename, tr_data):
+def create_report(filename, tr_data, lookups=None):
+    if lookups is None:
+        lookups = get_report_lookups(tr_data)
     doc = DatakitchenTemplate(filename)
-    doc.build(flowables=list(get_report_content(doc, tr_data)))
+    doc.build(flowables=list(get_report_content(doc, tr_data, lookups)))
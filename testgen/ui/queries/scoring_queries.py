@@ -43,6 +43,7 @@ def get_score_card_issue_reports(selected_issues: list["SelectedIssue"]):
             results.profile_run_id::VARCHAR,
             types.suggested_action,
             results.table_groups_id::VARCHAR,
+            groups.connection_id::VARCHAR,
             results.anomaly_id::VARCHAR
         FROM {schema}.profile_anomaly_results results
         INNER JOIN {schema}.profile_anomaly_types types
@@ -87,6 +88,7 @@ def get_score_card_issue_reports(selected_issues: list["SelectedIssue"]):
             results.test_suite_id,
             results.test_definition_id::VARCHAR as test_definition_id_runtime,
             results.table_groups_id::VARCHAR,
+            groups.connection_id::VARCHAR,
             types.id::VARCHAR AS test_type_id
         FROM {schema}.test_results results
         INNER JOIN {schema}.test_types types
@@ -208,6 +208,8 @@ delete from {schema}.profile_results pr USING {schema}.table_groups tg where tg.
 delete from {schema}.profiling_runs pr USING {schema}.table_groups tg where tg.id = pr.table_groups_id and tg.table_groups_name in ({",".join(table_group_items)});
 delete from {schema}.data_table_chars dtc USING {schema}.table_groups tg where tg.id = dtc.table_groups_id and tg.table_groups_name in ({",".join(table_group_items)});
 delete from {schema}.data_column_chars dcs USING {schema}.table_groups tg where tg.id = dcs.table_groups_id and tg.table_groups_name in ({",".join(table_group_items)});
+delete from {schema}.schema_ddf_cache sdc USING {schema}.table_groups tg where tg.id = sdc.table_groups_id and tg.table_groups_name in ({",".join(table_group_items)});
+delete from {schema}.schema_ddf_snapshots sds USING {schema}.table_groups tg where tg.id = sds.table_groups_id and tg.table_groups_name in ({",".join(table_group_items)});
 delete from {schema}.table_groups where table_groups_name in ({",".join(table_group_items)});"""
     db.execute_sql(sql)
     st.cache_data.clear()
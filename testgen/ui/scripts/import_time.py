@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+# Loaded on demand by the views and the database flavors, importing any of them on startup is a regression
+DEFERRED_PACKAGES = (
+    "reportlab",
+    "xlsxwriter",
+    "streamlit_authenticator",
+    "snowflake",
+    "databricks",
+    "pyodbc",
+    "cryptography",
+)
+
+
+@dataclass
+class ImportTimeReport:
+    module: str
+    total_ms: float
+    slowest: list[tuple[str, float]] = field(default_factory=list)
+    deferred_imported: list[str] = field(default_factory=list)
+
+
+def measure(module: str = "testgen.ui.app", top: int = 15) -> ImportTimeReport:
+    """
+    Imports `module` in a fresh interpreter with `python -X importtime` and parses the timings from its stderr.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    self_times: list[tuple[str, float]] = []
+    deferred_imported: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        name = name.strip()
+        self_times.append((name, int(self_us) / 1000))
+        if name == module:
+            total_us = int(cumulative_us)
+        if (package := name.split(".")[0]) in DEFERRED_PACKAGES:
+            deferred_imported.add(package)
+
+    return ImportTimeReport(
+        module=module,
+        total_ms=total_us / 1000,
+        slowest=sorted(self_times, key=lambda item: item[1], reverse=True)[:top],
+        deferred_imported=sorted(deferred_imported),
+    )
@@ -1,9 +1,13 @@
+import threading
+import time
 from urllib.parse import quote_plus
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine.cursor import CursorResult
 
+from testgen import settings
 from testgen.common.credentials import (
     get_tg_db,
     get_tg_host,
@@ -19,6 +23,11 @@ from testgen.common.encrypt import DecryptText
  Shared database access and utility functions
 """
 
+# Engines kept open between lookups, with the time they were last used
+_target_engines_lock = threading.Lock()
+_warm_target_engines: dict[tuple, list] = {}
+_WARM_TARGET_ENGINES_MAX = 16
+
 
 def get_schema():
     return get_tg_schema()
@@ -91,92 +100,141 @@ def execute_sql_raw(str_sql):
         con.commit()
 
 
+def _to_db_param(value):
+    # Bound parameters must be plain Python values
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _values_differ(edited: pd.Series, original: pd.Series) -> pd.Series:
+    return ~((edited == original) | (edited.isna() & original.isna()))
+
+
 def _get_df_edits(df_original: pd.DataFrame, df_edited: pd.DataFrame, lst_id_columns: list) -> tuple:
-    # Rows in df_edited that exist in df_original but have had any column changed
+    # Rows in df_edited that exist in df_original but have had any column changed, with a mask of the changed columns,
     #  based on composite ID columns
 
     # Merge the two dataframes based on the composite ID columns
     merged_df = df_edited.merge(df_original, on=lst_id_columns, how="outer", indicator=True, suffixes=("", "_original"))
-    # Filter the merged dataframe to only keep rows that are changed
-    # Step 1: Filter rows that exist in both dataframes
-    both_rows = merged_df[merged_df["_merge"] == "both"]
+    compare_columns = [col for col in df_original.columns if col not in lst_id_columns]
 
-    # Step 2: Identify changed rows
-    def has_changes(row):
-        for col in df_original.columns:
-            # Skip the ID columns
-            if col in lst_id_columns:
-                continue
-            if row[col] != row[col + "_original"]:
-                return True
-        return False
-
-    changed_rows_mask = both_rows.apply(has_changes, axis=1)
-
-    # Step 3: Combine the filters
-    changed_rows = both_rows[changed_rows_mask]
+    # Rows that exist in both dataframes, and which of their columns changed
+    both_rows = merged_df[merged_df["_merge"] == "both"]
+    changed_mask = pd.DataFrame(
+        {col: _values_differ(both_rows[col], both_rows[col + "_original"]) for col in compare_columns},
+        index=both_rows.index,
+        dtype=bool,
+    )
+    is_changed = changed_mask.any(axis=1)
+    changed_rows = both_rows[is_changed]
+    changed_mask = changed_mask[is_changed]
 
     # All rows in df_edited that are newly created and don't exist in df_original
     new_rows = merged_df[merged_df["_merge"] == "left_only"].drop(
-        columns=["_merge"] + [col + "_original" for col in df_original.columns if col not in lst_id_columns]
+        columns=["_merge"] + [col + "_original" for col in compare_columns]
     )
 
     # All rows in df_original that have been deleted from df_edited
     deleted_rows = merged_df[merged_df["_merge"] == "right_only"][df_original.columns]
 
-    return changed_rows, new_rows, deleted_rows
+    return changed_rows, changed_mask, new_rows, deleted_rows
 
 
-def _gen_df_update_sql(
-    changed_rows: pd.DataFrame, table_name: str, lst_id_columns: list, no_update_columns: list
-) -> list:
-    # Generate a list of SQL UPDATE statements based on the changed rows.
-
-    # Extract the original column names by removing the "_original" suffix
-    original_columns = [col.replace("_original", "") for col in changed_rows.columns if col.endswith("_original")]
-    # Drop columns we aren't updating from list
-    update_columns = [col for col in original_columns if col not in no_update_columns]
-
-    # Generate SQL UPDATE statements
-    sql_statements = []
-    for _, row in changed_rows.iterrows():
-        set_statements = []
-        for col in update_columns:
-            # If the value is different from the original value
-            if row[col] != row[col + "_original"]:
-                value = make_value_db_friendly(row[col])
-                set_statements.append(f"{col} = {value}")
-
-        # Handle composite keys for the WHERE clause
-        where_statements = []
-        for col in lst_id_columns:
-            value = make_value_db_friendly(row[col])
-            # value = f"'{row[col]}'" if isinstance(row[col], str) else row[col]
-            where_statements.append(f"{col} = {value}")
-
-        update_statement = f"UPDATE {get_schema()}.{table_name} SET {', '.join(set_statements)} WHERE {' AND '.join(where_statements)};"
-        sql_statements.append(update_statement)
-
-    return sql_statements
-
+def _get_column_types(con, table_name: str) -> dict[str, str]:
+    result = con.execute(
+        text("""
+        SELECT attname, FORMAT_TYPE(atttypid, atttypmod)
+          FROM pg_attribute
+         WHERE attrelid = CAST(:table_name AS REGCLASS)
+           AND attnum > 0
+           AND NOT attisdropped;
+        """),
+        {"table_name": f"{get_schema()}.{table_name}"},
+    )
+    return dict(result.fetchall())
 
-def _gen_df_delete_sql(deleted_rows: pd.DataFrame, table_name: str, lst_id_columns: list) -> list:
-    # Generate a list of SQL DELETE statements based on the deleted rows.
 
-    # Generate SQL DELETE statements
-    sql_statements = []
-    for _, row in deleted_rows.iterrows():
-        # Handle composite keys for the WHERE clause
-        where_statements = []
-        for col in lst_id_columns:
-            value = make_value_db_friendly(row[col])
-            # value = f"'{row[col]}'" if isinstance(row[col], str) else row[col]
-            where_statements.append(f"{col} = {value}")
+def _gen_df_update_sql(
+    changed_rows: pd.DataFrame,
+    changed_mask: pd.DataFrame,
+    table_name: str,
+    lst_id_columns: list,
+    no_update_columns: list,
+    dct_column_types: dict,
+) -> tuple[str, dict] | None:
+    # Generate a single UPDATE joined to the changed rows as VALUES. Each column is only set where it changed.
+
+    update_columns = [
+        col for col in changed_mask.columns if col not in no_update_columns and changed_mask[col].any()
+    ]
+    if changed_rows.empty or not update_columns:
+        return None
+
+    # Typed values are needed in the VALUES list, Postgres would infer text otherwise
+    params = {}
+    values = []
+    for row_idx, (row, changed) in enumerate(zip(
+        changed_rows[lst_id_columns + update_columns].itertuples(index=False),
+        changed_mask[update_columns].itertuples(index=False),
+        strict=True,
+    )):
+        row_values = []
+        for col_idx, (col, value) in enumerate(zip(lst_id_columns + update_columns, row, strict=True)):
+            params[f"v{row_idx}_{col_idx}"] = _to_db_param(value)
+            row_values.append(f"CAST(:v{row_idx}_{col_idx} AS {dct_column_types[col]})")
+        for col_idx, is_changed in enumerate(changed):
+            params[f"c{row_idx}_{col_idx}"] = bool(is_changed)
+            row_values.append(f":c{row_idx}_{col_idx}")
+        values.append(f"({', '.join(row_values)})")
 
-        delete_statement = f"DELETE FROM {get_schema()}.{table_name} WHERE {' AND '.join(where_statements)};"
-        sql_statements.append(delete_statement)
+    value_columns = lst_id_columns + update_columns + [f"{col}__changed" for col in update_columns]
+    set_statements = [f"{col} = CASE WHEN v.{col}__changed THEN v.{col} ELSE t.{col} END" for col in update_columns]
+    where_statements = [f"t.{col} = v.{col}" for col in lst_id_columns]
+
+    update_statement = f"""
+        UPDATE {get_schema()}.{table_name} t
+           SET {", ".join(set_statements)}
+          FROM (VALUES {", ".join(values)}) AS v ({", ".join(value_columns)})
+         WHERE {" AND ".join(where_statements)};
+    """
+    return update_statement, params
+
+
+def _gen_df_delete_sql(
+    deleted_rows: pd.DataFrame, table_name: str, lst_id_columns: list, dct_column_types: dict
+) -> tuple[str, dict] | None:
+    # Generate a single DELETE for the deleted rows
+    if deleted_rows.empty:
+        return None
+
+    if len(lst_id_columns) == 1:
+        id_column = lst_id_columns[0]
+        delete_statement = f"""
+            DELETE FROM {get_schema()}.{table_name}
+             WHERE {id_column} = ANY(CAST(:ids AS {dct_column_types[id_column]}[]));
+        """
+        return delete_statement, {"ids": [_to_db_param(value) for value in deleted_rows[id_column]]}
+
+    # Composite keys
+    params = {}
+    values = []
+    for row_idx, row in enumerate(deleted_rows[lst_id_columns].itertuples(index=False)):
+        row_values = []
+        for col_idx, (col, value) in enumerate(zip(lst_id_columns, row, strict=True)):
+            params[f"v{row_idx}_{col_idx}"] = _to_db_param(value)
+            row_values.append(f"CAST(:v{row_idx}_{col_idx} AS {dct_column_types[col]})")
+        values.append(f"({', '.join(row_values)})")
 
-    return sql_statements
+    delete_statement = f"""
+        DELETE FROM {get_schema()}.{table_name}
+         WHERE ({", ".join(lst_id_columns)}) IN (VALUES {", ".join(values)});
+    """
+    return delete_statement, params
 
 
 def _gen_insert_sql(
@@ -185,8 +243,8 @@ def _gen_insert_sql(
     lst_id_columns: list,
     no_update_columns: list,
     dct_hard_default_columns: dict,
-) -> str:
-    # Generate a SQL INSERT statement for the new rows, ensuring strings are properly quoted.
+) -> tuple[str, list[dict]] | None:
+    # Generate an INSERT statement with the parameters of each new row
 
     # Remove the id column as it will be generated by the server
     if lst_id_columns:
@@ -198,49 +256,41 @@ def _gen_insert_sql(
         # Add and default all columns
         new_rows = new_rows.assign(**dct_hard_default_columns)
 
-    # Generate column names and values for the INSERT statement
-    columns = ", ".join(new_rows.columns)
+    if new_rows.empty:
+        return None
 
-    # Ensure strings are quoted
-    values = []
-    for _, row in new_rows.iterrows():
-        row_values = []
-        for val in row:
-            row_values.append(make_value_db_friendly(val))
-            # if isinstance(val, str):
-            #     row_values.append(f"'{val}'")
-            # else:
-            #     row_values.append(str(val))
-        values.append(f"({', '.join(row_values)})")
+    columns = ", ".join(new_rows.columns)
+    value_params = ", ".join(f":v{col_idx}" for col_idx in range(len(new_rows.columns)))
+    lst_params = [
+        {f"v{col_idx}": _to_db_param(value) for col_idx, value in enumerate(row)}
+        for row in new_rows.itertuples(index=False)
+    ]
 
-    if values:
-        values_str = ", ".join(values)
-        # Construct the SQL INSERT statement
-        sql_statement = f"INSERT INTO {get_schema()}.{table_name} ({columns}) VALUES {values_str};"
-        return sql_statement
+    sql_statement = f"INSERT INTO {get_schema()}.{table_name} ({columns}) VALUES ({value_params});"
+    return sql_statement, lst_params
 
 
 def apply_df_edits(df_original, df_edited, str_table, lst_id_columns, no_update_columns, dct_hard_default_columns):
+    # Applies the inserts, updates and deletes in one transaction
+    df_changed, df_changed_mask, df_new, df_deleted = _get_df_edits(df_original, df_edited, lst_id_columns)
+    if df_changed.empty and df_new.empty and df_deleted.empty:
+        return False
+
     booStatus = False
-    df_changed, df_new, df_deleted = _get_df_edits(df_original, df_edited, lst_id_columns)
-
-    # Generate SQL UPDATE statements
-    lst_update_SQL = _gen_df_update_sql(df_changed, str_table, lst_id_columns, no_update_columns)
-    if lst_update_SQL:
-        for str_sql in lst_update_SQL:
-            execute_sql(str_sql)
-            booStatus = True
-    # Generate SQL DELETE statements
-    lst_delete_SQL = _gen_df_delete_sql(df_deleted, str_table, lst_id_columns)
-    if lst_delete_SQL:
-        for str_sql in lst_delete_SQL:
-            execute_sql(str_sql)
-            booStatus = True
-    # Generate SQL INSERT statements
-    str_insert_sql = _gen_insert_sql(df_new, str_table, lst_id_columns, no_update_columns, dct_hard_default_columns)
-    if str_insert_sql:
-        execute_sql(str_insert_sql)
-        booStatus = True
+    with _start_engine().begin() as con:
+        dct_column_types = _get_column_types(con, str_table)
+
+        update_sql = _gen_df_update_sql(
+            df_changed, df_changed_mask, str_table, lst_id_columns, no_update_columns, dct_column_types
+        )
+        delete_sql = _gen_df_delete_sql(df_deleted, str_table, lst_id_columns, dct_column_types)
+        insert_sql = _gen_insert_sql(df_new, str_table, lst_id_columns, no_update_columns, dct_hard_default_columns)
+
+        for statement in (update_sql, delete_sql, insert_sql):
+            if statement:
+                str_sql, params = statement
+                con.execute(text(str_sql), params)
+                booStatus = True
 
     return booStatus
 
@@ -268,10 +318,35 @@ def _start_target_db_engine(flavor, host, port, db_name, user, password, url, co
     return create_engine(connection_string, connect_args=connect_args)
 
 
+def _get_warm_target_db_engine(engine_key, *engine_args):
+    # Called with _target_engines_lock held
+    now = time.monotonic()
+    for key, (engine, last_used) in list(_warm_target_engines.items()):
+        if now - last_used > settings.TARGET_ENGINE_IDLE_SECONDS:
+            del _warm_target_engines[key]
+            engine.dispose()
+
+    if engine_key not in _warm_target_engines:
+        if len(_warm_target_engines) >= _WARM_TARGET_ENGINES_MAX:
+            oldest_key = min(_warm_target_engines, key=lambda key: _warm_target_engines[key][1])
+            _warm_target_engines.pop(oldest_key)[0].dispose()
+        _warm_target_engines[engine_key] = [_start_target_db_engine(*engine_args), now]
+
+    _warm_target_engines[engine_key][1] = now
+    return _warm_target_engines[engine_key][0]
+
+
+def _get_target_db_engine(*engine_args):
+    # bytea values come back as memoryview objects, which don't compare by content
+    engine_key = tuple(bytes(arg) if isinstance(arg, memoryview) else arg for arg in engine_args)
+    with _target_engines_lock:
+        return _get_warm_target_db_engine(engine_key, *engine_args)
+
+
 def retrieve_target_db_data(flavor, host, port, db_name, user, password, url, connect_by_url, connect_by_key, private_key, private_key_passphrase, http_path, sql_query, decrypt=False):
     if decrypt:
         password = DecryptText(password)
-    db_engine = _start_target_db_engine(flavor, host, port, db_name, user, password, url, connect_by_url, connect_by_key, private_key, private_key_passphrase, http_path)
+    db_engine = _get_target_db_engine(flavor, host, port, db_name, user, password, url, connect_by_url, connect_by_key, private_key, private_key_passphrase, http_path)
     with db_engine.connect() as connection:
         query_result = connection.execute(text(sql_query))
         return query_result.fetchall()
@@ -280,5 +355,5 @@ def retrieve_target_db_data(flavor, host, port, db_name, user, password, url, co
 def retrieve_target_db_df(flavor, host, port, db_name, user, password, sql_query, url, connect_by_url, connect_by_key, private_key, private_key_passphrase, http_path):
     if password:
         password = DecryptText(password)
-    db_engine = _start_target_db_engine(flavor, host, port, db_name, user, password, url, connect_by_url, connect_by_key, private_key, private_key_passphrase, http_path)
+    db_engine = _get_target_db_engine(flavor, host, port, db_name, user, password, url, connect_by_url, connect_by_key, private_key, private_key_passphrase, http_path)
     return pd.read_sql_query(text(sql_query), db_engine)
@@ -1,11 +1,17 @@
-import streamlit as st
-
 from testgen.common.read_file import replace_templated_functions
 from testgen.ui.services import database_service as db
+from testgen.ui.services.source_data_lookup_service import source_data_cache
 
 
 def get_source_data(hi_data):
-    str_schema = st.session_state["dbschema"]
+    if not hi_data.get("id"):
+        return _get_source_data(hi_data)
+    key = ("hygiene_issue", hi_data["table_groups_id"], hi_data.get("profile_run_id"), hi_data["id"])
+    return source_data_cache.get_or_lookup(key, lambda: _get_source_data(hi_data))
+
+
+def _get_source_data(hi_data):
+    str_schema = db.get_schema()
     # Define the query
     str_sql = f"""
             SELECT t.lookup_query, tg.table_group_schema,
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+
+from testgen import settings
+
+LOOKUP_RESULT_TYPE = tuple[str, str | None, str | None, object]
+
+
+class LookupCache:
+    """
+    Bounded, time-limited cache of source data lookups. Concurrent requests for a key that is being looked up wait for
+    that lookup instead of running their own.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, LOOKUP_RESULT_TYPE]] = OrderedDict()
+        self._in_flight: dict[Hashable, Future] = {}
+
+    def get_or_lookup(self, key: Hashable, lookup: Callable[[], LOOKUP_RESULT_TYPE]) -> LOOKUP_RESULT_TYPE:
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return lookup()
+
+        with self._lock:
+            if (entry := self._entries.get(key)) and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return _copy_result(entry[1])
+            if future := self._in_flight.get(key):
+                is_owner = False
+            else:
+                future = self._in_flight[key] = Future()
+                is_owner = True
+
+        if not is_owner:
+            return _copy_result(future.result())
+
+        try:
+            result = lookup()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            # Errors are not cached, so that the next request tries again
+            if result[0] != "ERR":
+                with self._lock:
+                    self._entries[key] = (time.monotonic(), result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+            return _copy_result(result)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _copy_result(result: LOOKUP_RESULT_TYPE) -> LOOKUP_RESULT_TYPE:
+    # Callers may change the dataframe, so each one gets its own copy
+    status, message, query, df = result
+    return status, message, query, df.copy() if df is not None else None
+
+
+source_data_cache = LookupCache(settings.SOURCE_DATA_LOOKUP_CACHE_SIZE, settings.SOURCE_DATA_LOOKUP_CACHE_SECONDS)
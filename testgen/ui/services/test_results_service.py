@@ -3,6 +3,7 @@ import pandas as pd
 from testgen.common import ConcatColumnList
 from testgen.common.read_file import replace_templated_functions
 from testgen.ui.services import database_service as db
+from testgen.ui.services.source_data_lookup_service import source_data_cache
 from testgen.ui.services.string_service import empty_if_null
 from testgen.ui.services.test_definition_service import get_test_definition
 
@@ -63,7 +64,7 @@ def get_test_results(
                    END as execution_error_ct,
                    p.project_code, r.table_groups_id::VARCHAR,
                    r.id::VARCHAR as test_result_id, r.test_run_id::VARCHAR,
-                   c.id::VARCHAR as connection_id, r.test_suite_id::VARCHAR,
+                   cn.connection_id::VARCHAR as connection_id, r.test_suite_id::VARCHAR,
                    r.test_definition_id::VARCHAR as test_definition_id_runtime,
                    CASE
                      WHEN r.auto_gen = TRUE THEN d.id
@@ -137,6 +138,13 @@ def get_test_result_history(db_schema, tr_data):
 
 
 def do_source_data_lookup_custom(db_schema, tr_data):
+    if not tr_data.get("test_result_id"):
+        return _do_source_data_lookup_custom(db_schema, tr_data)
+    key = ("test_result_custom", tr_data["table_groups_id"], tr_data.get("test_run_id"), tr_data["test_result_id"])
+    return source_data_cache.get_or_lookup(key, lambda: _do_source_data_lookup_custom(db_schema, tr_data))
+
+
+def _do_source_data_lookup_custom(db_schema, tr_data):
     # Define the query
     str_sql = f"""
             SELECT d.custom_query as lookup_query, tg.table_group_schema,
@@ -185,6 +193,13 @@ def do_source_data_lookup_custom(db_schema, tr_data):
 
 
 def do_source_data_lookup(db_schema, tr_data, sql_only=False):
+    if sql_only or not tr_data.get("test_result_id"):
+        return _do_source_data_lookup(db_schema, tr_data, sql_only)
+    key = ("test_result", tr_data["table_groups_id"], tr_data.get("test_run_id"), tr_data["test_result_id"])
+    return source_data_cache.get_or_lookup(key, lambda: _do_source_data_lookup(db_schema, tr_data))
+
+
+def _do_source_data_lookup(db_schema, tr_data, sql_only=False):
     # Define the query
     str_sql = f"""
             SELECT t.lookup_query, tg.table_group_schema,
@@ -70,13 +70,14 @@ class BaseConnectionForm(BaseForm, ManualRender):
     max_threads: int = Field(
         default=4,
         ge=1,
-        le=8,
+        le=50,
         st_kwargs_min_value=1,
-        st_kwargs_max_value=8,
+        st_kwargs_max_value=50,
         st_kwargs_label="Max Threads (Advanced Tuning)",
         st_kwargs_help=(
-            "Maximum number of concurrent threads that run tests. Default values should be retained unless "
-            "test queries are failing."
+            "Maximum number of concurrent queries that run tests and profiling. TestGen adjusts the concurrency to "
+            "the observed latency and errors, up to this maximum. Only Snowflake and Databricks connections can use "
+            "more than 10. Lower it for small databases that should not receive many queries at once."
         ),
     )
     max_query_chars: int = Field(
@@ -12,7 +12,6 @@ import testgen.ui.services.database_service as db
 import testgen.ui.services.query_service as dq
 from testgen.ui.components import widgets as testgen
 from testgen.ui.components.widgets import testgen_component
-from testgen.ui.navigation.menu import MenuItem
 from testgen.ui.navigation.page import Page
 from testgen.ui.queries import project_queries
 from testgen.ui.queries.profiling_queries import TAG_FIELDS, get_column_by_id, get_hygiene_issues, get_table_by_id
@@ -31,7 +30,6 @@ class DataCatalogPage(Page):
     can_activate: typing.ClassVar = [
         lambda: session.authentication_status,
     ]
-    menu_item = MenuItem(icon=PAGE_ICON, label=PAGE_TITLE, section="Data Profiling", order=0)
 
     def render(self, project_code: str | None = None, table_group_id: str | None = None, selected: str | None = None, **_kwargs) -> None:
         testgen.page_header(
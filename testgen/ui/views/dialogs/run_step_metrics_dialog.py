@@ -0,0 +1,83 @@
+import json
+
+import pandas as pd
+import streamlit as st
+
+import testgen.ui.services.database_service as db
+from testgen.commands.run_step_metrics import export_run_step_metrics
+
+
+def run_step_metrics_button(run_id: str):
+    if st.button(
+        ":material/timer: Run Steps",
+        help="View the duration and database activity of each step of the run",
+        use_container_width=True,
+    ):
+        run_step_metrics_dialog(run_id)
+
+
+@st.dialog(title="Run Steps", width="large")
+def run_step_metrics_dialog(run_id: str):
+    df = get_run_step_metrics(run_id)
+    if df.empty:
+        st.markdown(":orange[No step metrics were recorded for this run.]")
+        return
+
+    df["python_seconds"] = (df["wall_seconds"] - df["target_db_seconds"] - df["metadata_db_seconds"]).clip(lower=0)
+    st.dataframe(
+        df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "step_name": "Step",
+            "wall_seconds": st.column_config.NumberColumn("Wall (s)", format="%.2f"),
+            "target_db_seconds": st.column_config.NumberColumn("Target DB (s)", format="%.2f"),
+            "metadata_db_seconds": st.column_config.NumberColumn("Metadata DB (s)", format="%.2f"),
+            "python_seconds": st.column_config.NumberColumn("Python (s)", format="%.2f"),
+            "query_ct": "Queries",
+            "row_ct": "Rows",
+            "byte_ct": "Bytes Sent",
+            "retry_ct": "Retries",
+            "error_message": "Error",
+        },
+        column_order=(
+            "step_name",
+            "wall_seconds",
+            "target_db_seconds",
+            "metadata_db_seconds",
+            "python_seconds",
+            "query_ct",
+            "row_ct",
+            "byte_ct",
+            "retry_ct",
+            "error_message",
+        ),
+    )
+    st.caption("Target and metadata DB times add up the queries of each step, which may run concurrently.")
+
+    st.download_button(
+        ":material/download: OpenTelemetry JSON",
+        data=json.dumps(export_run_step_metrics(run_id), indent=2),
+        file_name=f"run_telemetry_{run_id}.json",
+        mime="application/json",
+    )
+
+
+@st.cache_data(show_spinner=False)
+def get_run_step_metrics(run_id: str) -> pd.DataFrame:
+    schema: str = st.session_state["dbschema"]
+    sql = f"""
+    SELECT step_name,
+           wall_seconds::FLOAT,
+           target_db_seconds::FLOAT,
+           metadata_db_seconds::FLOAT,
+           query_ct,
+           row_ct,
+           byte_ct,
+           retry_ct,
+           error_message
+      FROM {schema}.run_step_metrics
+     WHERE run_id = '{run_id}'::UUID
+    ORDER BY step_seq;
+    """
+    return db.retrieve_data(sql)
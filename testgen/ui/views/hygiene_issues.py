@@ -15,9 +15,10 @@ from testgen.common import date_service
 from testgen.ui.components import widgets as testgen
 from testgen.ui.components.widgets.download_dialog import FILE_DATA_TYPE, download_dialog, zip_multi_file_data
 from testgen.ui.navigation.page import Page
-from testgen.ui.pdf.hygiene_issue_report import create_report
+from testgen.ui.pdf.hygiene_issue_report import create_report, get_report_lookups
+from testgen.ui.pdf.lookups import prefetch_report_lookups
 from testgen.ui.services import project_service, user_session_service
-from testgen.ui.services.hygiene_issues_service import get_source_data as get_source_data_uncached
+from testgen.ui.services.hygiene_issues_service import get_source_data
 from testgen.ui.session import session
 from testgen.ui.views.dialogs.profiling_results_dialog import view_profiling_button
 from testgen.utils import friendly_score
@@ -247,6 +248,7 @@ class HygieneIssuesPage(Page):
                                 "testgen_hygiene_issue_reports.zip",
                                 get_report_file_data,
                                 [(arg,) for arg in selected],
+                                prefetch_func=prefetch_report_lookups(get_report_lookups),
                             )
                             download_dialog(dialog_title=dialog_title, file_content_func=zip_func)
 
@@ -374,7 +376,7 @@ def get_profiling_anomalies(
                    END AS likelihood_order,
                    t.anomaly_description, r.detail, t.suggested_action,
                    r.anomaly_id, r.table_groups_id::VARCHAR, r.id::VARCHAR, p.profiling_starttime, r.profile_run_id::VARCHAR,
-                   tg.table_groups_name
+                   tg.table_groups_name, tg.connection_id::VARCHAR
               FROM {schema}.profile_anomaly_results r
             INNER JOIN {schema}.profile_anomaly_types t
                ON r.anomaly_id = t.id
@@ -458,11 +460,6 @@ def get_profiling_anomaly_summary(str_profile_run_id):
     ]
 
 
-@st.cache_data(show_spinner=False)
-def get_source_data(hi_data):
-    return get_source_data_uncached(hi_data)
-
-
 def write_frequency_graph(df_tests):
     # Count the frequency of each test_name
     df_count = df_tests["anomaly_name"].value_counts().reset_index()
@@ -522,13 +519,13 @@ def do_disposition_update(selected, str_new_status):
 
     return str_result
 
-def get_report_file_data(update_progress, tr_data) -> FILE_DATA_TYPE:
+def get_report_file_data(update_progress, tr_data, lookups=None) -> FILE_DATA_TYPE:
     hi_id = tr_data["id"][:8]
     profiling_time = pd.Timestamp(tr_data["profiling_starttime"]).strftime("%Y%m%d_%H%M%S")
     file_name = f"testgen_hygiene_issue_report_{hi_id}_{profiling_time}.pdf"
 
     with BytesIO() as buffer:
-        create_report(buffer, tr_data)
+        create_report(buffer, tr_data, lookups)
         update_progress(1.0)
         buffer.seek(0)
         return file_name, "application/pdf", buffer.read()
@@ -13,6 +13,7 @@ from testgen.ui.navigation.page import Page
 from testgen.ui.services import project_service, user_session_service
 from testgen.ui.session import session
 from testgen.ui.views.dialogs.data_preview_dialog import data_preview_dialog
+from testgen.ui.views.dialogs.run_step_metrics_dialog import run_step_metrics_button
 
 FORM_DATA_WIDTH = 400
 
@@ -46,8 +47,8 @@ class ProfilingResultsPage(Page):
             ],
         )
 
-        table_filter_column, column_filter_column, sort_column, export_button_column = st.columns(
-            [.3, .3, .08, .32], vertical_alignment="bottom"
+        table_filter_column, column_filter_column, sort_column, steps_column, export_button_column = st.columns(
+            [.3, .3, .08, .12, .2], vertical_alignment="bottom"
         )
 
         with table_filter_column:
@@ -114,6 +115,9 @@ class ProfilingResultsPage(Page):
             bind_to_query_prop="id",
         )
 
+        with steps_column:
+            run_step_metrics_button(run_id)
+
         with export_button_column:
             testgen.flex_row_end()
             render_export_button(df)
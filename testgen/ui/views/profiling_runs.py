@@ -10,7 +10,6 @@ import testgen.ui.services.form_service as fm
 import testgen.ui.services.query_service as dq
 from testgen.ui.components import widgets as testgen
 from testgen.ui.components.widgets import testgen_component
-from testgen.ui.navigation.menu import MenuItem
 from testgen.ui.navigation.page import Page
 from testgen.ui.queries import profiling_run_queries, project_queries
 from testgen.ui.services import user_session_service
@@ -30,13 +29,6 @@ class DataProfilingPage(Page):
         lambda: session.authentication_status,
         lambda: not user_session_service.user_has_catalog_role(),
     ]
-    menu_item = MenuItem(
-        icon=PAGE_ICON,
-        label=PAGE_TITLE,
-        section="Data Profiling",
-        order=1,
-        roles=[ role for role in typing.get_args(user_session_service.RoleType) if role != "catalog" ],
-    )
 
     def render(self, project_code: str | None = None, table_group_id: str | None = None, **_kwargs) -> None:
         testgen.page_header(
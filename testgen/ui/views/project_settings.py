@@ -7,7 +7,6 @@ from streamlit.delta_generator import DeltaGenerator
 
 from testgen.commands.run_observability_exporter import test_observability_exporter
 from testgen.ui.components import widgets as testgen
-from testgen.ui.navigation.menu import MenuItem
 from testgen.ui.navigation.page import Page
 from testgen.ui.services import project_service, user_session_service
 from testgen.ui.session import session
@@ -22,13 +21,6 @@ class ProjectSettingsPage(Page):
         lambda: user_session_service.user_is_admin(),
         lambda: session.project is not None,
     ]
-    menu_item = MenuItem(
-        icon="settings",
-        label=PAGE_TITLE,
-        section="Settings",
-        order=0,
-        roles=[ "admin" ],
-    )
 
     project: dict | None = None
     existing_names: list[str] | None = None
@@ -1,7 +1,6 @@
-from typing import ClassVar, get_args
+from typing import ClassVar
 
 from testgen.ui.components import widgets as testgen
-from testgen.ui.navigation.menu import MenuItem
 from testgen.ui.navigation.page import Page
 from testgen.ui.queries import project_queries
 from testgen.ui.queries.scoring_queries import get_all_score_cards
@@ -18,12 +17,6 @@ class QualityDashboardPage(Page):
         lambda: session.authentication_status,
         lambda: not user_session_service.user_has_catalog_role(),
     ]
-    menu_item = MenuItem(
-        icon="readiness_score",
-        label=PAGE_TITLE,
-        order=1,
-        roles=[ role for role in get_args(user_session_service.RoleType) if role != "catalog" ],
-    )
 
     def render(self, *, project_code: str, **_kwargs) -> None:
         project_summary = project_queries.get_summary_by_code(project_code)
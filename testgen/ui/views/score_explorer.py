@@ -14,6 +14,7 @@ from testgen.ui.components.widgets.download_dialog import FILE_DATA_TYPE, downlo
 from testgen.ui.navigation.page import Page
 from testgen.ui.navigation.router import Router
 from testgen.ui.pdf import hygiene_issue_report, test_result_report
+from testgen.ui.pdf.lookups import prefetch_report_lookups
 from testgen.ui.queries import profiling_queries, test_run_queries
 from testgen.ui.queries.scoring_queries import (
     get_all_score_cards,
@@ -179,20 +180,27 @@ def export_issue_reports(selected_issues: list[SelectedIssue]) -> None:
             "testgen_issue_reports.zip",
             get_report_file_data,
             [(arg,) for arg in issues_data],
+            prefetch_func=prefetch_report_lookups(get_report_lookups),
         )
         download_dialog(dialog_title=dialog_title, file_content_func=zip_func)
 
 
-def get_report_file_data(update_progress, issue) -> FILE_DATA_TYPE:
+def get_report_lookups(issue):
+    if issue["issue_type"] == "hygiene":
+        return hygiene_issue_report.get_report_lookups(issue)
+    return test_result_report.get_report_lookups(issue)
+
+
+def get_report_file_data(update_progress, issue, lookups=None) -> FILE_DATA_TYPE:
     with BytesIO() as buffer:
         if issue["issue_type"] == "hygiene":
             issue_id = issue["id"][:8]
             timestamp = pd.Timestamp(issue["profiling_starttime"]).strftime("%Y%m%d_%H%M%S")
-            hygiene_issue_report.create_report(buffer, issue)
+            hygiene_issue_report.create_report(buffer, issue, lookups)
         else:
             issue_id = issue["test_result_id"][:8]
             timestamp = pd.Timestamp(issue["test_time"]).strftime("%Y%m%d_%H%M%S")
-            test_result_report.create_report(buffer, issue)
+            test_result_report.create_report(buffer, issue, lookups)
 
         update_progress(1.0)
         buffer.seek(0)
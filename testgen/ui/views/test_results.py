@@ -17,11 +17,13 @@ from testgen.common import date_service
 from testgen.ui.components import widgets as testgen
 from testgen.ui.components.widgets.download_dialog import FILE_DATA_TYPE, download_dialog, zip_multi_file_data
 from testgen.ui.navigation.page import Page
-from testgen.ui.pdf.test_result_report import create_report
+from testgen.ui.pdf.lookups import prefetch_report_lookups
+from testgen.ui.pdf.test_result_report import create_report, get_report_lookups
 from testgen.ui.services import project_service, test_definition_service, test_results_service, user_session_service
 from testgen.ui.services.string_service import empty_if_null
 from testgen.ui.session import session
 from testgen.ui.views.dialogs.profiling_results_dialog import view_profiling_button
+from testgen.ui.views.dialogs.run_step_metrics_dialog import run_step_metrics_button
 from testgen.ui.views.test_definitions import show_test_form_by_id
 from testgen.utils import friendly_score
 
@@ -65,7 +67,9 @@ class TestResultsPage(Page):
             ],
         )
 
-        summary_column, score_column, actions_column = st.columns([.4, .2, .4], vertical_alignment="bottom")
+        summary_column, score_column, steps_column, actions_column = st.columns(
+            [.4, .2, .1, .3], vertical_alignment="bottom"
+        )
         status_filter_column, test_type_filter_column, table_filter_column, column_filter_column, sort_column, export_button_column = st.columns(
             [.2, .2, .2, .2, .1, .1], vertical_alignment="bottom"
         )
@@ -80,6 +84,9 @@ class TestResultsPage(Page):
         with score_column:
             render_score(run_df["project_code"], run_id)
 
+        with steps_column:
+            run_step_metrics_button(run_id)
+
         with status_filter_column:
             status_options = [
                 "Failed + Warning",
@@ -357,13 +364,11 @@ def get_test_definition(str_test_def_id):
     return test_definition_service.get_test_definition(str_schema, str_test_def_id)
 
 
-@st.cache_data(show_spinner=False)
 def do_source_data_lookup(selected_row):
     schema = st.session_state["dbschema"]
     return test_results_service.do_source_data_lookup(schema, selected_row)
 
 
-@st.cache_data(show_spinner=False)
 def do_source_data_lookup_custom(selected_row):
     schema = st.session_state["dbschema"]
     return test_results_service.do_source_data_lookup_custom(schema, selected_row)
@@ -597,6 +602,7 @@ def show_result_detail(
                         "testgen_test_issue_reports.zip",
                         get_report_file_data,
                         [(arg,) for arg in selected_rows],
+                        prefetch_func=prefetch_report_lookups(get_report_lookups),
                     )
                     download_dialog(dialog_title=dialog_title, file_content_func=zip_func)
 
@@ -748,13 +754,13 @@ def view_edit_test(button_container, test_definition_id):
             show_test_form_by_id(test_definition_id)
 
 
-def get_report_file_data(update_progress, tr_data) -> FILE_DATA_TYPE:
+def get_report_file_data(update_progress, tr_data, lookups=None) -> FILE_DATA_TYPE:
     tr_id = tr_data["test_result_id"][:8]
     tr_time = pd.Timestamp(tr_data["test_time"]).strftime("%Y%m%d_%H%M%S")
     file_name = f"testgen_test_issue_report_{tr_id}_{tr_time}.pdf"
 
     with BytesIO() as buffer:
-        create_report(buffer, tr_data)
+        create_report(buffer, tr_data, lookups)
         update_progress(1.0)
         buffer.seek(0)
         return file_name, "application/pdf", buffer.read()
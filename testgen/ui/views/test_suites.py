@@ -9,7 +9,6 @@ import testgen.ui.services.query_service as dq
 import testgen.ui.services.test_suite_service as test_suite_service
 from testgen.commands.run_observability_exporter import export_test_results
 from testgen.ui.components import widgets as testgen
-from testgen.ui.navigation.menu import MenuItem
 from testgen.ui.navigation.page import Page
 from testgen.ui.navigation.router import Router
 from testgen.ui.queries import project_queries
@@ -30,13 +29,6 @@ class TestSuitesPage(Page):
         lambda: session.authentication_status,
         lambda: not user_session_service.user_has_catalog_role(),
     ]
-    menu_item = MenuItem(
-        icon=PAGE_ICON,
-        label=PAGE_TITLE,
-        section="Data Quality Testing",
-        order=1,
-        roles=[ role for role in typing.get_args(user_session_service.RoleType) if role != "catalog" ],
-    )
 
     def render(self, project_code: str | None = None, table_group_id: str | None = None, **_kwargs) -> None:
         testgen.page_header(
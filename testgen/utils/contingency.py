@@ -0,0 +1,101 @@
+from collections.abc import Iterator
+from itertools import combinations
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# Columns must cover at least this share of the observations, and this count, to take part in a rule
+MIN_OBSERVATIONS_SHARE = 0.05
+MIN_OBSERVATIONS_COUNT = 30
+
+
+class ContingencyRule(NamedTuple):
+    cause_column_name: str
+    cause_column_value: object
+    effect_column_name: str
+    effect_column_value: object
+    pair_count: int
+    cause_column_total: int
+    effect_column_total: int
+    rule_ratio: float
+
+
+class _FactorizedColumn(NamedTuple):
+    name: str
+    codes: np.ndarray
+    values: np.ndarray
+    totals: np.ndarray
+
+
+def _factorize(df_counts: pd.DataFrame, column_names: list[str], freq_column: str) -> list[_FactorizedColumn]:
+    weights = df_counts[freq_column].to_numpy(dtype=np.float64)
+    factorized = []
+    for position, name in enumerate(column_names):
+        # Null values get code -1 and are left out, as they were by the previous pivot tables
+        codes, values = pd.factorize(df_counts.iloc[:, position], sort=True)
+        valid = codes >= 0
+        totals = np.bincount(codes[valid], weights=weights[valid], minlength=len(values))
+        factorized.append(_FactorizedColumn(name, codes, np.asarray(values, dtype=object), totals))
+    return factorized
+
+
+def find_contingency_rules(
+    df_counts: pd.DataFrame,
+    column_names: list[str],
+    threshold_ratio: float,
+    freq_column: str = "freq_ct",
+) -> Iterator[ContingencyRule]:
+    """
+    Finds IF X=A THEN Y=B rules between the given columns of a table.
+
+    `df_counts` holds the record count of each combination of values, with the columns in the order of `column_names`
+    and a `freq_column`. Each column is factorized once, and the co-occurrence matrix of every pair of columns is counted
+    with `np.bincount` on the combined codes. A rule is found when at least `threshold_ratio` of the records with the
+    cause value have the effect value, and both column totals meet the minimum observations.
+    """
+    if df_counts.empty or len(column_names) < 2:
+        return
+
+    weights = df_counts[freq_column].to_numpy(dtype=np.float64)
+    columns = _factorize(df_counts, column_names, freq_column)
+
+    # Total observations of all pairs: records where both columns of the pair are not null
+    not_null = np.column_stack([column.codes >= 0 for column in columns]).astype(np.float64)
+    pair_observations = (not_null * weights[:, None]).T @ not_null
+    total_observations = np.triu(pair_observations, k=1).sum()
+    threshold_min = max(total_observations * MIN_OBSERVATIONS_SHARE, MIN_OBSERVATIONS_COUNT)
+
+    # Values under the minimum observations can't be part of a rule, nor can columns without any other value
+    eligible = [column.totals >= threshold_min for column in columns]
+    candidates = [i for i, column_eligible in enumerate(eligible) if column_eligible.any()]
+
+    for i, j in combinations(candidates, 2):
+        first, second = columns[i], columns[j]
+        valid = (first.codes >= 0) & (second.codes >= 0)
+        combined = first.codes[valid] * len(second.values) + second.codes[valid]
+        pair_counts = np.bincount(
+            combined, weights=weights[valid], minlength=len(first.values) * len(second.values)
+        ).reshape(len(first.values), len(second.values))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            to_first_ratio = pair_counts / first.totals[:, None]
+            to_second_ratio = pair_counts / second.totals[None, :]
+
+        eligible_cells = (pair_counts > 0) & eligible[i][:, None] & eligible[j][None, :]
+        # First causes second, then second causes first, with the matrices transposed
+        for cause, effect, counts, cells, ratio in (
+            (first, second, pair_counts, eligible_cells, to_first_ratio),
+            (second, first, pair_counts.T, eligible_cells.T, to_second_ratio.T),
+        ):
+            for cause_code, effect_code in zip(*np.nonzero(cells & (ratio >= threshold_ratio)), strict=True):
+                yield ContingencyRule(
+                    cause.name,
+                    cause.values[cause_code],
+                    effect.name,
+                    effect.values[effect_code],
+                    int(counts[cause_code, effect_code]),
+                    int(cause.totals[cause_code]),
+                    int(effect.totals[effect_code]),
+                    float(ratio[cause_code, effect_code]),
+                )